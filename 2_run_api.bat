@@ -2,17 +2,37 @@
 setlocal
 REM Pin working directory to the folder of this BAT file:
 cd /d %~dp0
+REM Ensure local packages (rag/, agent/, etc.) are importable:
+set PYTHONPATH=%CD%
 
-echo [2_run_api] ========================================
-echo [2_run_api] WARNING: API Server is not implemented
-echo [2_run_api] ========================================
-echo.
-echo [2_run_api] This project currently only supports Streamlit UI.
-echo [2_run_api] Please use 3_run_ui.bat to start the Streamlit interface.
+REM Check if virtual environment exists
+if not exist .venv\Scripts\python.exe (
+  echo [2_run_api] ERROR: Virtual environment not found.
+  echo [2_run_api] Please run 0_setup_env.bat first to create the virtual environment.
+  pause
+  exit /b 1
+)
+
+if exist .env (
+  echo [2_run_api] .env file found. Environment variables will be loaded.
+) else (
+  echo [2_run_api] WARNING: .env file not found. LLM API keys may not be configured.
+)
+
+REM API server configuration (override by setting these before running)
+if "%API_HOST%"=="" set API_HOST=127.0.0.1
+if "%API_PORT%"=="" set API_PORT=8000
+if "%API_WORKERS%"=="" set API_WORKERS=4
+if "%API_MAX_QUEUE%"=="" set API_MAX_QUEUE=16
+if "%API_TIMEOUT%"=="" set API_TIMEOUT=60
+
+REM Pass --mock to run without LLM keys or indexes: 2_run_api.bat --mock
+echo [2_run_api] Starting Medical AI Agent API server...
+echo [2_run_api] API will be available at http://%API_HOST%:%API_PORT%
+echo [2_run_api]   POST /v1/turn, POST /v1/turn/stream (SSE), GET /v1/sessions
+echo [2_run_api]   GET /health, GET /ready, GET /metrics
 echo.
-echo [2_run_api] If you need an API server, you can:
-echo [2_run_api]   1. Create a FastAPI application
-echo [2_run_api]   2. Or use the agent.graph.run_agent() function directly
+echo [2_run_api] Press Ctrl+C to stop the server.
 echo.
-pause
-exit /b 0
+
+.venv\Scripts\python.exe -m api.server --host %API_HOST% --port %API_PORT% --workers %API_WORKERS% --max-queue %API_MAX_QUEUE% --timeout %API_TIMEOUT% %*
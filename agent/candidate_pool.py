@@ -0,0 +1,121 @@
+"""
+재검색용 후보 풀 (Incremental Re-retrieval)
+
+첫 검색에서 k보다 넓은 후보 풀을 가져와 세션 리소스로 보관하고,
+CRAG 재검색 시에는 인덱스를 다시 조회하는 대신 풀을 재작성 질의로 재점수화하여
+이미 보여준 문서를 제외한 다음 페이지를 반환합니다.
+풀에 남은 문서가 부족할 때만 인덱스 검색으로 돌아갑니다.
+
+Feature flag: candidate_pool_enabled (기본값: False)
+"""
+
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from retrieval.hybrid_retriever import tokenize_ko_en
+from agent.doc_set import doc_id
+
+
+# 후보 풀 크기 기본값 (첫 검색 k 대신 사용)
+DEFAULT_POOL_SIZE = 40
+
+# 원래 검색 순위 가중치 (어휘 점수가 같을 때 원래 순위 우선)
+RANK_PRIOR_WEIGHT = 0.1
+
+
+class CandidatePool:
+    """
+    한 턴의 첫 검색 후보 풀
+
+    풀 안의 문서만을 말뭉치로 보는 BM25로 재작성 질의와의 어휘 일치를 계산하고,
+    원래 검색 순위를 약한 prior로 더해 재정렬합니다.
+    """
+
+    def __init__(self, docs: List[Dict[str, Any]], user_text: str, route: str,
+                 k1: float = 1.5, b: float = 0.75):
+        self.docs = list(docs or [])
+        self.user_text = user_text
+        self.route = route
+        self.k1 = k1
+        self.b = b
+
+        self._ids = [doc_id(doc) for doc in self.docs]
+        self._term_freqs = [Counter(tokenize_ko_en(doc.get('text', ''))) for doc in self.docs]
+        self._doc_lens = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_len = (sum(self._doc_lens) / len(self._doc_lens)) if self._doc_lens else 0.0
+
+        doc_freq = Counter()
+        for tf in self._term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(self.docs)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def matches(self, user_text: str, route: str) -> bool:
+        """같은 턴(원문 질의) / 같은 라우트의 풀인지"""
+        return self.user_text == user_text and self.route == route
+
+    def remaining(self, exclude_ids: Iterable[str] = ()) -> int:
+        """아직 보여주지 않은 문서 수"""
+        excluded = set(exclude_ids)
+        return sum(1 for key in self._ids if key not in excluded)
+
+    def _lexical_score(self, index: int, query_terms: List[str]) -> float:
+        tf = self._term_freqs[index]
+        doc_len = self._doc_lens[index]
+        norm = self.k1 * (1 - self.b + self.b * doc_len / self._avg_len) if self._avg_len else self.k1
+
+        score = 0.0
+        for term in query_terms:
+            freq = tf.get(term, 0)
+            if freq:
+                score += self._idf.get(term, 0.0) * freq * (self.k1 + 1) / (freq + norm)
+        return score
+
+    def rescore(self, query: str, k: int,
+                exclude_ids: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        재작성 질의로 풀 재정렬 후 제외 문서를 뺀 상위 k개 반환
+
+        Returns:
+            'pool_score'가 표시된 문서 리스트 (원본 문서는 변경하지 않음)
+        """
+        excluded = set(exclude_ids)
+        query_terms = sorted({t for t in tokenize_ko_en(query) if len(t) >= 2})
+
+        candidates = [i for i, key in enumerate(self._ids) if key not in excluded]
+        if not candidates:
+            return []
+
+        lexical = {i: self._lexical_score(i, query_terms) for i in candidates}
+        max_lexical = max(lexical.values()) or 1.0
+        n = len(self.docs)
+
+        scored = []
+        for i in candidates:
+            prior = 1.0 - i / n
+            scored.append((lexical[i] / max_lexical + RANK_PRIOR_WEIGHT * prior, -i))
+        scored.sort(reverse=True)
+
+        return [
+            {**self.docs[-neg_i], 'pool_score': round(score, 4)}
+            for score, neg_i in scored[:k]
+        ]
+
+
+def pool_size(feature_flags: Dict[str, Any], k: int) -> int:
+    """첫 검색에서 가져올 후보 수 (풀 비활성화 시 k 그대로)"""
+    if not feature_flags.get('candidate_pool_enabled', False):
+        return k
+    return max(k, int(feature_flags.get('candidate_pool_size', DEFAULT_POOL_SIZE)))
+
+
+def shown_doc_ids(retrieved_docs_history: Optional[List[List[str]]]) -> set:
+    """이전 검색들에서 이미 보여준 문서 ID"""
+    return {key for ids in retrieved_docs_history or [] for key in ids}
@@ -0,0 +1,121 @@
+"""
+그래프 상태 체크포인트 / Fork (공유 prefix 실험용)
+
+Basic RAG / CRAG 및 대부분의 Ablation 프로파일은 generate_answer 이후 단계
+(refine / quality_check)의 플래그만 다릅니다. 노드 경계마다 LangGraph 체크포인터에
+상태를 저장하고, 첫 생성까지의 공유 prefix를 한 번만 실행한 뒤 저장된 상태에서
+설정별로 fork하여 이후 단계만 실행합니다.
+
+- 체크포인터: langgraph-checkpoint-sqlite가 있으면 로컬 SQLite, 없으면 메모리
+- fork 스레드는 실행 후 delete_thread로 삭제 (실행마다 스레드가 쌓이지 않도록)
+- prefix 그룹: fork 이후 단계에서만 쓰이는 플래그를 제외한 나머지가 같은 설정끼리 공유
+"""
+
+import os
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+try:
+    from langgraph.checkpoint.memory import MemorySaver
+    HAS_LANGGRAPH_CHECKPOINT = True
+except ImportError:
+    HAS_LANGGRAPH_CHECKPOINT = False
+    print("[WARNING] langgraph checkpoint not available. Fork 실행을 사용할 수 없습니다.")
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    HAS_SQLITE_SAVER = True
+except ImportError:
+    HAS_SQLITE_SAVER = False
+
+
+# 기본 fork 지점 (첫 답변 생성 직후)
+DEFAULT_FORK_NODE = 'generate_answer'
+
+# 로컬 체크포인트 저장소 기본 경로
+DEFAULT_CHECKPOINT_PATH = 'runs/checkpoints/graph_checkpoints.sqlite'
+
+# generate_answer 이후 노드(refine / quality_check)에서만 읽는 플래그
+# 이 플래그만 다른 설정들은 첫 생성까지의 prefix를 공유할 수 있음
+POST_GENERATION_FLAGS = (
+    'refine_strategy',
+    'self_refine_enabled',
+    'quality_check_enabled',
+    'llm_based_quality_check',
+    'quality_check_mode',
+    'cascade_band_low',
+    'cascade_band_high',
+    'cascade_shadow_judge',
+    'dynamic_query_rewrite',
+    'combined_eval_rewrite',
+    'duplicate_detection',
+    'progress_monitoring',
+    'max_refine_iterations',
+    'quality_threshold',
+)
+
+
+def prefix_signature(feature_flags: Dict[str, Any]) -> str:
+    """fork 이전 prefix 실행에 영향을 주는 플래그 서명"""
+    prefix_flags = {
+        key: value for key, value in (feature_flags or {}).items()
+        if key not in POST_GENERATION_FLAGS
+    }
+    return json.dumps(prefix_flags, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def group_by_prefix(flags_by_name: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """설정 이름을 prefix 서명별로 묶기 (입력 순서 유지)"""
+    groups: Dict[str, List[str]] = {}
+    for name, flags in flags_by_name.items():
+        groups.setdefault(prefix_signature(flags), []).append(name)
+    return groups
+
+
+# 전역 체크포인터 (싱글톤)
+_checkpointer = None
+
+
+def get_checkpointer(path: Optional[str] = None):
+    """
+    LangGraph 체크포인터 가져오기 (싱글톤)
+
+    Args:
+        path: SQLite 파일 경로 (기본값: runs/checkpoints/graph_checkpoints.sqlite)
+              langgraph-checkpoint-sqlite 미설치 시 메모리 체크포인터 사용
+    """
+    global _checkpointer
+    if _checkpointer is not None:
+        return _checkpointer
+
+    if not HAS_LANGGRAPH_CHECKPOINT:
+        raise RuntimeError("langgraph checkpoint 모듈이 없어 체크포인터를 만들 수 없습니다")
+
+    if HAS_SQLITE_SAVER:
+        path = path or DEFAULT_CHECKPOINT_PATH
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        _checkpointer = SqliteSaver(conn)
+        print(f"[Checkpoint] SQLite 체크포인터: {path}")
+    else:
+        _checkpointer = MemorySaver()
+        print("[Checkpoint] 메모리 체크포인터 (langgraph-checkpoint-sqlite 미설치)")
+    return _checkpointer
+
+
+def delete_thread(thread_id: str, checkpointer=None) -> None:
+    """
+    스레드의 체크포인트 삭제 (fork 실행이 끝난 뒤 호출)
+
+    Args:
+        thread_id: 삭제할 스레드 ID
+        checkpointer: 체크포인터 (기본값: 전역 체크포인터)
+    """
+    checkpointer = checkpointer if checkpointer is not None else _checkpointer
+    if checkpointer is None:
+        return
+    try:
+        checkpointer.delete_thread(thread_id)
+    except Exception as e:
+        print(f"[WARNING] 체크포인트 삭제 실패 ({thread_id}): {e}")
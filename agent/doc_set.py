@@ -0,0 +1,89 @@
+"""
+검색 문서 집합 (iteration-aware doc set)
+
+AgentState.retrieved_docs 리듀서와 재검색 루프용 문서 병합 유틸리티
+- 문서 ID 기준 중복 제거 (doc_id / id / 본문 md5)
+- 문서별 최초 검색 iteration(retrieval_iteration) 기록
+- 최대 문서 수 제한
+
+모든 노드가 {**state, ...}로 전체 상태를 반환하므로, 리듀서는 누적(add) 대신
+중복 제거 + 상한 적용 후 최신 값으로 교체합니다 (같은 리스트를 다시 받아도 결과 동일).
+재검색 시 이전 iteration 문서와의 병합은 retrieve 노드가 merge_iteration_docs로 수행합니다.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+
+# retrieved_docs 최대 문서 수 (리듀서 상한)
+MAX_RETRIEVED_DOCS = 20
+
+
+def doc_id(doc: Dict[str, Any]) -> str:
+    """문서 ID (doc_id → id → 본문 md5 순)"""
+    for key in ('doc_id', 'id'):
+        value = doc.get(key)
+        if value is not None and value != '':
+            return str(value)
+    return hashlib.md5(doc.get('text', '').encode('utf-8')).hexdigest()
+
+
+def dedup_docs(docs: List[Dict[str, Any]], cap: Optional[int] = None) -> List[Dict[str, Any]]:
+    """문서 ID 기준 중복 제거 (먼저 나온 문서 유지) 및 상한 적용"""
+    seen = set()
+    unique = []
+    for doc in docs or []:
+        key = doc_id(doc)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(doc)
+        if cap is not None and len(unique) >= cap:
+            break
+    return unique
+
+
+def reduce_retrieved_docs(existing: List[Dict[str, Any]], update: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    AgentState.retrieved_docs 리듀서
+
+    최신 값(update)으로 교체하되 중복 제거 및 MAX_RETRIEVED_DOCS 상한을 적용합니다.
+    update가 None이면 기존 값을 유지합니다.
+    """
+    if update is None:
+        return existing or []
+    return dedup_docs(update, cap=MAX_RETRIEVED_DOCS)
+
+
+def merge_iteration_docs(
+    previous_docs: List[Dict[str, Any]],
+    new_docs: List[Dict[str, Any]],
+    iteration: int,
+    cap: int = MAX_RETRIEVED_DOCS
+) -> List[Dict[str, Any]]:
+    """
+    재검색 결과와 이전 iteration 문서 병합
+
+    - 이번 iteration 문서를 검색 순위대로 앞에 배치
+    - 이전 iteration 문서 중 중복되지 않은 문서를 뒤에 유지
+    - 이미 본 문서는 최초 검색 iteration을 유지
+
+    Returns:
+        retrieval_iteration이 표시된 문서 리스트 (원본 문서는 변경하지 않음)
+    """
+    first_seen = {doc_id(doc): doc.get('retrieval_iteration', iteration) for doc in previous_docs or []}
+
+    tagged_new = [
+        {**doc, 'retrieval_iteration': first_seen.get(doc_id(doc), iteration)}
+        for doc in new_docs or []
+    ]
+    return dedup_docs(tagged_new + list(previous_docs or []), cap=min(cap, MAX_RETRIEVED_DOCS))
+
+
+def summarize_provenance(docs: List[Dict[str, Any]]) -> Dict[str, int]:
+    """iteration별 문서 수 (refine_iteration_logs용)"""
+    provenance: Dict[str, int] = {}
+    for doc in docs or []:
+        key = str(doc.get('retrieval_iteration', 0))
+        provenance[key] = provenance.get(key, 0) + 1
+    return provenance
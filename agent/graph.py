@@ -4,27 +4,173 @@ LangGraph 워크플로우 정의
 - 순환 구조 (Self-Refine 루프)
 """
 
+import time
+import uuid
+import queue
+import asyncio
+import functools
+import threading
+from typing import Any, Dict, Iterator
 from langgraph.graph import StateGraph, END
 from agent.state import AgentState
 from agent.nodes.extract_slots import extract_slots_node
-from agent.nodes.store_memory import store_memory_node
+from agent.nodes.store_memory import store_memory_node, store_memory_node_async
 from agent.nodes.assemble_context import assemble_context_node
-from agent.nodes.retrieve import retrieve_node
-from agent.nodes.generate_answer import generate_answer_node
-from agent.nodes.refine import refine_node
+from agent.nodes.retrieve import retrieve_node, retrieve_node_async
+from agent.nodes.generate_answer import generate_answer_node, generate_answer_node_async
+from agent.nodes.refine import refine_node, refine_node_async
 from agent.nodes.quality_check import quality_check_node
 from agent.nodes.check_similarity import check_similarity_node, store_response_node
 from agent.nodes.classify_intent import classify_intent_node
+from agent.streaming import emit_event
+from agent.single_flight import get_single_flight
+from agent.graph_profile import FULL_PROFILE, GraphProfile, graph_profile, entry_defaults, exit_defaults
+from agent.checkpoint import DEFAULT_FORK_NODE, get_checkpointer, group_by_prefix, delete_thread
+from agent.session_registry import (
+    RESOURCE_KEYS,
+    EXPORTED_RESOURCE_KEYS,
+    get_session_registry,
+    get_resource,
+    get_or_create_resource,
+    measure_state_size,
+)
 from core.config import get_agent_config
+from core.utils import normalize_query, patient_fingerprint
+from core.tracing import trace_span, is_tracing_enabled, configure_tracing
+from core.embedding_memo import embedding_turn
 
 # 그래프 캐시 (성능 최적화)
 _agent_graph_cache = None
+_agent_graph_async_cache = None
+_graph_variant_cache: Dict[tuple, Any] = {}  # (use_async, GraphProfile) → 특화 그래프
+_graph_variant_lock = threading.Lock()
+_forkable_graph_cache = None
+
+
+def _record_state_size(node_name: str, state: dict) -> None:
+    """노드 전이 후 상태 크기 기록 (state_size_tracking 플래그)"""
+    if not isinstance(state, dict):
+        return
+    if not (state.get('feature_flags') or {}).get('state_size_tracking', False):
+        return
+
+    size = measure_state_size(state)
+    size['node'] = node_name
+    get_or_create_resource(state, 'state_size_log', list).append(size)
+    print(f"[State Size] {node_name}: {size['total_bytes']:,} bytes, "
+          f"{size['num_keys']} keys, non-serializable={size['non_serializable']}")
+
+
+def _record_node_attributes(span, state: dict) -> None:
+    """노드 span에 결과 상태 요약 기록 (캐시 히트, 반복 횟수, 문서 수)"""
+    if not is_tracing_enabled() or not isinstance(state, dict):
+        return
+    span.set_attributes(
+        cache_hit=bool(state.get('cache_hit', False)),
+        iteration_count=state.get('iteration_count', 0),
+        num_docs=len(state.get('retrieved_docs') or []),
+    )
+
+
+def _instrument(node_name: str, node_fn):
+    """노드 함수 래핑 (span 추적 + 상태 크기 측정)"""
+    span_name = f"node.{node_name}"
+
+    if asyncio.iscoroutinefunction(node_fn):
+        @functools.wraps(node_fn)
+        async def _async_wrapper(state):
+            emit_event(state, {'type': 'node', 'node': node_name, 'status': 'start'})
+            with trace_span(span_name) as span:
+                result = await node_fn(state)
+                _record_node_attributes(span, result)
+            _record_state_size(node_name, result)
+            emit_event(state, {'type': 'node', 'node': node_name, 'status': 'end'})
+            return result
+        return _async_wrapper
+
+    @functools.wraps(node_fn)
+    def _wrapper(state):
+        emit_event(state, {'type': 'node', 'node': node_name, 'status': 'start'})
+        with trace_span(span_name) as span:
+            result = node_fn(state)
+            _record_node_attributes(span, result)
+        _record_state_size(node_name, result)
+        emit_event(state, {'type': 'node', 'node': node_name, 'status': 'end'})
+        return result
+    return _wrapper
+
+
+def _cache_router(state: AgentState) -> str:
+    """캐시 히트 시 바로 응답 저장(종료), 미스 시 파이프라인 진행"""
+    return "store_response" if state.get('skip_pipeline', False) else "pipeline"
+
+
+def _active_retrieval_router(state: AgentState) -> str:
+    """
+    Active Retrieval 라우팅 로직
+
+    - needs_retrieval=False: 검색 스킵, 바로 컨텍스트 조립 후 생성
+    - needs_retrieval=True: 정상 플로우 (슬롯 추출 → 검색)
+    """
+    # Feature flag 체크
+    feature_flags = state.get('feature_flags', {})
+    active_retrieval_enabled = feature_flags.get('active_retrieval_enabled', False)
+
+    if not active_retrieval_enabled:
+        # 비활성화 시 기존 플로우
+        return "extract_slots"
+
+    # 검색 필요성 판단
+    needs_retrieval = state.get('needs_retrieval', True)
+
+    if needs_retrieval:
+        return "extract_slots"  # 정상 플로우
+    else:
+        return "assemble_context"  # 검색 스킵
+
+
+def _retrieval_router(state: AgentState) -> str:
+    """
+    검색 필요성에 따른 라우팅
+
+    - needs_retrieval=False이고 이미 assemble_context를 거쳤으면 바로 생성
+    - 재검색 루프에서 이미 검색을 마친 경우 (iteration_count > 0 and retrieved_docs 있음) 바로 생성
+    - 첫 번째 검색 후 문서가 있으면 바로 생성 (무한 루프 방지)
+    - 그 외에는 retrieve 실행
+    """
+    needs_retrieval = state.get('needs_retrieval', True)
+    iteration_count = state.get('iteration_count', 0)
+
+    # Check if retrieval has been attempted (flag set by retrieve node)
+    retrieval_attempted = state.get('retrieval_attempted', False)
+
+    # 첫 번째 검색을 완료했으면 (문서 유무와 관계없이) 바로 답변 생성
+    # 무한 루프 방지: 검색을 시도했으나 문서를 못 찾은 경우에도 진행
+    if iteration_count == 0 and retrieval_attempted:
+        return "generate_answer"
+
+    # 재검색 루프에서 이미 검색을 마친 경우: 바로 답변 생성
+    if iteration_count > 0:
+        return "generate_answer"
+
+    # 검색 스킵 조건: Active Retrieval이 검색 불필요 판단
+    if not needs_retrieval and state.get('classification_skipped') is False:
+        return "generate_answer"
+    else:
+        return "retrieve"
 
 
-def build_agent_graph():
+def build_agent_graph(use_async: bool = False, profile: GraphProfile = FULL_PROFILE, checkpointer=None):
     """
     Agent 그래프 빌드
 
+    Args:
+        use_async: True면 I/O 바운드 노드(LLM/임베딩 호출)를 async 버전으로 등록
+                   (ainvoke 전용 그래프)
+        profile: 포함할 선택 노드 구성 (기본값: 모든 노드 포함)
+                 제외된 노드의 상태 값은 graph_profile.entry_defaults/exit_defaults로 보충
+        checkpointer: LangGraph 체크포인터 (노드 경계마다 상태 저장, fork 실행용)
+
     Returns:
         컴파일된 LangGraph
     """
@@ -32,169 +178,204 @@ def build_agent_graph():
     workflow = StateGraph(AgentState)
 
     # 노드 추가
-    workflow.add_node("check_similarity", check_similarity_node)
-    workflow.add_node("classify_intent", classify_intent_node)  # Active Retrieval
-    workflow.add_node("extract_slots", extract_slots_node)
-    workflow.add_node("store_memory", store_memory_node)
-    workflow.add_node("assemble_context", assemble_context_node)
-    workflow.add_node("retrieve", retrieve_node)
-    workflow.add_node("generate_answer", generate_answer_node)
-    workflow.add_node("refine", refine_node)
-    workflow.add_node("quality_check", quality_check_node)
-    workflow.add_node("store_response", store_response_node)
+    nodes = {
+        "check_similarity": check_similarity_node,
+        "classify_intent": classify_intent_node,  # Active Retrieval
+        "extract_slots": extract_slots_node,
+        "store_memory": store_memory_node_async if use_async else store_memory_node,
+        "assemble_context": assemble_context_node,
+        "retrieve": retrieve_node_async if use_async else retrieve_node,
+        "generate_answer": generate_answer_node_async if use_async else generate_answer_node,
+        "refine": refine_node_async if use_async else refine_node,
+        "quality_check": quality_check_node,
+        "store_response": store_response_node,
+    }
+    excluded = set()
+    if not profile.response_cache:
+        excluded.update({"check_similarity", "store_response"})
+    if not profile.active_retrieval:
+        excluded.add("classify_intent")
+    if not profile.retrieval:
+        excluded.update({"extract_slots", "store_memory", "retrieve"})
+    if not profile.self_refine:
+        excluded.add("refine")
+
+    for node_name, node_fn in nodes.items():
+        if node_name not in excluded:
+            workflow.add_node(node_name, _instrument(node_name, node_fn))
+
+    # 파이프라인 시작 노드 (캐시 미스 이후)
+    pipeline_start = "extract_slots" if profile.retrieval else "assemble_context"
+    if profile.active_retrieval:
+        pipeline_start = "classify_intent"
+    # 답변 확정 후 노드 (캐시 저장 또는 종료)
+    finish = "store_response" if profile.response_cache else END
 
     # 엣지 추가 - 캐시 확인이 첫 번째
-    workflow.set_entry_point("check_similarity")
-
-    # 조건부 엣지 - 캐시 히트 시 바로 종료
-    workflow.add_conditional_edges(
-        "check_similarity",
-        lambda x: "store_response" if x.get('skip_pipeline', False) else "classify_intent",
-        {
-            "store_response": "store_response",  # 캐시 히트 - 바로 종료
-            "classify_intent": "classify_intent"  # 캐시 미스 - 의도 분류
-        }
-    )
+    if profile.response_cache:
+        workflow.set_entry_point("check_similarity")
+
+        # 조건부 엣지 - 캐시 히트 시 바로 종료
+        workflow.add_conditional_edges(
+            "check_similarity",
+            _cache_router,
+            {
+                "store_response": "store_response",  # 캐시 히트 - 바로 종료
+                "pipeline": pipeline_start  # 캐시 미스 - 의도 분류
+            }
+        )
+    else:
+        workflow.set_entry_point(pipeline_start)
 
     # Active Retrieval 조건부 엣지
-    def _active_retrieval_router(state: AgentState) -> str:
-        """
-        Active Retrieval 라우팅 로직
-
-        - needs_retrieval=False: 검색 스킵, 바로 컨텍스트 조립 후 생성
-        - needs_retrieval=True: 정상 플로우 (슬롯 추출 → 검색)
-        """
-        # Feature flag 체크
-        feature_flags = state.get('feature_flags', {})
-        active_retrieval_enabled = feature_flags.get('active_retrieval_enabled', False)
-
-        if not active_retrieval_enabled:
-            # 비활성화 시 기존 플로우
-            return "extract_slots"
-
-        # 검색 필요성 판단
-        needs_retrieval = state.get('needs_retrieval', True)
-
-        if needs_retrieval:
-            return "extract_slots"  # 정상 플로우
-        else:
-            return "assemble_context"  # 검색 스킵
-
-    workflow.add_conditional_edges(
-        "classify_intent",
-        _active_retrieval_router,
-        {
-            "extract_slots": "extract_slots",      # 검색 필요 - 정상 플로우
-            "assemble_context": "assemble_context"  # 검색 불필요 - 스킵
-        }
-    )
-
-    workflow.add_edge("extract_slots", "store_memory")
-    workflow.add_edge("store_memory", "assemble_context")
-
-    # assemble_context 후 조건부 라우팅
-    def _retrieval_router(state: AgentState) -> str:
-        """
-        검색 필요성에 따른 라우팅
-
-        - needs_retrieval=False이고 이미 assemble_context를 거쳤으면 바로 생성
-        - 재검색 루프에서 이미 검색을 마친 경우 (iteration_count > 0 and retrieved_docs 있음) 바로 생성
-        - 첫 번째 검색 후 문서가 있으면 바로 생성 (무한 루프 방지)
-        - 그 외에는 retrieve 실행
-        """
-        needs_retrieval = state.get('needs_retrieval', True)
-        iteration_count = state.get('iteration_count', 0)
-        retrieved_docs = state.get('retrieved_docs', [])
-
-        # Check if retrieval has been attempted (flag set by retrieve node)
-        retrieval_attempted = state.get('retrieval_attempted', False)
-
-        # 첫 번째 검색을 완료했으면 (문서 유무와 관계없이) 바로 답변 생성
-        # 무한 루프 방지: 검색을 시도했으나 문서를 못 찾은 경우에도 진행
-        if iteration_count == 0 and retrieval_attempted:
-            return "generate_answer"
-
-        # 재검색 루프에서 이미 검색을 마친 경우: 바로 답변 생성
-        if iteration_count > 0:
-            return "generate_answer"
-
-        # 검색 스킵 조건: Active Retrieval이 검색 불필요 판단
-        if not needs_retrieval and state.get('classification_skipped') is False:
-            return "generate_answer"
+    if profile.active_retrieval:
+        workflow.add_conditional_edges(
+            "classify_intent",
+            _active_retrieval_router,
+            {
+                "extract_slots": "extract_slots",      # 검색 필요 - 정상 플로우
+                "assemble_context": "assemble_context"  # 검색 불필요 - 스킵
+            }
+        )
+
+    if profile.retrieval:
+        workflow.add_edge("extract_slots", "store_memory")
+        workflow.add_edge("store_memory", "assemble_context")
+
+        # assemble_context 후 조건부 라우팅
+        workflow.add_conditional_edges(
+            "assemble_context",
+            _retrieval_router,
+            {
+                "retrieve": "retrieve",                # 검색 필요
+                "generate_answer": "generate_answer"   # 검색 스킵
+            }
+        )
+
+        # ===== 핵심 수정: Self-Refine 루프에서 재검색 시 assemble_context를 다시 거치도록 =====
+        # retrieve → assemble_context (재조립) → generate_answer
+        workflow.add_edge("retrieve", "assemble_context")
+        # assemble_context는 이미 _retrieval_router에서 라우팅되므로, 검색 후에는 항상 generate_answer로
+    else:
+        workflow.add_edge("assemble_context", "generate_answer")
+
+    if profile.self_refine:
+        workflow.add_edge("generate_answer", "refine")
+
+        if profile.quality_loop and profile.retrieval:
+            # 조건부 엣지 (품질 검사) - 재검색 시 retrieve로 돌아가고, retrieve는 다시 assemble_context로
+            workflow.add_conditional_edges(
+                "refine",
+                quality_check_node,
+                {
+                    "retrieve": "retrieve",  # 재검색 → assemble_context (재조립) → generate_answer
+                    END: finish  # 응답 캐싱 후 종료
+                }
+            )
         else:
-            return "retrieve"
-
-    workflow.add_conditional_edges(
-        "assemble_context",
-        _retrieval_router,
-        {
-            "retrieve": "retrieve",                # 검색 필요
-            "generate_answer": "generate_answer"   # 검색 스킵
-        }
-    )
-
-    # ===== 핵심 수정: Self-Refine 루프에서 재검색 시 assemble_context를 다시 거치도록 =====
-    # retrieve → assemble_context (재조립) → generate_answer
-    workflow.add_edge("retrieve", "assemble_context")
-    # assemble_context는 이미 _retrieval_router에서 라우팅되므로, 검색 후에는 항상 generate_answer로
-
-    workflow.add_edge("generate_answer", "refine")
-
-    # 조건부 엣지 (품질 검사) - 재검색 시 retrieve로 돌아가고, retrieve는 다시 assemble_context로
-    workflow.add_conditional_edges(
-        "refine",
-        quality_check_node,
-        {
-            "retrieve": "retrieve",  # 재검색 → assemble_context (재조립) → generate_answer
-            END: "store_response"  # 응답 캐싱 후 종료
-        }
-    )
+            workflow.add_edge("refine", finish)
+    else:
+        workflow.add_edge("generate_answer", finish)
 
     # 응답 저장 후 종료
-    workflow.add_edge("store_response", END)
+    if profile.response_cache:
+        workflow.add_edge("store_response", END)
 
     # 그래프 컴파일
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
+
+    return app
 
+
+def _get_graph_variant(profile: GraphProfile, use_async: bool):
+    """프로파일별 컴파일 그래프 (서명 단위 캐싱)"""
+    key = (use_async, profile)
+    app = _graph_variant_cache.get(key)
+    if app is None:
+        with _graph_variant_lock:
+            app = _graph_variant_cache.get(key)
+            if app is None:
+                print(f"[Graph] 특화 그래프 컴파일: {profile.name} (async={use_async})")
+                app = build_agent_graph(use_async=use_async, profile=profile)
+                _graph_variant_cache[key] = app
     return app
 
 
-def get_agent_graph():
+def _specialized_profile(feature_flags: dict = None, mode: str = 'ai_agent'):
+    """graph_specialization_enabled일 때 사용할 프로파일 (비활성화 시 None)"""
+    if not feature_flags or not feature_flags.get('graph_specialization_enabled', False):
+        return None
+    return graph_profile(feature_flags, mode)
+
+
+def get_agent_graph(feature_flags: dict = None, mode: str = 'ai_agent'):
     """
     Agent 그래프 가져오기 (캐싱)
+
+    Args:
+        feature_flags: graph_specialization_enabled이면 플래그 프로파일에 맞춰
+                       비활성화 노드를 제외한 특화 그래프를 반환
+        mode: 'llm' 또는 'ai_agent'
     
     Returns:
         컴파일된 LangGraph (재사용)
     """
     global _agent_graph_cache
+    profile = _specialized_profile(feature_flags, mode)
+    if profile is not None:
+        return _get_graph_variant(profile, use_async=False)
     if _agent_graph_cache is None:
         _agent_graph_cache = build_agent_graph()
     return _agent_graph_cache
 
 
-def run_agent(
-    user_text: str,
-    mode: str = 'ai_agent',
-    conversation_history: str = None,
-    session_state: dict = None,
-    feature_overrides: dict = None,
-    return_state: bool = False,
-    session_id: str = "session-default",
-    user_id: str = "user-anonymous",
-) -> str:
+def get_agent_graph_async(feature_flags: dict = None, mode: str = 'ai_agent'):
     """
-    Agent 실행
-    
-    Args:
-        user_text: 사용자 입력
-        mode: 'llm' 또는 'ai_agent'
-        conversation_history: 대화 이력 (멀티턴 대화용)
-    
+    비동기 Agent 그래프 가져오기 (캐싱)
+
     Returns:
-        생성된 답변
+        async 노드가 등록된 컴파일된 LangGraph (ainvoke 전용)
     """
-    # 기능 플래그 로드 및 병합 (on/off 실험 지원)
-    agent_config = get_agent_config()
+    global _agent_graph_async_cache
+    profile = _specialized_profile(feature_flags, mode)
+    if profile is not None:
+        return _get_graph_variant(profile, use_async=True)
+    if _agent_graph_async_cache is None:
+        _agent_graph_async_cache = build_agent_graph(use_async=True)
+    return _agent_graph_async_cache
+
+
+def get_forkable_graph():
+    """
+    체크포인터가 연결된 Agent 그래프 (캐싱, run_agent_forked 전용)
+
+    Returns:
+        노드 경계마다 상태를 저장하는 컴파일된 LangGraph
+    """
+    global _forkable_graph_cache
+    if _forkable_graph_cache is None:
+        _forkable_graph_cache = build_agent_graph(checkpointer=get_checkpointer())
+    return _forkable_graph_cache
+
+
+def _select_graph(feature_flags: dict, mode: str, initial_state: dict, use_async: bool):
+    """
+    실행할 그래프 선택
+
+    특화 그래프를 쓰는 경우 제외된 노드가 남겼을 상태 값을 초기 상태에 병합합니다.
+
+    Returns:
+        (컴파일된 그래프, GraphProfile 또는 None)
+    """
+    profile = _specialized_profile(feature_flags, mode)
+    if profile is not None:
+        initial_state.update(entry_defaults(profile))
+    app = get_agent_graph_async(feature_flags, mode) if use_async else get_agent_graph(feature_flags, mode)
+    return app, profile
+
+
+def _resolve_feature_flags(agent_config: dict, feature_overrides: dict = None) -> dict:
+    """기능 플래그 로드 및 병합 (on/off 실험 지원)"""
     feature_flags = (agent_config.get('features') or {}).copy()
     if feature_overrides:
         feature_flags.update(feature_overrides)
@@ -207,7 +388,17 @@ def run_agent(
 
     # Context Engineering 기반 Self-Refine 강화 설정
     feature_flags.setdefault('llm_based_quality_check', True)  # LLM 기반 품질 평가 (vs 휴리스틱)
+    # 품질 평가 모드: heuristic / llm / cascade (휴리스틱 점수가 불확실 구간일 때만 LLM 평가)
+    feature_flags.setdefault(
+        'quality_check_mode',
+        'llm' if feature_flags.get('llm_based_quality_check', True) else 'heuristic'
+    )
+    feature_flags.setdefault('cascade_band_low', 0.35)  # 불확실 구간 하한 (휴리스틱 점수)
+    feature_flags.setdefault('cascade_band_high', 0.75)  # 불확실 구간 상한
+    feature_flags.setdefault('cascade_shadow_judge', False)  # 생략한 경우에도 LLM 평가를 실행해 일치도 측정
     feature_flags.setdefault('dynamic_query_rewrite', True)  # 동적 질의 재작성 (vs 정적)
+    # 평가 + 질의 재작성을 구조화 출력 1회 호출로 통합 (실패 시 개별 호출로 폴백)
+    feature_flags.setdefault('combined_eval_rewrite', False)  # 기본값: 비활성화 (안전)
     feature_flags.setdefault('quality_check_enabled', True)  # Quality Check 노드 활성화
     feature_flags.setdefault('duplicate_detection', True)  # 동일 문서 재검색 방지
     feature_flags.setdefault('progress_monitoring', True)  # 품질 점수 진행도 모니터링
@@ -221,8 +412,15 @@ def run_agent(
     feature_flags.setdefault('retrieval_mode', 'hybrid')  # hybrid/bm25/faiss
     feature_flags.setdefault('budget_aware_retrieval', True)
     feature_flags.setdefault('avg_doc_tokens', 200)
+    feature_flags.setdefault('max_retrieved_docs', 20)  # 재검색 루프 누적 문서 상한 (ID 중복 제거 후)
     feature_flags.setdefault('response_cache_enabled', True)  # 캐시 활성화
     feature_flags.setdefault('cache_similarity_threshold', 0.85)  # 85% 유사도 임계값
+    feature_flags.setdefault('cache_ttl_lab_minutes', None)  # 검사 수치 포함 질문의 캐시 TTL (분, None이면 기본 60분)
+    # 기본값: 비활성화 (안전) - 환자 맥락별 캐시 파티션
+    # 파티션 캐시는 메모리 전용: RESPONSE_CACHE_DIR 영속 캐시와 함께 쓸 수 없음 (켜면 경고 후 영속 캐시 미사용)
+    feature_flags.setdefault('cache_partitioning_enabled', False)
+    feature_flags.setdefault('cache_partition_size', 100)  # 파티션별 최대 항목 수
+    feature_flags.setdefault('cache_shared_partition', False)  # 프로필 미사용 + 환자 정보 없는 질문의 공유 파티션
     feature_flags.setdefault('style_variation_level', 0.3)  # 30% 스타일 변경
 
     # Active Retrieval 설정 (Ablation study용)
@@ -242,7 +440,46 @@ def run_agent(
     feature_flags.setdefault('working_memory_capacity', 5)  # Working Memory 용량 (턴 수)
     feature_flags.setdefault('compression_threshold', 5)  # 압축 시작 턴 수
 
-    # 초기 상태 (세션 상태가 있으면 병합)
+    # 세션 리소스 레지스트리 (False면 레거시: 무거운 객체를 상태에 보관)
+    feature_flags.setdefault('session_registry_enabled', True)
+    feature_flags.setdefault('state_size_tracking', False)  # 노드 전이별 상태 크기 측정
+
+    # Span 추적 (JSONL, scripts/summarize_traces.py로 요약)
+    feature_flags.setdefault('tracing_enabled', False)
+    feature_flags.setdefault('trace_path', None)  # None이면 runs/traces/<timestamp>_<pid>/node_trace.jsonl
+
+    # Speculative Retrieval 설정 (슬롯 추출과 1차 검색 중첩)
+    feature_flags.setdefault('speculative_retrieval_enabled', False)  # 기본값: 비활성화 (안전)
+
+    # 재검색 후보 풀 (첫 검색에서 넓게 가져와 재검색은 풀 재점수화로 처리)
+    feature_flags.setdefault('candidate_pool_enabled', False)  # 기본값: 비활성화 (안전)
+    feature_flags.setdefault('candidate_pool_size', 40)  # 첫 검색 후보 수
+
+    # 문서 패킹 (예산 내 융합 점수 합 최대 문서 집합, greedy break 대체)
+    feature_flags.setdefault('doc_packing_enabled', False)  # 기본값: 비활성화 (안전)
+    feature_flags.setdefault('doc_packing_fragments', False)  # 남은 예산을 문장 단위 조각으로 채우기
+
+    # 요청 병합 (동일 질의 + 동일 환자 맥락의 동시 요청은 그래프를 한 번만 실행)
+    feature_flags.setdefault('request_coalescing_enabled', False)  # 기본값: 비활성화 (안전)
+
+    # 플래그 프로파일별 특화 그래프 (비활성화 노드를 그래프에서 제외)
+    feature_flags.setdefault('graph_specialization_enabled', False)  # 기본값: 비활성화 (안전)
+
+    return feature_flags
+
+
+def _build_initial_state(
+    user_text: str,
+    mode: str,
+    conversation_history: str,
+    session_state: dict,
+    feature_flags: dict,
+    agent_config: dict,
+    session_id: str,
+    user_id: str,
+    resource_handle: str = None,
+) -> dict:
+    """초기 상태 구성 (세션 상태가 있으면 병합)"""
     initial_state = {
         'user_text': user_text,
         'mode': mode,
@@ -279,10 +516,7 @@ def run_agent(
         'classification_skipped': None,
         'classification_time_ms': None,
         'classification_error': None,
-        'intent_classifier': None,
         'compression_stats': None,
-        'context_compressor': None,
-        'hierarchical_memory': None,
         'hierarchical_memory_stats': None,
         'hierarchical_contexts': None,
 
@@ -292,16 +526,416 @@ def run_agent(
         'quality_score_history': [],
         'query_rewrite_history': [],
         'refine_iteration_logs': [],
+
+        # Speculative Retrieval
+        'speculative_retrieval_stats': None,
+
+        # 재검색 후보 풀
+        'candidate_pool_stats': None,
+
+        # 문서 패킹
+        'doc_packing_stats': None,
+
+        # 세션 리소스 핸들 (무거운 객체는 레지스트리에 보관)
+        'resource_handle': resource_handle,
     }
 
-    if session_state:
-        initial_state.update(session_state)
+    session_state = dict(session_state or {})
+    if resource_handle is not None:
+        # 세션 상태로 전달된 리소스(ProfileStore 등)는 레지스트리에 등록
+        resources = {key: session_state.pop(key) for key in RESOURCE_KEYS if key in session_state}
+        get_session_registry().register(resource_handle, resources)
+
+    initial_state.update(session_state)
+
+    return initial_state
+
+
+def _resource_handle(session_id: str, feature_flags: dict, persist_session: bool):
+    """
+    세션 리소스 핸들 결정
+
+    - persist_session=True: session_id 자체를 핸들로 사용 (호출 간 리소스 유지)
+    - persist_session=False: 호출 단위 핸들 (기존처럼 session_state로만 리소스 전달)
+    - session_registry_enabled=False: None (레거시 - 상태에 보관)
+    """
+    if not feature_flags.get('session_registry_enabled', True):
+        return None
+    if persist_session:
+        return session_id
+    return f"{session_id}::{uuid.uuid4().hex[:12]}"
+
+
+def _finalize_state(final_state: dict, persist_session: bool) -> dict:
+    """
+    최종 상태 정리
+
+    하위 호환을 위해 profile_store/hierarchical_memory를 결과에 다시 포함하고,
+    호출 단위 핸들의 리소스는 해제합니다.
+    """
+    handle = final_state.get('resource_handle')
+    if handle is None:
+        return final_state
+
+    registry = get_session_registry()
+    result = {**final_state, **registry.export(handle, EXPORTED_RESOURCE_KEYS)}
+    state_size_log = registry.get(handle, 'state_size_log')
+    if state_size_log:
+        result['state_size_stats'] = list(state_size_log)
+        registry.set(handle, 'state_size_log', [])
+
+    if not persist_session:
+        registry.release(handle)
+    return result
+
+
+def _ensure_tracing(feature_flags: dict) -> None:
+    """tracing_enabled 플래그가 켜져 있으면 span 추적 활성화 (프로세스당 한 번)"""
+    if feature_flags.get('tracing_enabled', False) and not is_tracing_enabled():
+        configure_tracing(feature_flags.get('trace_path'))
+
+
+def _coalescing_key(initial_state: dict):
+    """요청 병합 키 (정규화 질의 + 환자 맥락 지문), 비활성화 시 None"""
+    feature_flags = initial_state.get('feature_flags') or {}
+    if not feature_flags.get('request_coalescing_enabled', False):
+        return None
+
+    profile_store = get_resource(initial_state, 'profile_store')
+    profile_summary = profile_store.get_profile_summary() if profile_store is not None else ''
+    fingerprint = patient_fingerprint(
+        profile_summary,
+        initial_state.get('conversation_history'),
+        initial_state.get('mode'),
+        extra=feature_flags
+    )
+    return f"{normalize_query(initial_state.get('user_text', ''))}::{fingerprint}"
+
+
+def _adopt_shared_state(shared_state: dict, initial_state: dict) -> dict:
+    """
+    병합된 요청(follower)의 최종 상태 구성
+
+    답변/검색 결과는 leader의 결과를 사용하고, 세션 식별자와 리소스는 자기 것을 유지합니다.
+    캐시 히트와 마찬가지로 follower 세션의 프로필/메모리는 이번 턴에 갱신되지 않습니다.
+    """
+    adopted = {key: value for key, value in shared_state.items() if key not in RESOURCE_KEYS}
+    for key in ('session_id', 'user_id', 'resource_handle', 'conversation_history'):
+        adopted[key] = initial_state.get(key)
+    for key in RESOURCE_KEYS:
+        if key in initial_state:  # 레거시 모드: 상태에 보관된 자기 리소스 유지
+            adopted[key] = initial_state[key]
+    adopted['coalesced'] = True
+    print("[Single-Flight] 동일 질의가 진행 중이어서 결과를 공유했습니다")
+    return adopted
+
+
+def _invoke_coalesced(app, initial_state: dict):
+    """그래프 실행 (요청 병합 적용), (최종 상태, 공유 여부) 반환"""
+    key = _coalescing_key(initial_state)
+    if key is None:
+        return app.invoke(initial_state), False
+    final_state, shared = get_single_flight().do(key, lambda: app.invoke(initial_state))
+    if shared:
+        final_state = _adopt_shared_state(final_state, initial_state)
+    return final_state, shared
+
+
+async def _ainvoke_coalesced(app, initial_state: dict):
+    """_invoke_coalesced의 asyncio 버전"""
+    key = _coalescing_key(initial_state)
+    if key is None:
+        return await app.ainvoke(initial_state), False
+    final_state, shared = await get_single_flight().ado(key, lambda: app.ainvoke(initial_state))
+    if shared:
+        final_state = _adopt_shared_state(final_state, initial_state)
+    return final_state, shared
+
+
+def _report_turn_latency(final_state: dict, turn_ms: float) -> None:
+    """
+    턴 지연 시간 기록
+
+    Speculative Retrieval이 동작한 경우, 검색을 순차 실행했을 때의
+    추정 턴 지연 시간도 함께 기록합니다.
+    """
+    stats = final_state.get('speculative_retrieval_stats')
+    if not stats:
+        return
+
+    saved_ms = (stats.get('sequential_retrieval_ms') or 0.0) - (stats.get('overlapped_retrieval_ms') or 0.0)
+    stats['turn_ms_overlapped'] = round(turn_ms, 2)
+    stats['turn_ms_sequential_estimate'] = round(turn_ms + saved_ms, 2)
+    print(f"[Speculative Retrieval] turn latency: overlapped={stats['turn_ms_overlapped']:.1f}ms, "
+          f"sequential(est.)={stats['turn_ms_sequential_estimate']:.1f}ms")
+
+
+def run_agent(
+    user_text: str,
+    mode: str = 'ai_agent',
+    conversation_history: str = None,
+    session_state: dict = None,
+    feature_overrides: dict = None,
+    return_state: bool = False,
+    session_id: str = "session-default",
+    user_id: str = "user-anonymous",
+    persist_session: bool = False,
+) -> str:
+    """
+    Agent 실행
     
-    # 그래프 실행 (캐싱된 그래프 재사용)
-    app = get_agent_graph()
-    final_state = app.invoke(initial_state)
+    Args:
+        user_text: 사용자 입력
+        mode: 'llm' 또는 'ai_agent'
+        conversation_history: 대화 이력 (멀티턴 대화용)
+        persist_session: True면 session_id 단위로 세션 리소스(ProfileStore, 메모리,
+                         클라이언트 등)를 레지스트리에 유지하여 다음 턴에서 재사용
     
+    Returns:
+        생성된 답변
+    """
+    agent_config = get_agent_config()
+    feature_flags = _resolve_feature_flags(agent_config, feature_overrides)
+    resource_handle = _resource_handle(session_id, feature_flags, persist_session)
+    initial_state = _build_initial_state(
+        user_text, mode, conversation_history, session_state,
+        feature_flags, agent_config, session_id, user_id, resource_handle
+    )
+
+    # 그래프 실행 (캐싱된 그래프 재사용, graph_specialization_enabled면 프로파일별 특화 그래프)
+    app, profile = _select_graph(feature_flags, mode, initial_state, use_async=False)
+    turn_start = time.perf_counter()
+    _ensure_tracing(feature_flags)
+    try:
+        with trace_span("agent.turn", session_id=session_id, mode=mode, is_async=False) as span, \
+                embedding_turn() as embedding_memo:
+            final_state, coalesced = _invoke_coalesced(app, initial_state)
+            span.set_attributes(cache_hit=bool(final_state.get('cache_hit', False)), coalesced=coalesced,
+                                embedding_forward_passes=embedding_memo.misses)
+    except Exception:
+        # 호출 단위 핸들은 실패 시에도 해제
+        if resource_handle is not None and not persist_session:
+            get_session_registry().release(resource_handle)
+        raise
+    if profile is not None:
+        final_state = {**final_state, **exit_defaults(profile)}
+    _report_turn_latency(final_state, (time.perf_counter() - turn_start) * 1000)
+    final_state = _finalize_state(final_state, persist_session)
+    
+    if return_state:
+        return final_state
+    return final_state.get('answer', '')
+
+
+async def run_agent_async(
+    user_text: str,
+    mode: str = 'ai_agent',
+    conversation_history: str = None,
+    session_state: dict = None,
+    feature_overrides: dict = None,
+    return_state: bool = False,
+    session_id: str = "session-default",
+    user_id: str = "user-anonymous",
+    persist_session: bool = False,
+) -> str:
+    """
+    Agent 실행 (asyncio)
+
+    run_agent와 동일한 인자/반환값을 가지며, LLM·임베딩 호출을 await하는
+    비동기 그래프를 ainvoke로 실행합니다. 이벤트 루프 하나에서 여러 세션의
+    턴을 동시에 처리할 때 사용합니다.
+
+    AsyncOpenAI 클라이언트는 이벤트 루프별로 공유되므로, 루프를 닫기 전에
+    core.llm_client.aclose_shared_async_openai()를 await해 커넥션 풀을 정리합니다
+    (AgentServer.close()는 자동으로 호출).
+
+    Returns:
+        생성된 답변 (return_state=True면 최종 상태)
+    """
+    agent_config = get_agent_config()
+    feature_flags = _resolve_feature_flags(agent_config, feature_overrides)
+    resource_handle = _resource_handle(session_id, feature_flags, persist_session)
+    initial_state = _build_initial_state(
+        user_text, mode, conversation_history, session_state,
+        feature_flags, agent_config, session_id, user_id, resource_handle
+    )
+
+    app, profile = _select_graph(feature_flags, mode, initial_state, use_async=True)
+    turn_start = time.perf_counter()
+    _ensure_tracing(feature_flags)
+    try:
+        with trace_span("agent.turn", session_id=session_id, mode=mode, is_async=True) as span, \
+                embedding_turn() as embedding_memo:
+            final_state, coalesced = await _ainvoke_coalesced(app, initial_state)
+            span.set_attributes(cache_hit=bool(final_state.get('cache_hit', False)), coalesced=coalesced,
+                                embedding_forward_passes=embedding_memo.misses)
+    except Exception:
+        # 호출 단위 핸들은 실패 시에도 해제
+        if resource_handle is not None and not persist_session:
+            get_session_registry().release(resource_handle)
+        raise
+    if profile is not None:
+        final_state = {**final_state, **exit_defaults(profile)}
+    _report_turn_latency(final_state, (time.perf_counter() - turn_start) * 1000)
+    final_state = _finalize_state(final_state, persist_session)
+
     if return_state:
         return final_state
     return final_state.get('answer', '')
 
+
+def run_agent_stream(
+    user_text: str,
+    mode: str = 'ai_agent',
+    conversation_history: str = None,
+    session_state: dict = None,
+    feature_overrides: dict = None,
+    return_state: bool = False,
+    session_id: str = "session-default",
+    user_id: str = "user-anonymous",
+    persist_session: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Agent 실행 (스트리밍)
+
+    run_agent를 백그라운드 스레드에서 실행하면서 노드 진행 상황과 답변 토큰을
+    이벤트로 전달합니다 (이벤트 형식은 agent/streaming.py 참고).
+    Self-Refine 루프에서 재생성된 답변은 새 초안(draft)으로 다시 스트리밍되며,
+    이전 초안은 'superseded' 이벤트로 대체됨을 알립니다.
+
+    Yields:
+        이벤트 딕셔너리 (마지막 이벤트는 'final': 최종 답변, return_state=True면 최종 상태 포함)
+    """
+    events: queue.Queue = queue.Queue()
+    outcome: Dict[str, Any] = {}
+    done = object()
+
+    stream_state = {**(session_state or {}), 'stream_sink': events.put}
+
+    def _worker():
+        try:
+            outcome['state'] = run_agent(
+                user_text, mode=mode, conversation_history=conversation_history,
+                session_state=stream_state, feature_overrides=feature_overrides,
+                return_state=True, session_id=session_id, user_id=user_id,
+                persist_session=persist_session
+            )
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            if persist_session:
+                # 다음 턴에서 끝난 스트림으로 이벤트가 전달되지 않도록 해제
+                get_session_registry().set(session_id, 'stream_sink', None)
+            events.put(done)
+
+    worker = threading.Thread(target=_worker, name=f"agent-stream-{session_id}", daemon=True)
+    worker.start()
+
+    while True:
+        event = events.get()
+        if event is done:
+            break
+        yield event
+    worker.join()
+
+    if 'error' in outcome:
+        yield {'type': 'error', 'error': str(outcome['error'])}
+        raise outcome['error']
+
+    final_state = outcome['state']
+    final_state.pop('stream_sink', None)
+    yield {
+        'type': 'final',
+        'answer': final_state.get('answer', ''),
+        'draft': final_state.get('iteration_count', 0),
+        'state': final_state if return_state else None,
+    }
+
+
+def run_agent_forked(
+    user_text: str,
+    fork_overrides: Dict[str, dict],
+    mode: str = 'ai_agent',
+    conversation_history: str = None,
+    feature_overrides: dict = None,
+    session_id: str = "session-fork",
+    user_id: str = "user-anonymous",
+    fork_after: str = DEFAULT_FORK_NODE,
+) -> Dict[str, dict]:
+    """
+    공유 prefix를 한 번만 실행하고 설정별로 fork하여 이후 단계 실행 (실험용)
+
+    fork_overrides의 설정들을 prefix 서명(agent/checkpoint.py)으로 묶고, 그룹마다
+    fork_after 노드까지 한 번 실행한 뒤 체크포인트에서 설정별 feature_flags로 갈라져
+    나머지 그래프를 실행합니다. 캐시 히트 등으로 fork 지점 전에 끝나면 같은 최종 상태를 공유합니다.
+
+    Args:
+        fork_overrides: {설정 이름: feature_overrides} - 공통 feature_overrides 위에 병합
+        feature_overrides: 모든 설정에 공통으로 적용할 플래그
+        fork_after: fork 지점 노드 (기본값: generate_answer)
+
+    Returns:
+        {설정 이름: 최종 상태} - 각 상태의 'fork_stats'에 prefix/fork 소요 시간 기록
+    """
+    agent_config = get_agent_config()
+    flags_by_name = {
+        name: _resolve_feature_flags(agent_config, {**(feature_overrides or {}), **(overrides or {})})
+        for name, overrides in fork_overrides.items()
+    }
+    for name, flags in flags_by_name.items():
+        if not flags.get('session_registry_enabled', True):
+            raise ValueError(f"fork 실행에는 session_registry_enabled가 필요합니다 (설정: {name})")
+
+    app = get_forkable_graph()
+    results: Dict[str, dict] = {}
+
+    # 모든 fork가 같은 질의를 처리하므로 로컬 임베딩 메모를 공유
+    with embedding_turn():
+        for names in group_by_prefix(flags_by_name).values():
+            prefix_flags = flags_by_name[names[0]]
+            _ensure_tracing(prefix_flags)
+            resource_handle = _resource_handle(session_id, prefix_flags, persist_session=False)
+            initial_state = _build_initial_state(
+                user_text, mode, conversation_history, None,
+                prefix_flags, agent_config, session_id, user_id, resource_handle
+            )
+            thread_id = f"fork::{uuid.uuid4().hex[:12]}"
+            thread = {'configurable': {'thread_id': thread_id}}
+
+            try:
+                prefix_start = time.perf_counter()
+                with trace_span("agent.prefix", session_id=session_id, mode=mode, forks=len(names)):
+                    app.invoke(initial_state, thread, interrupt_after=[fork_after])
+                prefix_ms = (time.perf_counter() - prefix_start) * 1000
+                snapshot = app.get_state(thread)
+                print(f"[Fork] prefix 완료 ({prefix_ms:.0f}ms) → {len(names)}개 설정으로 분기: {', '.join(names)}")
+
+                for name in names:
+                    fork_start = time.perf_counter()
+                    if snapshot.next:
+                        # 같은 체크포인트에서 설정별 feature_flags로 분기 (형제 체크포인트 생성)
+                        fork_config = app.update_state(
+                            snapshot.config, {'feature_flags': flags_by_name[name]}, as_node=fork_after
+                        )
+                        with trace_span("agent.fork", session_id=session_id, fork=name):
+                            final_state = app.invoke(None, fork_config)
+                    else:
+                        final_state = dict(snapshot.values)
+                    fork_ms = (time.perf_counter() - fork_start) * 1000
+
+                    final_state = {**final_state, 'feature_flags': flags_by_name[name]}
+                    final_state['fork_stats'] = {
+                        'prefix_ms': round(prefix_ms, 2),
+                        'fork_ms': round(fork_ms, 2),
+                        'group_size': len(names),
+                        'forked': bool(snapshot.next),
+                    }
+                    # 리소스는 그룹의 모든 fork가 공유하므로 여기서는 해제하지 않음
+                    results[name] = _finalize_state(final_state, persist_session=True)
+            finally:
+                if resource_handle is not None:
+                    get_session_registry().release(resource_handle)
+                # prefix/fork 체크포인트는 이번 실행에서만 쓰므로 삭제
+                delete_thread(thread_id, app.checkpointer)
+
+    return {name: results[name] for name in fork_overrides}
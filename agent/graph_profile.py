@@ -0,0 +1,91 @@
+"""
+Feature-flag 프로파일별 그래프 구성
+
+build_agent_graph의 단일 그래프는 모든 선택 노드를 포함하므로, 비활성화된 기능도
+노드 전이 + feature_flags 재확인 + 조기 반환 비용을 매 턴 치릅니다.
+여기서는 플래그/모드로부터 필요한 노드 구성을 결정하고(GraphProfile),
+제외된 노드가 대신 남겼을 상태 값을 제공합니다.
+
+Feature flag: graph_specialization_enabled (기본값: False)
+"""
+
+from typing import Any, Dict, NamedTuple
+
+
+class GraphProfile(NamedTuple):
+    """
+    그래프 변형 서명 (컴파일 그래프 캐시 키)
+
+    response_cache: check_similarity / store_response 포함
+    active_retrieval: classify_intent 포함
+    retrieval: extract_slots / store_memory / retrieve 포함 (LLM 모드에서는 제외)
+    self_refine: refine 포함
+    quality_loop: refine 이후 quality_check 라우팅(재검색 루프) 포함
+    """
+    response_cache: bool = True
+    active_retrieval: bool = True
+    retrieval: bool = True
+    self_refine: bool = True
+    quality_loop: bool = True
+
+    @property
+    def name(self) -> str:
+        """로그/벤치마크용 짧은 이름 (포함된 선택 기능 나열)"""
+        parts = [field for field in self._fields if getattr(self, field)]
+        return '+'.join(parts) if parts else 'minimal'
+
+
+# 모든 선택 노드를 포함하는 그래프 (build_agent_graph 기본값과 동일)
+FULL_PROFILE = GraphProfile()
+
+
+def graph_profile(feature_flags: Dict[str, Any], mode: str = 'ai_agent') -> GraphProfile:
+    """
+    플래그/모드로 필요한 그래프 구성 결정
+
+    각 노드가 조기 반환하는 조건과 같은 기준을 사용합니다.
+    LLM 모드는 캐시/검색/셀프 리파인 노드가 모두 건너뛰므로 함께 제외합니다.
+    """
+    flags = feature_flags or {}
+    llm_mode = mode == 'llm'
+    self_refine = not llm_mode and flags.get('self_refine_enabled', True)
+
+    return GraphProfile(
+        response_cache=not llm_mode and flags.get('response_cache_enabled', True),
+        active_retrieval=not llm_mode and flags.get('active_retrieval_enabled', False),
+        retrieval=not llm_mode,
+        self_refine=self_refine,
+        quality_loop=self_refine and flags.get('quality_check_enabled', True),
+    )
+
+
+def entry_defaults(profile: GraphProfile) -> Dict[str, Any]:
+    """
+    제외된 노드가 그래프 진입 전에 남겼을 상태 값 (초기 상태에 병합)
+
+    다른 노드가 읽기 전에 설정되어야 하는 값만 포함합니다.
+    """
+    defaults: Dict[str, Any] = {}
+    if not profile.active_retrieval:
+        # classify_intent 비활성화 결과
+        defaults.update({
+            'needs_retrieval': True,
+            'dynamic_k': None,
+            'query_complexity': 'default',
+            'classification_skipped': True,
+        })
+    if not profile.retrieval:
+        # retrieve LLM 모드 결과
+        defaults.update({'retrieved_docs': [], 'retrieval_attempted': True})
+    if not profile.self_refine:
+        # refine 비활성화 결과 중 이전 노드가 읽지 않는 값 (store_response 메타데이터용)
+        defaults.update({'quality_score': 1.0, 'refine_strategy': 'disabled'})
+    return defaults
+
+
+def exit_defaults(profile: GraphProfile) -> Dict[str, Any]:
+    """제외된 노드가 그래프 종료 시점에 남겼을 상태 값 (최종 상태에 병합)"""
+    if not profile.self_refine:
+        # needs_retrieval은 검색 라우팅에 쓰이므로 종료 후에만 refine 결과로 덮어씀
+        return {'needs_retrieval': False}
+    return {}
@@ -79,6 +79,15 @@ class QueryMetrics:
     semantic_medications_count: Optional[int] = None
     tier_retrieval_time_ms: Optional[float] = None
 
+    # Quality Check Cascade 관련 (선택적)
+    quality_evaluations: int = 0  # 품질 평가 횟수 (refine iteration 수)
+    quality_judge_calls: int = 0  # 실제 LLM 평가 호출 수 (shadow 제외, 실패 후 폴백 포함)
+    quality_judge_shadow_calls: int = 0  # 일치도 측정용 shadow LLM 평가 호출 수
+    quality_judge_failures: int = 0  # LLM 평가 실패로 휴리스틱 폴백한 수
+    quality_judge_avoided: int = 0  # cascade로 LLM을 전혀 호출하지 않은 평가 수
+    cascade_agreements: int = 0  # 구간 밖 건 중 휴리스틱 판단이 shadow LLM 판단과 일치한 수
+    cascade_comparisons: int = 0  # 구간 밖 건 중 (성공한) shadow LLM 평가가 있는 수
+
 
 class AblationMetrics:
     """
@@ -176,6 +185,9 @@ class AblationMetrics:
         # 티어 검색 시간은 근사치 (assemble_context 시간의 일부)
         tier_retrieval_time = 0.0  # TODO: 정확한 측정을 위해 타이머 추가 필요
 
+        # Quality Check Cascade 메트릭
+        quality_stats = self._quality_check_stats(state)
+
         # 시간 분해 (근사치)
         retrieval_time = classification_time if retrieval_executed else 0.0
         generation_time = total_latency - retrieval_time - classification_time
@@ -214,31 +226,60 @@ class AblationMetrics:
             compressed_memory_count=compressed_memory_count,
             semantic_conditions_count=semantic_conditions_count,
             semantic_medications_count=semantic_medications_count,
-            tier_retrieval_time_ms=tier_retrieval_time
+            tier_retrieval_time_ms=tier_retrieval_time,
+            **quality_stats
         )
 
         self.query_metrics.append(metrics)
         return metrics
 
+    def _quality_check_stats(self, state: Dict[str, Any]) -> Dict[str, int]:
+        """refine_iteration_logs에서 품질 평가 / cascade 통계 집계"""
+        stats = {
+            'quality_evaluations': 0,
+            'quality_judge_calls': 0,
+            'quality_judge_shadow_calls': 0,
+            'quality_judge_failures': 0,
+            'quality_judge_avoided': 0,
+            'cascade_agreements': 0,
+            'cascade_comparisons': 0,
+        }
+        for log in state.get('refine_iteration_logs') or []:
+            feedback = log.get('quality_feedback') or {}
+            if 'evaluator' not in feedback:
+                continue  # 품질 평가를 하지 않는 전략 (basic_rag)
+            stats['quality_evaluations'] += 1
+            # LLM 호출 후 실패해 휴리스틱으로 폴백한 경우도 호출로 집계 (생략 아님)
+            stats['quality_judge_failures'] += bool(feedback.get('judge_failed'))
+            cascade = feedback.get('cascade')
+            if cascade is None:
+                stats['quality_judge_calls'] += feedback.get('evaluator') == 'llm'
+                continue
+            if cascade.get('judge_called'):
+                stats['quality_judge_calls'] += 1
+                continue
+            if cascade.get('shadow_judge'):
+                # shadow 평가는 LLM을 호출했으므로 생략으로 세지 않음
+                stats['quality_judge_shadow_calls'] += 1
+                stats['quality_judge_failures'] += bool(cascade.get('judge_failed'))
+            else:
+                stats['quality_judge_avoided'] += 1
+            if cascade.get('agrees_with_judge') is not None:
+                stats['cascade_comparisons'] += 1
+                stats['cascade_agreements'] += bool(cascade['agrees_with_judge'])
+        return stats
+
     def _estimate_total_tokens(self, state: Dict[str, Any]) -> int:
         """총 토큰 수 추정"""
-        from context.token_manager import TokenManager
-
-        token_manager = TokenManager()
-
-        # 시스템 프롬프트
-        system_tokens = token_manager.count_tokens(state.get('system_prompt', ''))
+        from context.token_manager import get_token_manager
 
-        # 사용자 프롬프트
-        user_tokens = token_manager.count_tokens(state.get('user_prompt', ''))
-
-        # 컨텍스트
-        context_tokens = token_manager.count_tokens(state.get('context_prompt', ''))
-
-        # 답변
-        answer_tokens = token_manager.count_tokens(state.get('answer', ''))
-
-        return system_tokens + user_tokens + context_tokens + answer_tokens
+        # 시스템 프롬프트 / 사용자 프롬프트 / 컨텍스트 / 답변
+        return sum(get_token_manager().count_tokens_batch([
+            state.get('system_prompt', ''),
+            state.get('user_prompt', ''),
+            state.get('context_prompt', ''),
+            state.get('answer', ''),
+        ]))
 
     def _estimate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
         """비용 추정 (GPT-4o-mini 기준)"""
@@ -324,12 +365,31 @@ class AblationMetrics:
             'avg_working_memory_size': np.mean([m.working_memory_size for m in self.query_metrics if m.working_memory_size is not None]) if any(m.working_memory_size for m in self.query_metrics) else 0.0,
             'avg_compressed_memory_count': np.mean([m.compressed_memory_count for m in self.query_metrics if m.compressed_memory_count is not None]) if any(m.compressed_memory_count for m in self.query_metrics) else 0.0,
             'avg_semantic_conditions': np.mean([m.semantic_conditions_count for m in self.query_metrics if m.semantic_conditions_count is not None]) if any(m.semantic_conditions_count for m in self.query_metrics) else 0.0,
-            'avg_semantic_medications': np.mean([m.semantic_medications_count for m in self.query_metrics if m.semantic_medications_count is not None]) if any(m.semantic_medications_count for m in self.query_metrics) else 0.0
+            'avg_semantic_medications': np.mean([m.semantic_medications_count for m in self.query_metrics if m.semantic_medications_count is not None]) if any(m.semantic_medications_count for m in self.query_metrics) else 0.0,
+
+            # Quality Check Cascade
+            **self._cascade_statistics()
         }
 
         self.aggregate_stats = stats
         return stats
 
+    def _cascade_statistics(self) -> Dict[str, Any]:
+        """LLM 평가 생략 비율과 (shadow 평가가 있는 경우) 전체 LLM 평가 대비 판단 일치율"""
+        evaluations = sum(m.quality_evaluations for m in self.query_metrics)
+        avoided = sum(m.quality_judge_avoided for m in self.query_metrics)
+        comparisons = sum(m.cascade_comparisons for m in self.query_metrics)
+        agreements = sum(m.cascade_agreements for m in self.query_metrics)
+        return {
+            'quality_judge_calls': sum(m.quality_judge_calls for m in self.query_metrics),
+            'quality_judge_shadow_calls': sum(m.quality_judge_shadow_calls for m in self.query_metrics),
+            'quality_judge_failures': sum(m.quality_judge_failures for m in self.query_metrics),
+            'quality_judge_avoided': avoided,
+            'judge_calls_avoided_rate': avoided / evaluations if evaluations else 0.0,
+            'cascade_agreement_rate': agreements / comparisons if comparisons else None,
+            'cascade_comparisons': comparisons,
+        }
+
     def save_results(self, filename: Optional[str] = None):
         """
         결과를 JSON 파일로 저장
@@ -436,7 +496,8 @@ def compare_experiments(
         'total_cost_usd',
         'avg_quality_score',
         'retrieval_skip_rate',
-        'avg_docs_retrieved'
+        'avg_docs_retrieved',
+        'judge_calls_avoided_rate'
     ]
 
     for metric in metrics_to_compare:
@@ -496,6 +557,11 @@ def compare_experiments(
         print(f"  Treatment: {values['treatment']:.4f}")
         print(f"  Change:    {values['percent_change']:+.2f}%")
 
+    agreement = treatment_stats.get('cascade_agreement_rate')
+    if agreement is not None:
+        comparison['cascade_agreement_rate'] = agreement
+        print(f"cascade_agreement_rate (treatment, n={treatment_stats.get('cascade_comparisons', 0)}): {agreement:.4f}")
+
     if 'statistical_test' in comparison and 'p_value' in comparison['statistical_test']:
         p_val = comparison['statistical_test']['p_value']
         sig = "✓" if comparison['statistical_test']['significant'] else "✗"
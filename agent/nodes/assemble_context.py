@@ -4,12 +4,13 @@
 
 from agent.state import AgentState
 from core.prompts import build_system_prompt, format_user_prompt
-from context.token_manager import TokenManager
+from context.token_manager import get_token_manager
 from context.context_manager import ContextManager
 from context.context_compressor import ContextCompressor
+from agent.session_registry import get_resource, get_or_create_resource
 
 # 컨텍스트/토큰 매니저는 모듈 단위로 1회 초기화
-_token_manager = TokenManager(max_total_tokens=4000)
+_token_manager = get_token_manager()
 _context_manager = ContextManager(token_manager=_token_manager)
 # Context Compressor는 필요시 초기화 (feature flag 기반)
 
@@ -53,11 +54,11 @@ def assemble_context_node(state: AgentState) -> AgentState:
         # Hierarchical Memory 컨텍스트 가져오기 (선택적)
         hierarchical_memory_enabled = feature_flags.get('hierarchical_memory_enabled', False)
 
-        if hierarchical_memory_enabled and 'hierarchical_memory' in state:
+        hierarchical_memory = get_resource(state, 'hierarchical_memory')
+        if hierarchical_memory_enabled and hierarchical_memory is not None:
             print("[Hierarchical Memory] Retrieving context from 3 tiers...")
 
             try:
-                hierarchical_memory = state['hierarchical_memory']
 
                 # 토큰 예산 확인
                 token_plan = state.get('token_plan', {})
@@ -92,18 +93,15 @@ def assemble_context_node(state: AgentState) -> AgentState:
             print("[Context Compression] Applying compression...")
 
             # Compressor 초기화 (캐싱)
-            if 'context_compressor' not in state:
-                # LLM client 가져오기 (abstractive 압축용)
-                llm_client = state.get('llm_client')
-
-                compressor = ContextCompressor(
+            compressor = get_or_create_resource(
+                state, 'context_compressor',
+                lambda: ContextCompressor(
                     token_manager=_token_manager,
-                    llm_client=llm_client,
+                    # LLM client 가져오기 (abstractive 압축용)
+                    llm_client=get_resource(state, 'llm_client'),
                     feature_flags=feature_flags
                 )
-                state['context_compressor'] = compressor
-            else:
-                compressor = state['context_compressor']
+            )
 
             # 토큰 예산 확인
             token_plan = state.get('token_plan', {})
@@ -124,11 +122,13 @@ def assemble_context_node(state: AgentState) -> AgentState:
                 print(f"[Context Compression] Skipped: {compression_stats.get('reason', 'unknown')}")
 
         # 문서 포맷팅
+        # 문서 패킹이 적용된 경우 검색 단계에서 이미 예산 내로 선택했으므로 전체 사용 (기존: 상위 5개)
         docs_text = ""
         if retrieved_docs:
+            docs_limit = None if state.get('doc_packing_stats') else 5
             docs_text = "\n\n".join([
                 f"[문서 {i+1}]\n{doc.get('text', '')}"
-                for i, doc in enumerate(retrieved_docs[:5])
+                for i, doc in enumerate(retrieved_docs[:docs_limit])
             ])
         
         # 시스템 프롬프트 생성
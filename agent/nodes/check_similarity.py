@@ -7,29 +7,107 @@ and retrieves cached responses if similarity is high enough.
 
 from typing import Dict, Any
 from agent.state import AgentState
-from memory.response_cache import ResponseCache, ResponseStyleVariator
+from memory.response_cache import ResponseCache, PartitionedResponseCache, ResponseStyleVariator, partition_key
 from core.utils import is_llm_mode
+from agent.session_registry import get_resource
+import os
 import time
+import atexit
 
 
 # Global cache instances (singleton pattern for session persistence)
 _response_cache = None
+_partitioned_cache = None
 _style_variator = None
 
 
 def get_response_cache() -> ResponseCache:
-    """Get or create global response cache instance"""
+    """
+    Get or create global response cache instance
+
+    RESPONSE_CACHE_DIR가 설정되면 프로세스/재시작 간 공유되는 영속 캐시를 사용합니다.
+    """
     global _response_cache
     if _response_cache is None:
-        _response_cache = ResponseCache(
+        cache_kwargs = dict(
             max_cache_size=100,
             similarity_threshold=0.85,  # 85% 유사도 이상일 때만 재사용
             cache_ttl_minutes=60,
             model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
         )
+        cache_dir = os.getenv('RESPONSE_CACHE_DIR')
+        if cache_dir:
+            from memory.persistent_response_cache import PersistentResponseCache
+            _response_cache = PersistentResponseCache(path=cache_dir, **cache_kwargs)
+            atexit.register(_response_cache.close)  # 버퍼된 통계/적중 기록 반영
+        else:
+            _response_cache = ResponseCache(**cache_kwargs)
     return _response_cache
 
 
+def get_partitioned_response_cache(feature_flags: Dict[str, Any] = None) -> PartitionedResponseCache:
+    """
+    Get or create global patient-partitioned response cache (cache_partitioning_enabled)
+
+    파티션 크기/공유 파티션 설정은 처음 생성할 때의 feature_flags를 따릅니다.
+    파티션 캐시는 프로세스 메모리에만 있으며 RESPONSE_CACHE_DIR 영속 캐시와 함께 쓸 수 없습니다.
+    """
+    global _partitioned_cache
+    if _partitioned_cache is None:
+        feature_flags = feature_flags or {}
+        if os.getenv('RESPONSE_CACHE_DIR'):
+            print("[WARNING] cache_partitioning_enabled는 영속 캐시(RESPONSE_CACHE_DIR)를 지원하지 않습니다. "
+                  "파티션 캐시는 프로세스 메모리에만 저장됩니다.")
+        _partitioned_cache = PartitionedResponseCache(
+            max_partition_size=feature_flags.get('cache_partition_size', 100),
+            shared_partition=feature_flags.get('cache_shared_partition', False),
+            similarity_threshold=0.85,
+            cache_ttl_minutes=60,
+            model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+        )
+    return _partitioned_cache
+
+
+# 질문에 포함되면 환자 고유 질문으로 보는 슬롯
+_PATIENT_SLOT_KEYS = ('demographics', 'conditions', 'symptoms', 'vitals', 'labs', 'medications')
+
+
+def _cache_partition(state: AgentState) -> str:
+    """환자 맥락 파티션 키 (user_id + 현재 프로필 요약 해시)"""
+    profile_store = get_resource(state, 'profile_store')
+    profile_summary = profile_store.get_profile_summary() if profile_store is not None else ''
+    return partition_key(state.get('user_id', ''), profile_summary)
+
+
+def _profile_unused(state: AgentState) -> bool:
+    """이번 설정에서 답변 생성에 프로필을 쓰지 않는지 (플래그 기준)"""
+    feature_flags = state.get('feature_flags', {})
+    return (
+        not feature_flags.get('include_profile', True)
+        or not feature_flags.get('include_personalization', True)
+    )
+
+
+def _shared_eligible(state: AgentState) -> bool:
+    """
+    공유 파티션 저장 대상인지
+
+    질문 환자의 프로필이 비어 있다는 것만으로는 공유하지 않습니다 (프로필이 있는 환자에게
+    개인화되지 않은 답변이 돌아감). 설정상 프로필을 쓰지 않고, 질문 자체에도
+    환자 고유 정보(나이/질환/증상/수치/약물 슬롯)가 없을 때만 공유합니다.
+    """
+    if not _profile_unused(state):
+        return False
+    slot_out = state.get('slot_out') or {}
+    for key in _PATIENT_SLOT_KEYS:
+        value = slot_out.get(key)
+        if isinstance(value, dict):
+            value = any(v for v in value.values())
+        if value:
+            return False
+    return True
+
+
 def get_style_variator() -> ResponseStyleVariator:
     """Get or create global style variator instance"""
     global _style_variator
@@ -64,7 +142,8 @@ def check_similarity_node(state: AgentState) -> AgentState:
         return {**state, 'cache_hit': False}
 
     # Get cache and variator instances
-    cache = get_response_cache()
+    partitioned = feature_flags.get('cache_partitioning_enabled', False)
+    cache = get_partitioned_response_cache(feature_flags) if partitioned else get_response_cache()
     variator = get_style_variator()
 
     # Update cache threshold if different
@@ -75,7 +154,11 @@ def check_similarity_node(state: AgentState) -> AgentState:
 
     # Check for similar cached query
     start_time = time.time()
-    cache_result = cache.find_similar(user_query)
+    if partitioned:
+        # 현재 환자 파티션 (+ 프로필 미사용 설정이면 공유 파티션)만 검색
+        cache_result = cache.find_similar(user_query, _cache_partition(state), include_shared=_profile_unused(state))
+    else:
+        cache_result = cache.find_similar(user_query)
 
     if cache_result:
         cached_response, similarity_score = cache_result
@@ -177,7 +260,8 @@ def store_response_node(state: AgentState) -> AgentState:
         return state
 
     # Get cache instance
-    cache = get_response_cache()
+    partitioned = feature_flags.get('cache_partitioning_enabled', False)
+    cache = get_partitioned_response_cache(feature_flags) if partitioned else get_response_cache()
 
     # Store the generated response
     user_query = state.get('user_text', '')
@@ -192,12 +276,29 @@ def store_response_node(state: AgentState) -> AgentState:
             'mode': state.get('mode', 'ai_agent')
         }
 
-        cache.add(
-            query=user_query,
-            response=answer,
-            metadata=metadata
-        )
+        # 검사 수치/활력징후가 포함된 질문은 짧은 TTL (값이 바뀌면 답변도 달라짐)
+        ttl_minutes = None
+        slot_out = state.get('slot_out') or {}
+        if slot_out.get('labs') or slot_out.get('vitals'):
+            ttl_minutes = feature_flags.get('cache_ttl_lab_minutes')
+
+        if partitioned:
+            cache.add(
+                query=user_query,
+                response=answer,
+                partition_key=_cache_partition(state),
+                shared=_shared_eligible(state),
+                metadata=metadata,
+                ttl_minutes=ttl_minutes
+            )
+        else:
+            cache.add(
+                query=user_query,
+                response=answer,
+                metadata=metadata,
+                ttl_minutes=ttl_minutes
+            )
 
-        print(f"[Cache Store] Response cached. Cache size: {len(cache.cache)}")
+        print(f"[Cache Store] Response cached. Cache size: {cache.get_stats()['cache_size']}")
 
     return state
\ No newline at end of file
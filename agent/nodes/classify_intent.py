@@ -12,6 +12,7 @@ Ablation Study를 위한 메트릭을 수집합니다.
 import time
 from typing import Dict, Any, Tuple
 from agent.state import AgentState
+from agent.session_registry import get_or_create_resource
 
 
 class IntentClassifier:
@@ -298,11 +299,9 @@ def classify_intent_node(state: AgentState) -> AgentState:
             }
 
         # Classifier 초기화 (캐싱)
-        if 'intent_classifier' not in state or state['intent_classifier'] is None:
-            classifier = IntentClassifier(feature_flags)
-            state['intent_classifier'] = classifier
-        else:
-            classifier = state['intent_classifier']
+        classifier = get_or_create_resource(
+            state, 'intent_classifier', lambda: IntentClassifier(feature_flags)
+        )
         
         # Classifier 유효성 검증
         if classifier is None:
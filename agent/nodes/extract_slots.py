@@ -6,6 +6,41 @@ from typing import Dict, Any
 from agent.state import AgentState
 from extraction.slot_extractor import SlotExtractor
 from core.utils import is_llm_mode
+from agent.nodes.retrieve import _get_embedding_client, _get_retriever, _base_k
+from agent.speculative_retrieval import start_speculative_retrieval
+from agent.candidate_pool import pool_size
+from agent.session_registry import get_resource, set_resource, get_or_create_resource
+
+
+def _start_speculative_retrieval(state: AgentState) -> None:
+    """
+    Speculative Retrieval 시작 (선택적)
+
+    슬롯 추출과 겹치도록 원문 user_text로 임베딩 + 1차 검색을 백그라운드에서 실행합니다.
+    첫 검색 전(재검색 루프가 아닌 경우)에만 시작합니다.
+    """
+    feature_flags = state.get('feature_flags', {})
+    if not feature_flags.get('speculative_retrieval_enabled', False):
+        return
+    if state.get('retrieval_attempted') or get_resource(state, 'speculative_retrieval') is not None:
+        return
+
+    try:
+        llm_client, embedding_model = _get_embedding_client(state)
+        retriever = _get_retriever(state, 'default')
+        handle = start_speculative_retrieval(
+            llm_client=llm_client,
+            embedding_model=embedding_model,
+            retriever=retriever,
+            query=state['user_text'],
+            k=pool_size(feature_flags, _base_k(feature_flags)),  # 후보 풀 활성화 시 풀 크기만큼
+            route='default',
+            retrieval_mode=feature_flags.get('retrieval_mode', 'hybrid')
+        )
+        set_resource(state, 'speculative_retrieval', handle)
+        print("[Speculative Retrieval] 1차 검색 시작 (슬롯 추출과 병렬)")
+    except Exception as e:
+        print(f"[WARNING] Speculative Retrieval 시작 실패: {e}")
 
 
 def extract_slots_node(state: AgentState) -> AgentState:
@@ -26,11 +61,12 @@ def extract_slots_node(state: AgentState) -> AgentState:
     use_medcat2 = feature_flags.get('medcat2_enabled', True)
 
     # 슬롯 추출기 초기화 (첫 실행 시만)
-    if 'slot_extractor' not in state:
-        extractor = SlotExtractor(use_medcat2=use_medcat2)
-        state['slot_extractor'] = extractor
-    else:
-        extractor = state['slot_extractor']
+    extractor = get_or_create_resource(
+        state, 'slot_extractor', lambda: SlotExtractor(use_medcat2=use_medcat2)
+    )
+
+    # Speculative Retrieval: 슬롯 추출 동안 1차 검색 진행
+    _start_speculative_retrieval(state)
     
     # 슬롯 추출
     slot_out = extractor.extract(state['user_text'])
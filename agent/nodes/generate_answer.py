@@ -2,52 +2,103 @@
 노드 5: LLM 답변 생성
 """
 
+import asyncio
 from agent.state import AgentState
-from core.llm_client import get_llm_client
+from core.llm_client import get_llm_client, LLMClient
 from core.config import get_llm_config
+from agent.session_registry import get_or_create_resource
+from agent.streaming import is_streaming, stream_answer, emit_event
+
+_GENERATION_ERROR_MESSAGE = "죄송합니다. 답변 생성 중 오류가 발생했습니다."
+
+
+def _get_llm_client(state: AgentState) -> LLMClient:
+    """세션에 캐싱된 LLM 클라이언트 반환 (없으면 생성)"""
+    def _create() -> LLMClient:
+        # LLM 설정 로드
+        llm_config = get_llm_config()
+        return get_llm_client(
+            provider=llm_config.get('provider', 'openai'),
+            model=llm_config.get('model', 'gpt-4o-mini'),
+            temperature=llm_config.get('temperature', 0.7),
+            max_tokens=llm_config.get('max_tokens', 1000)
+        )
+
+    return get_or_create_resource(state, 'llm_client', _create)
+
+
+def _build_user_prompt(state: AgentState) -> str:
+    """context_prompt가 있으면 사용자 프롬프트 앞에 붙여 맥락을 전달"""
+    return "\n\n".join(filter(None, [
+        state.get('context_prompt', ''),
+        state.get('user_prompt', '')
+    ]))
+
+
+def _generate(state: AgentState, llm_client: LLMClient) -> str:
+    """답변 생성 (run_agent_stream 실행 중이면 토큰 스트리밍)"""
+    prompt = _build_user_prompt(state)
+    system_prompt = state['system_prompt']
+
+    if not is_streaming(state):
+        return llm_client.generate(prompt=prompt, system_prompt=system_prompt)
+
+    try:
+        return stream_answer(state, llm_client.generate_stream(prompt=prompt, system_prompt=system_prompt))
+    except Exception:
+        # 일부 조각이 이미 전달되었을 수 있으므로 현재 초안을 무효화
+        emit_event(state, {'type': 'superseded', 'draft': state.get('iteration_count', 0)})
+        raise
 
 
 def generate_answer_node(state: AgentState) -> AgentState:
     """
     답변 생성 노드
-    
+
     LLM을 사용하여 답변을 생성합니다.
     """
     print("[Node] generate_answer")
-    
-    # LLM 설정 로드
-    llm_config = get_llm_config()
-    
-    # LLM 클라이언트 초기화
-    if 'llm_client' not in state:
-        llm_client = get_llm_client(
-            provider=llm_config.get('provider', 'openai'),
-            model=llm_config.get('model', 'gpt-4o-mini'),
-            temperature=llm_config.get('temperature', 0.7),
-            max_tokens=llm_config.get('max_tokens', 1000)
-        )
-        state['llm_client'] = llm_client
-    else:
-        llm_client = state['llm_client']
-    
+
+    llm_client = _get_llm_client(state)
+
     # 답변 생성
     try:
-        # context_prompt가 있으면 사용자 프롬프트 앞에 붙여 맥락을 전달
-        combined_user_prompt = "\n\n".join(filter(None, [
-            state.get('context_prompt', ''),
-            state.get('user_prompt', '')
-        ]))
-        
-        answer = llm_client.generate(
-            prompt=combined_user_prompt,
-            system_prompt=state['system_prompt']
-        )
+        answer = _generate(state, llm_client)
     except Exception as e:
         print(f"[ERROR] 답변 생성 실패: {e}")
-        answer = "죄송합니다. 답변 생성 중 오류가 발생했습니다."
-    
+        answer = _GENERATION_ERROR_MESSAGE
+
     return {
         **state,
         'answer': answer
     }
 
+
+async def generate_answer_node_async(state: AgentState) -> AgentState:
+    """
+    답변 생성 노드 (비동기)
+
+    generate_answer_node와 동일한 프롬프트를 사용하되,
+    LLM 호출을 await하여 이벤트 루프를 블로킹하지 않습니다.
+    """
+    print("[Node] generate_answer (async)")
+
+    llm_client = _get_llm_client(state)
+
+    try:
+        if is_streaming(state):
+            # 스트리밍은 동기 이터레이터이므로 스레드 풀에서 소비
+            answer = await asyncio.to_thread(_generate, state, llm_client)
+        else:
+            answer = await llm_client.agenerate(
+                prompt=_build_user_prompt(state),
+                system_prompt=state['system_prompt']
+            )
+    except Exception as e:
+        print(f"[ERROR] 답변 생성 실패: {e}")
+        answer = _GENERATION_ERROR_MESSAGE
+
+    return {
+        **state,
+        'answer': answer
+    }
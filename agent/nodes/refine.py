@@ -12,6 +12,33 @@ from core.utils import is_llm_mode
 from agent.refine_strategies import RefineStrategyFactory
 
 
+def _disabled_result(state: AgentState) -> AgentState:
+    """LLM 모드 또는 셀프 리파인 비활성화: 품질 검증 건너뛰기"""
+    return {
+        **state,
+        'quality_score': 1.0,
+        'needs_retrieval': False,
+        'refine_strategy': 'disabled'
+    }
+
+
+def _create_strategy(feature_flags: dict):
+    """Strategy 생성 (팩토리 패턴)"""
+    try:
+        strategy = RefineStrategyFactory.create(feature_flags)
+        print(f"[Refine] 전략 선택: {strategy.get_strategy_name()}")
+    except ValueError as e:
+        print(f"[ERROR] {e}, 기본값(corrective_rag) 사용")
+        feature_flags['refine_strategy'] = 'corrective_rag'
+        strategy = RefineStrategyFactory.create(feature_flags)
+    return strategy
+
+
+def _is_refine_disabled(state: AgentState) -> bool:
+    feature_flags = state.get('feature_flags', {})
+    return is_llm_mode(state) or not feature_flags.get('self_refine_enabled', True)
+
+
 def refine_node(state: AgentState) -> AgentState:
     """
     Self-Refine 노드 (Strategy 패턴 기반)
@@ -24,26 +51,10 @@ def refine_node(state: AgentState) -> AgentState:
     """
     print("[Node] refine (Strategy-based)")
 
-    feature_flags = state.get('feature_flags', {})
-    self_refine_enabled = feature_flags.get('self_refine_enabled', True)
-
-    # LLM 모드 또는 셀프 리파인 비활성화: 품질 검증 건너뛰기
-    if is_llm_mode(state) or not self_refine_enabled:
-        return {
-            **state,
-            'quality_score': 1.0,
-            'needs_retrieval': False,
-            'refine_strategy': 'disabled'
-        }
-
-    # Strategy 생성 (팩토리 패턴)
-    try:
-        strategy = RefineStrategyFactory.create(feature_flags)
-        print(f"[Refine] 전략 선택: {strategy.get_strategy_name()}")
-    except ValueError as e:
-        print(f"[ERROR] {e}, 기본값(corrective_rag) 사용")
-        feature_flags['refine_strategy'] = 'corrective_rag'
-        strategy = RefineStrategyFactory.create(feature_flags)
+    if _is_refine_disabled(state):
+        return _disabled_result(state)
+
+    strategy = _create_strategy(state.get('feature_flags', {}))
 
     # 전략 실행
     result = strategy.refine(state)
@@ -57,3 +68,27 @@ def refine_node(state: AgentState) -> AgentState:
         **state,
         **result
     }
+
+
+async def refine_node_async(state: AgentState) -> AgentState:
+    """
+    Self-Refine 노드 (비동기)
+
+    refine_node와 동일한 전략을 선택하고 strategy.arefine을 await합니다.
+    """
+    print("[Node] refine (Strategy-based, async)")
+
+    if _is_refine_disabled(state):
+        return _disabled_result(state)
+
+    strategy = _create_strategy(state.get('feature_flags', {}))
+
+    result = await strategy.arefine(state)
+
+    metrics = strategy.get_metrics(state)
+    result['refine_metrics'] = metrics
+
+    return {
+        **state,
+        **result
+    }
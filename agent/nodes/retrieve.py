@@ -2,13 +2,20 @@
 노드 4: 하이브리드 검색
 """
 
+import time
+import asyncio
 from agent.state import AgentState
 from retrieval.hybrid_retriever import HybridRetriever
 from core.llm_client import get_llm_client
 from core.config import get_retrieval_config, get_embedding_config
 from core.utils import is_llm_mode
 from core.config import get_agent_config
-from context.token_manager import TokenManager
+from context.token_manager import get_token_manager
+from agent.speculative_retrieval import choose_better
+from agent.doc_set import doc_id, merge_iteration_docs, MAX_RETRIEVED_DOCS
+from agent.candidate_pool import CandidatePool, pool_size, shown_doc_ids
+from agent.session_registry import get_resource, set_resource, get_or_create_resource
+from retrieval.doc_packer import pack_documents
 
 
 def _select_route(slot_out: dict, feature_flags: dict) -> str:
@@ -53,24 +60,64 @@ def _rewrite_query(user_text: str, slot_out: dict, profile_summary: str, feature
     return "\n".join(parts)
 
 
-def retrieve_node(state: AgentState) -> AgentState:
-    """
-    검색 노드
-    
-    하이브리드 검색을 수행합니다.
-    LLM 모드에서는 건너뜁니다.
+def _get_embedding_client(state: AgentState):
+    """임베딩용 LLM 클라이언트 (상태에 캐싱) 및 임베딩 모델명 반환"""
+    embedding_config = get_embedding_config()
+    embedding_model = embedding_config.get('model', 'text-embedding-3-large')
+
+    # LLM 클라이언트 초기화 (임베딩용)
+    llm_client = get_or_create_resource(state, 'llm_client', lambda: get_llm_client(
+        provider=embedding_config.get('provider', 'openai'),
+        embedding_model=embedding_model
+    ))
+
+    return llm_client, embedding_model
+
+
+def _get_retriever(state: AgentState, route: str) -> HybridRetriever:
+    """라우트별 HybridRetriever (상태의 retriever_cache에 캐싱)"""
+    retriever_key = f"hybrid_retriever::{route}"
+    retriever_cache = get_or_create_resource(state, 'retriever_cache', dict)
+
+    if retriever_key in retriever_cache:
+        return retriever_cache[retriever_key]
+
+    retrieval_config = get_retrieval_config()
+    agent_config = state.get('agent_config') or get_agent_config()
+    routing_table = (agent_config.get('routing') or {})
+
+    route_cfg = routing_table.get(route) or routing_table.get('default', {})
+    retriever_config = {
+        'bm25_corpus_path': route_cfg.get('bm25_corpus_path') or retrieval_config.get('bm25_corpus_path'),
+        'faiss_index_path': route_cfg.get('faiss_index_path') or retrieval_config.get('faiss_index_path'),
+        'faiss_meta_path': route_cfg.get('faiss_meta_path') or retrieval_config.get('faiss_meta_path'),
+        'rrf_k': retrieval_config.get('multi', {}).get('rrf_k', 60)
+    }
+    hybrid_retriever = HybridRetriever(retriever_config)
+    retriever_cache[retriever_key] = hybrid_retriever
+    return hybrid_retriever
+
+
+def _base_k(feature_flags: dict) -> int:
+    """설정 기반 기본 k (예산/dynamic_k 적용 전)"""
+    retrieval_config = get_retrieval_config()
+    return feature_flags.get(
+        'top_k_override',
+        retrieval_config.get('multi', {}).get('retrievers', [{}])[0].get('k', 8)
+    )
+
+
+def _plan_retrieval(state: AgentState) -> dict:
     """
-    print("[Node] retrieve")
-    
-    # LLM 모드: 검색 건너뛰기
-    if is_llm_mode(state):
-        return {
-            **state,
-            'retrieved_docs': [],
-            'retrieval_attempted': True
-        }
+    검색 계획 수립 (임베딩/검색 호출 전 단계)
 
+    iteration 카운트, 질의 재작성, 라우팅, 검색기 선택, k 결정을 수행하고
+    동기/비동기 검색 노드가 공유하는 계획 딕셔너리를 반환합니다.
+    """
     feature_flags = state.get('feature_flags', {})
+
+    # 재검색 시 refine 단계가 재작성한 질의 (후보 풀 재점수화용)
+    refine_query = state.get('query_for_retrieval') or state['user_text']
     
     # 재검색 시 iteration_count 증가 (이미 답변이 생성된 경우에만)
     if state.get('answer', ''):
@@ -79,22 +126,7 @@ def retrieve_node(state: AgentState) -> AgentState:
         # 첫 검색인 경우 0으로 초기화
         state['iteration_count'] = 0
     
-    # 설정 로드
-    retrieval_config = get_retrieval_config()
-    embedding_config = get_embedding_config()
-    agent_config = state.get('agent_config') or get_agent_config()
-    routing_table = (agent_config.get('routing') or {})
-    
-    # LLM 클라이언트 초기화 (임베딩용)
-    if 'llm_client' not in state:
-        embedding_model = embedding_config.get('model', 'text-embedding-3-large')
-        llm_client = get_llm_client(
-            provider=embedding_config.get('provider', 'openai'),
-            embedding_model=embedding_model
-        )
-        state['llm_client'] = llm_client
-    else:
-        llm_client = state['llm_client']
+    llm_client, embedding_model = _get_embedding_client(state)
     
     # 질의 재작성 (개인화 정보 포함)
     profile_summary = state.get('profile_summary', '')
@@ -102,36 +134,11 @@ def retrieve_node(state: AgentState) -> AgentState:
     rewritten_query = _rewrite_query(state['user_text'], slot_out, profile_summary, feature_flags)
     state['query_for_retrieval'] = rewritten_query
     
-    # 쿼리 벡터 생성 (3072차원)
-    try:
-        embedding_model = embedding_config.get('model', 'text-embedding-3-large')
-        query_vector = llm_client.embed(rewritten_query, embedding_model=embedding_model)
-        state['query_vector'] = query_vector
-        print(f"[INFO] 쿼리 벡터 생성 완료: {len(query_vector)}차원 (모델: {embedding_model})")
-    except Exception as e:
-        print(f"[WARNING] 임베딩 생성 실패: {e}")
-        query_vector = None
-    
     # 라우팅 규칙 적용
     route = _select_route(slot_out, feature_flags)
     state['active_route'] = route
 
-    retriever_key = f"hybrid_retriever::{route}"
-    retriever_cache = state.get('retriever_cache', {})
-
-    if retriever_key in retriever_cache:
-        hybrid_retriever = retriever_cache[retriever_key]
-    else:
-        route_cfg = routing_table.get(route) or routing_table.get('default', {})
-        retriever_config = {
-            'bm25_corpus_path': route_cfg.get('bm25_corpus_path') or retrieval_config.get('bm25_corpus_path'),
-            'faiss_index_path': route_cfg.get('faiss_index_path') or retrieval_config.get('faiss_index_path'),
-            'faiss_meta_path': route_cfg.get('faiss_meta_path') or retrieval_config.get('faiss_meta_path'),
-            'rrf_k': retrieval_config.get('multi', {}).get('rrf_k', 60)
-        }
-        hybrid_retriever = HybridRetriever(retriever_config)
-        retriever_cache[retriever_key] = hybrid_retriever
-        state['retriever_cache'] = retriever_cache
+    hybrid_retriever = _get_retriever(state, route)
     
     # 토큰 예산 확인 (없으면 기본값 사용)
     token_plan = state.get('token_plan', {})
@@ -153,49 +160,355 @@ def retrieve_node(state: AgentState) -> AgentState:
             print(f"[Active Retrieval] dynamic_k={dynamic_k} reduced to {final_k} due to budget constraint")
     else:
         # 기존 로직 (Fallback)
-        base_k = feature_flags.get(
-            'top_k_override',
-            retrieval_config.get('multi', {}).get('retrievers', [{}])[0].get('k', 8)
-        )
+        base_k = _base_k(feature_flags)
 
         # 예산 기반 k 계산 (평균 문서 길이 근사치)
         avg_doc_tokens = feature_flags.get('avg_doc_tokens', 200)
         max_k_by_budget = max(1, docs_budget // max(1, avg_doc_tokens))
         final_k = min(base_k, max_k_by_budget) if feature_flags.get('budget_aware_retrieval', True) else base_k
 
-    # 검색 모드에 따라 query/query_vector 선택
-    retrieval_mode = feature_flags.get('retrieval_mode', 'hybrid')  # hybrid/bm25/faiss
-    query_arg = rewritten_query if retrieval_mode != 'faiss' else ""
-    query_vec_arg = query_vector if retrieval_mode != 'bm25' else None
-    
-    # 검색 실행
-    candidate_docs = hybrid_retriever.search(
-        query=query_arg,
-        query_vector=query_vec_arg,
-        k=final_k
-    )
+    return {
+        'llm_client': llm_client,
+        'embedding_model': embedding_model,
+        'query': rewritten_query,
+        'refine_query': refine_query,
+        'route': route,
+        'retriever': hybrid_retriever,
+        'k': final_k,
+        # 첫 검색은 후보 풀 크기만큼 가져옴 (candidate_pool_enabled)
+        'search_k': pool_size(feature_flags, final_k) if state['iteration_count'] == 0 else final_k,
+        'docs_budget': docs_budget,
+        'retrieval_mode': feature_flags.get('retrieval_mode', 'hybrid'),  # hybrid/bm25/faiss
+    }
+
+
+def _search_args(plan: dict, query_vector) -> dict:
+    """검색 모드에 따라 query/query_vector 선택"""
+    retrieval_mode = plan['retrieval_mode']
+    return {
+        'query': plan['query'] if retrieval_mode != 'faiss' else "",
+        'query_vector': query_vector if retrieval_mode != 'bm25' else None,
+        'k': plan['search_k'],
+    }
+
+
+def _pool_retrieval(state: AgentState, plan: dict):
+    """
+    재검색: 후보 풀을 재작성 질의로 재점수화하여 이미 보여준 문서를 제외한 다음 페이지 반환
+
+    풀이 없거나(다른 턴/라우트 포함) 남은 문서가 k개 미만이면 None (인덱스 검색으로 진행)
+    """
+    feature_flags = state.get('feature_flags', {})
+    if not feature_flags.get('candidate_pool_enabled', False) or state.get('iteration_count', 0) == 0:
+        return None
+
+    pool = get_resource(state, 'candidate_pool')
+    if pool is None or not pool.matches(state['user_text'], plan['route']):
+        return None
+
+    stats = state.get('candidate_pool_stats') or {'pool_size': len(pool), 'pool_hits': 0, 'index_fallbacks': 0}
+    shown = shown_doc_ids(state.get('retrieved_docs_history'))
+    remaining = pool.remaining(shown)
+    if remaining < plan['k']:
+        print(f"[Candidate Pool] 남은 후보 {remaining}개 < k={plan['k']}, 인덱스 재검색")
+        state['candidate_pool_stats'] = {**stats, 'index_fallbacks': stats['index_fallbacks'] + 1, 'remaining': remaining}
+        return None
+
+    docs = pool.rescore(plan['refine_query'], plan['k'], exclude_ids=shown)
+    state['candidate_pool_stats'] = {**stats, 'pool_hits': stats['pool_hits'] + 1, 'remaining': remaining - len(docs)}
+    print(f"[Candidate Pool] 풀 재점수화로 {len(docs)}개 선택 (남은 후보 {remaining - len(docs)}개)")
+    return docs
+
+
+def _store_pool(state: AgentState, plan: dict, candidate_docs: list) -> list:
+    """첫 검색 결과를 후보 풀로 보관하고 상위 k개만 반환"""
+    feature_flags = state.get('feature_flags', {})
+    if feature_flags.get('candidate_pool_enabled', False) and state.get('iteration_count', 0) == 0:
+        set_resource(state, 'candidate_pool', CandidatePool(candidate_docs, state['user_text'], plan['route']))
+        state['candidate_pool_stats'] = {
+            'pool_size': len(candidate_docs),
+            'pool_hits': 0,  # 풀 재점수화로 처리한 재검색 수
+            'index_fallbacks': 0,  # 풀 소진으로 인덱스를 다시 조회한 재검색 수
+            'remaining': max(0, len(candidate_docs) - plan['k']),
+        }
+    return candidate_docs[:plan['k']]
+
+
+def _finalize_retrieval(state: AgentState, plan: dict, candidate_docs: list) -> AgentState:
+    """예산 내 문서만 선택하여 최종 상태 구성"""
+    feature_flags = state.get('feature_flags', {})
+    docs_budget = plan['docs_budget']
+
+    # 이전 iteration 문서와 ID 기준 병합 (이번 검색 결과 우선, 상한 적용)
+    iteration = state.get('iteration_count', 0)
+    previous_docs = state.get('retrieved_docs', []) if iteration > 0 else []
+    max_docs = feature_flags.get('max_retrieved_docs', MAX_RETRIEVED_DOCS)
+    merged_docs = None
 
     # 예산 내 문서만 선택 (토큰 수가 예산을 넘지 않도록 필터, 옵션)
     if feature_flags.get('budget_aware_retrieval', True):
-        token_manager = state.get('token_manager') or TokenManager(max_total_tokens=4000)
-        state['token_manager'] = token_manager
-
-        selected_docs = []
-        used_tokens = 0
-        for doc in candidate_docs:
-            doc_text = doc.get('text', '')
-            doc_tokens = token_manager.count_tokens(doc_text)
-            if used_tokens + doc_tokens <= docs_budget:
-                selected_docs.append(doc)
-                used_tokens += doc_tokens
-            else:
-                break
+        token_manager = get_or_create_resource(state, 'token_manager', get_token_manager)
+
+        if feature_flags.get('doc_packing_enabled', False):
+            # 병합된 전체 집합(재검색 시 이전 iteration 문서 포함)을 예산 내로 패킹:
+            # 융합 점수 합 최대 집합 (뒤 순위 짧은 문서 / 문장 조각으로 남는 예산 채움)
+            pool_docs = merge_iteration_docs(previous_docs, candidate_docs, iteration=iteration, cap=max_docs)
+            merged_docs, packing_stats = pack_documents(
+                pool_docs,
+                token_manager.count_tokens_batch([doc.get('text', '') for doc in pool_docs]),
+                docs_budget,
+                count_tokens_batch=token_manager.count_tokens_batch,
+                fragments=feature_flags.get('doc_packing_fragments', False),
+            )
+            state['doc_packing_stats'] = packing_stats
+            candidate_ids = {doc_id(doc) for doc in candidate_docs}
+            selected_docs = [doc for doc in merged_docs if doc_id(doc) in candidate_ids]
+            print(f"[Doc Packing] {packing_stats['selected']}+{packing_stats['fragments']}개 문서, "
+                  f"예산 사용률 {packing_stats['utilization']:.0%} (greedy {packing_stats['greedy_utilization']:.0%})")
+        else:
+            doc_token_counts = token_manager.count_tokens_batch([doc.get('text', '') for doc in candidate_docs])
+            selected_docs = []
+            used_tokens = 0
+            for doc, doc_tokens in zip(candidate_docs, doc_token_counts):
+                if used_tokens + doc_tokens <= docs_budget:
+                    selected_docs.append(doc)
+                    used_tokens += doc_tokens
+                else:
+                    break
     else:
         selected_docs = candidate_docs
+
+    if merged_docs is None:
+        merged_docs = merge_iteration_docs(previous_docs, selected_docs, iteration=iteration, cap=max_docs)
+
+    # iteration별 검색 문서 ID 이력 (CRAG 중복 검색 감지용)
+    retrieved_docs_history = list(state.get('retrieved_docs_history') or [])
+    retrieved_docs_history.append([doc_id(doc) for doc in selected_docs])
     
     return {
         **state,
-        'retrieved_docs': selected_docs,
+        'retrieved_docs': merged_docs,
+        'retrieved_docs_history': retrieved_docs_history,
         'retrieval_attempted': True  # Flag to indicate retrieval has been attempted
     }
 
+
+def _llm_mode_result(state: AgentState) -> AgentState:
+    """LLM 모드: 검색 건너뛰기"""
+    return {
+        **state,
+        'retrieved_docs': [],
+        'retrieval_attempted': True
+    }
+
+
+def _take_speculative(state: AgentState):
+    """
+    Speculative Retrieval 핸들 회수 (한 번만 사용)
+
+    첫 검색에서만 유효하며, 회수 후 상태에서 제거합니다.
+    """
+    handle = get_resource(state, 'speculative_retrieval')
+    set_resource(state, 'speculative_retrieval', None)
+    if handle is None or state.get('iteration_count', 0) > 0:
+        return None
+    return handle
+
+
+def _can_reuse_speculative(plan: dict, handle, outcome) -> bool:
+    """슬롯 보강이 없어 1차 검색 결과를 그대로 재사용할 수 있는지"""
+    return (
+        outcome is not None
+        and plan['query'] == handle.query
+        and plan['route'] == handle.route
+        and plan['k'] <= handle.k
+    )
+
+
+def _merge_speculative(plan: dict, handle, outcome, wait_ms: float,
+                       refined, refine_ms: float):
+    """
+    1차 검색 결과 재사용 또는 보강 질의 결과와 비교하여 더 나은 결과 선택
+
+    Args:
+        outcome: 1차 검색 (docs, query_vector, elapsed_ms), 실패 시 None
+        wait_ms: retrieve 노드가 1차 검색 완료를 기다린 시간
+        refined: 보강 질의 검색 (docs, query_vector), 재사용 시 None
+        refine_ms: 보강 질의 검색 소요 시간
+
+    Returns:
+        (candidate_docs, query_vector, stats) - candidate_docs는 k개보다 많을 수 있음 (후보 풀)
+    """
+    stats = {
+        'enabled': True,
+        'wait_ms': round(wait_ms, 2),
+        'speculative_ms': round(outcome[2], 2) if outcome is not None else None,
+        'refine_ms': round(refine_ms, 2),
+        'decision': None,
+        'coverage': {},
+    }
+    # 순차 실행이었다면 보강 질의 검색(재사용 시에는 동일한 1차 검색)만 수행했을 것
+    stats['overlapped_retrieval_ms'] = round(wait_ms + refine_ms, 2)
+
+    if refined is None:
+        spec_docs, spec_vector, _ = outcome
+        stats['decision'] = 'reused'
+        stats['sequential_retrieval_ms'] = stats['speculative_ms']
+        return spec_docs, spec_vector, stats
+
+    refined_docs, refined_vector = refined
+    stats['sequential_retrieval_ms'] = stats['refine_ms']
+
+    if outcome is None:
+        stats['decision'] = 'fallback'
+        return refined_docs, refined_vector, stats
+
+    spec_docs, spec_vector, _ = outcome
+    k = plan['k']
+    source, _, coverage = choose_better(plan['query'], spec_docs[:k], refined_docs[:k])
+    stats['decision'] = source
+    stats['coverage'] = {key: round(value, 3) for key, value in coverage.items()}
+
+    # 상위 k개로 비교하되, 후보 풀을 위해 선택된 쪽의 전체 결과를 반환
+    if source == 'refined':
+        return refined_docs, refined_vector, stats
+    return spec_docs, spec_vector, stats
+
+
+def _log_speculative(stats: dict) -> None:
+    print(f"[Speculative Retrieval] decision={stats['decision']}, "
+          f"wait={stats['wait_ms']:.1f}ms, refine={stats['refine_ms']:.1f}ms, "
+          f"sequential={stats['sequential_retrieval_ms']}ms, overlapped={stats['overlapped_retrieval_ms']}ms")
+
+
+def _embed_query(plan: dict):
+    """쿼리 벡터 생성 (실패 시 None)"""
+    try:
+        query_vector = plan['llm_client'].embed(plan['query'], embedding_model=plan['embedding_model'])
+        print(f"[INFO] 쿼리 벡터 생성 완료: {len(query_vector)}차원 (모델: {plan['embedding_model']})")
+        return query_vector
+    except Exception as e:
+        print(f"[WARNING] 임베딩 생성 실패: {e}")
+        return None
+
+
+def retrieve_node(state: AgentState) -> AgentState:
+    """
+    검색 노드
+    
+    하이브리드 검색을 수행합니다.
+    LLM 모드에서는 건너뜁니다.
+    """
+    print("[Node] retrieve")
+    
+    # LLM 모드: 검색 건너뛰기
+    if is_llm_mode(state):
+        return _llm_mode_result(state)
+
+    plan = _plan_retrieval(state)
+
+    # 후보 풀: 재검색은 풀 재점수화로 처리 (풀 소진 시에만 인덱스 검색)
+    pooled_docs = _pool_retrieval(state, plan)
+    if pooled_docs is not None:
+        return _finalize_retrieval(state, plan, pooled_docs)
+
+    def _refined_search():
+        # 쿼리 벡터 생성 (3072차원)
+        query_vector = _embed_query(plan)
+        # 검색 실행
+        return plan['retriever'].search(**_search_args(plan, query_vector)), query_vector
+
+    # Speculative Retrieval: extract_slots에서 시작한 1차 검색 회수
+    handle = _take_speculative(state)
+    if handle is None:
+        candidate_docs, query_vector = _refined_search()
+    else:
+        start = time.perf_counter()
+        try:
+            outcome = handle.result()
+        except Exception as e:
+            print(f"[WARNING] Speculative Retrieval 실패: {e}")
+            outcome = None
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        refined, refine_ms = None, 0.0
+        if not _can_reuse_speculative(plan, handle, outcome):
+            start = time.perf_counter()
+            refined = _refined_search()
+            refine_ms = (time.perf_counter() - start) * 1000
+
+        candidate_docs, query_vector, stats = _merge_speculative(
+            plan, handle, outcome, wait_ms, refined, refine_ms
+        )
+        state['speculative_retrieval_stats'] = stats
+        _log_speculative(stats)
+
+    if query_vector is not None:
+        state['query_vector'] = query_vector
+
+    candidate_docs = _store_pool(state, plan, candidate_docs)
+    return _finalize_retrieval(state, plan, candidate_docs)
+
+
+async def retrieve_node_async(state: AgentState) -> AgentState:
+    """
+    검색 노드 (비동기)
+
+    임베딩은 aembed로 await하고, CPU 바운드인 BM25/FAISS 검색은
+    스레드 풀에서 실행하여 이벤트 루프를 블로킹하지 않습니다.
+    """
+    print("[Node] retrieve (async)")
+
+    if is_llm_mode(state):
+        return _llm_mode_result(state)
+
+    plan = _plan_retrieval(state)
+
+    # 후보 풀: 재검색은 풀 재점수화로 처리 (풀 소진 시에만 인덱스 검색)
+    pooled_docs = _pool_retrieval(state, plan)
+    if pooled_docs is not None:
+        return _finalize_retrieval(state, plan, pooled_docs)
+
+    async def _refined_search():
+        try:
+            query_vector = await plan['llm_client'].aembed(plan['query'], embedding_model=plan['embedding_model'])
+            print(f"[INFO] 쿼리 벡터 생성 완료: {len(query_vector)}차원 (모델: {plan['embedding_model']})")
+        except Exception as e:
+            print(f"[WARNING] 임베딩 생성 실패: {e}")
+            query_vector = None
+
+        docs = await asyncio.to_thread(
+            plan['retriever'].search,
+            **_search_args(plan, query_vector)
+        )
+        return docs, query_vector
+
+    handle = _take_speculative(state)
+    if handle is None:
+        candidate_docs, query_vector = await _refined_search()
+    else:
+        start = time.perf_counter()
+        try:
+            outcome = await asyncio.wrap_future(handle.future)
+        except Exception as e:
+            print(f"[WARNING] Speculative Retrieval 실패: {e}")
+            outcome = None
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        refined, refine_ms = None, 0.0
+        if not _can_reuse_speculative(plan, handle, outcome):
+            start = time.perf_counter()
+            refined = await _refined_search()
+            refine_ms = (time.perf_counter() - start) * 1000
+
+        candidate_docs, query_vector, stats = _merge_speculative(
+            plan, handle, outcome, wait_ms, refined, refine_ms
+        )
+        state['speculative_retrieval_stats'] = stats
+        _log_speculative(stats)
+
+    if query_vector is not None:
+        state['query_vector'] = query_vector
+
+    candidate_docs = _store_pool(state, plan, candidate_docs)
+    return _finalize_retrieval(state, plan, candidate_docs)
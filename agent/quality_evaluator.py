@@ -5,11 +5,42 @@ LLM 기반 품질 평가자 (Context Engineering 기반)
 - Completeness Check: 사용자 질문에 완전히 답했는지 확인
 - Accuracy Check: 의학적으로 정확한지 확인
 - Missing Info Identification: 부족한 정보 식별 및 피드백 생성
+- Evaluate + Rewrite: 평가와 재검색 질의 생성을 한 번의 구조화 출력 호출로 처리
 """
 
 import json
 from typing import Dict, Any, List, Optional
 from core.llm_client import LLMClient
+from agent.query_rewriter import format_slot_context
+
+
+# 평가 + 질의 재작성 통합 호출용 구조화 출력 스키마 (OpenAI response_format)
+EVAL_REWRITE_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "crag_evaluation",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "grounding_score": {"type": "number"},
+                "completeness_score": {"type": "number"},
+                "accuracy_score": {"type": "number"},
+                "missing_info": {"type": "array", "items": {"type": "string"}},
+                "improvement_suggestions": {"type": "array", "items": {"type": "string"}},
+                "needs_retrieval": {"type": "boolean"},
+                "reason": {"type": "string"},
+                "rewritten_query": {"type": "string"},
+            },
+            "required": [
+                "grounding_score", "completeness_score", "accuracy_score",
+                "missing_info", "improvement_suggestions", "needs_retrieval",
+                "reason", "rewritten_query",
+            ],
+            "additionalProperties": False,
+        },
+    },
+}
 
 
 class QualityEvaluator:
@@ -52,16 +83,8 @@ class QualityEvaluator:
                 'reason': str  # 평가 사유
             }
         """
-        # 문서 컨텍스트 포맷팅
-        docs_text = self._format_docs(retrieved_docs)
-
-        # 평가 프롬프트 생성
-        evaluation_prompt = self._build_evaluation_prompt(
-            user_query=user_query,
-            answer=answer,
-            docs_text=docs_text,
-            profile_summary=profile_summary,
-            previous_feedback=previous_feedback
+        evaluation_prompt = self._prepare_prompt(
+            user_query, answer, retrieved_docs, profile_summary, previous_feedback
         )
 
         # LLM에게 평가 요청
@@ -72,28 +95,201 @@ class QualityEvaluator:
                 temperature=0.3,  # 일관된 평가를 위해 낮은 temperature
                 max_tokens=800
             )
+            return self._finalize_feedback(evaluation_result)
 
-            # JSON 파싱
-            feedback = self._parse_evaluation_result(evaluation_result)
+        except Exception as e:
+            print(f"[ERROR] 품질 평가 실패: {e}")
+            import traceback
+            traceback.print_exc()
 
-            # 전체 점수 계산 (가중 평균)
-            overall_score = (
-                feedback['grounding_score'] * 0.4 +
-                feedback['completeness_score'] * 0.4 +
-                feedback['accuracy_score'] * 0.2
-            )
-            feedback['overall_score'] = overall_score
+            # 폴백: 간단한 휴리스틱 평가
+            return self._fallback_evaluation(user_query, answer, retrieved_docs)
 
-            return feedback
+    async def aevaluate(
+        self,
+        user_query: str,
+        answer: str,
+        retrieved_docs: List[Dict[str, Any]],
+        profile_summary: str = "",
+        previous_feedback: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        답변 품질 종합 평가 (비동기)
+
+        evaluate와 동일한 프롬프트/파싱을 사용하며 LLM 호출만 await합니다.
+        """
+        evaluation_prompt = self._prepare_prompt(
+            user_query, answer, retrieved_docs, profile_summary, previous_feedback
+        )
+
+        try:
+            evaluation_result = await self.llm_client.agenerate(
+                prompt=evaluation_prompt,
+                system_prompt=self._get_system_prompt(),
+                temperature=0.3,
+                max_tokens=800
+            )
+            return self._finalize_feedback(evaluation_result)
 
         except Exception as e:
             print(f"[ERROR] 품질 평가 실패: {e}")
             import traceback
             traceback.print_exc()
 
-            # 폴백: 간단한 휴리스틱 평가
             return self._fallback_evaluation(user_query, answer, retrieved_docs)
 
+    def evaluate_and_rewrite(
+        self,
+        user_query: str,
+        answer: str,
+        retrieved_docs: List[Dict[str, Any]],
+        profile_summary: str = "",
+        previous_feedback: Optional[Dict[str, Any]] = None,
+        slot_out: Optional[Dict[str, Any]] = None,
+        iteration_count: int = 0
+    ) -> Dict[str, Any]:
+        """
+        품질 평가 + 재검색 질의 생성 (1회 LLM 호출)
+
+        evaluate()의 결과에 'rewritten_query'가 추가됩니다.
+        재검색이 필요 없으면 rewritten_query는 빈 문자열입니다.
+        호출/파싱 실패 시 예외를 그대로 올리므로, 호출자는 evaluate() + rewrite() 경로로 폴백해야 합니다.
+        """
+        prompt = self._prepare_combined_prompt(
+            user_query, answer, retrieved_docs, profile_summary,
+            previous_feedback, slot_out, iteration_count
+        )
+
+        result = self.llm_client.generate(
+            prompt=prompt,
+            system_prompt=self._get_combined_system_prompt(),
+            temperature=0.3,
+            max_tokens=900,
+            response_format=EVAL_REWRITE_SCHEMA
+        )
+        return self._finalize_combined_feedback(result)
+
+    async def aevaluate_and_rewrite(
+        self,
+        user_query: str,
+        answer: str,
+        retrieved_docs: List[Dict[str, Any]],
+        profile_summary: str = "",
+        previous_feedback: Optional[Dict[str, Any]] = None,
+        slot_out: Optional[Dict[str, Any]] = None,
+        iteration_count: int = 0
+    ) -> Dict[str, Any]:
+        """evaluate_and_rewrite의 비동기 버전"""
+        prompt = self._prepare_combined_prompt(
+            user_query, answer, retrieved_docs, profile_summary,
+            previous_feedback, slot_out, iteration_count
+        )
+
+        result = await self.llm_client.agenerate(
+            prompt=prompt,
+            system_prompt=self._get_combined_system_prompt(),
+            temperature=0.3,
+            max_tokens=900,
+            response_format=EVAL_REWRITE_SCHEMA
+        )
+        return self._finalize_combined_feedback(result)
+
+    def _prepare_prompt(
+        self,
+        user_query: str,
+        answer: str,
+        retrieved_docs: List[Dict[str, Any]],
+        profile_summary: str,
+        previous_feedback: Optional[Dict[str, Any]]
+    ) -> str:
+        """문서 포맷팅 후 평가 프롬프트 생성"""
+        docs_text = self._format_docs(retrieved_docs)
+
+        return self._build_evaluation_prompt(
+            user_query=user_query,
+            answer=answer,
+            docs_text=docs_text,
+            profile_summary=profile_summary,
+            previous_feedback=previous_feedback
+        )
+
+    def _finalize_feedback(self, evaluation_result: str) -> Dict[str, Any]:
+        """LLM 응답 파싱 후 전체 점수(가중 평균) 계산"""
+        feedback = self._parse_evaluation_result(evaluation_result)
+
+        overall_score = (
+            feedback['grounding_score'] * 0.4 +
+            feedback['completeness_score'] * 0.4 +
+            feedback['accuracy_score'] * 0.2
+        )
+        feedback['overall_score'] = overall_score
+
+        return feedback
+
+    def _prepare_combined_prompt(
+        self,
+        user_query: str,
+        answer: str,
+        retrieved_docs: List[Dict[str, Any]],
+        profile_summary: str,
+        previous_feedback: Optional[Dict[str, Any]],
+        slot_out: Optional[Dict[str, Any]],
+        iteration_count: int
+    ) -> str:
+        """평가 + 재작성 통합 프롬프트 생성"""
+        prompt_parts = [
+            "다음 의료 AI 답변의 품질을 평가하고, 재검색이 필요하면 검색 질의를 재작성해주세요.\n",
+            f"**사용자 질문:**\n{user_query}\n",
+            f"\n**생성된 답변:**\n{answer}\n",
+            f"\n**검색된 근거 문서:**\n{self._format_docs(retrieved_docs)}\n"
+        ]
+
+        if profile_summary:
+            prompt_parts.append(f"\n**사용자 프로필:**\n{profile_summary}\n")
+
+        slot_context = format_slot_context(slot_out)
+        if slot_context:
+            prompt_parts.append(f"\n**추출된 컨텍스트:**\n{slot_context}\n")
+
+        if previous_feedback:
+            missing_info = previous_feedback.get('missing_info', [])
+            if missing_info:
+                prompt_parts.append(
+                    f"\n**이전 iteration에서 식별된 부족 정보:**\n"
+                    f"{', '.join(missing_info)}\n"
+                )
+
+        prompt_parts.append(f"\n**현재 반복 횟수:** {iteration_count + 1}\n")
+
+        prompt_parts.append("""
+다음 기준으로 평가하세요:
+
+1. **grounding_score**: 답변이 검색 문서에 근거하는가? (0.0-1.0)
+2. **completeness_score**: 사용자 질문에 완전히 답했는가? (0.0-1.0)
+3. **accuracy_score**: 의학적으로 정확하고 안전한가? (0.0-1.0)
+4. **missing_info**: 답변에 부족한 정보 목록
+5. **improvement_suggestions**: 답변 개선을 위한 구체적 제안
+6. **needs_retrieval**: 추가 검색이 필요한가? (true/false)
+7. **reason**: 전반적인 평가 이유
+8. **rewritten_query**: needs_retrieval이 true이면 부족한 정보와 사용자 맥락을 반영한
+   간결한 검색 질의, false이면 빈 문자열
+
+JSON만 반환하고 다른 설명은 생략하세요.
+""")
+
+        return "".join(prompt_parts)
+
+    def _finalize_combined_feedback(self, result: str) -> Dict[str, Any]:
+        """통합 호출 응답 파싱 (JSON이 아니면 예외 - 호출자가 폴백)"""
+        feedback = json.loads(self._extract_json_text(result))
+        if not isinstance(feedback, dict):
+            raise ValueError("통합 평가 응답이 JSON 객체가 아님")
+
+        rewritten_query = str(feedback.pop('rewritten_query', '') or '').strip()
+        feedback = self._finalize_feedback(json.dumps(feedback, ensure_ascii=False))
+        feedback['rewritten_query'] = rewritten_query
+        return feedback
+
     def _format_docs(self, retrieved_docs: List[Dict[str, Any]]) -> str:
         """검색 문서를 텍스트로 포맷팅"""
         if not retrieved_docs:
@@ -168,17 +364,29 @@ JSON만 반환하고 다른 설명은 생략하세요.
 답변의 근거성, 완전성, 정확성을 엄격하게 평가하고, 부족한 정보를 식별하며, 개선 방안을 제시합니다.
 항상 JSON 형식으로만 응답하세요."""
 
-    def _parse_evaluation_result(self, result: str) -> Dict[str, Any]:
-        """LLM 평가 결과 파싱"""
-        # JSON 블록 추출
+    def _get_combined_system_prompt(self) -> str:
+        """통합 호출 시스템 프롬프트"""
+        return """당신은 의료 AI 답변의 품질을 평가하고 재검색 질의를 작성하는 전문가입니다.
+답변의 근거성, 완전성, 정확성을 엄격하게 평가하고, 부족한 정보를 채울 수 있는 검색 질의를 제시합니다.
+항상 JSON 형식으로만 응답하세요."""
+
+    @staticmethod
+    def _extract_json_text(result: str) -> str:
+        """LLM 응답에서 JSON 본문 추출 (코드 블록 제거)"""
         result = result.strip()
 
-        # 코드 블록 제거
         if "```json" in result:
             result = result.split("```json")[1].split("```")[0]
         elif "```" in result:
             result = result.split("```")[1].split("```")[0]
 
+        return result
+
+    def _parse_evaluation_result(self, result: str) -> Dict[str, Any]:
+        """LLM 평가 결과 파싱"""
+        # JSON 블록 추출 (코드 블록 제거)
+        result = self._extract_json_text(result)
+
         # JSON 파싱
         try:
             feedback = json.loads(result)
@@ -193,7 +401,8 @@ JSON만 반환하고 다른 설명은 생략하세요.
                 'missing_info': [],
                 'improvement_suggestions': [],
                 'needs_retrieval': False,
-                'reason': 'JSON 파싱 실패로 기본값 사용'
+                'reason': 'JSON 파싱 실패로 기본값 사용',
+                'judge_failed': True
             }
 
         # 필수 필드 확인 및 기본값 설정
@@ -237,5 +446,6 @@ JSON만 반환하고 다른 설명은 생략하세요.
             'missing_info': [],
             'improvement_suggestions': [],
             'needs_retrieval': overall_score < 0.5,
-            'reason': '폴백 휴리스틱 평가 (LLM 평가 실패)'
+            'reason': '폴백 휴리스틱 평가 (LLM 평가 실패)',
+            'judge_failed': True
         }
@@ -10,6 +10,32 @@ from typing import Dict, Any, List, Optional
 from core.llm_client import LLMClient
 
 
+def format_slot_context(slot_out: Optional[Dict[str, Any]]) -> str:
+    """슬롯 정보를 한 줄 컨텍스트로 포맷팅 (나이 | 성별 | 질환 | 복용 약물)"""
+    if not slot_out:
+        return ""
+
+    demographics = slot_out.get('demographics', {})
+    conditions = slot_out.get('conditions', [])
+    medications = slot_out.get('medications', [])
+
+    context_info = []
+    if demographics.get('age'):
+        context_info.append(f"나이: {demographics['age']}")
+    if demographics.get('gender'):
+        context_info.append(f"성별: {demographics['gender']}")
+    if conditions:
+        condition_names = [c.get('name', '') for c in conditions if c.get('name')]
+        if condition_names:
+            context_info.append(f"질환: {', '.join(condition_names)}")
+    if medications:
+        med_names = [m.get('name', '') for m in medications if m.get('name')]
+        if med_names:
+            context_info.append(f"복용 약물: {', '.join(med_names)}")
+
+    return ' | '.join(context_info)
+
+
 class QueryRewriter:
     """Context-aware 질의 재작성기"""
 
@@ -74,6 +100,52 @@ class QueryRewriter:
                 original_query, missing_info, profile_summary, slot_out
             )
 
+    async def arewrite(
+        self,
+        original_query: str,
+        quality_feedback: Dict[str, Any],
+        previous_answer: str = "",
+        profile_summary: str = "",
+        slot_out: Optional[Dict[str, Any]] = None,
+        iteration_count: int = 0
+    ) -> str:
+        """
+        품질 피드백 기반 질의 재작성 (비동기)
+
+        rewrite와 동일한 규칙을 따르며 LLM 호출만 await합니다.
+        """
+        missing_info = quality_feedback.get('missing_info', [])
+        improvement_suggestions = quality_feedback.get('improvement_suggestions', [])
+
+        if not missing_info and not improvement_suggestions:
+            return self._enhance_with_profile(original_query, profile_summary, slot_out)
+
+        try:
+            rewrite_prompt = self._build_rewrite_prompt(
+                original_query=original_query,
+                missing_info=missing_info,
+                improvement_suggestions=improvement_suggestions,
+                previous_answer=previous_answer,
+                profile_summary=profile_summary,
+                slot_out=slot_out,
+                iteration_count=iteration_count
+            )
+            rewritten_query = await self.llm_client.agenerate(
+                prompt=rewrite_prompt,
+                system_prompt=self._get_system_prompt(),
+                temperature=0.5,
+                max_tokens=300
+            )
+            return self._clean_rewritten_query(rewritten_query)
+        except Exception as e:
+            print(f"[ERROR] LLM 기반 질의 재작성 실패: {e}")
+            import traceback
+            traceback.print_exc()
+
+            return self._fallback_rewrite(
+                original_query, missing_info, profile_summary, slot_out
+            )
+
     def _llm_based_rewrite(
         self,
         original_query: str,
@@ -104,7 +176,10 @@ class QueryRewriter:
             max_tokens=300
         )
 
-        # 정제 (불필요한 설명 제거)
+        return self._clean_rewritten_query(rewritten_query)
+
+    def _clean_rewritten_query(self, rewritten_query: str) -> str:
+        """정제 (불필요한 설명 제거)"""
         rewritten_query = rewritten_query.strip()
 
         # "재작성된 질의:" 같은 프리픽스 제거
@@ -150,28 +225,9 @@ class QueryRewriter:
         if profile_summary:
             prompt_parts.append(f"\n**사용자 프로필:**\n{profile_summary}\n")
 
-        if slot_out:
-            # 슬롯 정보 추가 (간단히)
-            demographics = slot_out.get('demographics', {})
-            conditions = slot_out.get('conditions', [])
-            medications = slot_out.get('medications', [])
-
-            context_info = []
-            if demographics.get('age'):
-                context_info.append(f"나이: {demographics['age']}")
-            if demographics.get('gender'):
-                context_info.append(f"성별: {demographics['gender']}")
-            if conditions:
-                condition_names = [c.get('name', '') for c in conditions if c.get('name')]
-                if condition_names:
-                    context_info.append(f"질환: {', '.join(condition_names)}")
-            if medications:
-                med_names = [m.get('name', '') for m in medications if m.get('name')]
-                if med_names:
-                    context_info.append(f"복용 약물: {', '.join(med_names)}")
-
-            if context_info:
-                prompt_parts.append(f"\n**추출된 컨텍스트:**\n{' | '.join(context_info)}\n")
+        slot_context = format_slot_context(slot_out)
+        if slot_context:
+            prompt_parts.append(f"\n**추출된 컨텍스트:**\n{slot_context}\n")
 
         prompt_parts.append(f"\n**현재 반복 횟수:** {iteration_count + 1}\n")
 
@@ -4,6 +4,7 @@ Base Strategy for Refine Process
 추상 인터페이스: 모든 Refine 전략이 구현해야 할 메서드 정의
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 from agent.state import AgentState
@@ -40,6 +41,15 @@ class BaseRefineStrategy(ABC):
         """
         pass
 
+    async def arefine(self, state: AgentState) -> Dict[str, Any]:
+        """
+        refine의 비동기 버전
+
+        기본 구현은 동기 refine을 스레드 풀에서 실행합니다.
+        LLM 호출이 있는 전략은 네이티브 비동기 구현으로 재정의합니다.
+        """
+        return await asyncio.to_thread(self.refine, state)
+
     @abstractmethod
     def should_retrieve(self, state: AgentState) -> bool:
         """
@@ -90,6 +90,10 @@ class BasicRAGStrategy(BaseRefineStrategy):
             'refine_strategy': self.get_strategy_name(),
         }
 
+    async def arefine(self, state: AgentState) -> Dict[str, Any]:
+        """Basic RAG: I/O가 없으므로 동기 refine을 그대로 사용"""
+        return self.refine(state)
+
     def should_retrieve(self, state: AgentState) -> bool:
         """
         Basic RAG: 항상 재검색 불필요 (종료)
@@ -3,11 +3,10 @@ Corrective RAG Strategy (CRAG)
 
 현재 구현의 CRAG 로직을 Strategy 패턴으로 캡슐화
 - LLM 기반 품질 평가
-- 동적 질의 재작성
+- 동적 질의 재작성 (combined_eval_rewrite: 평가 호출에서 재작성 질의까지 함께 생성)
 - 조건부 재검색
 """
 
-import hashlib
 from typing import Dict, Any
 from agent.state import AgentState
 from agent.refine_strategies.base_strategy import BaseRefineStrategy
@@ -15,6 +14,8 @@ from agent.quality_evaluator import QualityEvaluator
 from agent.query_rewriter import QueryRewriter
 from core.llm_client import get_llm_client
 from core.config import get_llm_config
+from agent.session_registry import get_or_create_resource
+from agent.doc_set import doc_id, summarize_provenance
 
 
 class CorrectiveRAGStrategy(BaseRefineStrategy):
@@ -37,63 +38,183 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
         """
         print(f"[{self.get_strategy_name().upper()}] Refine 수행 중...")
 
-        answer = state.get('answer', '')
-        retrieved_docs = state.get('retrieved_docs', [])
-        profile_summary = state.get('profile_summary', '')
-        iteration_count = state.get('iteration_count', 0)
+        # 품질 평가 (quality_check_mode: heuristic / llm / cascade)
+        quality_feedback = self._evaluate(state)
 
-        # LLM 기반 또는 휴리스틱 품질 평가
-        llm_based_quality_check = self.feature_flags.get('llm_based_quality_check', True)
+        quality_score, needs_retrieval = self._decide(state, quality_feedback)
 
-        if llm_based_quality_check:
-            quality_feedback = self._llm_based_evaluation(
+        # 동적 질의 재작성
+        new_query = state.get('user_text', '')
+        if needs_retrieval and self.feature_flags.get('dynamic_query_rewrite', True):
+            new_query = self._rewrite_query(
                 state=state,
-                answer=answer,
-                retrieved_docs=retrieved_docs,
-                profile_summary=profile_summary
+                quality_feedback=quality_feedback,
+                answer=state.get('answer', '')
+            )
+            print(f"[{self.get_strategy_name().upper()}] 질의 재작성: {new_query[:100]}...")
+
+        return self._build_result(state, quality_feedback, quality_score, needs_retrieval, new_query)
+
+    async def arefine(self, state: AgentState) -> Dict[str, Any]:
+        """
+        CRAG 품질 평가 및 재검색 판단 (비동기)
+
+        refine과 동일한 판단 로직을 사용하며 평가/재작성 LLM 호출만 await합니다.
+        """
+        print(f"[{self.get_strategy_name().upper()}] Refine 수행 중 (async)...")
+
+        quality_feedback = await self._aevaluate(state)
+
+        quality_score, needs_retrieval = self._decide(state, quality_feedback)
+
+        new_query = state.get('user_text', '')
+        if needs_retrieval and self.feature_flags.get('dynamic_query_rewrite', True):
+            new_query = await self._arewrite_query(
+                state=state,
+                quality_feedback=quality_feedback,
+                answer=state.get('answer', '')
             )
-            quality_score = quality_feedback.get('overall_score', 0.5)
+            print(f"[{self.get_strategy_name().upper()}] 질의 재작성: {new_query[:100]}...")
+
+        return self._build_result(state, quality_feedback, quality_score, needs_retrieval, new_query)
+
+    def _quality_check_mode(self) -> str:
+        """품질 평가 모드 (미지정 시 llm_based_quality_check로 결정)"""
+        mode = self.feature_flags.get('quality_check_mode')
+        if mode not in ('heuristic', 'llm', 'cascade'):
+            mode = 'llm' if self.feature_flags.get('llm_based_quality_check', True) else 'heuristic'
+        return mode
+
+    def _evaluation_inputs(self, state: AgentState) -> Dict[str, Any]:
+        return {
+            'answer': state.get('answer', ''),
+            'retrieved_docs': state.get('retrieved_docs', []),
+            'profile_summary': state.get('profile_summary', ''),
+        }
+
+    def _in_uncertainty_band(self, heuristic_score: float) -> bool:
+        """휴리스틱 점수가 불확실 구간이면 LLM 평가 필요"""
+        low = self.feature_flags.get('cascade_band_low', 0.35)
+        high = self.feature_flags.get('cascade_band_high', 0.75)
+        return low <= heuristic_score <= high
+
+    def _evaluate(self, state: AgentState) -> Dict[str, Any]:
+        """품질 평가 (cascade: 휴리스틱 점수가 불확실 구간일 때만 LLM 평가)"""
+        mode = self._quality_check_mode()
+        inputs = self._evaluation_inputs(state)
+
+        if mode == 'heuristic':
+            return {**self._heuristic_evaluation(**inputs), 'evaluator': 'heuristic'}
+        if mode == 'llm':
+            return {**self._llm_based_evaluation(state=state, **inputs), 'evaluator': 'llm'}
+
+        heuristic = self._heuristic_evaluation(**inputs)
+        in_band = self._in_uncertainty_band(heuristic['overall_score'])
+        judged = self._llm_based_evaluation(state=state, **inputs) if in_band else None
+        shadow = None
+        if not in_band and self.feature_flags.get('cascade_shadow_judge', False):
+            shadow = self._llm_based_evaluation(state=state, **inputs)
+        return self._cascade_feedback(heuristic, judged, shadow)
+
+    async def _aevaluate(self, state: AgentState) -> Dict[str, Any]:
+        """_evaluate의 비동기 버전"""
+        mode = self._quality_check_mode()
+        inputs = self._evaluation_inputs(state)
+
+        if mode == 'heuristic':
+            return {**self._heuristic_evaluation(**inputs), 'evaluator': 'heuristic'}
+        if mode == 'llm':
+            return {**await self._allm_based_evaluation(state=state, **inputs), 'evaluator': 'llm'}
+
+        heuristic = self._heuristic_evaluation(**inputs)
+        in_band = self._in_uncertainty_band(heuristic['overall_score'])
+        judged = await self._allm_based_evaluation(state=state, **inputs) if in_band else None
+        shadow = None
+        if not in_band and self.feature_flags.get('cascade_shadow_judge', False):
+            shadow = await self._allm_based_evaluation(state=state, **inputs)
+        return self._cascade_feedback(heuristic, judged, shadow)
+
+    def _cascade_feedback(self, heuristic: Dict[str, Any], judged, shadow) -> Dict[str, Any]:
+        """
+        cascade 결과 구성
+
+        judged: 불확실 구간이라 호출한 LLM 평가 (없으면 휴리스틱 결과 사용)
+        shadow: 구간 밖이라 생략했지만 일치도 측정을 위해 호출한 LLM 평가 (cascade_shadow_judge)
+
+        LLM 호출이 실패해 폴백 휴리스틱으로 대체된 평가(judge_failed)는 일치도 비교에서 제외합니다.
+        """
+        heuristic_decision = self._retrieval_decision(heuristic, 'heuristic')
+        judge = judged or shadow
+        judge_failed = bool(judge is not None and judge.get('judge_failed'))
+        judge_decision = None
+        if judge is not None and not judge_failed:
+            judge_decision = self._retrieval_decision(judge, 'llm')
+
+        if judged is not None:
+            feedback = {**judged, 'evaluator': 'llm'}
+        else:
+            feedback = {**heuristic, 'evaluator': 'heuristic'}
+
+        feedback['cascade'] = {
+            'heuristic_score': heuristic['overall_score'],
+            'judge_called': judged is not None,
+            'shadow_judge': shadow is not None,
+            'judge_failed': judge_failed,
+            'heuristic_needs_retrieval': heuristic_decision,
+            'judge_needs_retrieval': judge_decision,
+            'agrees_with_judge': None if judge_decision is None else heuristic_decision == judge_decision,
+        }
+        status = 'LLM 평가' if judged is not None else 'LLM 평가 생략'
+        print(f"[{self.get_strategy_name().upper()}] Cascade: 휴리스틱 {heuristic['overall_score']:.2f} → {status}")
+        return feedback
+
+    def _retrieval_decision(self, quality_feedback: Dict[str, Any], evaluator: str) -> bool:
+        """품질 기준만으로 본 재검색 필요 여부 (반복 횟수 제한 제외)"""
+        quality_score = quality_feedback.get('overall_score', 0.5)
+        threshold = self.feature_flags.get('quality_threshold', 0.5)
+
+        if evaluator == 'llm':
             needs_retrieval_by_quality = quality_feedback.get('needs_retrieval', False)
         else:
-            quality_feedback = self._heuristic_evaluation(
-                answer=answer,
-                retrieved_docs=retrieved_docs,
-                profile_summary=profile_summary
-            )
-            quality_score = quality_feedback.get('overall_score', 0.5)
-            threshold = self.feature_flags.get('quality_threshold', 0.5)
             needs_retrieval_by_quality = quality_score < threshold
+        return bool(needs_retrieval_by_quality and quality_score < threshold)
+
+    def _decide(self, state: AgentState, quality_feedback: Dict[str, Any]):
+        """
+        품질 피드백으로부터 (quality_score, needs_retrieval) 결정
+        """
+        iteration_count = state.get('iteration_count', 0)
+        quality_score = quality_feedback.get('overall_score', 0.5)
 
         print(f"[{self.get_strategy_name().upper()}] 품질 점수: {quality_score:.2f} (Iteration: {iteration_count + 1})")
 
         # 재검색 필요 여부 결정
         max_iter = self.feature_flags.get('max_refine_iterations', 2)
-        threshold = self.feature_flags.get('quality_threshold', 0.5)
 
         needs_retrieval = (
-            needs_retrieval_by_quality and
-            quality_score < threshold and
+            self._retrieval_decision(quality_feedback, quality_feedback.get('evaluator', 'llm')) and
             iteration_count < max_iter
         )
+        return quality_score, needs_retrieval
+
+    def _build_result(
+        self,
+        state: AgentState,
+        quality_feedback: Dict[str, Any],
+        quality_score: float,
+        needs_retrieval: bool,
+        new_query: str
+    ) -> Dict[str, Any]:
+        """이력/로그를 갱신하고 상태 업데이트 딕셔너리 구성"""
+        iteration_count = state.get('iteration_count', 0)
+        retrieved_docs = state.get('retrieved_docs', [])
 
         # 이력 추적
         quality_score_history = state.get('quality_score_history') or []
         quality_score_history.append(quality_score)
 
-        # 동적 질의 재작성
-        new_query = state.get('user_text', '')
         query_rewrite_history = state.get('query_rewrite_history') or []
-
-        if needs_retrieval and self.feature_flags.get('dynamic_query_rewrite', True):
-            new_query = self._rewrite_query(
-                state=state,
-                quality_feedback=quality_feedback,
-                answer=answer
-            )
-            query_rewrite_history.append(new_query)
-            print(f"[{self.get_strategy_name().upper()}] 질의 재작성: {new_query[:100]}...")
-        else:
-            query_rewrite_history.append(new_query)
+        query_rewrite_history.append(new_query)
 
         # Iteration 로그
         refine_iteration_logs = state.get('refine_iteration_logs') or []
@@ -104,7 +225,9 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
             'quality_feedback': quality_feedback,
             'needs_retrieval': needs_retrieval,
             'rewritten_query': new_query,
-            'num_docs': len(retrieved_docs)
+            'num_docs': len(retrieved_docs),
+            'doc_provenance': summarize_provenance(retrieved_docs),  # iteration별 문서 수
+            'new_doc_ids': self._latest_retrieval_ids(state),
         })
 
         return {
@@ -144,27 +267,61 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
 
         return True
 
-    def _llm_based_evaluation(self, state, answer, retrieved_docs, profile_summary) -> dict:
-        """LLM 기반 품질 평가"""
-        # LLM 클라이언트 초기화
-        if 'llm_client' not in state:
+    def _get_llm_client(self, state):
+        """세션에 캐싱된 LLM 클라이언트 반환 (없으면 생성)"""
+        def _create():
             llm_config = get_llm_config()
-            llm_client = get_llm_client(
+            return get_llm_client(
                 provider=llm_config.get('provider', 'openai'),
                 model=llm_config.get('model', 'gpt-4o-mini'),
                 temperature=llm_config.get('temperature', 0.7),
                 max_tokens=llm_config.get('max_tokens', 1000)
             )
-            state['llm_client'] = llm_client
-        else:
-            llm_client = state['llm_client']
 
-        # Quality Evaluator 초기화
-        if 'quality_evaluator' not in state:
-            evaluator = QualityEvaluator(llm_client=llm_client)
-            state['quality_evaluator'] = evaluator
-        else:
-            evaluator = state['quality_evaluator']
+        return get_or_create_resource(state, 'llm_client', _create)
+
+    def _get_evaluator(self, state) -> QualityEvaluator:
+        """Quality Evaluator 초기화 (캐싱)"""
+        return get_or_create_resource(
+            state, 'quality_evaluator',
+            lambda: QualityEvaluator(llm_client=self._get_llm_client(state))
+        )
+
+    def _get_rewriter(self, state) -> QueryRewriter:
+        """Query Rewriter 초기화 (캐싱)"""
+        return get_or_create_resource(
+            state, 'query_rewriter',
+            lambda: QueryRewriter(llm_client=self._get_llm_client(state))
+        )
+
+    def _combined_eval_rewrite_enabled(self) -> bool:
+        """평가 + 질의 재작성 통합 호출 사용 여부 (동적 질의 재작성이 켜져 있을 때만 의미 있음)"""
+        return bool(
+            self.feature_flags.get('combined_eval_rewrite', False) and
+            self.feature_flags.get('dynamic_query_rewrite', True)
+        )
+
+    def _combined_kwargs(self, state, answer, retrieved_docs, profile_summary) -> dict:
+        """QualityEvaluator.evaluate_and_rewrite 호출 인자 구성"""
+        return {
+            'user_query': state.get('user_text', ''),
+            'answer': answer,
+            'retrieved_docs': retrieved_docs,
+            'profile_summary': profile_summary,
+            'previous_feedback': state.get('quality_feedback'),
+            'slot_out': state.get('slot_out', {}),
+            'iteration_count': state.get('iteration_count', 0),
+        }
+
+    def _llm_based_evaluation(self, state, answer, retrieved_docs, profile_summary) -> dict:
+        """LLM 기반 품질 평가"""
+        evaluator = self._get_evaluator(state)
+
+        if self._combined_eval_rewrite_enabled():
+            try:
+                return evaluator.evaluate_and_rewrite(**self._combined_kwargs(state, answer, retrieved_docs, profile_summary))
+            except Exception as e:
+                print(f"[WARNING] 평가+재작성 통합 호출 실패, 개별 평가로 폴백: {e}")
 
         # 평가 실행
         try:
@@ -177,7 +334,31 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
             )
         except Exception as e:
             print(f"[ERROR] LLM 평가 실패, 휴리스틱으로 폴백: {e}")
-            quality_feedback = self._heuristic_evaluation(answer, retrieved_docs, profile_summary)
+            quality_feedback = {**self._heuristic_evaluation(answer, retrieved_docs, profile_summary), 'judge_failed': True}
+
+        return quality_feedback
+
+    async def _allm_based_evaluation(self, state, answer, retrieved_docs, profile_summary) -> dict:
+        """LLM 기반 품질 평가 (비동기)"""
+        evaluator = self._get_evaluator(state)
+
+        if self._combined_eval_rewrite_enabled():
+            try:
+                return await evaluator.aevaluate_and_rewrite(**self._combined_kwargs(state, answer, retrieved_docs, profile_summary))
+            except Exception as e:
+                print(f"[WARNING] 평가+재작성 통합 호출 실패, 개별 평가로 폴백: {e}")
+
+        try:
+            quality_feedback = await evaluator.aevaluate(
+                user_query=state.get('user_text', ''),
+                answer=answer,
+                retrieved_docs=retrieved_docs,
+                profile_summary=profile_summary,
+                previous_feedback=state.get('quality_feedback')
+            )
+        except Exception as e:
+            print(f"[ERROR] LLM 평가 실패, 휴리스틱으로 폴백: {e}")
+            quality_feedback = {**self._heuristic_evaluation(answer, retrieved_docs, profile_summary), 'judge_failed': True}
 
         return quality_feedback
 
@@ -204,49 +385,64 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
             'reason': '휴리스틱 평가'
         }
 
+    def _rewrite_kwargs(self, state, quality_feedback, answer) -> dict:
+        """QueryRewriter 호출 인자 구성"""
+        return {
+            'original_query': state.get('user_text', ''),
+            'quality_feedback': quality_feedback,
+            'previous_answer': answer,
+            'profile_summary': state.get('profile_summary', ''),
+            'slot_out': state.get('slot_out', {}),
+            'iteration_count': state.get('iteration_count', 0),
+        }
+
     def _rewrite_query(self, state, quality_feedback, answer) -> str:
-        """동적 질의 재작성"""
-        llm_client = state.get('llm_client')
-        if not llm_client:
-            llm_config = get_llm_config()
-            llm_client = get_llm_client(
-                provider=llm_config.get('provider', 'openai'),
-                model=llm_config.get('model', 'gpt-4o-mini'),
-                temperature=llm_config.get('temperature', 0.7),
-                max_tokens=llm_config.get('max_tokens', 1000)
-            )
-            state['llm_client'] = llm_client
+        """동적 질의 재작성 (통합 평가 호출이 재작성 질의를 이미 만들었으면 그대로 사용)"""
+        if quality_feedback.get('rewritten_query'):
+            return quality_feedback['rewritten_query']
 
-        if 'query_rewriter' not in state:
-            rewriter = QueryRewriter(llm_client=llm_client)
-            state['query_rewriter'] = rewriter
-        else:
-            rewriter = state['query_rewriter']
+        rewriter = self._get_rewriter(state)
 
         try:
-            rewritten_query = rewriter.rewrite(
-                original_query=state.get('user_text', ''),
-                quality_feedback=quality_feedback,
-                previous_answer=answer,
-                profile_summary=state.get('profile_summary', ''),
-                slot_out=state.get('slot_out', {}),
-                iteration_count=state.get('iteration_count', 0)
-            )
+            rewritten_query = rewriter.rewrite(**self._rewrite_kwargs(state, quality_feedback, answer))
+        except Exception as e:
+            print(f"[ERROR] 질의 재작성 실패: {e}")
+            rewritten_query = state.get('user_text', '')
+
+        return rewritten_query
+
+    async def _arewrite_query(self, state, quality_feedback, answer) -> str:
+        """동적 질의 재작성 (비동기)"""
+        if quality_feedback.get('rewritten_query'):
+            return quality_feedback['rewritten_query']
+
+        rewriter = self._get_rewriter(state)
+
+        try:
+            rewritten_query = await rewriter.arewrite(**self._rewrite_kwargs(state, quality_feedback, answer))
         except Exception as e:
             print(f"[ERROR] 질의 재작성 실패: {e}")
             rewritten_query = state.get('user_text', '')
 
         return rewritten_query
 
+    def _latest_retrieval_ids(self, state) -> list:
+        """가장 최근 검색에서 처음 등장한 문서 ID"""
+        retrieved_docs_history = state.get('retrieved_docs_history') or []
+        if not retrieved_docs_history:
+            return []
+        seen = {key for ids in retrieved_docs_history[:-1] for key in ids}
+        return [key for key in retrieved_docs_history[-1] if key not in seen]
+
     def _check_duplicate_docs(self, state) -> bool:
-        """동일 문서 재검색 방지"""
-        retrieved_docs = state.get('retrieved_docs', [])
+        """동일 문서 재검색 방지 (최근 두 번의 검색 결과 비교)"""
         retrieved_docs_history = state.get('retrieved_docs_history') or []
 
-        if not retrieved_docs or len(retrieved_docs_history) < 2:
+        if len(retrieved_docs_history) < 2:
             return False
 
-        current_hashes = self._compute_doc_hashes(retrieved_docs)
+        # retrieved_docs는 이전 iteration 문서가 병합된 집합이므로 검색별 이력으로 비교
+        current_hashes = retrieved_docs_history[-1]
         previous_hashes = retrieved_docs_history[-2]
 
         current_set = set(current_hashes)
@@ -269,11 +465,8 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
         return improvement < 0.05  # 최소 0.05 개선 필요
 
     def _compute_doc_hashes(self, retrieved_docs) -> list:
-        """문서 해시 계산"""
-        return [
-            hashlib.md5(doc.get('text', '').encode('utf-8')).hexdigest()
-            for doc in retrieved_docs if doc.get('text')
-        ]
+        """문서 ID 계산 (retrieved_docs_history와 동일한 기준)"""
+        return [doc_id(doc) for doc in retrieved_docs if doc.get('text')]
 
     def get_metrics(self, state: AgentState) -> Dict[str, Any]:
         """CRAG 특화 메트릭"""
@@ -284,7 +477,15 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
                 log for log in state.get('refine_iteration_logs', [])
                 if log.get('quality_feedback', {}).get('reason') != '휴리스틱 평가'
             ]),
+            'judge_calls_avoided': len([
+                log for log in state.get('refine_iteration_logs', [])
+                if self._judge_avoided(log.get('quality_feedback', {}).get('cascade'))
+            ]),
             'query_rewrites': len(state.get('query_rewrite_history', [])),
+            'combined_eval_rewrites': len([
+                log for log in state.get('refine_iteration_logs', [])
+                if log.get('quality_feedback', {}).get('rewritten_query')
+            ]),
             'quality_improvements': self._calculate_quality_improvements(state),
             'duplicate_detections': 0,  # TODO: 추적 필요 시 추가
             'early_terminations': 0,  # TODO: 추적 필요 시 추가
@@ -292,6 +493,11 @@ class CorrectiveRAGStrategy(BaseRefineStrategy):
 
         return {**base_metrics, **crag_metrics}
 
+    @staticmethod
+    def _judge_avoided(cascade) -> bool:
+        """cascade로 LLM 평가 호출이 실제로 생략되었는지 (shadow 평가도 호출로 봄)"""
+        return bool(cascade) and not cascade.get('judge_called') and not cascade.get('shadow_judge')
+
     def _calculate_quality_improvements(self, state) -> float:
         """품질 개선폭 계산"""
         history = state.get('quality_score_history', [])
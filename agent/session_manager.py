@@ -0,0 +1,372 @@
+"""
+세션 매니저 (다중 세션 / LRU 퇴출 / 디스크 영속화)
+
+호출자가 session_state를 직접 들고 다니지 않아도 session_id만으로 대화를 이어갈 수 있도록,
+세션별 ProfileStore, HierarchicalMemorySystem, 대화 링 버퍼, 캐시된 리소스를 관리합니다.
+
+- 리소스는 세션 리소스 레지스트리(handle = session_id)에 보관 (run_agent persist_session=True)
+- 메모리에 올라와 있는 세션 수가 max_sessions를 넘으면 가장 오래 사용하지 않은 세션을
+  디스크(spill_dir)로 내보내고 레지스트리에서 해제
+- 퇴출된 세션은 다음 턴에서 디스크로부터 지연 로딩
+
+디스크 구조: <spill_dir>/<session key>/
+    session.json              세션 메타데이터 + 대화 링 버퍼
+    profile_store.pkl         ProfileStore (pickle)
+    hierarchical_memory.json  HierarchicalMemorySystem.save_to_file 형식
+
+사용 예:
+    manager = get_session_manager()
+    answer = manager.run_turn("patient-001", "당뇨 약을 바꿔도 되나요?")
+"""
+
+import os
+import re
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from agent.session_registry import get_session_registry
+
+
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_HISTORY_TURNS = 20
+DEFAULT_SPILL_DIR = os.path.join('runs', 'sessions')
+
+_SESSION_FILE = 'session.json'
+_PROFILE_FILE = 'profile_store.pkl'
+_HIERARCHICAL_FILE = 'hierarchical_memory.json'
+
+
+@dataclass
+class SessionRecord:
+    """메모리에 올라와 있는 세션 정보"""
+    session_id: str
+    user_id: str
+    history: Deque[Dict[str, str]]
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    turns: int = 0
+    active_turns: int = 0  # 진행 중인 턴 수 (진행 중에는 퇴출하지 않음)
+
+
+def format_history(messages: List[Dict[str, str]]) -> Optional[str]:
+    """대화 링 버퍼를 프롬프트용 텍스트로 포맷팅 (app.py와 같은 형식)"""
+    if not messages:
+        return None
+
+    history_lines = []
+    for msg in messages:
+        role = msg.get("role", "")
+        content = msg.get("content", "")
+        if role == "user":
+            history_lines.append(f"사용자: {content}")
+        elif role == "assistant":
+            history_lines.append(f"AI: {content}")
+    return "\n".join(history_lines)
+
+
+class SessionManager:
+    """
+    세션 매니저 (스레드 안전)
+
+    Args:
+        max_sessions: 메모리에 유지할 최대 세션 수 (초과 시 LRU 퇴출)
+        spill_dir: 퇴출된 세션을 저장할 디렉토리
+        history_turns: 세션별 대화 링 버퍼 크기 (턴 수, 사용자+AI 메시지 한 쌍 = 1턴)
+        runner: 턴 실행 함수 (기본값: agent.graph.run_agent)
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        spill_dir: str = DEFAULT_SPILL_DIR,
+        history_turns: int = DEFAULT_HISTORY_TURNS,
+        runner: Optional[Callable[..., Any]] = None,
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.spill_dir = spill_dir
+        self.history_turns = history_turns
+        self.runner = runner
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {'created': 0, 'evicted': 0, 'reloaded': 0}
+
+    # ===== 세션 조회 / 생성 =====
+
+    def open(self, session_id: str, user_id: Optional[str] = None) -> SessionRecord:
+        """
+        세션 가져오기 (메모리 → 디스크 → 새로 생성 순)
+
+        최근 사용으로 표시하고, 상한을 넘으면 다른 세션을 퇴출합니다.
+        """
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                record = self._reload(session_id)
+            if record is None:
+                record = SessionRecord(
+                    session_id=session_id,
+                    user_id=user_id or session_id,
+                    history=deque(maxlen=self.history_turns * 2),
+                )
+                self.stats['created'] += 1
+            elif user_id:
+                record.user_id = user_id
+
+            self._sessions[session_id] = record
+            self._sessions.move_to_end(session_id)
+            record.last_access = time.time()
+            self._enforce_limit()
+            return record
+
+    def __contains__(self, session_id: str) -> bool:
+        """메모리 또는 디스크에 세션이 있는지"""
+        with self._lock:
+            return session_id in self._sessions or os.path.exists(self._session_path(session_id))
+
+    def resident_sessions(self) -> List[str]:
+        """메모리에 올라와 있는 세션 ID (오래된 순)"""
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def history(self, session_id: str) -> List[Dict[str, str]]:
+        return list(self.open(session_id).history)
+
+    def get_resource(self, session_id: str, name: str, default: Any = None) -> Any:
+        """세션 리소스 조회 (예: 'profile_store')"""
+        self.open(session_id)
+        return get_session_registry().get(session_id, name, default)
+
+    def clear_history(self, session_id: str) -> None:
+        """대화 링 버퍼만 비우기 (프로필/메모리는 유지)"""
+        with self._lock:
+            self.open(session_id).history.clear()
+
+    # ===== 턴 실행 =====
+
+    def begin_turn(self, session_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        턴 시작: run_agent / run_agent_stream에 넘길 세션 인자 반환
+
+        반드시 end_turn과 짝을 이뤄 호출해야 합니다 (진행 중인 세션은 퇴출하지 않음).
+        """
+        with self._lock:
+            record = self.open(session_id, user_id)
+            record.active_turns += 1
+            return {
+                'conversation_history': format_history(list(record.history)),
+                'session_id': session_id,
+                'user_id': record.user_id,
+                'persist_session': True,
+            }
+
+    def end_turn(self, session_id: str, user_text: Optional[str] = None, answer: Optional[str] = None) -> None:
+        """턴 종료: 대화 링 버퍼에 기록 (user_text가 None이면 실패한 턴으로 보고 기록하지 않음)"""
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                return
+            record.active_turns = max(0, record.active_turns - 1)
+            if user_text is not None:
+                record.history.append({"role": "user", "content": user_text})
+                record.history.append({"role": "assistant", "content": answer or ""})
+                record.turns += 1
+            record.last_access = time.time()
+            self._enforce_limit()
+
+    def run_turn(
+        self,
+        session_id: str,
+        user_text: str,
+        user_id: Optional[str] = None,
+        return_state: bool = False,
+        **run_kwargs,
+    ):
+        """
+        세션 단위 턴 실행
+
+        Args:
+            session_id: 세션 ID
+            user_text: 사용자 입력
+            user_id: 사용자 ID (없으면 기존 값 또는 session_id)
+            return_state: True면 최종 상태 반환
+            **run_kwargs: run_agent에 그대로 전달 (mode, feature_overrides 등)
+
+        Returns:
+            생성된 답변 (return_state=True면 최종 상태)
+        """
+        runner = self.runner
+        if runner is None:
+            from agent.graph import run_agent
+            runner = run_agent
+
+        turn_kwargs = self.begin_turn(session_id, user_id)
+        completed = False
+        answer = None
+        try:
+            final_state = runner(user_text, return_state=True, **turn_kwargs, **run_kwargs)
+            answer = final_state.get('answer', '')
+            completed = True
+        finally:
+            self.end_turn(session_id, user_text if completed else None, answer)
+
+        if return_state:
+            return final_state
+        return answer
+
+    # ===== 퇴출 / 영속화 =====
+
+    def evict(self, session_id: str) -> bool:
+        """세션을 디스크로 내보내고 메모리에서 해제 (진행 중이면 False)"""
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None or record.active_turns > 0:
+                return False
+            self._spill(record)
+            del self._sessions[session_id]
+            get_session_registry().release(session_id)
+            self.stats['evicted'] += 1
+            print(f"[Session Manager] 세션 퇴출: {session_id} (resident={len(self._sessions)})")
+            return True
+
+    def flush(self) -> int:
+        """메모리에 있는 모든 세션을 디스크에 저장 (메모리에는 유지), 저장한 세션 수 반환"""
+        with self._lock:
+            for record in self._sessions.values():
+                self._spill(record)
+            return len(self._sessions)
+
+    def close(self, session_id: str, delete: bool = False) -> None:
+        """세션 종료 (delete=True면 디스크 사본도 삭제)"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            get_session_registry().release(session_id)
+            if delete:
+                directory = self._session_dir(session_id)
+                for filename in (_SESSION_FILE, _PROFILE_FILE, _HIERARCHICAL_FILE):
+                    path = os.path.join(directory, filename)
+                    if os.path.exists(path):
+                        os.remove(path)
+                if os.path.isdir(directory) and not os.listdir(directory):
+                    os.rmdir(directory)
+
+    def _enforce_limit(self) -> None:
+        """상한 초과 시 오래된 세션부터 퇴출 (진행 중인 세션은 건너뜀)"""
+        if len(self._sessions) <= self.max_sessions:
+            return
+        # 가장 최근에 사용한 세션(방금 연 세션)은 퇴출 대상에서 제외
+        for session_id in list(self._sessions.keys())[:-1]:
+            if len(self._sessions) <= self.max_sessions:
+                break
+            self.evict(session_id)
+
+    def _session_dir(self, session_id: str) -> str:
+        # 파일 시스템에 안전한 이름 + 해시 (서로 다른 ID가 같은 이름이 되지 않도록)
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', session_id)[:64]
+        digest = hashlib.sha1(session_id.encode('utf-8')).hexdigest()[:10]
+        return os.path.join(self.spill_dir, f"{safe}-{digest}")
+
+    def _session_path(self, session_id: str) -> str:
+        return os.path.join(self._session_dir(session_id), _SESSION_FILE)
+
+    def _spill(self, record: SessionRecord) -> None:
+        """세션을 디스크에 기록"""
+        directory = self._session_dir(record.session_id)
+        os.makedirs(directory, exist_ok=True)
+        resources = get_session_registry().export(record.session_id)
+
+        profile_path = os.path.join(directory, _PROFILE_FILE)
+        profile_store = resources.get('profile_store')
+        if profile_store is not None:
+            with open(profile_path, 'wb') as f:
+                pickle.dump(profile_store, f, protocol=pickle.HIGHEST_PROTOCOL)
+        elif os.path.exists(profile_path):
+            os.remove(profile_path)
+
+        hierarchical_path = os.path.join(directory, _HIERARCHICAL_FILE)
+        hierarchical_memory = resources.get('hierarchical_memory')
+        if hierarchical_memory is not None:
+            hierarchical_memory.save_to_file(hierarchical_path)
+        elif not resources.get('hierarchical_memory_path') and os.path.exists(hierarchical_path):
+            # 재로딩 후 아직 생성되지 않은 경우(hierarchical_memory_path)에는 기존 사본 유지
+            os.remove(hierarchical_path)
+
+        meta = {
+            'session_id': record.session_id,
+            'user_id': record.user_id,
+            'created_at': record.created_at,
+            'last_access': record.last_access,
+            'turns': record.turns,
+            'history': list(record.history),
+        }
+        tmp_path = self._session_path(record.session_id) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, self._session_path(record.session_id))
+
+    def _reload(self, session_id: str) -> Optional[SessionRecord]:
+        """디스크에서 세션 지연 로딩 (없으면 None)"""
+        session_path = self._session_path(session_id)
+        if not os.path.exists(session_path):
+            return None
+
+        try:
+            with open(session_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+
+            registry = get_session_registry()
+            directory = self._session_dir(session_id)
+            profile_path = os.path.join(directory, _PROFILE_FILE)
+            if os.path.exists(profile_path):
+                with open(profile_path, 'rb') as f:
+                    registry.set(session_id, 'profile_store', pickle.load(f))
+
+            # HierarchicalMemorySystem은 LLM/MedCAT 의존성이 필요하므로
+            # store_memory 노드에서 생성할 때 이 경로의 사본을 복원
+            hierarchical_path = os.path.join(directory, _HIERARCHICAL_FILE)
+            if os.path.exists(hierarchical_path):
+                registry.set(session_id, 'hierarchical_memory_path', hierarchical_path)
+        except Exception as e:
+            print(f"[WARNING] 세션 로딩 실패 ({session_id}): {e}")
+            return None
+
+        self.stats['reloaded'] += 1
+        print(f"[Session Manager] 세션 로딩: {session_id} ({meta.get('turns', 0)}턴)")
+        return SessionRecord(
+            session_id=session_id,
+            user_id=meta.get('user_id') or session_id,
+            history=deque(meta.get('history', []), maxlen=self.history_turns * 2),
+            created_at=meta.get('created_at', time.time()),
+            last_access=time.time(),
+            turns=meta.get('turns', 0),
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'resident': len(self._sessions),
+                'active': sum(1 for r in self._sessions.values() if r.active_turns > 0),
+                'max_sessions': self.max_sessions,
+            }
+
+
+# 전역 세션 매니저 (싱글톤)
+_session_manager = None
+
+
+def get_session_manager(**kwargs) -> SessionManager:
+    """
+    세션 매니저 가져오기 (싱글톤)
+
+    첫 호출 시 kwargs(max_sessions, spill_dir, history_turns, runner)로 생성합니다.
+    """
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = SessionManager(**kwargs)
+    return _session_manager
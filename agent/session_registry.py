@@ -0,0 +1,177 @@
+"""
+세션 리소스 레지스트리
+- LLM 클라이언트, ProfileStore, 검색기 캐시 등 무거운 세션 객체를 AgentState 밖에서 관리
+- AgentState에는 직렬화 가능한 데이터와 작은 핸들(resource_handle)만 유지
+- 노드 전이마다 {**state, ...}로 복사되는 딕셔너리 크기를 줄이고 체크포인트/직렬화를 가능하게 함
+"""
+
+import sys
+import pickle
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+# 상태 대신 레지스트리에 보관하는 세션 리소스 키
+RESOURCE_KEYS = (
+    'llm_client',
+    'profile_store',
+    'slot_extractor',
+    'retriever_cache',
+    'token_manager',
+    'intent_classifier',
+    'context_compressor',
+    'hierarchical_memory',
+    'medcat_adapter',
+    'speculative_retrieval',
+    'quality_evaluator',
+    'query_rewriter',
+    'stream_sink',
+    'candidate_pool',
+)
+
+# 하위 호환: run_agent(return_state=True) 결과에 다시 포함하는 리소스 키
+EXPORTED_RESOURCE_KEYS = ('profile_store', 'hierarchical_memory')
+
+
+class SessionResourceRegistry:
+    """
+    세션 리소스 레지스트리 (스레드 안전)
+
+    handle(session_id 또는 턴 단위 핸들) → {리소스 이름: 객체}
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, handle: str, name: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._sessions.get(handle, {}).get(name, default)
+
+    def set(self, handle: str, name: str, value: Any) -> None:
+        with self._lock:
+            self._sessions.setdefault(handle, {})[name] = value
+
+    def get_or_create(self, handle: str, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        리소스가 없으면 factory로 생성 후 등록
+
+        factory(MedCAT 로딩 등)는 잠금 밖에서 실행하여 다른 세션을 막지 않으며,
+        동시 생성 경합 시 먼저 등록된 객체를 사용합니다.
+        """
+        existing = self.get(handle, name)
+        if existing is not None:
+            return existing
+
+        created = factory()
+        with self._lock:
+            resources = self._sessions.setdefault(handle, {})
+            if resources.get(name) is None:
+                resources[name] = created
+            return resources[name]
+
+    def register(self, handle: str, resources: Dict[str, Any]) -> None:
+        """여러 리소스를 한 번에 등록 (None 값은 무시)"""
+        with self._lock:
+            session = self._sessions.setdefault(handle, {})
+            for name, value in resources.items():
+                if value is not None:
+                    session[name] = value
+
+    def export(self, handle: str, names: Optional[tuple] = None) -> Dict[str, Any]:
+        """세션 리소스 사본(얕은 복사) 반환"""
+        with self._lock:
+            resources = self._sessions.get(handle, {})
+            if names is None:
+                return dict(resources)
+            return {name: resources[name] for name in names if name in resources}
+
+    def release(self, handle: str) -> None:
+        """세션 리소스 해제"""
+        with self._lock:
+            self._sessions.pop(handle, None)
+
+    def handles(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def __contains__(self, handle: str) -> bool:
+        with self._lock:
+            return handle in self._sessions
+
+
+# 전역 레지스트리 (싱글톤)
+_session_registry = None
+
+
+def get_session_registry() -> SessionResourceRegistry:
+    """세션 리소스 레지스트리 가져오기 (싱글톤)"""
+    global _session_registry
+    if _session_registry is None:
+        _session_registry = SessionResourceRegistry()
+    return _session_registry
+
+
+def get_resource(state: dict, name: str, default: Any = None) -> Any:
+    """
+    세션 리소스 조회
+
+    상태에 resource_handle이 있으면 레지스트리에서, 없으면(레거시 모드) 상태에서 조회합니다.
+    """
+    handle = state.get('resource_handle')
+    if handle is None:
+        value = state.get(name)
+        return default if value is None else value
+    return get_session_registry().get(handle, name, default)
+
+
+def set_resource(state: dict, name: str, value: Any) -> Any:
+    """세션 리소스 등록 (레거시 모드에서는 상태에 저장)"""
+    handle = state.get('resource_handle')
+    if handle is None:
+        state[name] = value
+    else:
+        get_session_registry().set(handle, name, value)
+    return value
+
+
+def get_or_create_resource(state: dict, name: str, factory: Callable[[], Any]) -> Any:
+    """세션 리소스 조회, 없으면 factory로 생성 후 등록"""
+    handle = state.get('resource_handle')
+    if handle is None:
+        if state.get(name) is None:
+            state[name] = factory()
+        return state[name]
+    return get_session_registry().get_or_create(handle, name, factory)
+
+
+def _value_size(value: Any):
+    """값의 직렬화 크기 (바이트), 직렬화 불가 시 (sys.getsizeof, False)"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)), True
+    except Exception:
+        return sys.getsizeof(value), False
+
+
+def measure_state_size(state: dict) -> Dict[str, Any]:
+    """
+    상태 크기 측정
+
+    Returns:
+        {'total_bytes', 'num_keys', 'largest_keys', 'non_serializable'}
+    """
+    sizes = {}
+    non_serializable = []
+    for key, value in state.items():
+        size, serializable = _value_size(value)
+        sizes[key] = size
+        if not serializable:
+            non_serializable.append(key)
+
+    largest = sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'total_bytes': sum(sizes.values()),
+        'num_keys': len(sizes),
+        'largest_keys': largest,
+        'non_serializable': non_serializable,
+    }
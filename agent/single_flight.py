@@ -0,0 +1,104 @@
+"""
+Single-Flight 요청 병합
+
+같은 질의(정규화 후)와 같은 환자 맥락 지문을 가진 요청이 동시에 들어오면
+첫 요청(leader)만 그래프를 실행하고, 나머지(follower)는 그 결과를 기다려 공유합니다.
+시맨틱 캐시는 첫 요청이 끝난 뒤에야 도움이 되므로, 동시에 도착한 동일 요청을 위한 보완입니다.
+
+Feature flag: request_coalescing_enabled (기본값: False)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    키별 진행 중 계산 공유 (스레드 / asyncio 공용)
+
+    진행 중 계산은 concurrent.futures.Future로 보관하므로
+    스레드(run_agent)와 이벤트 루프(run_agent_async) 요청이 서로 결과를 공유할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'leaders': 0, 'shared': 0}
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """(Future, leader 여부)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['shared'] += 1
+                return future, False
+            future = Future()
+            future.set_running_or_notify_cancel()  # follower 대기 취소가 leader 결과에 영향을 주지 않도록
+            self._inflight[key] = future
+            self.stats['leaders'] += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        키에 대해 fn을 한 번만 실행
+
+        Returns:
+            (결과, 공유 여부) - follower면 공유 여부 True
+            leader가 예외로 끝나면 follower에도 같은 예외가 전달됩니다.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(timeout=timeout), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._finish(key, future)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]],
+                  timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """do()의 asyncio 버전 (fn은 코루틴 함수)"""
+        future, leader = self._join(key)
+        if not leader:
+            waiter = asyncio.shield(asyncio.wrap_future(future))
+            return await asyncio.wait_for(waiter, timeout), True
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._finish(key, future)
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+
+# 전역 Single-Flight (싱글톤)
+_single_flight = None
+
+
+def get_single_flight() -> SingleFlight:
+    """run_agent 요청 병합용 SingleFlight 가져오기 (싱글톤)"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
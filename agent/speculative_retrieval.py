@@ -0,0 +1,144 @@
+"""
+Speculative Retrieval (슬롯 추출과 검색 중첩 실행)
+
+슬롯 추출(MedCAT + 번역)과 검색용 임베딩 호출은 모두 느리지만 서로 독립적입니다.
+extract_slots 단계에서 원문 user_text로 임베딩 + 1차 하이브리드 검색을
+백그라운드 스레드에서 미리 시작하고, retrieve 단계에서
+- 슬롯 보강 질의가 원문과 같으면 결과를 그대로 재사용하고
+- 다르면 보강 질의로 다시 검색한 뒤 두 결과 중 더 나은 쪽을 선택합니다.
+
+Feature flag: speculative_retrieval_enabled (기본값: False)
+"""
+
+import time
+import atexit
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from retrieval.hybrid_retriever import tokenize_ko_en
+from core.tracing import trace_span
+
+
+# 백그라운드 검색용 스레드 풀 (프로세스 전역)
+_SPECULATIVE_MAX_WORKERS = 4
+_speculative_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_speculative_executor() -> ThreadPoolExecutor:
+    """Speculative Retrieval 스레드 풀 가져오기 (싱글톤)"""
+    global _speculative_executor
+    if _speculative_executor is None:
+        _speculative_executor = ThreadPoolExecutor(
+            max_workers=_SPECULATIVE_MAX_WORKERS,
+            thread_name_prefix="speculative-retrieval"
+        )
+        atexit.register(_speculative_executor.shutdown, wait=False)
+    return _speculative_executor
+
+
+@dataclass
+class SpeculativeRetrieval:
+    """백그라운드에서 진행 중인 1차 검색 핸들"""
+    query: str
+    route: str
+    k: int
+    retrieval_mode: str
+    future: Future
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def result(self, timeout: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Optional[List[float]], float]:
+        """(docs, query_vector, elapsed_ms) 반환 - 완료될 때까지 대기"""
+        return self.future.result(timeout=timeout)
+
+
+def _embed_and_search(llm_client, embedding_model: str, retriever, query: str,
+                      k: int, retrieval_mode: str):
+    """백그라운드 작업: 임베딩 + 하이브리드 검색"""
+    start = time.perf_counter()
+
+    query_vector = None
+    if retrieval_mode != 'bm25':
+        try:
+            query_vector = llm_client.embed(query, embedding_model=embedding_model)
+        except Exception as e:
+            print(f"[WARNING] Speculative 임베딩 생성 실패: {e}")
+
+    docs = retriever.search(
+        query=query if retrieval_mode != 'faiss' else "",
+        query_vector=query_vector if retrieval_mode != 'bm25' else None,
+        k=k
+    )
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return docs, query_vector, elapsed_ms
+
+
+def _traced_embed_and_search(*args):
+    with trace_span("retrieve.speculative"):
+        return _embed_and_search(*args)
+
+
+def start_speculative_retrieval(llm_client, embedding_model: str, retriever, query: str,
+                                k: int, route: str = 'default',
+                                retrieval_mode: str = 'hybrid') -> SpeculativeRetrieval:
+    """
+    원문 질의로 임베딩 + 1차 검색을 백그라운드에서 시작
+
+    Returns:
+        SpeculativeRetrieval 핸들 (retrieve 노드에서 result()로 회수)
+    """
+    # 현재 컨텍스트(추적 span 등)를 백그라운드 스레드로 전파
+    context = contextvars.copy_context()
+    future = get_speculative_executor().submit(
+        context.run, _traced_embed_and_search,
+        llm_client, embedding_model, retriever, query, k, retrieval_mode
+    )
+    return SpeculativeRetrieval(
+        query=query,
+        route=route,
+        k=k,
+        retrieval_mode=retrieval_mode,
+        future=future
+    )
+
+
+def keyword_coverage(query: str, docs: List[Dict[str, Any]]) -> float:
+    """
+    질의 키워드 커버리지 (0.0 ~ 1.0)
+
+    보강 질의의 고유 토큰 중 검색 문서 본문에 등장하는 비율
+    """
+    query_terms = {t for t in tokenize_ko_en(query) if len(t) >= 2}
+    if not query_terms or not docs:
+        return 0.0
+
+    doc_terms = set()
+    for doc in docs:
+        doc_terms.update(tokenize_ko_en(doc.get('text', '')))
+
+    return len(query_terms & doc_terms) / len(query_terms)
+
+
+def choose_better(enriched_query: str,
+                  speculative_docs: List[Dict[str, Any]],
+                  refined_docs: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]], Dict[str, float]]:
+    """
+    1차(원문) 결과와 보강 질의 결과 중 더 나은 쪽 선택
+
+    보강 질의 기준 키워드 커버리지를 비교하며, 동점이면 개인화 정보가
+    반영된 보강 질의 결과를 우선합니다.
+
+    Returns:
+        (선택 출처 'speculative'/'refined', 선택된 문서, 커버리지 점수)
+    """
+    scores = {
+        'speculative': keyword_coverage(enriched_query, speculative_docs),
+        'refined': keyword_coverage(enriched_query, refined_docs),
+    }
+    if refined_docs and scores['refined'] >= scores['speculative']:
+        return 'refined', refined_docs, scores
+    if not speculative_docs:
+        return 'refined', refined_docs, scores
+    return 'speculative', speculative_docs, scores
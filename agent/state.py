@@ -3,7 +3,7 @@ AgentState 정의 (TypedDict)
 """
 
 from typing import TypedDict, Annotated, Dict, Any, List, Optional
-from operator import add
+from agent.doc_set import reduce_retrieved_docs
 
 
 class AgentState(TypedDict):
@@ -29,10 +29,10 @@ class AgentState(TypedDict):
     
     # 메모리
     profile_summary: str
-    profile_store: Any  # ProfileStore 인스턴스 (세션 유지용)
+    profile_store: Any  # (레거시) ProfileStore 인스턴스 - 세션 레지스트리 비활성화 시에만 사용
     
     # 검색 관련
-    retrieved_docs: Annotated[List[Dict[str, Any]], add]
+    retrieved_docs: Annotated[List[Dict[str, Any]], reduce_retrieved_docs]  # ID 중복 제거 + 상한 (agent/doc_set.py)
     query_vector: List[float]  # 임베딩 벡터
     retrieval_attempted: bool  # 검색 시도 여부 (무한 루프 방지용)
 
@@ -65,21 +65,34 @@ class AgentState(TypedDict):
     classification_skipped: Optional[bool]  # 분류 스킵 여부
     classification_time_ms: Optional[float]  # 분류 소요 시간
     classification_error: Optional[str]  # 분류 에러 메시지
-    intent_classifier: Optional[Any]  # IntentClassifier 인스턴스 (캐싱용)
+    intent_classifier: Optional[Any]  # (레거시) IntentClassifier 인스턴스 - 세션 레지스트리 비활성화 시에만 사용
 
     # Context Compression 관련 (선택적 - 비활성화 시 None/False)
     compression_stats: Optional[Dict[str, Any]]  # 압축 통계 (compression_applied, ratio 등)
-    context_compressor: Optional[Any]  # ContextCompressor 인스턴스 (캐싱용)
+    context_compressor: Optional[Any]  # (레거시) ContextCompressor 인스턴스 - 세션 레지스트리 비활성화 시에만 사용
 
     # Hierarchical Memory 관련 (선택적 - 비활성화 시 None/False)
-    hierarchical_memory: Optional[Any]  # HierarchicalMemorySystem 인스턴스
+    hierarchical_memory: Optional[Any]  # (레거시) HierarchicalMemorySystem 인스턴스 - 세션 레지스트리 비활성화 시에만 사용
     hierarchical_memory_stats: Optional[Dict[str, Any]]  # 메모리 통계 (턴 수, 티어 크기 등)
     hierarchical_contexts: Optional[Dict[str, str]]  # 검색된 티어 컨텍스트 (working/compressed/semantic)
 
     # Self-Refine 강화 (Context Engineering 기반)
     quality_feedback: Optional[Dict[str, Any]]  # LLM 기반 품질 평가 결과 (grounding, completeness, missing_info 등)
-    retrieved_docs_history: Optional[List[List[str]]]  # 각 iteration의 문서 해시 이력 (중복 검색 방지)
+    retrieved_docs_history: Optional[List[List[str]]]  # 각 iteration에서 검색된 문서 ID 이력 (중복 검색 방지)
     quality_score_history: Optional[List[float]]  # iteration별 품질 점수 이력 (진행도 모니터링)
     query_rewrite_history: Optional[List[str]]  # iteration별 질의 재작성 이력
     refine_iteration_logs: Optional[List[Dict[str, Any]]]  # 상세 iteration 로그 (분석용)
 
+    # Speculative Retrieval 관련 (선택적 - 비활성화 시 None)
+    speculative_retrieval: Optional[Any]  # (레거시) 1차 검색 핸들 - 세션 레지스트리 비활성화 시에만 사용
+    speculative_retrieval_stats: Optional[Dict[str, Any]]  # 재사용/보강 결정 및 순차/중첩 지연 시간
+
+    # 재검색 후보 풀 (candidate_pool_enabled - 비활성화 시 None)
+    candidate_pool_stats: Optional[Dict[str, Any]]  # 풀 크기, 풀 재점수화/인덱스 재검색 횟수
+
+    # 문서 패킹 (doc_packing_enabled - 비활성화 시 None)
+    doc_packing_stats: Optional[Dict[str, Any]]  # 마지막 검색의 예산/사용 토큰/사용률, greedy 대비
+
+    # 세션 리소스 레지스트리 (agent/session_registry.py)
+    resource_handle: Optional[str]  # 레지스트리 핸들 (None이면 레거시: 리소스를 상태에 보관)
+    state_size_stats: Optional[List[Dict[str, Any]]]  # 노드 전이별 상태 크기 (state_size_tracking)
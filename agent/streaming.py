@@ -0,0 +1,53 @@
+"""
+스트리밍 이벤트 (run_agent_stream)
+
+그래프 실행 중 발생하는 이벤트를 세션 리소스 'stream_sink'(콜백)로 전달합니다.
+
+이벤트 형식 (dict):
+- {'type': 'node', 'node': str, 'status': 'start' | 'end'}       노드 진행 상황
+- {'type': 'answer_start', 'draft': int}                          답변 초안 생성 시작
+- {'type': 'delta', 'draft': int, 'text': str}                     답변 토큰 조각
+- {'type': 'superseded', 'draft': int}                             CRAG 재검색으로 이전 초안이 대체됨
+- {'type': 'final', 'answer': str, 'draft': int | None, 'state': dict | None}
+- {'type': 'error', 'error': str}
+"""
+
+from typing import Any, Callable, Dict, Iterator
+
+from agent.session_registry import get_resource
+
+
+StreamSink = Callable[[Dict[str, Any]], None]
+
+
+def emit_event(state: dict, event: Dict[str, Any]) -> None:
+    """세션에 stream_sink가 등록되어 있으면 이벤트 전달 (없으면 무시)"""
+    sink = get_resource(state, 'stream_sink')
+    if sink is None:
+        return
+    try:
+        sink(event)
+    except Exception as e:
+        print(f"[WARNING] 스트림 이벤트 전달 실패: {e}")
+
+
+def is_streaming(state: dict) -> bool:
+    return get_resource(state, 'stream_sink') is not None
+
+
+def stream_answer(state: dict, chunks: Iterator[str]) -> str:
+    """
+    답변 조각을 delta 이벤트로 전달하면서 전체 답변을 조립
+
+    이전 초안(answer)이 이미 있으면 superseded 이벤트를 먼저 보냅니다.
+    """
+    draft = state.get('iteration_count', 0)
+    if state.get('answer'):
+        emit_event(state, {'type': 'superseded', 'draft': max(0, draft - 1)})
+    emit_event(state, {'type': 'answer_start', 'draft': draft})
+
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        emit_event(state, {'type': 'delta', 'draft': draft, 'text': chunk})
+    return ''.join(parts)
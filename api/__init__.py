@@ -0,0 +1,4 @@
+"""
+API 모듈
+- asyncio HTTP 서버 (run_agent 래핑)
+"""
@@ -0,0 +1,519 @@
+"""
+asyncio HTTP API 서버 (run_agent 래핑)
+
+표준 라이브러리(asyncio)만 사용하는 최소 HTTP/1.1 서버입니다.
+
+엔드포인트:
+    POST   /v1/turn               턴 실행 (JSON 입력/출력)
+    POST   /v1/turn/stream        턴 실행 (SSE: node/delta/superseded/final 이벤트)
+    GET    /v1/sessions           메모리에 올라와 있는 세션 목록 + 세션 매니저 통계
+    GET    /v1/sessions/<id>      세션 대화 이력
+    DELETE /v1/sessions/<id>      세션 종료 (디스크 사본 포함 삭제)
+    GET    /health                프로세스 생존 확인
+    GET    /ready                 모델/인덱스 워밍업 완료 여부 (완료 전 503)
+    GET    /metrics               큐 깊이, 처리량, 지연 시간, 거절/타임아웃 수
+
+턴 요청 본문:
+    {"session_id": "...", "user_text": "...", "user_id": "...", "mode": "ai_agent",
+     "feature_overrides": {...}, "timeout": 60}
+
+동작:
+- LangGraph 노드는 블로킹이므로 크기가 제한된 스레드 풀(workers)에서 실행
+- 진행 중 + 대기 요청이 workers + max_queue를 넘으면 503 (Retry-After)으로 즉시 거절
+- 요청별 타임아웃 초과 시 504 (이미 시작된 턴은 백그라운드에서 끝까지 실행됨)
+
+실행:
+    python -m api.server --port 8000
+    python -m api.server --mock            # LLM/인덱스 없이 에코 응답 (스모크 테스트용)
+    python -m api.server --mock-llm        # 전체 그래프 + 모의 LLM/임베딩 (API 키 없이 부하 테스트)
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import unquote
+
+from agent.session_manager import SessionManager
+from core.llm_client import aclose_shared_async_openai
+from core.rate_limiter import get_throttling_stats
+
+
+MAX_BODY_BYTES = 1 * 1024 * 1024
+_LATENCY_WINDOW = 512
+
+_STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+    504: 'Gateway Timeout',
+}
+
+
+class HTTPError(Exception):
+    """HTTP 오류 응답"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+# ===== 기본 실행기 =====
+
+def _default_runner(user_text: str, **kwargs) -> Dict[str, Any]:
+    from agent.graph import run_agent
+    return run_agent(user_text, **kwargs)
+
+
+def _default_stream_runner(user_text: str, **kwargs) -> Iterator[Dict[str, Any]]:
+    from agent.graph import run_agent_stream
+    return run_agent_stream(user_text, **kwargs)
+
+
+def _default_warmup() -> None:
+    """그래프 컴파일, LLM 클라이언트 생성, 기본 라우트 검색 인덱스 로딩"""
+    from agent.graph import get_agent_graph
+    from agent.nodes.retrieve import _get_embedding_client, _get_retriever
+    from agent.session_registry import get_session_registry
+
+    get_agent_graph()
+    handle = f"warmup::{uuid.uuid4().hex[:8]}"
+    state = {'resource_handle': handle}
+    try:
+        _get_embedding_client(state)
+        _get_retriever(state, 'default')
+    finally:
+        get_session_registry().release(handle)
+
+
+def mock_runner(user_text: str, return_state: bool = False, **kwargs) -> Dict[str, Any]:
+    """LLM/인덱스 없이 에코 응답 (--mock)"""
+    answer = f"[mock] {user_text}"
+    state = {'answer': answer, 'session_id': kwargs.get('session_id'), 'iteration_count': 0}
+    return state if return_state else answer
+
+
+def mock_stream_runner(user_text: str, return_state: bool = False, **kwargs) -> Iterator[Dict[str, Any]]:
+    """mock_runner의 스트리밍 버전"""
+    for node in ('check_similarity', 'generate_answer', 'store_response'):
+        yield {'type': 'node', 'node': node, 'status': 'start'}
+        if node == 'generate_answer':
+            yield {'type': 'answer_start', 'draft': 0}
+            for word in f"[mock] {user_text}".split(' '):
+                yield {'type': 'delta', 'draft': 0, 'text': word + ' '}
+        yield {'type': 'node', 'node': node, 'status': 'end'}
+    state = mock_runner(user_text, return_state=True, **kwargs)
+    yield {'type': 'final', 'answer': state['answer'], 'draft': 0, 'state': state if return_state else None}
+
+
+# ===== 서버 =====
+
+class AgentServer:
+    """
+    run_agent를 감싸는 asyncio HTTP 서버
+
+    Args:
+        runner: run_agent 호환 함수
+        stream_runner: run_agent_stream 호환 제너레이터 함수
+        warmup: 준비 상태 전에 한 번 실행할 함수 (None이면 즉시 ready)
+        session_manager: 세션 매니저 (없으면 runner로 새로 생성)
+        workers: 블로킹 턴 실행용 스레드 수
+        max_queue: workers 외에 대기시킬 수 있는 최대 요청 수
+        request_timeout: 기본 요청 타임아웃 (초)
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Any] = _default_runner,
+        stream_runner: Callable[..., Iterator[Dict[str, Any]]] = _default_stream_runner,
+        warmup: Optional[Callable[[], None]] = _default_warmup,
+        session_manager: Optional[SessionManager] = None,
+        workers: int = 4,
+        max_queue: int = 16,
+        request_timeout: float = 60.0,
+    ):
+        self.runner = runner
+        self.stream_runner = stream_runner
+        self.warmup = warmup
+        self.session_manager = session_manager or SessionManager(runner=runner)
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.request_timeout = request_timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="agent-worker")
+        self._pending = 0
+        self._latencies_ms: deque = deque(maxlen=_LATENCY_WINDOW)
+        self._started_at = time.time()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.ready = warmup is None
+        self.warmup_error: Optional[str] = None
+        self.counters = {'accepted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'timeouts': 0}
+
+    # ===== 수명 주기 =====
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8000) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        if self.warmup is not None:
+            asyncio.get_running_loop().create_task(self._run_warmup())
+        sockets = self._server.sockets or []
+        if sockets:
+            bound = sockets[0].getsockname()
+            print(f"[API] listening on http://{bound[0]}:{bound[1]} "
+                  f"(workers={self.workers}, max_queue={self.max_queue}, timeout={self.request_timeout}s)")
+        return self._server
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+        await aclose_shared_async_openai()  # 이 루프에서 만든 AsyncOpenAI 커넥션 풀 종료
+
+    async def _run_warmup(self) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.warmup)
+            self.ready = True
+            print(f"[API] warmup 완료 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        except Exception as e:
+            self.warmup_error = f"{type(e).__name__}: {e}"
+            print(f"[ERROR] warmup 실패: {self.warmup_error}")
+
+    # ===== 승인 제어 / 지표 =====
+
+    @property
+    def queue_depth(self) -> int:
+        """워커를 기다리는 요청 수"""
+        return max(0, self._pending - self.workers)
+
+    def _admit(self) -> None:
+        if not self.ready:
+            raise HTTPError(503, 'server is warming up', {'Retry-After': '5'})
+        if self._pending >= self.workers + self.max_queue:
+            self.counters['rejected'] += 1
+            raise HTTPError(503, 'server is overloaded', {'Retry-After': '1'})
+        self._pending += 1
+        self.counters['accepted'] += 1
+
+    def _release(self, started: float, ok: bool) -> None:
+        self._pending -= 1
+        self.counters['completed' if ok else 'failed'] += 1
+        self._latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    def _submit(self, fn: Callable[[], Any], started: float, abandoned: threading.Event) -> asyncio.Future:
+        """
+        워커 스레드에서 fn 실행
+
+        승인 슬롯은 fn이 실제로 끝날 때 해제합니다. 타임아웃/연결 끊김으로 응답을 포기해도
+        워커 스레드는 계속 점유 중이므로, 그동안 새 요청이 workers + max_queue를 넘어
+        실행기 내부 큐에 쌓이지 않도록 슬롯을 유지합니다.
+        """
+        future = asyncio.get_running_loop().run_in_executor(self._executor, fn)
+
+        def _done(f: asyncio.Future) -> None:
+            ok = not f.cancelled() and f.exception() is None and not abandoned.is_set()
+            self._release(started, ok)
+
+        future.add_done_callback(_done)
+        return future
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies_ms)
+
+        def _pct(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 1)
+
+        return {
+            **self.counters,
+            'in_flight': self._pending,
+            'queue_depth': self.queue_depth,
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'latency_ms': {'p50': _pct(0.50), 'p95': _pct(0.95), 'p99': _pct(0.99)},
+            'uptime_s': round(time.time() - self._started_at, 1),
+            'sessions': self.session_manager.get_stats(),
+            'llm_throttling': get_throttling_stats(),
+        }
+
+    # ===== HTTP 처리 =====
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                await self._dispatch(method, path, body, writer)
+            except HTTPError as e:
+                await self._write_json(writer, e.status, {'error': e.message}, e.headers)
+            except Exception as e:
+                print(f"[ERROR] 요청 처리 실패: {e}")
+                await self._write_json(writer, 500, {'error': f"{type(e).__name__}: {e}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        if not request_line:
+            raise ConnectionError('empty request')
+        parts = request_line.split()
+        if len(parts) < 2:
+            raise HTTPError(400, 'malformed request line')
+        method, target = parts[0].upper(), parts[1]
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1')
+            if line in ('\r\n', '\n', ''):
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, 'request body too large')
+        body = await reader.readexactly(length) if length else b''
+        return method, target.split('?', 1)[0], body
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        if path == '/health':
+            return await self._write_json(writer, 200, {'status': 'ok'})
+        if path == '/ready':
+            status = 200 if self.ready else 503
+            return await self._write_json(writer, status, {'ready': self.ready, 'warmup_error': self.warmup_error})
+        if path == '/metrics':
+            return await self._write_json(writer, 200, self.metrics())
+
+        if path == '/v1/turn':
+            self._require(method, 'POST')
+            return await self._write_json(writer, 200, await self._turn(self._parse_turn(body)))
+        if path == '/v1/turn/stream':
+            self._require(method, 'POST')
+            return await self._stream_turn(self._parse_turn(body), writer)
+
+        if path == '/v1/sessions':
+            self._require(method, 'GET')
+            manager = self.session_manager
+            return await self._write_json(writer, 200, {
+                'sessions': manager.resident_sessions(),
+                'stats': manager.get_stats(),
+            })
+        if path.startswith('/v1/sessions/'):
+            session_id = unquote(path[len('/v1/sessions/'):])
+            if not session_id:
+                raise HTTPError(404, 'not found')
+            return await self._session(method, session_id, writer)
+
+        raise HTTPError(404, 'not found')
+
+    @staticmethod
+    def _require(method: str, expected: str) -> None:
+        if method != expected:
+            raise HTTPError(405, f"use {expected}")
+
+    @staticmethod
+    def _parse_turn(body: bytes) -> Dict[str, Any]:
+        try:
+            payload = json.loads(body or b'{}')
+        except json.JSONDecodeError as e:
+            raise HTTPError(400, f"invalid JSON: {e}")
+        if not isinstance(payload, dict) or not str(payload.get('user_text') or '').strip():
+            raise HTTPError(400, "'user_text' is required")
+        payload.setdefault('session_id', f"session-{uuid.uuid4().hex[:12]}")
+        return payload
+
+    def _run_kwargs(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'mode': payload.get('mode', 'ai_agent'),
+            'feature_overrides': payload.get('feature_overrides'),
+        }
+
+    def _timeout(self, payload: Dict[str, Any]) -> float:
+        try:
+            return min(float(payload.get('timeout') or self.request_timeout), self.request_timeout)
+        except (TypeError, ValueError):
+            return self.request_timeout
+
+    async def _turn(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self._admit()
+        started = time.perf_counter()
+        abandoned = threading.Event()
+        session_id = payload['session_id']
+        call = lambda: self.session_manager.run_turn(
+            session_id, payload['user_text'], user_id=payload.get('user_id'),
+            **self._run_kwargs(payload)
+        )
+        future = self._submit(call, started, abandoned)
+        try:
+            # shield: 타임아웃이 실행기 future를 취소해 슬롯이 먼저 해제되지 않도록
+            answer = await asyncio.wait_for(asyncio.shield(future), self._timeout(payload))
+        except asyncio.TimeoutError:
+            abandoned.set()
+            self.counters['timeouts'] += 1
+            raise HTTPError(504, 'turn timed out')
+        return {
+            'session_id': session_id,
+            'answer': answer,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    async def _stream_turn(self, payload: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        self._admit()
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        done = object()
+        abandoned = threading.Event()  # 타임아웃/연결 끊김: 생산자는 다음 이벤트에서 중단
+        session_id = payload['session_id']
+
+        def _produce():
+            manager = self.session_manager
+            turn_kwargs = manager.begin_turn(session_id, payload.get('user_id'))
+            answer = None
+            stream = self.stream_runner(payload['user_text'], **turn_kwargs, **self._run_kwargs(payload))
+            try:
+                for event in stream:
+                    if abandoned.is_set():
+                        break
+                    if event.get('type') == 'final':
+                        answer = event.get('answer', '')
+                        event = {k: v for k, v in event.items() if k != 'state'}
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+            except Exception as e:
+                loop.call_soon_threadsafe(events.put_nowait, {'type': 'error', 'error': f"{type(e).__name__}: {e}"})
+                raise
+            finally:
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()
+                manager.end_turn(session_id, payload['user_text'] if answer is not None else None, answer)
+                loop.call_soon_threadsafe(events.put_nowait, done)
+
+        try:
+            writer.write(self._head(200, 'text/event-stream', {
+                'Cache-Control': 'no-cache',
+                'X-Session-Id': session_id,
+            }))
+            await writer.drain()
+        except BaseException:
+            self._release(started, False)
+            raise
+
+        self._submit(_produce, started, abandoned)
+        try:
+            deadline = loop.time() + self._timeout(payload)
+            while True:
+                remaining = deadline - loop.time()
+                try:
+                    event = await asyncio.wait_for(events.get(), max(0.0, remaining))
+                except asyncio.TimeoutError:
+                    abandoned.set()
+                    self.counters['timeouts'] += 1
+                    await self._write_sse(writer, {'type': 'error', 'error': 'turn timed out'})
+                    return
+                if event is done:
+                    break
+                await self._write_sse(writer, event)
+        except BaseException:
+            abandoned.set()
+            raise
+
+    async def _session(self, method: str, session_id: str, writer: asyncio.StreamWriter) -> None:
+        manager = self.session_manager
+        if method == 'GET':
+            if session_id not in manager:
+                raise HTTPError(404, 'unknown session')
+            return await self._write_json(writer, 200, {
+                'session_id': session_id,
+                'history': manager.history(session_id),
+            })
+        if method == 'DELETE':
+            manager.close(session_id, delete=True)
+            return await self._write_json(writer, 200, {'session_id': session_id, 'deleted': True})
+        raise HTTPError(405, 'use GET or DELETE')
+
+    # ===== 응답 쓰기 =====
+
+    @staticmethod
+    def _head(status: int, content_type: str, headers: Optional[Dict[str, str]] = None,
+              length: Optional[int] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'OK')}",
+                 f"Content-Type: {content_type}",
+                 "Connection: close"]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    async def _write_json(self, writer: asyncio.StreamWriter, status: int, payload: Any,
+                          headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        writer.write(self._head(status, 'application/json; charset=utf-8', headers, len(body)) + body)
+        await writer.drain()
+
+    @staticmethod
+    async def _write_sse(writer: asyncio.StreamWriter, event: Dict[str, Any]) -> None:
+        data = json.dumps(event, ensure_ascii=False, default=str)
+        writer.write(f"event: {event.get('type', 'message')}\ndata: {data}\n\n".encode('utf-8'))
+        await writer.drain()
+
+
+async def serve(host: str, port: int, **server_kwargs) -> None:
+    server = AgentServer(**server_kwargs)
+    await server.start(host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Medical agent HTTP API (asyncio)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=4, help="Blocking turn worker threads")
+    ap.add_argument("--max-queue", type=int, default=16, help="Requests allowed to wait for a worker")
+    ap.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    ap.add_argument("--max-sessions", type=int, default=1000, help="Sessions kept in memory (LRU)")
+    ap.add_argument("--mock", action="store_true", help="Echo backend without LLM/index (smoke tests)")
+    ap.add_argument("--mock-llm", action="store_true",
+                    help="Run the full graph with the deterministic mock LLM/embedding provider (LLM_MOCK=1)")
+    args = ap.parse_args()
+
+    if args.mock_llm:
+        os.environ['LLM_MOCK'] = '1'
+
+    runner = mock_runner if args.mock else _default_runner
+    server_kwargs = dict(
+        runner=runner,
+        stream_runner=mock_stream_runner if args.mock else _default_stream_runner,
+        warmup=None if args.mock else _default_warmup,
+        session_manager=SessionManager(max_sessions=args.max_sessions, runner=runner),
+        workers=args.workers,
+        max_queue=args.max_queue,
+        request_timeout=args.timeout,
+    )
+    try:
+        asyncio.run(serve(args.host, args.port, **server_kwargs))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,16 +5,32 @@ Streamlit 웹 인터페이스
 
 import streamlit as st
 import sys
+import uuid
 from pathlib import Path
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from agent.graph import run_agent, build_agent_graph
+from agent.graph import run_agent_stream, build_agent_graph
+from agent.session_manager import get_session_manager
 from agent.state import AgentState
 
 
+# 스트리밍 진행 상황 표시용 노드 이름
+_NODE_LABELS = {
+    "check_similarity": "유사 질문 캐시 확인",
+    "classify_intent": "질문 의도 분석",
+    "extract_slots": "의학 정보 추출",
+    "store_memory": "대화 기억 저장",
+    "assemble_context": "맥락 구성",
+    "retrieve": "의학 문헌 검색",
+    "generate_answer": "답변 작성",
+    "refine": "답변 품질 검토",
+    "store_response": "응답 저장",
+}
+
+
 # 페이지 설정
 st.set_page_config(
     page_title="의학지식 AI Agent",
@@ -28,9 +44,9 @@ if 'messages' not in st.session_state:
     st.session_state.messages = []  # [{"role": "user"|"assistant", "content": "..."}]
 if 'agent_graph' not in st.session_state:
     st.session_state.agent_graph = None
-if 'profile_store' not in st.session_state:
-    # LangGraph 실행 결과로 전달되는 ProfileStore 객체를 유지해 멀티턴에서도 누적
-    st.session_state.profile_store = None
+if 'session_id' not in st.session_state:
+    # 브라우저 세션 ID (ProfileStore/메모리/대화 이력은 SessionManager가 관리)
+    st.session_state.session_id = f"session-{uuid.uuid4().hex[:12]}"
 
 
 def initialize_agent():
@@ -44,31 +60,6 @@ def initialize_agent():
     return st.session_state.agent_graph
 
 
-def format_conversation_history(messages: list) -> str:
-    """
-    대화 이력을 프롬프트용 텍스트로 포맷팅
-    
-    Args:
-        messages: [{"role": "user"|"assistant", "content": "..."}, ...]
-    
-    Returns:
-        포맷팅된 대화 이력 문자열
-    """
-    if not messages:
-        return None
-    
-    history_lines = []
-    for msg in messages:
-        role = msg.get("role", "")
-        content = msg.get("content", "")
-        if role == "user":
-            history_lines.append(f"사용자: {content}")
-        elif role == "assistant":
-            history_lines.append(f"AI: {content}")
-    
-    return "\n".join(history_lines)
-
-
 def _extract_profile_snapshot(profile_store):
     """
     ProfileStore에서 UI용 스냅샷 추출
@@ -153,7 +144,9 @@ def main():
 
         st.markdown("---")
         st.header("🧾 내 정보 (실시간)")
-        snapshot = _extract_profile_snapshot(st.session_state.profile_store)
+        snapshot = _extract_profile_snapshot(
+            get_session_manager().get_resource(st.session_state.session_id, 'profile_store')
+        )
         st.markdown(f"**성별/나이:** {snapshot['gender_age']}")
         _render_tag_line("질환", snapshot["conditions"])
         _render_tag_line("증상", snapshot["symptoms"])
@@ -166,6 +159,7 @@ def main():
         st.header("📋 대화 관리")
         if st.button("🗑️ 대화 초기화", use_container_width=True):
             st.session_state.messages = []
+            get_session_manager().clear_history(st.session_state.session_id)
             st.rerun()
         st.markdown(f"**대화 수:** {len([m for m in st.session_state.messages if m['role'] == 'user'])}")
 
@@ -209,42 +203,58 @@ def main():
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # AI 응답 생성
+        # AI 응답 생성 (토큰 스트리밍)
         with st.chat_message("assistant"):
-            with st.spinner("답변을 생성하는 중..."):
-                try:
-                    # 대화 이력 포맷팅 (현재 질문 제외)
-                    conversation_history = format_conversation_history(
-                        st.session_state.messages[:-1]  # 현재 질문 제외
-                    )
-                    
-                    session_payload = {}
-                    if st.session_state.profile_store is not None:
-                        # LangGraph 상태에 기존 프로필을 전달해 멀티턴 누적
-                        session_payload['profile_store'] = st.session_state.profile_store
+            status_placeholder = st.empty()
+            answer_placeholder = st.empty()
+            session_manager = get_session_manager()
+            completed = False
+            answer = ""
+            try:
+                # 대화 이력/세션 리소스는 SessionManager가 session_id 단위로 관리
+                turn_kwargs = session_manager.begin_turn(st.session_state.session_id)
+                status_placeholder.caption("⏳ 답변을 생성하는 중...")
+                for event in run_agent_stream(
+                    user_text=prompt,
+                    mode=mode,
+                    **turn_kwargs
+                ):
+                    event_type = event['type']
+                    if event_type == 'node' and event['status'] == 'start':
+                        label = _NODE_LABELS.get(event['node'], event['node'])
+                        status_placeholder.caption(f"⏳ {label}...")
+                    elif event_type == 'answer_start':
+                        answer = ""
+                    elif event_type == 'delta':
+                        answer += event['text']
+                        answer_placeholder.markdown(answer + "▌")
+                    elif event_type == 'superseded':
+                        # CRAG 재검색으로 이전 초안이 대체됨
+                        answer = ""
+                        answer_placeholder.empty()
+                        status_placeholder.caption("🔄 근거를 보강하여 답변을 다시 작성하는 중...")
+                    elif event_type == 'final':
+                        answer = event['answer']
+                        completed = True
+
+                status_placeholder.empty()
+                answer_placeholder.markdown(answer)
 
-                    # Agent 실행
-                    final_state = run_agent(
-                        user_text=prompt,
-                        mode=mode,
-                        conversation_history=conversation_history,
-                        session_state=session_payload,
-                        return_state=True
-                    )
+                # AI 메시지 추가
+                st.session_state.messages.append({"role": "assistant", "content": answer})
 
-                    # 프로필 상태 업데이트 (사이드바 실시간 반영)
-                    st.session_state.profile_store = final_state.get('profile_store', st.session_state.profile_store)
-                    answer = final_state.get('answer', '')
-                    
-                    # AI 메시지 추가 및 표시
-                    st.markdown(answer)
-                    st.session_state.messages.append({"role": "assistant", "content": answer})
-                    
-                except Exception as e:
-                    error_msg = f"오류 발생: {e}"
-                    st.error(error_msg)
-                    st.exception(e)
-                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            except Exception as e:
+                status_placeholder.empty()
+                error_msg = f"오류 발생: {e}"
+                st.error(error_msg)
+                st.exception(e)
+                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            finally:
+                session_manager.end_turn(
+                    st.session_state.session_id,
+                    prompt if completed else None,
+                    answer
+                )
     
     # 푸터
     st.markdown("---")
@@ -56,6 +56,44 @@ ABLATION_PROFILES = {
         }
     },
 
+    # === Self-Refine + Cascade 품질 평가 (휴리스틱 → 불확실 구간만 LLM) ===
+    "self_refine_cascade_quality": {
+        "description": "Self-Refine + Cascade 품질 평가 (휴리스틱 점수가 불확실 구간일 때만 LLM 평가)",
+        "features": {
+            "self_refine_enabled": True,
+            "quality_check_enabled": True,
+            "llm_based_quality_check": True,
+            "quality_check_mode": "cascade",
+            "cascade_band_low": 0.35,
+            "cascade_band_high": 0.75,
+            "cascade_shadow_judge": False,  # 생략 건은 실제로 LLM을 호출하지 않음
+            "dynamic_query_rewrite": False,
+            "duplicate_detection": False,
+            "progress_monitoring": False,
+            "max_refine_iterations": 2,
+            "quality_threshold": 0.5,
+        }
+    },
+
+    # === Cascade 일치도 측정 (생략 건에도 LLM 평가를 실행, 비용 절감 없음) ===
+    "self_refine_cascade_quality_shadow": {
+        "description": "Cascade 품질 평가 + shadow LLM 평가 (생략 건의 휴리스틱-LLM 판단 일치도 측정용)",
+        "features": {
+            "self_refine_enabled": True,
+            "quality_check_enabled": True,
+            "llm_based_quality_check": True,
+            "quality_check_mode": "cascade",
+            "cascade_band_low": 0.35,
+            "cascade_band_high": 0.75,
+            "cascade_shadow_judge": True,  # 생략 건에도 LLM 평가 실행 (일치도 측정 전용)
+            "dynamic_query_rewrite": False,
+            "duplicate_detection": False,
+            "progress_monitoring": False,
+            "max_refine_iterations": 2,
+            "quality_threshold": 0.5,
+        }
+    },
+
     # === Self-Refine + 동적 질의 재작성 ===
     "self_refine_dynamic_query": {
         "description": "Self-Refine + LLM 품질 평가 + 동적 질의 재작성",
@@ -71,6 +109,22 @@ ABLATION_PROFILES = {
         }
     },
 
+    # === Self-Refine + 동적 질의 재작성 (평가/재작성 통합 호출) ===
+    "self_refine_combined_rewrite": {
+        "description": "Self-Refine + LLM 품질 평가와 질의 재작성을 1회 구조화 출력 호출로 통합",
+        "features": {
+            "self_refine_enabled": True,
+            "quality_check_enabled": True,
+            "llm_based_quality_check": True,
+            "dynamic_query_rewrite": True,
+            "combined_eval_rewrite": True,  # 평가 + 재작성 통합 (실패 시 개별 호출 폴백)
+            "duplicate_detection": False,
+            "progress_monitoring": False,
+            "max_refine_iterations": 2,
+            "quality_threshold": 0.5,
+        }
+    },
+
     # === Self-Refine + Quality Check (2중 안전장치) ===
     "self_refine_full_safety": {
         "description": "Self-Refine + Quality Check (2중 안전장치: 중복 검색 방지 + 진행도 모니터링)",
@@ -82,13 +82,8 @@ class ContextManager:
 
     # 내부 유틸
     def _clip_text(self, text: str, max_tokens: int) -> str:
-        """간단한 토큰 예산 내 자르기 (단어 단위)"""
-        if not text or max_tokens <= 0:
-            return ""
-        tokens = text.split()
-        # 근사치: 토큰 수는 단어 수로 간주
-        clipped = tokens[-max_tokens:]
-        return " ".join(clipped)
+        """토큰 예산 내 자르기 (최근 대화가 뒤에 있으므로 뒷부분 유지)"""
+        return self.token_manager.clip_to_tokens(text, max_tokens, keep='tail')
 
     def _assemble_prompt(
         self,
@@ -1,11 +1,35 @@
 """
-토큰 예산 배분기 (간단한 근사치 버전)
+토큰 예산 배분기
 
-- 실제 서비스에서는 tiktoken 등 실제 토크나이저로 교체 가능
+- 토큰 수: 설정 모델의 BPE 토크나이저(tiktoken)로 계산, 텍스트 해시 기준 메모이제이션
+  (tiktoken 미설치 시 기존 근사치: 단어 수 * 1.3)
+- 자르기: 토큰 ID 단위 (앞/뒤 유지 선택)
 - 최대 컨텍스트 길이 내에서 쿼리/프로필/최근 대화/검색 근거 예산을 분배
+
+모든 예산 계산 경로(컨텍스트 조립, 검색 문서 예산, 계층형 메모리, 메트릭)가
+get_token_manager()의 같은 구현과 캐시를 공유합니다.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+    print("[WARNING] tiktoken not available. 토큰 수 근사치(단어 수 * 1.3)를 사용합니다.")
+
+
+DEFAULT_MODEL = 'gpt-4o-mini'
+DEFAULT_ENCODING = 'o200k_base'  # gpt-4o 계열
+
+# 토큰 수 메모이제이션 상한 (항목 수)
+TOKEN_CACHE_SIZE = 50000
 
 
 @dataclass
@@ -18,21 +42,161 @@ class TokenPlan:
     for_docs: int
 
 
+def approx_token_count(text: str) -> int:
+    """기존 근사치 (단어 수 * 1.3), tiktoken 미설치 시 사용"""
+    if not text:
+        return 0
+    return int(len(text.split()) * 1.3)
+
+
+def _configured_model() -> str:
+    """model_config.yaml의 llm.model (설정을 읽을 수 없으면 gpt-4o-mini)"""
+    try:
+        from core.config import get_llm_config
+        return (get_llm_config() or {}).get('model', DEFAULT_MODEL)
+    except Exception:
+        return DEFAULT_MODEL
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """모델명 → tiktoken 인코딩 (모르는 모델은 o200k_base)"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+class _TokenCountCache:
+    """(인코딩, 텍스트 해시) → 토큰 수 LRU (스레드 안전, 프로세스 전역)"""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._data: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(encoding_name: str, text: str) -> Tuple[str, bytes]:
+        return encoding_name, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[int]:
+        with self._lock:
+            count = self._data.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def put(self, key: Tuple[str, bytes], count: int) -> None:
+        with self._lock:
+            self._data[key] = count
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+_token_count_cache = _TokenCountCache()
+
+
 class TokenManager:
-    """LLM 컨텍스트 내 토큰 예산 배분"""
+    """LLM 컨텍스트 내 토큰 계산 / 자르기 / 예산 배분"""
 
-    def __init__(self, max_total_tokens: int = 4000):
+    def __init__(self, max_total_tokens: int = 4000, model: Optional[str] = None):
         self.max_total = max_total_tokens
+        self.model = model or _configured_model()
+        self._encoding = None
+        if HAS_TIKTOKEN:
+            try:
+                self._encoding = _get_encoding(self.model)
+            except Exception as e:
+                # BPE 파일을 받을 수 없는 오프라인 환경 등
+                print(f"[WARNING] tiktoken 인코딩 로드 실패, 근사치 사용: {e}")
+
+    @property
+    def encoding_name(self) -> str:
+        return self._encoding.name if self._encoding is not None else 'approx'
 
     def count_tokens(self, text: str) -> int:
-        """
-        토큰 수 근사치
-        - 가벼운 근사치: 단어 수 * 1.3
-        - 필요 시 tiktoken 등으로 교체
-        """
+        """토큰 수 (BPE, 텍스트 해시 기준 캐시)"""
         if not text:
             return 0
-        return int(len(text.split()) * 1.3)
+        if self._encoding is None:
+            return approx_token_count(text)
+
+        key = _token_count_cache.key(self._encoding.name, text)
+        count = _token_count_cache.get(key)
+        if count is None:
+            count = len(self._encoding.encode_ordinary(text))
+            _token_count_cache.put(key, count)
+        return count
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """여러 텍스트의 토큰 수 (캐시 미스만 encode_ordinary_batch로 한 번에 인코딩)"""
+        if self._encoding is None:
+            return [approx_token_count(text) for text in texts]
+
+        counts: List[Optional[int]] = [0 if not text else None for text in texts]
+        missing: Dict[Tuple[str, bytes], List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            key = _token_count_cache.key(self._encoding.name, text)
+            cached = _token_count_cache.get(key)
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                counts[i] = cached
+
+        if missing:
+            keys = list(missing)
+            encoded = self._encoding.encode_ordinary_batch([texts[missing[key][0]] for key in keys])
+            for key, tokens in zip(keys, encoded):
+                _token_count_cache.put(key, len(tokens))
+                for i in missing[key]:
+                    counts[i] = len(tokens)
+        return counts
+
+    def encode(self, text: str) -> List[int]:
+        """토큰 ID 목록 (tiktoken 필요)"""
+        if self._encoding is None:
+            raise RuntimeError("tiktoken이 설치되지 않았습니다. pip install tiktoken")
+        return self._encoding.encode_ordinary(text or '')
+
+    def clip_to_tokens(self, text: str, max_tokens: int, keep: str = 'head') -> str:
+        """
+        토큰 예산 내로 자르기 (토큰 ID 단위)
+
+        Args:
+            keep: 'head'면 앞부분, 'tail'이면 뒷부분(최근 대화 등) 유지
+        """
+        if not text or max_tokens <= 0:
+            return ""
+
+        if self._encoding is None:
+            # 근사치: 토큰 수는 단어 수로 간주
+            words = text.split()
+            clipped = words[-max_tokens:] if keep == 'tail' else words[:max_tokens]
+            return " ".join(clipped)
+
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        tokens = self.encode(text)
+        clipped = tokens[-max_tokens:] if keep == 'tail' else tokens[:max_tokens]
+        # 멀티바이트(한글) 문자가 토큰 경계에서 잘리면 생기는 대체 문자 제거
+        return self._encoding.decode(clipped).strip('�')
 
     def make_plan(
         self,
@@ -44,9 +208,7 @@ class TokenManager:
         reserved_for_system: int = 400,
     ) -> TokenPlan:
         """쿼리/프로필/최근 대화/장기 요약/검색 근거 예산 분배"""
-        q = self.count_tokens(current_query)
-        p = self.count_tokens(profile_summary)
-        l = self.count_tokens(longterm_summary)
+        q, p, l = self.count_tokens_batch([current_query, profile_summary, longterm_summary])
 
         # 검색 근거와 시스템 프롬프트용 예산을 미리 확보
         available = max(1000, self.max_total - reserved_for_docs - reserved_for_system)
@@ -66,3 +228,19 @@ class TokenManager:
             for_docs=reserved_for_docs,
         )
 
+
+# 전역 TokenManager (싱글톤)
+_token_manager: Optional[TokenManager] = None
+
+
+def get_token_manager() -> TokenManager:
+    """공유 TokenManager 가져오기 (싱글톤, 설정 모델의 토크나이저)"""
+    global _token_manager
+    if _token_manager is None:
+        _token_manager = TokenManager(max_total_tokens=4000)
+    return _token_manager
+
+
+def get_token_cache_stats() -> Dict[str, int]:
+    """토큰 수 캐시 통계 (크기, 적중/미스)"""
+    return _token_count_cache.stats()
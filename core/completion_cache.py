@@ -0,0 +1,196 @@
+"""
+LLM 완성 결과 캐시 (내용 주소 지정, 디스크 저장)
+
+Ablation / 재현 실험은 같은 시스템 프롬프트 + 문서 + 질문을 같은 설정으로 반복 호출합니다.
+(provider, model, messages, temperature, max_tokens, response_format)의 해시를 키로
+응답 본문을 SQLite에 저장하고, 같은 요청은 API 호출 없이 돌려줍니다.
+
+- 옵트인: LLM_COMPLETION_CACHE 환경 변수(파일 경로) 또는 model_config.yaml의 llm.completion_cache.enabled
+- 크기 상한: 초과 시 마지막 사용 시각이 오래된 항목부터 삭제 (LRU)
+- 호출별 우회: generate(..., use_cache=False)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+
+DEFAULT_CACHE_PATH = 'runs/cache/llm_completions.sqlite'
+DEFAULT_MAX_MB = 256
+
+
+def completion_key(provider: str, model: str, messages: List[Dict[str, str]],
+                   temperature: Optional[float], max_tokens: Optional[int],
+                   response_format: Optional[Dict[str, Any]] = None) -> str:
+    """요청 내용의 SHA-256 (같은 요청이면 같은 키)"""
+    payload = {
+        'provider': provider,
+        'model': model,
+        'messages': messages,
+        'temperature': temperature,
+        'max_tokens': max_tokens,
+        'response_format': response_format,
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class CompletionCache:
+    """SQLite 기반 완성 결과 캐시 (스레드 안전, 크기 상한 LRU)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL, tokens INTEGER NOT NULL DEFAULT 0,"
+                " size INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON completions(last_access)")
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()
+        self._total_bytes = row[0]
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'saved_tokens': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 (없으면 None), 적중 시 마지막 사용 시각 갱신"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, tokens FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE completions SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+            self.stats['hits'] += 1
+            self.stats['saved_tokens'] += row[1]
+            return row[0]
+
+    def put(self, key: str, response: str, tokens: int = 0) -> None:
+        """응답 저장 (tokens: 적중 시 절약되는 토큰 수로 집계)"""
+        size = len(key) + len(response.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                old = self._conn.execute("SELECT size FROM completions WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, response, tokens, size, created_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, response, int(tokens or 0), size, now, now)
+                )
+            self._total_bytes += size - (old[0] if old else 0)
+            self.stats['stores'] += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        """크기 상한 초과 시 오래 사용되지 않은 항목부터 삭제 (lock 보유 상태에서 호출)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)  # 매 저장마다 삭제하지 않도록 여유 확보
+        with self._conn:
+            rows = self._conn.execute(
+                "SELECT key, size FROM completions ORDER BY last_access"
+            ).fetchall()
+            evicted = []
+            for key, size in rows:
+                if self._total_bytes <= target:
+                    break
+                evicted.append((key,))
+                self._total_bytes -= size
+            self._conn.executemany("DELETE FROM completions WHERE key = ?", evicted)
+        self.stats['evictions'] += len(evicted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            total_bytes = self._total_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['size_mb'] = round(total_bytes / (1024 * 1024), 3)
+        stats['path'] = self.path
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# 전역 캐시 (싱글톤, 비활성화 시 None)
+_completion_cache: Optional[CompletionCache] = None
+_completion_cache_resolved = False
+_completion_cache_lock = threading.Lock()
+
+
+def _configured_cache() -> Optional[CompletionCache]:
+    """LLM_COMPLETION_CACHE 환경 변수 > model_config.yaml 순으로 캐시 설정 확인"""
+    env_path = os.getenv('LLM_COMPLETION_CACHE')
+    if env_path:
+        return CompletionCache(env_path)
+
+    try:
+        from core.config import get_llm_config
+        cache_config = (get_llm_config() or {}).get('completion_cache') or {}
+    except Exception:
+        cache_config = {}
+    if not cache_config.get('enabled', False):
+        return None
+    return CompletionCache(
+        cache_config.get('path', DEFAULT_CACHE_PATH),
+        int(cache_config.get('max_mb', DEFAULT_MAX_MB) * 1024 * 1024)
+    )
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """완성 결과 캐시 가져오기 (싱글톤, 비활성화 시 None)"""
+    global _completion_cache, _completion_cache_resolved
+    if _completion_cache_resolved:
+        return _completion_cache
+    with _completion_cache_lock:
+        if not _completion_cache_resolved:
+            _completion_cache = _configured_cache()
+            _completion_cache_resolved = True
+            if _completion_cache is not None:
+                print(f"[CompletionCache] 활성화: {_completion_cache.path}")
+    return _completion_cache
+
+
+def configure_completion_cache(path: Optional[str] = DEFAULT_CACHE_PATH,
+                               max_mb: float = DEFAULT_MAX_MB) -> Optional[CompletionCache]:
+    """
+    캐시 활성화 (path=None이면 비활성화)
+
+    Returns:
+        새 캐시 인스턴스 (비활성화 시 None)
+    """
+    global _completion_cache, _completion_cache_resolved
+    with _completion_cache_lock:
+        if _completion_cache is not None:
+            _completion_cache.close()
+        _completion_cache = CompletionCache(path, int(max_mb * 1024 * 1024)) if path else None
+        _completion_cache_resolved = True
+    return _completion_cache
+
+
+def get_completion_cache_stats() -> Dict[str, Any]:
+    """실행 요약용 캐시 통계 (적중/미스, 절약 토큰)"""
+    cache = get_completion_cache()
+    if cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **cache.get_stats()}
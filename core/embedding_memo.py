@@ -0,0 +1,84 @@
+"""
+턴 단위 로컬 임베딩 메모 (model, text) → 벡터
+
+한 턴 안에서 같은 질의를 여러 번 임베딩하는 경로를 하나의 인코더 forward pass로 합칩니다.
+(check_similarity의 find_similar와 store_response의 ResponseCache.add가 같은 user_text를 임베딩)
+
+- 범위: run_agent / run_agent_async가 embedding_turn()으로 턴마다 새 메모를 설정 (contextvars)
+  → asyncio 태스크와 copy_context로 실행되는 스레드(Speculative Retrieval 등)도 같은 메모를 봄
+- 턴 밖(스크립트, 테스트)에서는 메모 없이 매번 계산
+- 로컬 인코더(SentenceTransformer 등)를 쓰는 곳은 memoized_embedding()으로 감싸서 사용
+"""
+
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+class TurnEmbeddingMemo:
+    """한 턴 동안의 (model, text) → 임베딩 (스레드 안전, 키별 한 번만 계산)"""
+
+    def __init__(self):
+        self._vectors: Dict[Tuple[str, str], Any] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0  # 실제 인코더 forward pass 수
+
+    def get_or_compute(self, model: str, text: str, compute: Callable[[str], Any]) -> Any:
+        key = (model, text)
+        with self._lock:
+            if key in self._vectors:
+                self.hits += 1
+                return self._vectors[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        # 같은 키를 동시에 요청한 스레드는 첫 계산을 기다림
+        with key_lock:
+            with self._lock:
+                if key in self._vectors:
+                    self.hits += 1
+                    return self._vectors[key]
+            vector = compute(text)
+            with self._lock:
+                self._vectors[key] = vector
+                self.misses += 1
+            return vector
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'forward_passes': self.misses, 'size': len(self._vectors)}
+
+
+# 현재 턴의 메모 (없으면 None: 메모 없이 계산)
+_turn_memo: contextvars.ContextVar = contextvars.ContextVar('turn_embedding_memo', default=None)
+
+
+@contextmanager
+def embedding_turn() -> Iterator[TurnEmbeddingMemo]:
+    """턴 범위 설정 (중첩 시 바깥 턴의 메모를 그대로 사용)"""
+    memo = _turn_memo.get()
+    if memo is not None:
+        yield memo
+        return
+    memo = TurnEmbeddingMemo()
+    token = _turn_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _turn_memo.reset(token)
+
+
+def memoized_embedding(model: str, text: str, compute: Callable[[str], Any]) -> Any:
+    """현재 턴 메모에서 임베딩 조회, 없으면 compute(text)로 계산 후 저장"""
+    memo = _turn_memo.get()
+    if memo is None:
+        return compute(text)
+    return memo.get_or_compute(model, text, compute)
+
+
+def get_turn_embedding_stats() -> Optional[Dict[str, int]]:
+    """현재 턴의 메모 통계 (턴 밖이면 None)"""
+    memo = _turn_memo.get()
+    return memo.stats() if memo is not None else None
@@ -2,13 +2,153 @@
 LLM 클라이언트 통합
 - OpenAI API
 - Google Gemini API
+- Mock (API 키 없이 부하 테스트용 결정적 응답 / 임베딩)
 - 통일된 인터페이스
+- 프로세스 전역 클라이언트 풀 (HTTP 커넥션 풀 공유) + RPM/TPM 제한 + 재시도/deadline
 """
 
 import os
-from typing import Dict, Any, Optional, List
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from abc import ABC, abstractmethod
 
+from core.tracing import trace_span, record_token_usage
+from core.rate_limiter import RetryPolicy, get_rate_limiter, call_with_retry, acall_with_retry, get_throttling_stats
+from core.completion_cache import completion_key, get_completion_cache
+
+
+# 설정 누락 시 기본 한도 (config/model_config.yaml의 llm.rate_limit / request_timeout / max_retries)
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+DEFAULT_REQUEST_TIMEOUT = 60.0
+DEFAULT_MAX_RETRIES = 4
+
+# 배치 임베딩 기본값 (config/corpus_config.yaml의 embedding.batch_size가 우선)
+DEFAULT_EMBED_BATCH_SIZE = 128
+DEFAULT_EMBED_BATCH_TOKENS = 250000  # OpenAI 요청당 입력 토큰 상한(300k) 아래로 여유
+DEFAULT_EMBED_WORKERS = 4
+
+
+def _pool_settings() -> Dict[str, Any]:
+    """호출 제한/재시도 설정 (model_config.yaml의 llm 섹션, 없으면 기본값)"""
+    try:
+        from core.config import get_llm_config
+        llm_config = get_llm_config() or {}
+    except Exception:
+        llm_config = {}
+    rate_limit = llm_config.get('rate_limit') or {}
+    return {
+        'requests_per_minute': rate_limit.get('requests_per_minute', DEFAULT_REQUESTS_PER_MINUTE),
+        'tokens_per_minute': rate_limit.get('tokens_per_minute', DEFAULT_TOKENS_PER_MINUTE),
+        'request_timeout': llm_config.get('request_timeout', DEFAULT_REQUEST_TIMEOUT),
+        'max_retries': llm_config.get('max_retries', DEFAULT_MAX_RETRIES),
+    }
+
+
+def _estimate_tokens(texts: List[str], max_tokens: int = 0) -> int:
+    """TPM 예약량 추정: 입력 문자 수 / 2 (한국어 기준 보수적) + 최대 출력 토큰"""
+    return sum(len(text or '') for text in texts) // 2 + (max_tokens or 0)
+
+
+def _cache_lookup(provider: str, model: str, messages: List[Dict[str, str]],
+                  options: Dict[str, Any], kwargs: Dict[str, Any]):
+    """
+    완성 캐시 조회 → (cache, key, cached_text)
+
+    캐시 비활성화 또는 use_cache=False(호출별 우회)이면 (None, None, None)
+    """
+    if not kwargs.get('use_cache', True):
+        return None, None, None
+    cache = get_completion_cache()
+    if cache is None:
+        return None, None, None
+    key = completion_key(provider, model, messages, options.get('temperature'),
+                         options.get('max_tokens'), options.get('response_format'))
+    return cache, key, cache.get(key)
+
+
+def _embed_batch_size() -> int:
+    try:
+        from core.config import get_embedding_config
+        return int(get_embedding_config().get('batch_size', DEFAULT_EMBED_BATCH_SIZE))
+    except Exception:
+        return DEFAULT_EMBED_BATCH_SIZE
+
+
+def chunk_texts(texts: List[str], batch_size: int, max_batch_tokens: int) -> List[List[int]]:
+    """
+    배치 임베딩 요청 분할 (텍스트 인덱스 목록의 리스트, 입력 순서 유지)
+
+    한 요청에 batch_size개 이하, 추정 토큰 max_batch_tokens 이하만 담습니다.
+    상한보다 큰 단일 텍스트는 단독 요청으로 보냅니다.
+    """
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for i, text in enumerate(texts):
+        tokens = _estimate_tokens([text])
+        if current and (len(current) >= batch_size or current_tokens + tokens > max_batch_tokens):
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# api_key별 공유 openai.OpenAI (httpx 커넥션 풀 공유, SDK 자체 재시도는 끄고 call_with_retry 사용)
+_shared_openai_clients: Dict[str, Any] = {}
+_shared_openai_lock = threading.Lock()
+
+
+def _get_shared_openai(api_key: str):
+    with _shared_openai_lock:
+        client = _shared_openai_clients.get(api_key)
+        if client is None:
+            import openai
+            client = openai.OpenAI(api_key=api_key, max_retries=0)
+            _shared_openai_clients[api_key] = client
+        return client
+
+
+# (이벤트 루프, api_key)별 공유 openai.AsyncOpenAI (httpx 커넥션 풀이 루프에 묶임)
+# 루프가 사라지면 해당 루프의 클라이언트도 함께 해제
+_shared_async_openai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_shared_async_openai(api_key: str):
+    loop = asyncio.get_running_loop()
+    with _shared_openai_lock:
+        clients = _shared_async_openai_clients.get(loop)
+        if clients is None:
+            clients = {}
+            _shared_async_openai_clients[loop] = clients
+        client = clients.get(api_key)
+        if client is None:
+            import openai
+            client = openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+            clients[api_key] = client
+        return client
+
+
+async def aclose_shared_async_openai() -> None:
+    """현재 이벤트 루프의 공유 AsyncOpenAI 클라이언트 종료 (루프 종료 전 호출)"""
+    with _shared_openai_lock:
+        clients = _shared_async_openai_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
 
 class LLMClient(ABC):
     """LLM 클라이언트 추상 클래스"""
@@ -23,6 +163,124 @@ class LLMClient(ABC):
         """임베딩 생성 (선택적)"""
         pass
 
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """
+        스트리밍 텍스트 생성 (텍스트 조각을 순서대로 yield)
+
+        기본 구현은 generate 결과 전체를 한 번에 yield합니다.
+        스트리밍 API가 있는 클라이언트는 이 메서드를 재정의합니다.
+        """
+        yield self.generate(prompt, system_prompt, **kwargs)
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """
+        비동기 텍스트 생성
+
+        기본 구현은 동기 generate를 스레드 풀에서 실행합니다.
+        네이티브 비동기 SDK가 있는 클라이언트는 이 메서드를 재정의합니다.
+        """
+        return await asyncio.to_thread(self.generate, prompt, system_prompt, **kwargs)
+
+    async def aembed(self, text: str, **kwargs) -> List[float]:
+        """비동기 임베딩 생성 (기본: 스레드 풀에서 동기 embed 실행)"""
+        return await asyncio.to_thread(self.embed, text, **kwargs)
+
+    def _embed_chunk(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """요청 1건 분량의 임베딩 (기본: 텍스트별 embed, 배치 API가 있으면 재정의)"""
+        return [self.embed(text, **kwargs) for text in texts]
+
+    async def _aembed_chunk(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return await asyncio.to_thread(self._embed_chunk, texts, **kwargs)
+
+    def _embed_chunk_or_each(self, texts: List[str], **kwargs) -> List[Optional[List[float]]]:
+        """
+        청크 임베딩, 실패 시 텍스트별로 재시도 (부분 실패 처리)
+
+        재시도 후에도 실패한 텍스트 자리는 None
+        """
+        try:
+            return self._embed_chunk(texts, **kwargs)
+        except Exception as e:
+            print(f"[WARNING] 배치 임베딩 실패 ({len(texts)}개), 개별 요청으로 재시도: {e}")
+        return self._embed_each(texts, **kwargs)
+
+    def _embed_each(self, texts: List[str], **kwargs) -> List[Optional[List[float]]]:
+        """텍스트별 embed (실패한 자리는 None)"""
+        vectors: List[Optional[List[float]]] = []
+        for text in texts:
+            try:
+                vectors.append(self.embed(text, **kwargs))
+            except Exception as e:
+                print(f"[ERROR] 임베딩 실패: {e}")
+                vectors.append(None)
+        return vectors
+
+    def embed_batch(self, texts: List[str], batch_size: Optional[int] = None,
+                    max_batch_tokens: int = DEFAULT_EMBED_BATCH_TOKENS,
+                    max_workers: int = DEFAULT_EMBED_WORKERS, **kwargs) -> List[Optional[List[float]]]:
+        """
+        배치 임베딩 생성
+
+        개수(batch_size) / 추정 토큰(max_batch_tokens) 기준으로 요청을 나누고
+        청크들을 스레드 풀에서 동시에 보냅니다 (호출 한도는 공유 RateLimiter가 조절).
+
+        Args:
+            texts: 임베딩할 텍스트 목록
+            batch_size: 요청당 최대 텍스트 수 (없으면 embedding.batch_size 설정)
+            max_batch_tokens: 요청당 최대 추정 토큰 수
+            max_workers: 동시에 보낼 청크 수
+            **kwargs: embed와 동일 (embedding_model 등)
+
+        Returns:
+            입력 순서와 같은 벡터 목록 (실패한 텍스트는 None)
+        """
+        if not texts:
+            return []
+        chunks = chunk_texts(texts, batch_size or _embed_batch_size(), max_batch_tokens)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        with trace_span("llm.embed_batch", texts=len(texts), chunks=len(chunks)) as span:
+            def _run(indices: List[int]):
+                return indices, self._embed_chunk_or_each([texts[i] for i in indices], **kwargs)
+
+            if len(chunks) == 1 or max_workers <= 1:
+                outputs = [_run(indices) for indices in chunks]
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                    outputs = list(executor.map(_run, chunks))
+
+            for indices, vectors in outputs:
+                for i, vector in zip(indices, vectors):
+                    results[i] = vector
+            span.set_attribute('failed', sum(1 for vector in results if vector is None))
+        return results
+
+    async def aembed_batch(self, texts: List[str], batch_size: Optional[int] = None,
+                           max_batch_tokens: int = DEFAULT_EMBED_BATCH_TOKENS,
+                           max_workers: int = DEFAULT_EMBED_WORKERS, **kwargs) -> List[Optional[List[float]]]:
+        """embed_batch()의 asyncio 버전 (청크를 동시에 await)"""
+        if not texts:
+            return []
+        chunks = chunk_texts(texts, batch_size or _embed_batch_size(), max_batch_tokens)
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def _run(indices: List[int]):
+            chunk = [texts[i] for i in indices]
+            async with semaphore:
+                try:
+                    return await self._aembed_chunk(chunk, **kwargs)
+                except Exception as e:
+                    print(f"[WARNING] 배치 임베딩 실패 ({len(chunk)}개), 개별 요청으로 재시도: {e}")
+                    return await asyncio.to_thread(self._embed_each, chunk, **kwargs)
+
+        outputs = await asyncio.gather(*(_run(indices) for indices in chunks))
+
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        for indices, vectors in zip(chunks, outputs):
+            for i, vector in zip(indices, vectors):
+                results[i] = vector
+        return results
+
 
 class OpenAIClient(LLMClient):
     """OpenAI 클라이언트"""
@@ -38,33 +296,167 @@ class OpenAIClient(LLMClient):
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
         
         try:
-            import openai
-            self.client = openai.OpenAI(api_key=self.api_key)
+            self.client = _get_shared_openai(self.api_key)
         except ImportError:
             raise ImportError("openai 패키지가 설치되지 않았습니다. pip install openai")
-    
-    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
-        """텍스트 생성"""
+
+        settings = _pool_settings()
+        self.limiter = get_rate_limiter('openai', settings['requests_per_minute'], settings['tokens_per_minute'])
+        self.retry_policy = RetryPolicy(max_retries=settings['max_retries'], deadline_s=settings['request_timeout'])
+
+    def _get_async_client(self):
+        """현재 이벤트 루프용 AsyncOpenAI 클라이언트 반환 (루프/api_key별 공유, 인스턴스 상태 변경 없음)"""
+        return _get_shared_async_openai(self.api_key)
+
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """chat.completions 메시지 구성"""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=kwargs.get('temperature', self.temperature),
-                max_tokens=kwargs.get('max_tokens', self.max_tokens)
+        return messages
+
+    def _extract_content(self, response) -> str:
+        """응답에서 본문 추출 (비어있으면 에러)"""
+        if not response.choices or not response.choices[0].message.content:
+            raise ValueError("LLM 응답이 비어있습니다")
+        return response.choices[0].message.content
+
+    def _resolve_embedding_model(self, embedding_model: Optional[str] = None) -> str:
+        """임베딩 모델명 결정: 인자 > 인스턴스 속성 > 설정 기본값"""
+        if embedding_model is None:
+            embedding_model = getattr(self, 'embedding_model', None)
+
+        if embedding_model is None:
+            # 설정에서 읽기
+            from core.config import get_embedding_config
+            embedding_config = get_embedding_config()
+            embedding_model = embedding_config.get('model', 'text-embedding-3-large')
+
+        return embedding_model
+
+    def _extract_embedding(self, response) -> List[float]:
+        """응답에서 임베딩 벡터 추출 (비어있으면 에러)"""
+        if not response.data or not response.data[0].embedding:
+            raise ValueError("임베딩 응답이 비어있습니다")
+        return response.data[0].embedding
+    
+    def _completion_options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """chat.completions 옵션 (response_format: 구조화 출력 JSON schema, 선택)"""
+        options = {
+            'temperature': kwargs.get('temperature', self.temperature),
+            'max_tokens': kwargs.get('max_tokens', self.max_tokens),
+        }
+        if kwargs.get('response_format'):
+            options['response_format'] = kwargs['response_format']
+        return options
+
+    def _reserved_tokens(self, messages: List[Dict[str, str]], options: Dict[str, Any]) -> int:
+        return _estimate_tokens([m['content'] for m in messages], options.get('max_tokens', 0))
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """
+        텍스트 생성
+
+        kwargs의 deadline_s로 호출별 전체 시간 상한(대기 + 재시도 포함)을 지정할 수 있습니다.
+        완성 캐시가 활성화되어 있으면 같은 요청은 캐시에서 반환합니다 (use_cache=False로 우회).
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        options = self._completion_options(kwargs)
+
+        # 429/5xx는 재시도, 그 외 에러는 그대로 전파 (상위에서 처리)
+        with trace_span("llm.generate", provider="openai", model=self.model) as span:
+            cache, key, cached = _cache_lookup('openai', self.model, messages, options, kwargs)
+            if cached is not None:
+                span.set_attribute('completion_cache', 'hit')
+                return cached
+
+            response = call_with_retry(
+                lambda timeout: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    timeout=timeout,
+                    **options
+                ),
+                self.limiter, self.retry_policy,
+                tokens=self._reserved_tokens(messages, options),
+                deadline_s=kwargs.get('deadline_s')
             )
-            
-            if not response.choices or not response.choices[0].message.content:
+            record_token_usage(span, getattr(response, 'usage', None))
+        content = self._extract_content(response)
+        if cache is not None:
+            cache.put(key, content, getattr(getattr(response, 'usage', None), 'total_tokens', 0))
+        return content
+
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """스트리밍 텍스트 생성 (stream=True, delta.content 조각 yield)"""
+        messages = self._build_messages(prompt, system_prompt)
+
+        max_tokens = kwargs.get('max_tokens', self.max_tokens)
+
+        with trace_span("llm.generate_stream", provider="openai", model=self.model) as span:
+            # 재시도는 스트림 연결까지만 (조각을 내보낸 뒤에는 재시도하지 않음)
+            stream = call_with_retry(
+                lambda timeout: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=kwargs.get('temperature', self.temperature),
+                    max_tokens=max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    timeout=timeout
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([m['content'] for m in messages], max_tokens),
+                deadline_s=kwargs.get('deadline_s')
+            )
+
+            received = False
+            for chunk in stream:
+                # include_usage: 마지막 청크는 choices 없이 usage만 포함
+                if getattr(chunk, 'usage', None) is not None:
+                    record_token_usage(span, chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not received:
+                        span.set_attribute('time_to_first_token_ms', span.elapsed_ms())
+                        received = True
+                    yield delta
+
+            if not received:
                 raise ValueError("LLM 응답이 비어있습니다")
-            
-            return response.choices[0].message.content
-        except Exception as e:
-            # 에러를 그대로 전파 (상위에서 처리)
-            raise
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """비동기 텍스트 생성 (AsyncOpenAI)"""
+        messages = self._build_messages(prompt, system_prompt)
+
+        options = self._completion_options(kwargs)
+
+        with trace_span("llm.generate", provider="openai", model=self.model, is_async=True) as span:
+            cache, key, cached = _cache_lookup('openai', self.model, messages, options, kwargs)
+            if cached is not None:
+                span.set_attribute('completion_cache', 'hit')
+                return cached
+
+            client = self._get_async_client()
+            response = await acall_with_retry(
+                lambda timeout: client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    timeout=timeout,
+                    **options
+                ),
+                self.limiter, self.retry_policy,
+                tokens=self._reserved_tokens(messages, options),
+                deadline_s=kwargs.get('deadline_s')
+            )
+            record_token_usage(span, getattr(response, 'usage', None))
+        content = self._extract_content(response)
+        if cache is not None:
+            cache.put(key, content, getattr(getattr(response, 'usage', None), 'total_tokens', 0))
+        return content
     
     def embed(self, text: str, embedding_model: Optional[str] = None) -> List[float]:
         """
@@ -77,37 +469,93 @@ class OpenAIClient(LLMClient):
         Returns:
             임베딩 벡터 (3072차원 for text-embedding-3-large)
         """
-        # 모델명 결정: 인자 > 인스턴스 속성 > 기본값
-        if embedding_model is None:
-            embedding_model = getattr(self, 'embedding_model', None)
-        
-        if embedding_model is None:
-            # 설정에서 읽기
-            from core.config import get_embedding_config
-            embedding_config = get_embedding_config()
-            embedding_model = embedding_config.get('model', 'text-embedding-3-large')
-        
-        try:
-            response = self.client.embeddings.create(
-                model=embedding_model,
-                input=text
+        embedding_model = self._resolve_embedding_model(embedding_model)
+
+        # 에러는 그대로 전파 (상위에서 처리)
+        with trace_span("llm.embed", provider="openai", model=embedding_model) as span:
+            response = call_with_retry(
+                lambda timeout: self.client.embeddings.create(
+                    model=embedding_model,
+                    input=text,
+                    timeout=timeout
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([text])
             )
-            
-            if not response.data or not response.data[0].embedding:
-                raise ValueError("임베딩 응답이 비어있습니다")
-            
-            return response.data[0].embedding
-        except Exception as e:
-            # 에러를 그대로 전파 (상위에서 처리)
-            raise
+            record_token_usage(span, getattr(response, 'usage', None))
+        return self._extract_embedding(response)
+
+    async def aembed(self, text: str, embedding_model: Optional[str] = None) -> List[float]:
+        """비동기 임베딩 생성 (AsyncOpenAI)"""
+        embedding_model = self._resolve_embedding_model(embedding_model)
+
+        with trace_span("llm.embed", provider="openai", model=embedding_model, is_async=True) as span:
+            client = self._get_async_client()
+            response = await acall_with_retry(
+                lambda timeout: client.embeddings.create(
+                    model=embedding_model,
+                    input=text,
+                    timeout=timeout
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([text])
+            )
+            record_token_usage(span, getattr(response, 'usage', None))
+        return self._extract_embedding(response)
+
+    def _extract_embeddings(self, response, expected: int) -> List[List[float]]:
+        """배치 응답에서 벡터 추출 (data[].index 기준으로 입력 순서 복원)"""
+        data = sorted(response.data or [], key=lambda item: item.index)
+        if len(data) != expected or any(not item.embedding for item in data):
+            raise ValueError(f"임베딩 응답 개수 불일치 ({len(data)}/{expected})")
+        return [item.embedding for item in data]
+
+    def _embed_chunk(self, texts: List[str], embedding_model: Optional[str] = None) -> List[List[float]]:
+        """요청 1건으로 여러 텍스트 임베딩 (embeddings.create input=list)"""
+        embedding_model = self._resolve_embedding_model(embedding_model)
+
+        with trace_span("llm.embed", provider="openai", model=embedding_model, batch=len(texts)) as span:
+            response = call_with_retry(
+                lambda timeout: self.client.embeddings.create(
+                    model=embedding_model,
+                    input=texts,
+                    timeout=timeout
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens(texts)
+            )
+            record_token_usage(span, getattr(response, 'usage', None))
+        return self._extract_embeddings(response, len(texts))
+
+    async def _aembed_chunk(self, texts: List[str], embedding_model: Optional[str] = None) -> List[List[float]]:
+        embedding_model = self._resolve_embedding_model(embedding_model)
+
+        with trace_span("llm.embed", provider="openai", model=embedding_model, batch=len(texts), is_async=True) as span:
+            client = self._get_async_client()
+            response = await acall_with_retry(
+                lambda timeout: client.embeddings.create(
+                    model=embedding_model,
+                    input=texts,
+                    timeout=timeout
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens(texts)
+            )
+            record_token_usage(span, getattr(response, 'usage', None))
+        return self._extract_embeddings(response, len(texts))
 
 
 class GeminiClient(LLMClient):
     """Google Gemini 클라이언트"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = 'gemini-2.0-flash-exp', **kwargs):
+    # embed_content 요청당 최대 텍스트 수
+    EMBED_BATCH_LIMIT = 100
+
+    def __init__(self, api_key: Optional[str] = None, model: str = 'gemini-2.0-flash-exp',
+                 embedding_model: Optional[str] = None, **kwargs):
         self.api_key = api_key or os.getenv('GOOGLE_API_KEY')
         self.model = model
+        self.embedding_model = embedding_model
         self.temperature = kwargs.get('temperature', 0.7)
         self.max_tokens = kwargs.get('max_tokens', 1000)
         
@@ -118,46 +566,536 @@ class GeminiClient(LLMClient):
             import google.generativeai as genai
             genai.configure(api_key=self.api_key)
             self.client = genai.GenerativeModel(self.model)
+            self._genai = genai
         except ImportError:
             raise ImportError("google-generativeai 패키지가 설치되지 않았습니다. pip install google-generativeai")
+
+        settings = _pool_settings()
+        self.limiter = get_rate_limiter('gemini', settings['requests_per_minute'], settings['tokens_per_minute'])
+        self.retry_policy = RetryPolicy(max_retries=settings['max_retries'], deadline_s=settings['request_timeout'])
     
-    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
-        """텍스트 생성"""
+    @staticmethod
+    def _record_usage(span, response) -> None:
+        """Gemini usage_metadata를 OpenAI 스타일 토큰 속성으로 기록"""
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return
+        record_token_usage(span, {
+            'prompt_tokens': getattr(usage, 'prompt_token_count', None),
+            'completion_tokens': getattr(usage, 'candidates_token_count', None),
+            'total_tokens': getattr(usage, 'total_token_count', None),
+        })
+
+    def _cache_lookup(self, full_prompt: str, generation_config: Dict[str, Any], kwargs: Dict[str, Any]):
+        options = {
+            'temperature': generation_config['temperature'],
+            'max_tokens': generation_config['max_output_tokens'],
+            'response_format': generation_config.get('response_mime_type'),
+        }
+        return _cache_lookup('gemini', self.model, [{'role': 'user', 'content': full_prompt}], options, kwargs)
+
+    @staticmethod
+    def _total_tokens(response) -> int:
+        return getattr(getattr(response, 'usage_metadata', None), 'total_token_count', 0) or 0
+
+    def _build_request(self, prompt: str, system_prompt: Optional[str], kwargs: Dict[str, Any]):
+        """Gemini 요청 (프롬프트, generation_config) 구성"""
         full_prompt = prompt
         if system_prompt:
             full_prompt = f"{system_prompt}\n\n{prompt}"
-        
-        response = self.client.generate_content(
-            full_prompt,
-            generation_config={
-                'temperature': kwargs.get('temperature', self.temperature),
-                'max_output_tokens': kwargs.get('max_tokens', self.max_tokens)
-            }
-        )
-        
+
+        generation_config = {
+            'temperature': kwargs.get('temperature', self.temperature),
+            'max_output_tokens': kwargs.get('max_tokens', self.max_tokens)
+        }
+        if kwargs.get('response_format'):
+            # Gemini는 OpenAI JSON schema 형식을 받지 않으므로 JSON 모드만 사용
+            generation_config['response_mime_type'] = 'application/json'
+        return full_prompt, generation_config
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """텍스트 생성"""
+        full_prompt, generation_config = self._build_request(prompt, system_prompt, kwargs)
+
+        with trace_span("llm.generate", provider="gemini", model=self.model) as span:
+            cache, key, cached = self._cache_lookup(full_prompt, generation_config, kwargs)
+            if cached is not None:
+                span.set_attribute('completion_cache', 'hit')
+                return cached
+
+            response = call_with_retry(
+                lambda timeout: self.client.generate_content(
+                    full_prompt,
+                    generation_config=generation_config,
+                    request_options={'timeout': timeout} if timeout else None
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([full_prompt], generation_config['max_output_tokens']),
+                deadline_s=kwargs.get('deadline_s')
+            )
+            self._record_usage(span, response)
+
+        if cache is not None:
+            cache.put(key, response.text, self._total_tokens(response))
+        return response.text
+
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """스트리밍 텍스트 생성 (generate_content(stream=True))"""
+        full_prompt, generation_config = self._build_request(prompt, system_prompt, kwargs)
+
+        with trace_span("llm.generate_stream", provider="gemini", model=self.model) as span:
+            response = call_with_retry(
+                lambda timeout: self.client.generate_content(
+                    full_prompt,
+                    generation_config=generation_config,
+                    stream=True,
+                    request_options={'timeout': timeout} if timeout else None
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([full_prompt], generation_config['max_output_tokens']),
+                deadline_s=kwargs.get('deadline_s')
+            )
+            for chunk in response:
+                text = getattr(chunk, 'text', '')
+                if text:
+                    yield text
+            self._record_usage(span, response)
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """비동기 텍스트 생성 (generate_content_async)"""
+        full_prompt, generation_config = self._build_request(prompt, system_prompt, kwargs)
+
+        with trace_span("llm.generate", provider="gemini", model=self.model, is_async=True) as span:
+            cache, key, cached = self._cache_lookup(full_prompt, generation_config, kwargs)
+            if cached is not None:
+                span.set_attribute('completion_cache', 'hit')
+                return cached
+
+            response = await acall_with_retry(
+                lambda timeout: self.client.generate_content_async(
+                    full_prompt,
+                    generation_config=generation_config,
+                    request_options={'timeout': timeout} if timeout else None
+                ),
+                self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([full_prompt], generation_config['max_output_tokens']),
+                deadline_s=kwargs.get('deadline_s')
+            )
+            self._record_usage(span, response)
+
+        if cache is not None:
+            cache.put(key, response.text, self._total_tokens(response))
         return response.text
     
-    def embed(self, text: str) -> List[float]:
-        """임베딩 생성 (Gemini는 임베딩 API가 다를 수 있음)"""
-        # Gemini 임베딩은 별도 구현 필요
-        raise NotImplementedError("Gemini 임베딩은 별도 구현이 필요합니다.")
+    def _resolve_embedding_model(self, embedding_model: Optional[str] = None) -> str:
+        """임베딩 모델명 결정: 인자 > 인스턴스 속성 > 설정(provider가 gemini일 때) > 기본값"""
+        embedding_model = embedding_model or self.embedding_model
+        if embedding_model is None:
+            try:
+                from core.config import get_embedding_config
+                embedding_config = get_embedding_config()
+                if embedding_config.get('provider') == 'gemini':
+                    embedding_model = embedding_config.get('model')
+            except Exception:
+                pass
+        embedding_model = embedding_model or 'text-embedding-004'
+        return embedding_model if embedding_model.startswith('models/') else f"models/{embedding_model}"
+
+    def _embed_content(self, content, embedding_model: Optional[str], tokens: int):
+        """genai.embed_content 호출 (단일 문자열 또는 리스트)"""
+        embedding_model = self._resolve_embedding_model(embedding_model)
+
+        with trace_span("llm.embed", provider="gemini", model=embedding_model) as span:
+            result = call_with_retry(
+                lambda timeout: self._genai.embed_content(
+                    model=embedding_model,
+                    content=content,
+                    request_options={'timeout': timeout} if timeout else None
+                ),
+                self.limiter, self.retry_policy,
+                tokens=tokens
+            )
+            if isinstance(content, list):
+                span.set_attribute('batch', len(content))
+        embedding = result.get('embedding') if isinstance(result, dict) else getattr(result, 'embedding', None)
+        if not embedding:
+            raise ValueError("임베딩 응답이 비어있습니다")
+        return embedding
+
+    def embed(self, text: str, embedding_model: Optional[str] = None) -> List[float]:
+        """임베딩 생성 (genai.embed_content)"""
+        return self._embed_content(text, embedding_model, _estimate_tokens([text]))
+
+    def _embed_chunk(self, texts: List[str], embedding_model: Optional[str] = None) -> List[List[float]]:
+        """요청당 EMBED_BATCH_LIMIT개씩 content=list로 임베딩"""
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.EMBED_BATCH_LIMIT):
+            part = texts[start:start + self.EMBED_BATCH_LIMIT]
+            embeddings = self._embed_content(part, embedding_model, _estimate_tokens(part))
+            if len(embeddings) != len(part):
+                raise ValueError(f"임베딩 응답 개수 불일치 ({len(embeddings)}/{len(part)})")
+            vectors.extend(embeddings)
+        return vectors
+
+
+class MockAPIError(Exception):
+    """모의 API 오류 (status_code로 재시도 여부 결정: 429 / 503 / 504)"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"mock API error (status {status_code})")
+        self.status_code = status_code
+
+
+def _stable_seed(*parts: Any) -> int:
+    """입력에 대한 안정적인 정수 시드 (프로세스/실행 순서와 무관)"""
+    digest = hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+# 임베딩 모델별 차원 (mock 임베딩이 실제 인덱스와 같은 차원을 갖도록)
+_EMBEDDING_DIMENSIONS = {
+    'text-embedding-3-large': 3072,
+    'text-embedding-3-small': 1536,
+    'text-embedding-ada-002': 1536,
+    'text-embedding-004': 768,
+}
+
+_MOCK_ANSWER_SENTENCES = [
+    "제공된 문서에 따르면 현재 복용 중인 약물과의 상호작용을 먼저 확인하는 것이 중요합니다.",
+    "증상이 지속되거나 악화되면 담당 의사와 상담하시기 바랍니다.",
+    "규칙적인 생활 습관과 식이 조절이 도움이 될 수 있습니다.",
+    "검사 수치는 개인의 병력에 따라 해석이 달라질 수 있습니다.",
+    "처방된 용량을 임의로 변경하지 않도록 주의하세요.",
+    "정기적인 추적 검사를 통해 경과를 관찰하는 것이 권장됩니다.",
+    "일반적으로 알려진 부작용으로는 위장 장애와 두통 등이 있습니다.",
+]
+
+
+class MockLLMClient(LLMClient):
+    """
+    결정적 모의 LLM / 임베딩 클라이언트 (API 키 없이 전체 그래프 부하 테스트용)
+
+    - 응답: (seed, model, 프롬프트) 해시로 결정되는 답변 / 품질 평가 JSON / 재작성 질의
+    - 임베딩: (seed, 텍스트) 해시 기반 단위 벡터 (임베딩 모델 차원)
+    - 지연 시간 분포(fixed / uniform / lognormal / exponential)와 오류율(429 / 503)을 주입
+      (오류는 실제 클라이언트와 같은 RateLimiter / 재시도 경로를 거침)
+
+    설정 우선순위: 생성자 인자 > MOCK_LLM_* 환경 변수 > model_config.yaml의 llm.mock > 기본값
+    """
+
+    def __init__(self, model: str = 'mock-llm', embedding_model: Optional[str] = None, **kwargs):
+        settings = self._settings(kwargs)
+        self.model = model
+        self.embedding_model = embedding_model
+        self.temperature = kwargs.get('temperature', 0.7)
+        self.max_tokens = kwargs.get('max_tokens', 1000)
+        self.seed = int(settings['seed'])
+        self.latency_ms = float(settings['latency_ms'])
+        self.latency_distribution = settings['latency_distribution']
+        self.latency_sigma = float(settings['latency_sigma'])
+        self.embed_latency_ms = float(settings['embed_latency_ms'])
+        self.error_rate = float(settings['error_rate'])
+        self.embedding_dimension = settings['embedding_dimension']
+
+        # 지연/오류 샘플링은 호출 순서 기준으로 재현 (응답 내용은 프롬프트 해시로 결정)
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+        pool = _pool_settings()
+        self.limiter = get_rate_limiter('mock', pool['requests_per_minute'], pool['tokens_per_minute'])
+        self.retry_policy = RetryPolicy(max_retries=pool['max_retries'], deadline_s=pool['request_timeout'])
+
+    @staticmethod
+    def _settings(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            from core.config import get_llm_config
+            mock_config = (get_llm_config() or {}).get('mock') or {}
+        except Exception:
+            mock_config = {}
+
+        defaults = {
+            'seed': 0,
+            'latency_ms': 0.0,
+            'latency_distribution': 'fixed',
+            'latency_sigma': 0.5,
+            'embed_latency_ms': 0.0,
+            'error_rate': 0.0,
+            'embedding_dimension': None,
+        }
+        settings = {}
+        for name, default in defaults.items():
+            env_value = os.getenv(f"MOCK_LLM_{name.upper()}")
+            if name in kwargs:
+                settings[name] = kwargs[name]
+            elif env_value is not None:
+                settings[name] = env_value
+            else:
+                settings[name] = mock_config.get(name, default)
+        return settings
+
+    # ===== 지연 / 오류 주입 =====
+
+    def _sample_latency(self, base_ms: float) -> float:
+        """설정된 분포에서 지연 시간(초) 샘플링 (lock 보유 상태에서 호출)"""
+        if base_ms <= 0:
+            return 0.0
+        if self.latency_distribution == 'uniform':
+            latency_ms = self._rng.uniform(0, 2 * base_ms)
+        elif self.latency_distribution == 'lognormal':
+            latency_ms = self._rng.lognormvariate(math.log(base_ms), self.latency_sigma)  # base_ms = 중앙값
+        elif self.latency_distribution == 'exponential':
+            latency_ms = self._rng.expovariate(1.0 / base_ms)  # base_ms = 평균
+        else:
+            latency_ms = base_ms
+        return latency_ms / 1000
+
+    def _sample_call(self, base_ms: float) -> Tuple[float, Optional[int]]:
+        """(지연 시간, 오류 상태 코드 또는 None)"""
+        with self._rng_lock:
+            latency = self._sample_latency(base_ms)
+            error = None
+            if self.error_rate > 0 and self._rng.random() < self.error_rate:
+                error = 429 if self._rng.random() < 0.5 else 503
+        return latency, error
+
+    def _simulate(self, base_ms: float, timeout: Optional[float]) -> None:
+        latency, error = self._sample_call(base_ms)
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise MockAPIError(504)
+        time.sleep(latency)
+        if error is not None:
+            raise MockAPIError(error)
+
+    async def _asimulate(self, base_ms: float, timeout: Optional[float]) -> None:
+        latency, error = self._sample_call(base_ms)
+        if timeout is not None and latency > timeout:
+            await asyncio.sleep(timeout)
+            raise MockAPIError(504)
+        await asyncio.sleep(latency)
+        if error is not None:
+            raise MockAPIError(error)
+
+    # ===== 결정적 응답 =====
+
+    def _respond(self, prompt: str, system_prompt: Optional[str], options: Dict[str, Any]) -> str:
+        rng = random.Random(_stable_seed(self.seed, self.model, system_prompt or '', prompt))
+
+        if 'grounding_score' in prompt or options.get('response_format'):
+            return self._evaluation_json(rng, prompt)
+        if system_prompt and '질의 재작성' in system_prompt:
+            return f"{self._question(prompt)} 추가 정보 {rng.randrange(1000)}"
+
+        count = min(2 + rng.randrange(4), len(_MOCK_ANSWER_SENTENCES))
+        sentences = rng.sample(_MOCK_ANSWER_SENTENCES, count)
+        return f"[mock] {' '.join(sentences)}"
+
+    @staticmethod
+    def _question(prompt: str) -> str:
+        """프롬프트의 첫 비어있지 않은 줄 (재작성 질의 생성용)"""
+        for line in prompt.splitlines():
+            line = line.strip().strip('*').strip()
+            if line and not line.endswith(':'):
+                return line[:100]
+        return prompt[:100]
+
+    @staticmethod
+    def _evaluation_json(rng: random.Random, prompt: str) -> str:
+        """QualityEvaluator가 파싱하는 품질 평가 JSON"""
+        scores = {
+            'grounding_score': round(rng.uniform(0.5, 0.95), 2),
+            'completeness_score': round(rng.uniform(0.5, 0.95), 2),
+            'accuracy_score': round(rng.uniform(0.6, 0.95), 2),
+        }
+        overall = scores['grounding_score'] * 0.4 + scores['completeness_score'] * 0.4 + scores['accuracy_score'] * 0.2
+        needs_retrieval = overall < 0.7
+        feedback = {
+            **scores,
+            'missing_info': ['복용량 정보'] if needs_retrieval else [],
+            'improvement_suggestions': ['근거 문서 인용 보강'] if needs_retrieval else [],
+            'needs_retrieval': needs_retrieval,
+            'reason': 'mock 평가',
+        }
+        if 'rewritten_query' in prompt:
+            feedback['rewritten_query'] = f"복용량 정보 {rng.randrange(1000)}" if needs_retrieval else ''
+        return json.dumps(feedback, ensure_ascii=False)
+
+    def _embedding_dim(self, embedding_model: Optional[str]) -> int:
+        if self.embedding_dimension:
+            return int(self.embedding_dimension)
+        model = embedding_model or self.embedding_model or ''
+        return _EMBEDDING_DIMENSIONS.get(model.split('/')[-1], 3072)
+
+    def _vector(self, text: str, dim: int) -> List[float]:
+        """텍스트 해시 기반 단위 벡터 (같은 텍스트 → 같은 벡터)"""
+        rng = random.Random(_stable_seed(self.seed, 'embed', text))
+        vector = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    # ===== LLMClient 인터페이스 =====
+
+    def _options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'temperature': kwargs.get('temperature', self.temperature),
+            'max_tokens': kwargs.get('max_tokens', self.max_tokens),
+            'response_format': kwargs.get('response_format'),
+        }
+
+    @staticmethod
+    def _usage(prompt: str, system_prompt: Optional[str], text: str) -> Dict[str, int]:
+        prompt_tokens = _estimate_tokens([prompt, system_prompt or ''])
+        completion_tokens = _estimate_tokens([text])
+        return {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+        }
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """모의 텍스트 생성 (지연/오류 주입 + 재시도)"""
+        messages = [{'role': 'system', 'content': system_prompt or ''}, {'role': 'user', 'content': prompt}]
+        options = self._options(kwargs)
+
+        with trace_span("llm.generate", provider="mock", model=self.model) as span:
+            cache, key, cached = _cache_lookup('mock', self.model, messages, options, kwargs)
+            if cached is not None:
+                span.set_attribute('completion_cache', 'hit')
+                return cached
+
+            def _call(timeout):
+                self._simulate(self.latency_ms, timeout)
+                return self._respond(prompt, system_prompt, options)
+
+            text = call_with_retry(
+                _call, self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([prompt, system_prompt or ''], options['max_tokens']),
+                deadline_s=kwargs.get('deadline_s')
+            )
+            usage = self._usage(prompt, system_prompt, text)
+            record_token_usage(span, usage)
+
+        if cache is not None:
+            cache.put(key, text, usage['total_tokens'])
+        return text
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """모의 비동기 텍스트 생성 (asyncio.sleep으로 지연)"""
+        messages = [{'role': 'system', 'content': system_prompt or ''}, {'role': 'user', 'content': prompt}]
+        options = self._options(kwargs)
+
+        with trace_span("llm.generate", provider="mock", model=self.model, is_async=True) as span:
+            cache, key, cached = _cache_lookup('mock', self.model, messages, options, kwargs)
+            if cached is not None:
+                span.set_attribute('completion_cache', 'hit')
+                return cached
+
+            async def _call(timeout):
+                await self._asimulate(self.latency_ms, timeout)
+                return self._respond(prompt, system_prompt, options)
+
+            text = await acall_with_retry(
+                _call, self.limiter, self.retry_policy,
+                tokens=_estimate_tokens([prompt, system_prompt or ''], options['max_tokens']),
+                deadline_s=kwargs.get('deadline_s')
+            )
+            usage = self._usage(prompt, system_prompt, text)
+            record_token_usage(span, usage)
+
+        if cache is not None:
+            cache.put(key, text, usage['total_tokens'])
+        return text
+
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """모의 스트리밍 (생성 결과를 어절 단위로 yield)"""
+        words = self.generate(prompt, system_prompt, **{**kwargs, 'use_cache': False}).split(' ')
+        for i, word in enumerate(words):
+            yield word if i == 0 else f" {word}"
+
+    def embed(self, text: str, embedding_model: Optional[str] = None) -> List[float]:
+        """결정적 해시 임베딩"""
+        dim = self._embedding_dim(embedding_model)
+
+        with trace_span("llm.embed", provider="mock", model=embedding_model or self.embedding_model):
+            def _call(timeout):
+                self._simulate(self.embed_latency_ms, timeout)
+                return self._vector(text, dim)
+
+            return call_with_retry(_call, self.limiter, self.retry_policy, tokens=_estimate_tokens([text]))
+
+    async def aembed(self, text: str, embedding_model: Optional[str] = None) -> List[float]:
+        dim = self._embedding_dim(embedding_model)
+
+        with trace_span("llm.embed", provider="mock", model=embedding_model or self.embedding_model, is_async=True):
+            async def _call(timeout):
+                await self._asimulate(self.embed_latency_ms, timeout)
+                return self._vector(text, dim)
+
+            return await acall_with_retry(_call, self.limiter, self.retry_policy, tokens=_estimate_tokens([text]))
+
+    def _embed_chunk(self, texts: List[str], embedding_model: Optional[str] = None) -> List[List[float]]:
+        """배치 요청 1건 (지연/오류는 요청 단위로 주입)"""
+        dim = self._embedding_dim(embedding_model)
+
+        def _call(timeout):
+            self._simulate(self.embed_latency_ms, timeout)
+            return [self._vector(text, dim) for text in texts]
+
+        return call_with_retry(_call, self.limiter, self.retry_policy, tokens=_estimate_tokens(texts))
+
+
+# 프로세스 전역 클라이언트 풀 (제공자 + 설정이 같으면 같은 인스턴스 재사용)
+_client_pool: Dict[Tuple, LLMClient] = {}
+_client_pool_lock = threading.Lock()
+
+
+def _pool_key(provider: str, kwargs: Dict[str, Any]) -> Tuple:
+    return (provider, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
 
 
 def get_llm_client(provider: str = 'openai', **kwargs) -> LLMClient:
     """
-    LLM 클라이언트 팩토리 함수
+    LLM 클라이언트 팩토리 함수 (프로세스 전역 풀)
+
+    같은 제공자/설정의 클라이언트는 하나만 만들어 공유하므로,
+    여러 노드·세션·실험 스레드가 커넥션 풀과 RPM/TPM 한도를 함께 씁니다.
     
     Args:
-        provider: 'openai' 또는 'gemini'
+        provider: 'openai', 'gemini' 또는 'mock' (LLM_MOCK=1이면 항상 mock)
         **kwargs: 클라이언트별 설정
     
     Returns:
         LLMClient 인스턴스
     """
-    if provider.lower() == 'openai':
-        return OpenAIClient(**kwargs)
-    elif provider.lower() == 'gemini':
-        return GeminiClient(**kwargs)
+    provider = provider.lower()
+    if os.getenv('LLM_MOCK', '').lower() in ('1', 'true', 'yes'):
+        provider = 'mock'  # 오프라인 부하 테스트: 모든 클라이언트를 mock으로 대체
+
+    if provider == 'openai':
+        client_cls = OpenAIClient
+    elif provider == 'gemini':
+        client_cls = GeminiClient
+    elif provider == 'mock':
+        client_cls = MockLLMClient
     else:
         raise ValueError(f"지원하지 않는 LLM 제공자: {provider}")
 
+    key = _pool_key(provider, kwargs)
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+        if client is None:
+            client = client_cls(**kwargs)
+            _client_pool[key] = client
+        return client
+
+
+def get_llm_pool_stats() -> Dict[str, Any]:
+    """클라이언트 풀 크기 + 제공자별 스로틀링 통계"""
+    with _client_pool_lock:
+        pooled = len(_client_pool)
+    return {
+        'pooled_clients': pooled,
+        'shared_http_clients': len(_shared_openai_clients),
+        'throttling': get_throttling_stats(),
+    }
+
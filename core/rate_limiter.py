@@ -0,0 +1,286 @@
+"""
+LLM API 호출 제한 / 재시도
+- 토큰 버킷: 분당 요청 수(RPM) / 분당 토큰 수(TPM)를 스레드·asyncio 태스크 간에 공유
+- 지터 지수 백오프: 429 / 5xx / 연결 오류만 재시도 (Retry-After 헤더 우선)
+- 호출별 deadline: 대기 + 재시도를 포함한 전체 시간 상한
+- 스로틀링 통계 (대기 횟수/시간, 재시도, 포기 횟수)
+
+사용 예:
+    limiter = get_rate_limiter('openai')
+    response = call_with_retry(lambda timeout: client.create(..., timeout=timeout),
+                               limiter, tokens=1200, deadline_s=60)
+"""
+
+import time
+import random
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """호출 deadline 초과 (대기 또는 재시도 중)"""
+
+
+class TokenBucket:
+    """
+    토큰 버킷 (스레드 안전)
+
+    reserve()는 필요한 양을 즉시 차감(음수 잔량 허용)하고 대기 시간을 돌려주므로,
+    동시에 들어온 호출이 도착 순서대로 줄을 서며 한도를 함께 나눠 씁니다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate_per_sec = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_sec)
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """amount만큼 예약하고 사용 가능해질 때까지의 대기 시간(초) 반환"""
+        amount = min(amount, self.capacity)  # 버킷보다 큰 요청은 버킷 전체를 기다림
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_sec
+
+    def refund(self, amount: float) -> None:
+        """예약 취소 (deadline 초과로 호출하지 않은 경우)"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """
+    RPM / TPM 제한기 (프로세스 전역 공유)
+
+    requests_per_minute / tokens_per_minute가 None이면 해당 제한 없음
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.requests = TokenBucket(requests_per_minute, clock=clock) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'throttled': 0,  # 한도 때문에 대기한 호출 수
+            'throttle_wait_s': 0.0,  # 누적 대기 시간
+            'retries': 0,  # 429/5xx 재시도 수
+            'rate_limit_errors': 0,  # 서버가 돌려준 429 수
+            'server_errors': 0,  # 5xx / 연결 오류 수
+            'deadline_exceeded': 0,
+            'gave_up': 0,  # 재시도 한도 초과로 실패한 호출 수
+        }
+
+    def _record(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def _reserve(self, tokens: float, deadline: Optional[float]) -> float:
+        """요청 1건 + tokens 예약 후 대기 시간 반환 (deadline 안에 못 들어가면 예약 취소 후 예외)"""
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+
+        if deadline is not None and time.monotonic() + wait > deadline:
+            if self.requests is not None:
+                self.requests.refund(1)
+            if self.tokens is not None and tokens:
+                self.tokens.refund(tokens)
+            self._record('deadline_exceeded')
+            raise DeadlineExceeded(f"rate limit 대기 {wait:.1f}s가 deadline을 넘습니다")
+
+        self._record('calls')
+        if wait > 0:
+            self._record('throttled')
+            self._record('throttle_wait_s', wait)
+        return wait
+
+    def acquire(self, tokens: float = 0, deadline: Optional[float] = None) -> float:
+        """한도 내에서 호출 가능해질 때까지 대기 (블로킹), 대기 시간 반환"""
+        wait = self._reserve(tokens, deadline)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: float = 0, deadline: Optional[float] = None) -> float:
+        """acquire()의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        wait = self._reserve(tokens, deadline)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['throttle_wait_s'] = round(stats['throttle_wait_s'], 3)
+        return stats
+
+
+# ===== 재시도 =====
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """예외의 HTTP 상태 코드 (openai / httpx / google.api_core 예외)"""
+    status = getattr(exc, 'status_code', None)
+    if status is None:
+        response = getattr(exc, 'response', None)
+        status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(exc, 'code', None)  # google.api_core 예외 (Gemini)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """429 / 5xx / 연결·타임아웃 오류만 재시도"""
+    status = error_status(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(exc).__name__ in ('APIConnectionError', 'APITimeoutError', 'ConnectError', 'ReadTimeout')
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Retry-After 헤더 (초), 없으면 None"""
+    headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    try:
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0,
+                  rng: Callable[[], float] = random.random) -> float:
+    """Full-jitter 지수 백오프: [0, min(cap, base * 2^attempt)) 구간의 임의 지연"""
+    return rng() * min(cap, base * (2 ** attempt))
+
+
+class RetryPolicy:
+    """재시도 정책 (최대 재시도 수, 백오프, 기본 deadline)"""
+
+    def __init__(self, max_retries: int = 4, base_delay: float = 0.5, max_delay: float = 20.0,
+                 deadline_s: Optional[float] = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_s = deadline_s
+
+    def delay(self, attempt: int, exc: BaseException) -> float:
+        retry_after = retry_after_seconds(exc)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("호출 deadline 초과")
+    return remaining
+
+
+def _on_failure(limiter: RateLimiter, policy: RetryPolicy, attempt: int,
+                exc: BaseException, deadline: Optional[float]) -> float:
+    """실패 기록 후 재시도 대기 시간 반환 (재시도 불가면 예외 재발생)"""
+    if not is_retryable(exc):
+        raise exc
+    limiter._record('rate_limit_errors' if error_status(exc) == 429 else 'server_errors')
+    if attempt >= policy.max_retries:
+        limiter._record('gave_up')
+        raise exc
+
+    delay = policy.delay(attempt, exc)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        limiter._record('deadline_exceeded')
+        raise DeadlineExceeded(f"재시도 대기 {delay:.1f}s가 deadline을 넘습니다") from exc
+    limiter._record('retries')
+    print(f"[RateLimiter] 재시도 {attempt + 1}/{policy.max_retries} ({type(exc).__name__}, {delay:.2f}s 후)")
+    return delay
+
+
+def call_with_retry(fn: Callable[[Optional[float]], Any], limiter: RateLimiter,
+                    policy: RetryPolicy, tokens: float = 0,
+                    deadline_s: Optional[float] = None) -> Any:
+    """
+    한도 대기 + 재시도 + deadline을 적용해 fn 호출
+
+    Args:
+        fn: 남은 시간(초, deadline 없으면 None)을 받아 API를 호출하는 함수 (요청 timeout으로 사용)
+        tokens: TPM 버킷에서 차감할 예상 토큰 수
+        deadline_s: 전체 시간 상한 (없으면 policy.deadline_s)
+    """
+    deadline_s = policy.deadline_s if deadline_s is None else deadline_s
+    deadline = time.monotonic() + deadline_s if deadline_s else None
+
+    attempt = 0
+    while True:
+        limiter.acquire(tokens, deadline)
+        try:
+            return fn(_remaining(deadline))
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            time.sleep(_on_failure(limiter, policy, attempt, e, deadline))
+            attempt += 1
+
+
+async def acall_with_retry(fn: Callable[[Optional[float]], Awaitable[Any]], limiter: RateLimiter,
+                           policy: RetryPolicy, tokens: float = 0,
+                           deadline_s: Optional[float] = None) -> Any:
+    """call_with_retry()의 asyncio 버전 (fn은 코루틴 함수)"""
+    deadline_s = policy.deadline_s if deadline_s is None else deadline_s
+    deadline = time.monotonic() + deadline_s if deadline_s else None
+
+    attempt = 0
+    while True:
+        await limiter.aacquire(tokens, deadline)
+        try:
+            return await fn(_remaining(deadline))
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            await asyncio.sleep(_on_failure(limiter, policy, attempt, e, deadline))
+            attempt += 1
+
+
+# 제공자별 전역 제한기 (싱글톤)
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str = 'openai', requests_per_minute: Optional[float] = None,
+                     tokens_per_minute: Optional[float] = None) -> RateLimiter:
+    """
+    제공자별 RateLimiter 가져오기 (싱글톤)
+
+    첫 호출 시의 한도로 생성되며, 이후 호출의 한도 인자는 무시됩니다.
+    """
+    key = provider.lower()
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+def get_throttling_stats() -> Dict[str, Dict[str, Any]]:
+    """제공자별 스로틀링 통계"""
+    with _rate_limiters_lock:
+        limiters = dict(_rate_limiters)
+    return {provider: limiter.get_stats() for provider, limiter in limiters.items()}
@@ -0,0 +1,224 @@
+"""
+Span 기반 지연 시간 추적
+- 노드/LLM/임베딩/MedCAT/FAISS 호출을 중첩 span으로 기록
+- span별 wall time, CPU time(해당 스레드), 속성(토큰 사용량, 캐시 히트 등)
+- 실행(run)별 JSONL 파일로 내보내기 (runs/<run_id>/node_trace.jsonl 형식)
+
+사용 예:
+    from core.tracing import trace_span
+
+    with trace_span("llm.generate", model="gpt-4o-mini") as span:
+        response = ...
+        span.set_attribute("prompt_tokens", 120)
+
+추적이 비활성화되어 있으면 trace_span은 거의 비용이 없는 no-op입니다.
+활성화: configure_tracing(path) 또는 환경 변수 AGENT_TRACE_PATH
+요약: python scripts/summarize_traces.py <node_trace.jsonl>
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# 현재 활성 span (중첩 추적용, asyncio 태스크/스레드별로 분리)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """단일 span (시작/종료 시각, CPU 시간, 속성)"""
+
+    __slots__ = (
+        'name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+        'start_time', '_wall_start', '_cpu_start', 'wall_ms', 'cpu_ms', 'status', 'thread'
+    )
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_time = time.time()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self.wall_ms = None
+        self.cpu_ms = None
+        self.status = 'ok'
+        self.thread = threading.current_thread().name
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """수치 속성 누적 (예: 토큰 수)"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def elapsed_ms(self) -> float:
+        """span 시작 후 경과 시간 (진행 중 측정용, 예: time-to-first-token)"""
+        return round((time.perf_counter() - self._wall_start) * 1000, 3)
+
+    def finish(self) -> None:
+        self.wall_ms = (time.perf_counter() - self._wall_start) * 1000
+        self.cpu_ms = (time.thread_time() - self._cpu_start) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_time': self.start_time,
+            'wall_ms': round(self.wall_ms, 3) if self.wall_ms is not None else None,
+            'cpu_ms': round(self.cpu_ms, 3) if self.cpu_ms is not None else None,
+            'status': self.status,
+            'thread': self.thread,
+            'attributes': self.attributes,
+        }
+
+
+class _NoopSpan:
+    """추적 비활성화 시 사용하는 span (모든 호출 무시)"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes) -> None:
+        pass
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+    def elapsed_ms(self) -> float:
+        return 0.0
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class JSONLSpanExporter:
+    """종료된 span을 한 줄씩 JSONL 파일에 기록 (스레드 안전)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class Tracer:
+    """span 생성 및 내보내기"""
+
+    def __init__(self):
+        self.exporter: Optional[JSONLSpanExporter] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(self, path: Optional[str]) -> None:
+        self.exporter = JSONLSpanExporter(path) if path else None
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        if self.exporter is None:
+            yield _NOOP_SPAN
+            return
+
+        span = Span(name, parent=_current_span.get(), attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = 'error'
+            span.set_attribute('error', f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                print(f"[WARNING] span 내보내기 실패: {e}")
+
+
+# 전역 Tracer (싱글톤)
+_tracer = None
+
+
+def get_tracer() -> Tracer:
+    """Tracer 가져오기 (싱글톤, AGENT_TRACE_PATH 환경 변수로 자동 활성화)"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+        env_path = os.getenv('AGENT_TRACE_PATH')
+        if env_path:
+            _tracer.configure(env_path)
+    return _tracer
+
+
+def default_trace_path(base_dir: str = 'runs/traces') -> str:
+    """실행별 기본 trace 파일 경로 (runs/traces/<timestamp>_<pid>/node_trace.jsonl)"""
+    run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+    return os.path.join(base_dir, run_id, 'node_trace.jsonl')
+
+
+def configure_tracing(path: Optional[str] = None) -> str:
+    """
+    추적 활성화
+
+    Args:
+        path: JSONL 출력 경로 (없으면 default_trace_path())
+
+    Returns:
+        실제 출력 경로
+    """
+    path = path or default_trace_path()
+    get_tracer().configure(path)
+    print(f"[Tracing] span 기록: {path}")
+    return path
+
+
+def disable_tracing() -> None:
+    get_tracer().configure(None)
+
+
+def is_tracing_enabled() -> bool:
+    return get_tracer().enabled
+
+
+def trace_span(name: str, **attributes):
+    """span 컨텍스트 매니저 (비활성화 시 no-op)"""
+    return get_tracer().span(name, **attributes)
+
+
+def current_span():
+    """현재 활성 span (없거나 비활성화 시 no-op span)"""
+    span = _current_span.get()
+    return span if span is not None else _NOOP_SPAN
+
+
+def record_token_usage(span, usage) -> None:
+    """OpenAI 스타일 usage 객체/딕셔너리에서 토큰 사용량 기록"""
+    if usage is None:
+        return
+    get = usage.get if isinstance(usage, dict) else (lambda key: getattr(usage, key, None))
+    for key in ('prompt_tokens', 'completion_tokens', 'total_tokens'):
+        value = get(key)
+        if value is not None:
+            span.set_attribute(key, value)
@@ -4,6 +4,12 @@
 - 코드 중복 제거
 """
 
+import re
+import json
+import hashlib
+import unicodedata
+from typing import Any, Optional
+
 from agent.state import AgentState
 
 
@@ -20,3 +26,34 @@ def is_llm_mode(state: AgentState) -> bool:
     return state.get('mode') == 'llm'
 
 
+_TRAILING_PUNCT = re.compile(r'[\s?!.。？！~]+$')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_query(text: str) -> str:
+    """
+    질의 정규화 (동일 질의 판별용)
+
+    유니코드 NFKC, 소문자, 공백 압축, 끝 문장부호 제거
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower().strip()
+    text = _WHITESPACE.sub(' ', text)
+    return _TRAILING_PUNCT.sub('', text)
+
+
+def patient_fingerprint(
+    profile_summary: str = '',
+    conversation_history: Optional[str] = None,
+    mode: str = '',
+    extra: Any = None
+) -> str:
+    """
+    환자 맥락 지문 (프로필 요약 + 대화 이력 + 모드 + 기타 설정의 해시)
+
+    같은 질의라도 환자 맥락이 다르면 답변이 달라지므로 요청 병합 키에 포함합니다.
+    """
+    payload = json.dumps(
+        [profile_summary or '', conversation_history or '', mode or '', extra],
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
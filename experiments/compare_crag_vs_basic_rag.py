@@ -10,12 +10,16 @@ CRAG vs Basic RAG 비교 실험 스크립트
 - Baseline: Basic RAG (refine_strategy='basic_rag')
 - Treatment: Corrective RAG (refine_strategy='corrective_rag')
 - 동일한 쿼리 세트로 비교
+
+--fork: 두 전략이 공유하는 prefix(슬롯 추출 → 검색 → 첫 생성)를 쿼리당 한 번만 실행하고
+        체크포인트에서 전략별로 분기 (agent.graph.run_agent_forked)
 """
 
 import json
 import time
+import argparse
 from typing import List, Dict, Any
-from agent.graph import run_agent
+from agent.graph import run_agent, run_agent_forked
 
 
 # 실험용 쿼리 세트 (의료 도메인)
@@ -54,16 +58,7 @@ def run_experiment_single_query(
     Returns:
         실험 결과 딕셔너리
     """
-    # 기본 설정
-    base_flags = {
-        'refine_strategy': strategy,
-        'self_refine_enabled': True,
-        'quality_check_enabled': True,
-    }
-
-    # 추가 설정 병합
-    if feature_overrides:
-        base_flags.update(feature_overrides)
+    base_flags = _strategy_flags(strategy, feature_overrides)
 
     # 시작 시간
     start_time = time.time()
@@ -88,7 +83,33 @@ def run_experiment_single_query(
     end_time = time.time()
     latency = end_time - start_time
 
-    # 결과 추출
+    return _build_result(query, strategy, final_state, success, error, latency)
+
+
+def _strategy_flags(strategy: str, feature_overrides: Dict[str, Any] = None) -> Dict[str, Any]:
+    """전략별 feature flags"""
+    # 기본 설정
+    base_flags = {
+        'refine_strategy': strategy,
+        'self_refine_enabled': True,
+        'quality_check_enabled': True,
+    }
+
+    # 추가 설정 병합
+    if feature_overrides:
+        base_flags.update(feature_overrides)
+    return base_flags
+
+
+def _build_result(
+    query: str,
+    strategy: str,
+    final_state: Dict[str, Any],
+    success: bool,
+    error: str,
+    latency: float
+) -> Dict[str, Any]:
+    """최종 상태에서 실험 결과 추출"""
     result = {
         # 메타데이터
         'query': query,
@@ -119,14 +140,44 @@ def run_experiment_single_query(
 
         # 메트릭
         'refine_metrics': final_state.get('refine_metrics', {}),
+
+        # Fork 실행 정보 (--fork)
+        'fork_stats': final_state.get('fork_stats'),
     }
 
     return result
 
 
+def run_experiment_forked_query(
+    query: str,
+    strategies: List[str],
+    feature_overrides: Dict[str, Any] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    공유 prefix를 한 번 실행하고 전략별로 fork하여 실행
+
+    latency_seconds는 prefix + 해당 fork 소요 시간 (단독 실행 시 지연 시간에 해당)
+    """
+    fork_overrides = {strategy: _strategy_flags(strategy, feature_overrides) for strategy in strategies}
+
+    try:
+        states = run_agent_forked(user_text=query, fork_overrides=fork_overrides)
+    except Exception as e:
+        print(f"[ERROR] 쿼리 실행 실패: {e}")
+        return {strategy: _build_result(query, strategy, {}, False, str(e), 0.0) for strategy in strategies}
+
+    results = {}
+    for strategy, final_state in states.items():
+        fork_stats = final_state.get('fork_stats') or {}
+        latency = (fork_stats.get('prefix_ms', 0.0) + fork_stats.get('fork_ms', 0.0)) / 1000
+        results[strategy] = _build_result(query, strategy, final_state, True, None, latency)
+    return results
+
+
 def run_experiment_batch(
     queries: List[str],
-    strategies: List[str] = ['basic_rag', 'corrective_rag']
+    strategies: List[str] = ['basic_rag', 'corrective_rag'],
+    fork: bool = False
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     배치 실험 실행
@@ -134,6 +185,7 @@ def run_experiment_batch(
     Args:
         queries: 쿼리 리스트
         strategies: 비교할 전략 리스트
+        fork: True면 쿼리당 공유 prefix를 한 번만 실행하고 전략별로 분기
 
     Returns:
         전략별 결과 딕셔너리
@@ -144,6 +196,8 @@ def run_experiment_batch(
     current = 0
 
     for query in queries:
+        forked = run_experiment_forked_query(query, strategies) if fork else None
+
         for strategy in strategies:
             current += 1
             print(f"\n{'='*80}")
@@ -152,7 +206,7 @@ def run_experiment_batch(
             print(f"전략: {strategy}")
             print(f"{'='*80}\n")
 
-            result = run_experiment_single_query(query, strategy)
+            result = forked[strategy] if fork else run_experiment_single_query(query, strategy)
             results[strategy].append(result)
 
             # 간단한 요약 출력
@@ -274,13 +328,21 @@ def main():
     """
     메인 실험 실행
     """
+    parser = argparse.ArgumentParser(description="CRAG vs Basic RAG 비교 실험")
+    parser.add_argument('--fork', action='store_true',
+                        help='공유 prefix를 쿼리당 한 번만 실행하고 체크포인트에서 전략별로 분기')
+    args = parser.parse_args()
+
     print("CRAG vs Basic RAG 비교 실험 시작")
     print(f"총 {len(TEST_QUERIES)}개 쿼리 × 2개 전략 = {len(TEST_QUERIES) * 2}회 실행")
+    if args.fork:
+        print("Fork 모드: 쿼리당 prefix 1회 실행 후 전략별 분기")
 
     # 실험 실행
     results = run_experiment_batch(
         queries=TEST_QUERIES,
-        strategies=['basic_rag', 'corrective_rag']
+        strategies=['basic_rag', 'corrective_rag'],
+        fork=args.fork
     )
 
     # 메트릭 계산
@@ -5,6 +5,7 @@
 
 Usage:
     python experiments/run_ablation_comparison.py
+    python experiments/run_ablation_comparison.py --fork   # 공유 prefix 1회 실행 후 프로파일별 분기
 """
 import json
 import sys
@@ -16,7 +17,9 @@ import time
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from agent.graph import run_agent
+from agent.graph import run_agent, run_agent_forked
+from core.completion_cache import get_completion_cache_stats
+from core.llm_client import get_llm_pool_stats
 from config.ablation_config import ABLATION_PROFILES, get_ablation_profile
 
 # ============================================================
@@ -45,6 +48,35 @@ TEST_QUERIES = [
 # 실행 섹션
 # ============================================================
 
+def _profile_features(profile_name: str) -> dict:
+    """프로파일 플래그 (캐시 비활성화 - 순수 성능 측정)"""
+    features = dict(get_ablation_profile(profile_name))
+    features['response_cache_enabled'] = False
+    return features
+
+
+def _run_forked(profiles: list) -> dict:
+    """
+    쿼리별로 공유 prefix(첫 생성까지)를 한 번만 실행하고 프로파일별로 분기
+
+    Returns:
+        {query: {profile_name: (최종 상태 또는 예외, 소요 시간)}}
+        소요 시간은 prefix + 해당 fork 시간 (단독 실행 시 지연 시간에 해당)
+    """
+    fork_overrides = {name: _profile_features(name) for name in profiles}
+    forked = {}
+    for query in TEST_QUERIES:
+        try:
+            states = run_agent_forked(user_text=query, fork_overrides=fork_overrides)
+            forked[query] = {}
+            for name, state in states.items():
+                stats = state.get('fork_stats') or {}
+                forked[query][name] = (state, (stats.get('prefix_ms', 0.0) + stats.get('fork_ms', 0.0)) / 1000)
+        except Exception as e:
+            forked[query] = {name: (e, 0.0) for name in profiles}
+    return forked
+
+
 def main():
     print("=" * 80)
     print("Ablation Study - 프로파일 비교 실험")
@@ -55,6 +87,12 @@ def main():
     print("=" * 80)
     print()
 
+    fork = '--fork' in sys.argv[1:]
+    valid_profiles = [name for name in PROFILES_TO_TEST if name in ABLATION_PROFILES]
+    forked = _run_forked(valid_profiles) if fork else None
+    if fork:
+        print("Fork 모드: 쿼리당 prefix 1회 실행 후 프로파일별 분기")
+
     # 프로파일별 결과 저장
     all_results = {}
 
@@ -64,17 +102,14 @@ def main():
         print(f"[{profile_idx}/{len(PROFILES_TO_TEST)}] 프로파일: {profile_name}")
         print(f"{'='*80}")
 
-        # 프로파일 로드
+        # 프로파일 로드 (캐시 비활성화 - 순수 성능 측정)
         try:
-            features = get_ablation_profile(profile_name)
+            features = _profile_features(profile_name)
             print(f"설명: {ABLATION_PROFILES[profile_name]['description']}")
         except ValueError as e:
             print(f"❌ 오류: {e}")
             continue
 
-        # 캐시 비활성화 (순수 성능 측정)
-        features['response_cache_enabled'] = False
-
         profile_results = []
 
         # 각 쿼리 실행
@@ -84,14 +119,19 @@ def main():
             query_start = time.time()
 
             try:
-                result = run_agent(
-                    user_text=query,
-                    mode="ai_agent",
-                    feature_overrides=features,
-                    return_state=True
-                )
-
-                query_elapsed = time.time() - query_start
+                if fork:
+                    result, query_elapsed = forked[query][profile_name]
+                    if isinstance(result, Exception):
+                        raise result
+                else:
+                    result = run_agent(
+                        user_text=query,
+                        mode="ai_agent",
+                        feature_overrides=features,
+                        return_state=True
+                    )
+
+                    query_elapsed = time.time() - query_start
 
                 metrics = {
                     'query_id': query_idx,
@@ -185,6 +225,16 @@ def main():
 
     print(f"{'='*80}")
 
+    completion_cache = get_completion_cache_stats()
+    if completion_cache['enabled']:
+        print(f"LLM 완성 캐시: 히트 {completion_cache['hits']} / 미스 {completion_cache['misses']}, "
+              f"절약 토큰 {completion_cache['saved_tokens']:,}")
+    llm_pool = get_llm_pool_stats()
+    for provider, throttling in llm_pool['throttling'].items():
+        print(f"LLM 스로틀링 [{provider}]: 429 {throttling['rate_limit_errors']}회, 재시도 {throttling['retries']}회, "
+              f"한도 대기 {throttling['throttled']}회 ({throttling['throttle_wait_s']:.1f}초), "
+              f"deadline 초과 {throttling['deadline_exceeded']}회")
+
     # ============================================================
     # 결과 저장
     # ============================================================
@@ -201,6 +251,8 @@ def main():
         'num_queries': len(TEST_QUERIES),
         'test_queries': TEST_QUERIES,
         'results': all_results,
+        'completion_cache': get_completion_cache_stats(),
+        'llm_pool': llm_pool,
     }
 
     with open(output_file, 'w', encoding='utf-8') as f:
@@ -20,6 +20,8 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from agent.graph import run_agent
+from core.completion_cache import get_completion_cache_stats
+from core.llm_client import get_llm_pool_stats
 
 # ============================================================
 # 설정 섹션 (여기를 수정하세요)
@@ -127,6 +129,8 @@ def main():
             'total_tokens': sum(r.get('total_tokens', 0) for r in successful_results),
             'total_cost_usd': sum(r.get('estimated_cost_usd', 0.0) for r in successful_results),
             'cache_hit_rate': sum(r['cache_hit'] for r in successful_results) / len(successful_results) if successful_results else 0.0,
+            'completion_cache': get_completion_cache_stats(),
+            'llm_pool': get_llm_pool_stats(),
         }
 
         print("=" * 80)
@@ -141,6 +145,14 @@ def main():
         print(f"총 토큰 사용: {summary['total_tokens']:,}")
         print(f"총 예상 비용: ${summary['total_cost_usd']:.4f}")
         print(f"캐시 히트율: {summary['cache_hit_rate']:.1%}")
+        completion_cache = summary['completion_cache']
+        if completion_cache['enabled']:
+            print(f"LLM 완성 캐시: 히트 {completion_cache['hits']} / 미스 {completion_cache['misses']}, "
+                  f"절약 토큰 {completion_cache['saved_tokens']:,}")
+        for provider, throttling in summary['llm_pool']['throttling'].items():
+            print(f"LLM 스로틀링 [{provider}]: 429 {throttling['rate_limit_errors']}회, 재시도 {throttling['retries']}회, "
+                  f"한도 대기 {throttling['throttled']}회 ({throttling['throttle_wait_s']:.1f}초), "
+                  f"deadline 초과 {throttling['deadline_exceeded']}회")
         print("=" * 80)
     else:
         summary = {'error': '모든 쿼리 실패'}
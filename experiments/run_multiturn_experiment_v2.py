@@ -39,6 +39,7 @@ logger = logging.getLogger(__name__)
 # 기존 스캐폴드 임포트
 from agent.graph import run_agent
 from core.llm_client import get_llm_client
+from context.token_manager import get_token_manager
 from core.config import get_llm_config, get_agent_config
 from memory.profile_store import ProfileStore
 
@@ -592,9 +593,8 @@ class MultiTurnExperimentRunner:
                 system_prompt=system_prompt
             )
 
-            # 토큰 사용량 추정 (간단 계산)
-            input_tokens = len(full_prompt.split()) * 1.3  # 대략 추정
-            output_tokens = len(answer.split()) * 1.3
+            # 토큰 사용량 추정 (설정 모델 토크나이저)
+            input_tokens, output_tokens = get_token_manager().count_tokens_batch([full_prompt, answer])
             usage = {
                 "input_tokens": int(input_tokens),
                 "output_tokens": int(output_tokens),
@@ -787,9 +787,8 @@ class MultiTurnExperimentRunner:
                 "hierarchical_memory_stats": final_state.get('hierarchical_memory_stats'),
             }
 
-            # 토큰 사용량 추정 (간단 계산)
-            input_tokens = len(question.split()) * 1.3
-            output_tokens = len(answer.split()) * 1.3
+            # 토큰 사용량 추정 (설정 모델 토크나이저)
+            input_tokens, output_tokens = get_token_manager().count_tokens_batch([question, answer])
             usage = {
                 "input_tokens": int(input_tokens),
                 "output_tokens": int(output_tokens),
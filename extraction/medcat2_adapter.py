@@ -19,6 +19,8 @@ import logging
 from typing import Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from core.tracing import trace_span
+
 logger = logging.getLogger(__name__)
 
 # .env 파일 자동 로드
@@ -141,7 +143,9 @@ class MedCAT2Adapter:
         # MedCAT2 모델이 있으면 사용
         if self._model:
             try:
-                entities = self._model.get_entities(text)
+                with trace_span("medcat.get_entities", chars=len(text)) as span:
+                    entities = self._model.get_entities(text)
+                    span.set_attribute("num_entities", len(entities.get('entities', {})))
                 
                 for entity in entities.get('entities', {}).values():
                     cui = entity.get('cui', '')
@@ -17,6 +17,7 @@ from typing import Dict, Any, List, Optional
 logger = logging.getLogger(__name__)
 
 from .medcat2_adapter import MedCAT2Adapter, _detect_language
+from core.tracing import trace_span
 
 
 class SlotExtractor:
@@ -127,16 +128,18 @@ class SlotExtractor:
                 
                 if use_multilingual:
                     # 다국어 추출 (한국어 자동 번역)
-                    medcat_entities = self.medcat2_adapter.extract_entities_multilingual(
-                        t,
-                        use_neural_translation=self.use_neural_translation,
-                        use_dict_translation=self.use_dict_translation
-                    )
+                    with trace_span("medcat.extract", multilingual=True, language=detected_lang):
+                        medcat_entities = self.medcat2_adapter.extract_entities_multilingual(
+                            t,
+                            use_neural_translation=self.use_neural_translation,
+                            use_dict_translation=self.use_dict_translation
+                        )
                     # 메타데이터 저장
                     slots['metadata'] = medcat_entities.get('metadata', {})
                 else:
                     # 기본 영어 추출
-                    medcat_entities = self.medcat2_adapter.extract_entities(t)
+                    with trace_span("medcat.extract", multilingual=False, language=detected_lang):
+                        medcat_entities = self.medcat2_adapter.extract_entities(t)
                     slots['metadata'] = {
                         'original_text': t,
                         'translated_text': t,
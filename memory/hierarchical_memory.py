@@ -18,6 +18,9 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import json
+import time
+
+from context.token_manager import get_token_manager
 
 
 @dataclass
@@ -152,37 +155,71 @@ class HierarchicalMemorySystem:
             return
 
         try:
-            # 턴 중요도 계산
-            importance = self._calculate_turn_importance(extracted_slots)
-
-            # DialogueTurn 생성
-            turn = DialogueTurn(
-                turn_id=self.turn_counter,
-                user_query=user_query,
-                agent_response=agent_response,
-                extracted_slots=extracted_slots,
-                timestamp=datetime.now().isoformat(),
-                importance=importance
-            )
+            if self._append_turn(user_query, agent_response, extracted_slots):
+                self._compress_to_tier2()
+                self._update_semantic_memory()
 
-            # Working Memory에 추가
-            self.working_memory.append(turn)
-            self.turn_counter += 1
-            self.metrics['total_turns'] += 1
+        except Exception as e:
+            print(f"[WARNING] Failed to add turn to hierarchical memory: {e}")
 
-            # 5턴 이상 시 압축 수행
-            if self.turn_counter >= self.compression_threshold:
-                # 매 5턴마다 압축
-                if self.turn_counter % 5 == 0:
-                    self._compress_to_tier2()
+    async def add_turn_async(
+        self,
+        user_query: str,
+        agent_response: str,
+        extracted_slots: Dict[str, Any]
+    ) -> None:
+        """
+        새 턴 추가 (비동기)
 
-                # 매 5턴마다 Semantic Memory 업데이트
-                if self.turn_counter % 5 == 0:
-                    self._update_semantic_memory()
+        add_turn과 동일하되, Tier 2 압축의 LLM 요약 호출을 await합니다.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            if self._append_turn(user_query, agent_response, extracted_slots):
+                await self._compress_to_tier2_async()
+                self._update_semantic_memory()
 
         except Exception as e:
             print(f"[WARNING] Failed to add turn to hierarchical memory: {e}")
 
+    def _append_turn(
+        self,
+        user_query: str,
+        agent_response: str,
+        extracted_slots: Dict[str, Any]
+    ) -> bool:
+        """
+        Working Memory에 턴 추가
+
+        Returns:
+            이번 턴에서 압축/Semantic 업데이트가 필요하면 True
+        """
+        # 턴 중요도 계산
+        importance = self._calculate_turn_importance(extracted_slots)
+
+        # DialogueTurn 생성
+        turn = DialogueTurn(
+            turn_id=self.turn_counter,
+            user_query=user_query,
+            agent_response=agent_response,
+            extracted_slots=extracted_slots,
+            timestamp=datetime.now().isoformat(),
+            importance=importance
+        )
+
+        # Working Memory에 추가
+        self.working_memory.append(turn)
+        self.turn_counter += 1
+        self.metrics['total_turns'] += 1
+
+        # 5턴 이상 시 매 5턴마다 압축 + Semantic Memory 업데이트
+        return (
+            self.turn_counter >= self.compression_threshold and
+            self.turn_counter % 5 == 0
+        )
+
     def _calculate_turn_importance(self, slots: Dict[str, Any]) -> float:
         """
         턴 중요도 계산
@@ -227,14 +264,41 @@ class HierarchicalMemorySystem:
             return
 
         try:
-            import time
             start_time = time.time()
 
-            # Working Memory의 모든 턴을 텍스트로 변환
-            turns_text = self._format_turns_for_compression(list(self.working_memory))
+            summary = self.llm_client.generate(
+                prompt=self._build_compression_prompt(),
+                max_tokens=200
+            )
+
+            self._store_compressed(summary, start_time)
+
+        except Exception as e:
+            print(f"[ERROR] Compression to Tier 2 failed: {e}")
+
+    async def _compress_to_tier2_async(self) -> None:
+        """Working Memory → Compressing Memory 압축 (비동기 LLM 요약)"""
+        if not self.llm_client or len(self.working_memory) == 0:
+            return
+
+        try:
+            start_time = time.time()
+
+            summary = await self.llm_client.agenerate(
+                prompt=self._build_compression_prompt(),
+                max_tokens=200
+            )
+
+            self._store_compressed(summary, start_time)
 
-            # LLM으로 요약
-            summary_prompt = f"""다음은 환자와의 최근 {len(self.working_memory)}턴 대화입니다.
+        except Exception as e:
+            print(f"[ERROR] Compression to Tier 2 failed: {e}")
+
+    def _build_compression_prompt(self) -> str:
+        """Working Memory의 모든 턴을 요약 프롬프트로 변환"""
+        turns_text = self._format_turns_for_compression(list(self.working_memory))
+
+        return f"""다음은 환자와의 최근 {len(self.working_memory)}턴 대화입니다.
 이를 200 토큰 이내로 요약하되, 다음 정보를 우선 포함하세요:
 1. 환자가 호소한 주요 증상
 2. 진단되거나 의심되는 질환
@@ -247,40 +311,34 @@ class HierarchicalMemorySystem:
 
 요약 (한국어, 200 토큰 이내):"""
 
-            summary = self.llm_client.generate(
-                prompt=summary_prompt,
-                max_tokens=200
-            )
-
-            # 핵심 의료 정보 추출
-            key_medical_info = self._extract_key_medical_info(list(self.working_memory))
-
-            # CompressedMemory 생성
-            compressed = CompressedMemory(
-                memory_id=self.memory_counter,
-                summary=summary,
-                key_medical_info=key_medical_info,
-                turn_range=(
-                    self.working_memory[0].turn_id,
-                    self.working_memory[-1].turn_id
-                ),
-                timestamp=datetime.now().isoformat(),
-                importance=self._calculate_compressed_importance(list(self.working_memory))
-            )
+    def _store_compressed(self, summary: str, start_time: float) -> None:
+        """LLM 요약 결과를 Tier 2에 저장하고 메트릭 갱신"""
+        # 핵심 의료 정보 추출
+        key_medical_info = self._extract_key_medical_info(list(self.working_memory))
+
+        # CompressedMemory 생성
+        compressed = CompressedMemory(
+            memory_id=self.memory_counter,
+            summary=summary,
+            key_medical_info=key_medical_info,
+            turn_range=(
+                self.working_memory[0].turn_id,
+                self.working_memory[-1].turn_id
+            ),
+            timestamp=datetime.now().isoformat(),
+            importance=self._calculate_compressed_importance(list(self.working_memory))
+        )
 
-            # Tier 2에 추가
-            self.compressing_memory.append(compressed)
-            self.memory_counter += 1
-            self.metrics['compressions_performed'] += 1
+        # Tier 2에 추가
+        self.compressing_memory.append(compressed)
+        self.memory_counter += 1
+        self.metrics['compressions_performed'] += 1
 
-            # 메트릭 업데이트
-            elapsed_ms = (time.time() - start_time) * 1000
-            self._update_compression_time(elapsed_ms)
+        # 메트릭 업데이트
+        elapsed_ms = (time.time() - start_time) * 1000
+        self._update_compression_time(elapsed_ms)
 
-            print(f"[Hierarchical Memory] Compressed turns {compressed.turn_range} to Tier 2")
-
-        except Exception as e:
-            print(f"[ERROR] Compression to Tier 2 failed: {e}")
+        print(f"[Hierarchical Memory] Compressed turns {compressed.turn_range} to Tier 2")
 
     def _format_turns_for_compression(self, turns: List[DialogueTurn]) -> str:
         """턴 리스트를 LLM용 텍스트로 변환"""
@@ -732,8 +790,7 @@ class HierarchicalMemorySystem:
         lines = []
         for turn in reversed(self.working_memory):
             line = f"User: {turn.user_query}\nAgent: {turn.agent_response[:200]}...\n"
-            # 간단한 토큰 추정 (단어 수 / 0.75)
-            estimated_tokens = len(line.split()) / 0.75
+            estimated_tokens = get_token_manager().count_tokens(line)
             if estimated_tokens > budget:
                 break
             lines.append(line)
@@ -756,7 +813,7 @@ class HierarchicalMemorySystem:
         lines = []
         for mem in sorted_memories:
             line = f"[요약 {mem.memory_id}] {mem.summary}\n"
-            estimated_tokens = len(line.split()) / 0.75
+            estimated_tokens = get_token_manager().count_tokens(line)
             if estimated_tokens > budget:
                 break
             lines.append(line)
@@ -793,12 +850,10 @@ class HierarchicalMemorySystem:
 
         result = "\n".join(parts)
 
-        # 예산 초과 시 절삭
-        estimated_tokens = len(result.split()) / 0.75
-        if estimated_tokens > budget:
-            words = result.split()
-            max_words = int(budget * 0.75)
-            result = " ".join(words[:max_words]) + "..."
+        # 예산 초과 시 절삭 (토큰 단위)
+        token_manager = get_token_manager()
+        if token_manager.count_tokens(result) > budget:
+            result = token_manager.clip_to_tokens(result, budget) + "..."
 
         return result
 
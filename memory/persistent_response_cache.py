@@ -0,0 +1,452 @@
+"""
+영속 응답 캐시 (SQLite + mmap 임베딩 행렬, 멀티 프로세스 공유)
+
+프로세스 메모리의 ResponseCache는 재시작 / Streamlit 워커 / 병렬 실험 프로세스마다 빈 상태로 시작합니다.
+PersistentResponseCache는 같은 디렉터리를 쓰는 모든 프로세스가 항목과 누적 통계를 공유합니다.
+
+- entries.sqlite3: 항목(질문/응답/메타데이터/만료 시각/행 번호), 누적 통계, 메타(차원/세대/시퀀스)
+- embeddings.<세대>.f32: 정규화 임베딩 float32 행렬 (행 번호 = entries.row), np.memmap 읽기 전용 매핑으로 검색
+- 쓰기: BEGIN IMMEDIATE로 프로세스 간 직렬화, 임베딩 행을 먼저 쓰고 항목을 커밋 (읽는 쪽은 완성된 행만 봄)
+- 동기화: 변경마다 seq 증가, 각 프로세스는 sync_interval_s마다 seq > 마지막 seq 변경만 반영 (삭제는 tombstone)
+- 세대 파일은 만들 때 고정 용량으로 할당하고 크기를 바꾸지 않음 (매핑 중인 파일 크기 변경은 Windows에서 실패)
+- 압축: compact_every번 쓸 때마다, 또는 현재 세대 파일의 행이 모두 찼을 때 tombstone/만료 항목을 지우고
+  살아있는 행만 새 세대 파일로 다시 씀 (이전 세대를 매핑 중인 프로세스는 세대 변경을 보고 전체 재로딩)
+- 이전 세대 파일은 각 프로세스가 세대 전환 / 종료 시 삭제를 시도 (마지막으로 매핑을 놓는 프로세스가 삭제)
+
+사용: RESPONSE_CACHE_DIR 환경 변수 (agent/nodes/check_similarity.py의 get_response_cache)
+"""
+
+import os
+import glob
+import hashlib
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from memory.response_cache import ResponseCache, CachedResponse, EmbeddingRows, _normalize
+
+
+DEFAULT_SYNC_INTERVAL_S = 1.0
+DEFAULT_COMPACT_EVERY = 500
+
+# 세대 파일 용량 단위 (행 수), 용량은 max_cache_size의 2배 이상을 이 단위로 올림
+_CAPACITY_ROWS = 1024
+
+_STAT_KEYS = ('total_queries', 'cache_hits', 'cache_misses', 'total_tokens_saved', 'total_time_saved_ms')
+
+
+class SharedEmbeddingMatrix(EmbeddingRows):
+    """디스크 임베딩 행렬(mmap) 위의 키 → 행 매핑 (읽기 전용, 행 번호는 SQLite가 할당)"""
+
+    backend = 'mmap'
+
+    def clear(self):
+        super().clear()
+        self._path: Optional[str] = None
+
+    def map_file(self, path: str, dim: int):
+        """세대 파일 전체를 읽기 전용으로 매핑 (세대 파일 크기는 고정이므로 세대마다 한 번)"""
+        if not os.path.exists(path):
+            return
+        rows = os.path.getsize(path) // (dim * 4)
+        if rows == 0 or (path == self._path and rows == self._size):
+            return
+        self._vectors = np.memmap(path, dtype=np.float32, mode='r', shape=(rows, dim))
+        valid = np.zeros(rows, dtype=bool)
+        if self._valid is not None and path == self._path:
+            valid[:len(self._valid)] = self._valid
+        self._valid = valid
+        self._key_of.extend([None] * (rows - len(self._key_of)))
+        self._size = rows
+        self._path = path
+
+    def attach(self, key: str, row: int):
+        old = self._slot_of.get(key)
+        if old is not None and old != row:
+            self._valid[old] = False
+            self._key_of[old] = None
+        self._slot_of[key] = row
+        self._key_of[row] = key
+        self._valid[row] = True
+
+
+class PersistentResponseCache(ResponseCache):
+    """여러 프로세스가 공유하는 디스크 기반 ResponseCache"""
+
+    def __init__(
+        self,
+        path: str,
+        sync_interval_s: float = DEFAULT_SYNC_INTERVAL_S,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+        **kwargs
+    ):
+        """
+        Args:
+            path: 캐시 디렉터리 (프로세스 간 공유)
+            sync_interval_s: 다른 프로세스 변경 반영 주기 (조회 시 확인)
+            compact_every: 이 프로세스에서 N번 쓸 때마다 압축 (0이면 비활성화)
+            **kwargs: ResponseCache 인자 (index_backend는 무시, mmap 행렬 사용)
+        """
+        kwargs.pop('index_backend', None)
+        super().__init__(**kwargs)
+        self.path = path
+        self.sync_interval_s = sync_interval_s
+        self.compact_every = compact_every
+        os.makedirs(path, exist_ok=True)
+
+        self._db_lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            os.path.join(path, 'entries.sqlite3'), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._transaction(self._create_tables)
+
+        self.index = SharedEmbeddingMatrix()
+        self._generation: Optional[int] = None
+        self._last_seq = 0
+        self._last_sync = 0.0
+        self._writes = 0
+        self._pending_access: Dict[str, int] = {}
+        self._flushed_stats = dict(self.stats)
+
+        self._sync(force=True)
+        self.warm_start_entries = len(self.cache)
+        print(f"[Response Cache] 영속 캐시 warm start: {self.warm_start_entries}개 항목 ({path})")
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+    def _create_tables(self):
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, row INTEGER NOT NULL, query TEXT NOT NULL, response TEXT NOT NULL,"
+            " metadata TEXT, timestamp REAL NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL,"
+            " hit_count INTEGER NOT NULL DEFAULT 0, deleted INTEGER NOT NULL DEFAULT 0, seq INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_seq ON entries(seq)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(deleted, last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _transaction(self, fn: Callable[[], Any]) -> Any:
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE: 프로세스 간 쓰기 직렬화)"""
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def _meta(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, name: str, value: int):
+        self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def _embeddings_path(self, generation: int) -> str:
+        return os.path.join(self.path, f'embeddings.{generation}.f32')
+
+    def _capacity(self, generation: int, dim: int) -> int:
+        """세대 파일의 행 용량 (파일이 없으면 0)"""
+        path = self._embeddings_path(generation)
+        return os.path.getsize(path) // (dim * 4) if os.path.exists(path) else 0
+
+    def _allocate_generation(self, generation: int, dim: int, live: int) -> np.memmap:
+        """새 세대 파일을 고정 용량으로 생성 (아직 커밋 전이라 다른 프로세스는 매핑하지 않음)"""
+        rows = max(2 * self.max_cache_size, live + 1)
+        capacity = -(-rows // _CAPACITY_ROWS) * _CAPACITY_ROWS
+        return np.memmap(
+            self._embeddings_path(generation), dtype=np.float32, mode='w+', shape=(capacity, dim)
+        )
+
+    def _write_vector(self, generation: int, dim: int, row: int, vector: np.ndarray):
+        """임베딩 행 쓰기 (쓰기 트랜잭션 안에서 호출, row는 세대 용량 안, 파일 크기는 바꾸지 않음)"""
+        with open(self._embeddings_path(generation), 'r+b') as f:
+            f.seek(row * dim * 4)
+            f.write(vector.astype(np.float32).tobytes())
+
+    def _rewrite_generation(self, dim: int, generation: int) -> int:
+        """
+        tombstone/만료 항목 삭제 후 살아있는 행만 새 세대 파일로 복사 (쓰기 트랜잭션 안에서 호출)
+
+        Returns:
+            삭제된 항목 수
+        """
+        removed = self._conn.execute(
+            "DELETE FROM entries WHERE deleted = 1 OR expires_at <= ?", (time.time(),)
+        ).rowcount
+        live = self._conn.execute("SELECT key, row FROM entries ORDER BY row").fetchall()
+
+        old_path = self._embeddings_path(generation)
+        new = self._allocate_generation(generation + 1, dim, len(live))
+        if live and os.path.exists(old_path):
+            old_rows = os.path.getsize(old_path) // (dim * 4)
+            old = np.memmap(old_path, dtype=np.float32, mode='r', shape=(old_rows, dim))
+            new[:len(live)] = old[[row for _, row in live]]
+            del old
+        new.flush()
+        del new
+
+        self._conn.executemany(
+            "UPDATE entries SET row = ? WHERE key = ?", [(i, key) for i, (key, _) in enumerate(live)]
+        )
+        self._set_meta('next_row', len(live))
+        self._set_meta('generation', generation + 1)
+        return removed
+
+    def _remove_stale_generations(self):
+        """현재 세대보다 오래된 임베딩 파일 삭제 (다른 프로세스가 아직 매핑 중이면 실패, 다음 전환 때 재시도)"""
+        if self._generation is None:
+            return
+        for path in glob.glob(os.path.join(self.path, 'embeddings.*.f32')):
+            try:
+                generation = int(os.path.basename(path).split('.')[1])
+            except ValueError:
+                continue
+            if generation < self._generation:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------------
+    def _sync(self, force: bool = False):
+        """다른 프로세스 변경 반영 (seq 기반 증분, 세대가 바뀌면 전체 재로딩)"""
+        now = time.monotonic()
+        if not force and now - self._last_sync < self.sync_interval_s:
+            return
+        self._last_sync = now
+        for _ in range(3):
+            if self._sync_once():
+                return
+        print("[WARNING] 영속 응답 캐시 동기화 실패 (압축 진행 중), 다음 조회에서 재시도")
+
+    def _sync_once(self) -> bool:
+        with self._db_lock:
+            self._flush()
+            # 읽기 트랜잭션: 세대와 항목을 같은 스냅샷에서 조회
+            self._conn.execute("BEGIN")
+            try:
+                generation = self._meta('generation', 0)
+                dim = self._meta('dim')
+                since = self._last_seq if generation == self._generation else 0
+                rows = self._conn.execute(
+                    "SELECT key, row, query, response, metadata, timestamp, expires_at, hit_count, deleted, seq"
+                    " FROM entries WHERE seq > ? ORDER BY seq",
+                    (since,)
+                ).fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+
+        path = self._embeddings_path(generation)
+        if any(not row[8] for row in rows) and not os.path.exists(path):
+            return False  # 스냅샷 이후 다른 프로세스가 압축하여 이전 세대 파일 삭제
+
+        if generation != self._generation:
+            # 이전 세대 매핑을 놓은 뒤 오래된 파일 삭제 시도
+            self.cache.clear()
+            self.index.clear()
+            self._expiry_heap = []
+            self._last_seq = 0
+            self._generation = generation
+            self._remove_stale_generations()
+        if not rows:
+            return True
+        self.index.map_file(path, dim)
+
+        wall_now = time.time()
+        for key, row, query, response, metadata, timestamp, expires_at, hit_count, deleted, _ in rows:
+            if deleted or expires_at <= wall_now:
+                if self.cache.pop(key, None) is not None:
+                    self.index.remove(key)
+                continue
+            cached = CachedResponse(
+                query=query,
+                query_embedding=self.index._vectors[row],
+                response=response,
+                timestamp=datetime.fromtimestamp(timestamp),
+                hit_count=hit_count,
+                metadata=json.loads(metadata) if metadata else {},
+                expires_at=datetime.fromtimestamp(expires_at)
+            )
+            self.cache[key] = cached
+            self.cache.move_to_end(key)
+            self.index.attach(key, row)
+            self._schedule_expiry(cached)
+        self._last_seq = rows[-1][-1]
+        return True
+
+    def _flush(self):
+        """버퍼된 통계 증분과 적중 기록을 DB에 반영 (_db_lock 보유 상태에서 호출)"""
+        deltas = [(key, self.stats[key] - self._flushed_stats.get(key, 0)) for key in _STAT_KEYS]
+        deltas = [(key, delta) for key, delta in deltas if delta]
+        if not deltas and not self._pending_access:
+            return
+
+        access_time = time.time()
+        access = [(count, access_time, key) for key, count in self._pending_access.items()]
+
+        def write():
+            self._conn.executemany(
+                "INSERT INTO stats (name, value) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                deltas
+            )
+            self._conn.executemany(
+                "UPDATE entries SET hit_count = hit_count + ?, last_access = ? WHERE key = ?", access
+            )
+
+        self._transaction(write)
+        self._flushed_stats = dict(self.stats)
+        self._pending_access = {}
+
+    # ------------------------------------------------------------------
+    # ResponseCache 인터페이스
+    # ------------------------------------------------------------------
+    def find_similar(self, query: str):
+        self._sync()
+        result = super().find_similar(query)
+        if result:
+            key = result[0].query_hash
+            self._pending_access[key] = self._pending_access.get(key, 0) + 1
+        return result
+
+    def add(
+        self,
+        query: str,
+        response: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl_minutes: Optional[float] = None
+    ) -> CachedResponse:
+        """항목 저장 (모든 프로세스에 공유, 용량 초과 시 가장 오래 사용되지 않은 항목 tombstone)"""
+        vector = _normalize(self._compute_embedding(query))
+        now = time.time()
+        ttl = timedelta(minutes=ttl_minutes) if ttl_minutes is not None else self.cache_ttl
+        key = hashlib.md5(query.lower().strip().encode()).hexdigest()
+
+        def write():
+            dim = self._meta('dim')
+            if dim is None:
+                dim = len(vector)
+                self._set_meta('dim', dim)
+            elif dim != len(vector):
+                raise ValueError(f"embedding dimension {len(vector)} != {dim}")
+            generation = self._meta('generation', 0)
+            seq = self._meta('seq', 0) + 1
+
+            existing = self._conn.execute(
+                "SELECT row FROM entries WHERE key = ? AND deleted = 0", (key,)
+            ).fetchone()
+            if existing:
+                row = existing[0]
+            else:
+                row = self._meta('next_row', 0)
+                capacity = self._capacity(generation, dim)
+                if capacity == 0:
+                    self._allocate_generation(generation, dim, row).flush()
+                elif row >= capacity:
+                    # 현재 세대 파일이 가득 참: 매핑된 파일을 늘리지 않고 새 세대로 압축
+                    self._rewrite_generation(dim, generation)
+                    generation += 1
+                    row = self._meta('next_row', 0)
+                self._set_meta('next_row', row + 1)
+
+            # 임베딩 먼저 기록 → 항목 커밋 후에는 항상 완성된 행
+            self._write_vector(generation, dim, row, vector)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, row, query, response, metadata, timestamp, expires_at, last_access, hit_count, deleted, seq)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 0, ?)",
+                (key, row, query, response, json.dumps(metadata or {}, ensure_ascii=False, default=str),
+                 now, now + ttl.total_seconds(), now, seq)
+            )
+
+            # 용량 초과분은 마지막 사용 시각 기준으로 tombstone (다른 프로세스에도 삭제 전파)
+            live = self._conn.execute("SELECT COUNT(*) FROM entries WHERE deleted = 0").fetchone()[0]
+            if live > self.max_cache_size:
+                evicted = self._conn.execute(
+                    "SELECT key FROM entries WHERE deleted = 0 AND key != ? ORDER BY last_access LIMIT ?",
+                    (key, live - self.max_cache_size)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE entries SET deleted = 1, seq = ? WHERE key = ?", [(seq, k) for (k,) in evicted]
+                )
+            self._set_meta('seq', seq)
+
+        self._transaction(write)
+        self._writes += 1
+        if self.compact_every and self._writes % self.compact_every == 0:
+            self.compact()
+        self._sync(force=True)
+        return self.cache.get(key)
+
+    def compact(self) -> int:
+        """
+        tombstone/만료 항목 삭제 후 살아있는 행만 새 세대 임베딩 파일로 다시 씀
+
+        Returns:
+            삭제된 항목 수
+        """
+        def write():
+            dim = self._meta('dim')
+            if dim is None:
+                return 0
+            return self._rewrite_generation(dim, self._meta('generation', 0))
+
+        removed = self._transaction(write)
+        print(f"[Response Cache] 압축: {removed}개 항목 삭제")
+        self._sync(force=True)  # 새 세대로 재매핑 + 이전 세대 파일 삭제
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """프로세스 통계 + 모든 프로세스/재시작 누적 통계"""
+        stats = super().get_stats()
+        with self._db_lock:
+            self._flush()
+            totals = dict(self._conn.execute("SELECT name, value FROM stats").fetchall())
+        queries = totals.get('total_queries', 0)
+        stats['persistent'] = {
+            **{key: totals.get(key, 0) for key in _STAT_KEYS},
+            'cache_hit_rate': totals.get('cache_hits', 0) / queries if queries else 0,
+            'warm_start_entries': self.warm_start_entries,
+            'generation': self._generation,
+            'path': self.path,
+        }
+        return stats
+
+    def clear(self):
+        """모든 프로세스의 공유 캐시와 누적 통계 삭제 (세대를 올려 이전 세대 파일도 삭제)"""
+        def write():
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM stats")
+            self._set_meta('next_row', 0)
+            self._set_meta('generation', self._meta('generation', 0) + 1)
+
+        with self._db_lock:
+            self._pending_access = {}
+            self._transaction(write)
+            super().clear()
+            self._flushed_stats = dict(self.stats)
+            self._generation = None
+        self._sync(force=True)  # 새 세대로 전환하면서 이전 세대 파일 삭제
+
+    def close(self):
+        with self._db_lock:
+            self._flush()
+            self._conn.close()
+        # 매핑을 놓은 뒤, 이 프로세스 때문에 남아 있던 이전 세대 파일 삭제 재시도
+        self.cache.clear()
+        self.index.clear()
+        self._expiry_heap = []
+        self._remove_stale_generations()
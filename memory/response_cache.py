@@ -7,8 +7,11 @@ Stores query-response pairs and allows retrieval based on semantic similarity.
 This implementation uses:
 1. Sentence transformers for semantic similarity calculation
 2. LRU caching for memory efficiency
-3. Time-based expiry for cache freshness
+3. Time-based expiry for cache freshness (per-entry TTL, expiry min-heap)
 4. Style variation for repeated responses
+5. A contiguous matrix of normalized embeddings (one matrix-vector product per lookup,
+   optional FAISS inner-product index for large caches)
+6. Optional partitioning by patient context (PartitionedResponseCache)
 """
 
 from typing import Dict, List, Tuple, Optional, Any
@@ -20,6 +23,17 @@ import hashlib
 import json
 import random
 from collections import OrderedDict
+import heapq
+
+from core.embedding_memo import embedding_turn, memoized_embedding
+from core.utils import patient_fingerprint
+
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+    faiss = None
 
 
 @dataclass
@@ -31,6 +45,7 @@ class CachedResponse:
     timestamp: datetime
     hit_count: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    expires_at: Optional[datetime] = None
     query_hash: str = field(init=False)
 
     def __post_init__(self):
@@ -38,6 +53,141 @@ class CachedResponse:
         self.query_hash = hashlib.md5(self.query.lower().strip().encode()).hexdigest()
 
 
+def _normalize(vec: np.ndarray) -> np.ndarray:
+    """L2-normalize to float32 (zero vectors stay zero)"""
+    vec = np.asarray(vec, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+
+class EmbeddingRows:
+    """
+    Read-only key -> row mapping over a matrix of normalized embeddings
+
+    Rows are masked out on remove; a lookup is a single matrix-vector product followed
+    by argmax over the valid rows. Subclasses decide where rows come from
+    (EmbeddingMatrix writes them in memory, the persistent cache maps them from disk).
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._vectors: Optional[np.ndarray] = None  # (capacity, dim) float32
+        self._valid: Optional[np.ndarray] = None    # (capacity,) bool
+        self._size = 0                              # rows in use (including freed)
+        self._slot_of: Dict[str, int] = {}
+        self._key_of: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def remove(self, key: str) -> Optional[int]:
+        """Mask the row of key; returns the freed row (None if key is unknown)"""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return None
+        self._valid[slot] = False
+        self._key_of[slot] = None
+        return slot
+
+    def best_match(self, query_embedding: np.ndarray) -> Optional[Tuple[str, float]]:
+        """(key, cosine similarity) of the most similar row, or None if empty"""
+        if not self._slot_of:
+            return None
+        query = _normalize(query_embedding)
+        scores = self._vectors[:self._size] @ query
+        scores[~self._valid[:self._size]] = -np.inf
+        slot = int(np.argmax(scores))
+        return self._key_of[slot], float(scores[slot])
+
+
+class EmbeddingMatrix(EmbeddingRows):
+    """
+    Normalized embeddings in a contiguous matrix, kept in step with the cache OrderedDict
+
+    Each cache key owns one row (slot). Removed rows are masked and reused by later adds,
+    so the matrix only grows up to the peak cache size. A lookup is a single
+    matrix-vector product followed by argmax.
+
+    With backend='faiss' the rows are mirrored into an IndexIDMap2(IndexFlatIP)
+    keyed by slot id, and lookups go through faiss (falls back to numpy if faiss is missing).
+    """
+
+    def __init__(self, backend: str = 'numpy', initial_capacity: int = 64):
+        if backend == 'faiss' and not HAS_FAISS:
+            print("[WARNING] faiss not available. ResponseCache uses the numpy index.")
+            backend = 'numpy'
+        self.backend = backend
+        self.initial_capacity = initial_capacity
+        super().__init__()
+
+    def clear(self):
+        super().clear()
+        self._free: List[int] = []
+        self._faiss_index = None
+
+    def _allocate(self, dim: int) -> int:
+        if self._vectors is None:
+            self._vectors = np.zeros((self.initial_capacity, dim), dtype=np.float32)
+            self._valid = np.zeros(self.initial_capacity, dtype=bool)
+            if self.backend == 'faiss':
+                self._faiss_index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        if self._free:
+            return self._free.pop()
+        if self._size == len(self._vectors):
+            # Grow by doubling (amortized O(1) per add)
+            capacity = len(self._vectors) * 2
+            vectors = np.zeros((capacity, dim), dtype=np.float32)
+            vectors[:self._size] = self._vectors[:self._size]
+            valid = np.zeros(capacity, dtype=bool)
+            valid[:self._size] = self._valid[:self._size]
+            self._vectors, self._valid = vectors, valid
+        self._key_of.append(None)
+        self._size += 1
+        return self._size - 1
+
+    def add(self, key: str, embedding: np.ndarray):
+        """Store (or replace) the normalized embedding for key"""
+        vec = _normalize(embedding)
+        if self._vectors is not None and vec.shape[0] != self._vectors.shape[1]:
+            raise ValueError(f"embedding dimension {vec.shape[0]} != {self._vectors.shape[1]}")
+
+        slot = self._slot_of.get(key)
+        if slot is None:
+            slot = self._allocate(vec.shape[0])
+            self._slot_of[key] = slot
+            self._key_of[slot] = key
+        elif self._faiss_index is not None:
+            self._faiss_index.remove_ids(np.array([slot], dtype=np.int64))
+
+        self._vectors[slot] = vec
+        self._valid[slot] = True
+        if self._faiss_index is not None:
+            self._faiss_index.add_with_ids(vec.reshape(1, -1), np.array([slot], dtype=np.int64))
+
+    def remove(self, key: str) -> Optional[int]:
+        slot = super().remove(key)
+        if slot is None:
+            return None
+        self._free.append(slot)
+        if self._faiss_index is not None:
+            self._faiss_index.remove_ids(np.array([slot], dtype=np.int64))
+        return slot
+
+    def best_match(self, query_embedding: np.ndarray) -> Optional[Tuple[str, float]]:
+        """(key, cosine similarity) of the most similar row, or None if empty"""
+        if self._faiss_index is None:
+            return super().best_match(query_embedding)
+        if not self._slot_of:
+            return None
+        scores, ids = self._faiss_index.search(_normalize(query_embedding).reshape(1, -1), 1)
+        slot = int(ids[0][0])
+        if slot < 0:
+            return None
+        return self._key_of[slot], float(scores[0][0])
+
+
 class ResponseCache:
     """
     Manages response caching with semantic similarity matching
@@ -54,7 +204,9 @@ class ResponseCache:
         max_cache_size: int = 100,
         similarity_threshold: float = 0.85,
         cache_ttl_minutes: int = 60,
-        model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+        model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        index_backend: str = 'numpy',
+        encoder: Optional[Any] = None
     ):
         """
         Initialize ResponseCache
@@ -64,17 +216,27 @@ class ResponseCache:
             similarity_threshold: Minimum cosine similarity for cache hit (0-1)
             cache_ttl_minutes: Time-to-live for cached items in minutes
             model_name: Sentence transformer model for embeddings
+            index_backend: 'numpy' (matrix-vector product) or 'faiss' (inner-product index)
+            encoder: Already loaded sentence transformer to share (e.g. between partitions)
         """
         self.max_cache_size = max_cache_size
         self.similarity_threshold = similarity_threshold
         self.cache_ttl = timedelta(minutes=cache_ttl_minutes)
 
         # Initialize sentence transformer
-        self.encoder = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.encoder = encoder if encoder is not None else SentenceTransformer(model_name)
 
         # OrderedDict for LRU implementation
         self.cache: OrderedDict[str, CachedResponse] = OrderedDict()
 
+        # Normalized query embeddings, one row per cache key
+        self.index = EmbeddingMatrix(backend=index_backend)
+
+        # Expiry min-heap of (expires_at, key); entries for replaced/evicted keys are
+        # skipped lazily, so expiry costs O(expired) instead of a full scan per lookup
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+
         # Statistics
         self.stats = {
             'total_queries': 0,
@@ -85,37 +247,40 @@ class ResponseCache:
         }
 
     def _compute_embedding(self, text: str) -> np.ndarray:
-        """Compute embedding for text"""
-        return self.encoder.encode(text, convert_to_tensor=False)
-
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors"""
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
+        """Compute embedding for text (memoized per agent turn, shared by find_similar and add)"""
+        return memoized_embedding(
+            self.model_name, text, lambda t: self.encoder.encode(t, convert_to_tensor=False)
+        )
 
     def _is_expired(self, cached_item: CachedResponse) -> bool:
         """Check if cached item has expired"""
+        if cached_item.expires_at is not None:
+            return datetime.now() > cached_item.expires_at
         return datetime.now() - cached_item.timestamp > self.cache_ttl
 
     def _evict_expired(self):
-        """Remove expired items from cache"""
-        expired_keys = [
-            key for key, item in self.cache.items()
-            if self._is_expired(item)
-        ]
-        for key in expired_keys:
-            del self.cache[key]
+        """Remove expired items from cache (pops only the expired heap entries)"""
+        now = datetime.now()
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            item = self.cache.get(key)
+            # Skip stale entries (key replaced with a new expiry or already evicted)
+            if item is not None and item.expires_at == expires_at:
+                del self.cache[key]
+                self.index.remove(key)
+
+    def _schedule_expiry(self, cached: CachedResponse):
+        """Push the entry's expiry, rebuilding the heap when stale entries pile up"""
+        heapq.heappush(self._expiry_heap, (cached.expires_at, cached.query_hash))
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [(item.expires_at, key) for key, item in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
 
     def _evict_lru(self):
         """Evict least recently used item if cache is full"""
         if len(self.cache) >= self.max_cache_size:
-            self.cache.popitem(last=False)  # Remove oldest item
+            key, _ = self.cache.popitem(last=False)  # Remove oldest item
+            self.index.remove(key)
 
     def find_similar(self, query: str) -> Optional[Tuple[CachedResponse, float]]:
         """
@@ -146,19 +311,16 @@ class ResponseCache:
         # Compute embedding for semantic search
         query_embedding = self._compute_embedding(query)
 
-        # Find best semantic match
+        # Find best semantic match (expired items were already evicted above)
         best_match = None
         best_similarity = 0.0
 
-        for key, cached_item in self.cache.items():
-            if self._is_expired(cached_item):
-                continue
-
-            similarity = self._cosine_similarity(query_embedding, cached_item.query_embedding)
-
+        match = self.index.best_match(query_embedding)
+        if match is not None:
+            key, similarity = match
             if similarity > best_similarity and similarity >= self.similarity_threshold:
                 best_similarity = similarity
-                best_match = cached_item
+                best_match = self.cache[key]
 
         if best_match:
             # Move to end (most recently used)
@@ -174,7 +336,8 @@ class ResponseCache:
         self,
         query: str,
         response: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl_minutes: Optional[float] = None
     ) -> CachedResponse:
         """
         Add a new query-response pair to cache
@@ -183,6 +346,8 @@ class ResponseCache:
             query: User query
             response: Generated response
             metadata: Additional metadata to store
+            ttl_minutes: Time-to-live for this entry (None: cache default),
+                e.g. shorter for questions about lab values
 
         Returns:
             CachedResponse object
@@ -191,16 +356,21 @@ class ResponseCache:
         self._evict_lru()
 
         # Create cached response
+        now = datetime.now()
+        ttl = timedelta(minutes=ttl_minutes) if ttl_minutes is not None else self.cache_ttl
         cached = CachedResponse(
             query=query,
             query_embedding=self._compute_embedding(query),
             response=response,
-            timestamp=datetime.now(),
-            metadata=metadata or {}
+            timestamp=now,
+            metadata=metadata or {},
+            expires_at=now + ttl
         )
 
         # Add to cache
         self.cache[cached.query_hash] = cached
+        self.index.add(cached.query_hash, cached.query_embedding)
+        self._schedule_expiry(cached)
 
         return cached
 
@@ -220,20 +390,208 @@ class ResponseCache:
             **self.stats,
             'cache_hit_rate': cache_hit_rate,
             'cache_size': len(self.cache),
-            'max_cache_size': self.max_cache_size
+            'max_cache_size': self.max_cache_size,
+            'index_backend': self.index.backend
         }
 
     def clear(self):
         """Clear all cached items"""
         self.cache.clear()
+        self.index.clear()
+        self._expiry_heap = []
+        self.stats = {
+            'total_queries': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'total_tokens_saved': 0,
+            'total_time_saved_ms': 0
+        }
+
+
+def partition_key(user_id: str, profile_summary: str = '') -> str:
+    """Patient-context partition key (user_id + profile-summary hash)"""
+    return f"{user_id or 'anonymous'}:{patient_fingerprint(profile_summary)}"
+
+
+class PartitionedResponseCache:
+    """
+    Response cache partitioned by patient context
+
+    A lookup scans only the patient's partition (and the shared partition, if enabled),
+    so it never returns an answer personalized for another patient's profile and its
+    cost does not grow with the number of patients. Each partition is a ResponseCache
+    with its own capacity, LRU eviction and expiry; partitions share one encoder and
+    the least recently used patient partition is dropped beyond max_partitions.
+    """
+
+    SHARED_PARTITION = '__shared__'
+
+    def __init__(
+        self,
+        max_partition_size: int = 100,
+        max_partitions: int = 1000,
+        shared_partition: bool = False,
+        similarity_threshold: float = 0.85,
+        cache_ttl_minutes: int = 60,
+        model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        index_backend: str = 'numpy'
+    ):
+        """
+        Initialize PartitionedResponseCache
+
+        Args:
+            max_partition_size: Maximum number of cached responses per partition
+            max_partitions: Maximum number of partitions kept in memory (the shared one is never dropped)
+            shared_partition: Also search/store profile-independent answers in a shared partition
+                (off by default; callers decide which answers are safe to share)
+            (other arguments as in ResponseCache)
+        """
+        self.max_partition_size = max_partition_size
+        self.max_partitions = max_partitions
+        self.shared_partition = shared_partition
+        self._similarity_threshold = similarity_threshold
+        self.cache_ttl_minutes = cache_ttl_minutes
+        self.model_name = model_name
+        self.index_backend = index_backend
+        self.encoder = SentenceTransformer(model_name)
+
+        self.partitions: OrderedDict[str, ResponseCache] = OrderedDict()
         self.stats = {
             'total_queries': 0,
             'cache_hits': 0,
             'cache_misses': 0,
+            'shared_hits': 0,
             'total_tokens_saved': 0,
             'total_time_saved_ms': 0
         }
 
+    @property
+    def similarity_threshold(self) -> float:
+        return self._similarity_threshold
+
+    @similarity_threshold.setter
+    def similarity_threshold(self, value: float):
+        self._similarity_threshold = value
+        for partition in self.partitions.values():
+            partition.similarity_threshold = value
+
+    def partition(self, key: str, create: bool = True) -> Optional[ResponseCache]:
+        """Get (or create) the partition for key"""
+        partition = self.partitions.get(key)
+        if partition is not None:
+            self.partitions.move_to_end(key)
+            return partition
+        if not create:
+            return None
+
+        partition = ResponseCache(
+            max_cache_size=self.max_partition_size,
+            similarity_threshold=self._similarity_threshold,
+            cache_ttl_minutes=self.cache_ttl_minutes,
+            model_name=self.model_name,
+            index_backend=self.index_backend,
+            encoder=self.encoder
+        )
+        self.partitions[key] = partition
+        # Drop the least recently used patient partition (the shared one is kept)
+        while len(self.partitions) > self.max_partitions:
+            oldest = next((k for k in self.partitions if k != self.SHARED_PARTITION), None)
+            if oldest is None or oldest == key:
+                break
+            del self.partitions[oldest]
+        return partition
+
+    def find_similar(
+        self,
+        query: str,
+        partition_key: str,
+        include_shared: bool = True
+    ) -> Optional[Tuple[CachedResponse, float]]:
+        """
+        Find the most similar cached query in the patient's partition and the shared partition
+
+        The patient's own partition wins ties with the shared partition.
+
+        Args:
+            query: User query to match
+            partition_key: Patient partition (see partition_key())
+            include_shared: Also search the shared partition (if enabled)
+
+        Returns:
+            Tuple of (cached_response, similarity_score) or None if no match
+        """
+        self.stats['total_queries'] += 1
+        keys = [partition_key]
+        if self.shared_partition and include_shared:
+            keys.append(self.SHARED_PARTITION)
+
+        best = None
+        best_key = None
+        # One encoder pass for the query across all searched partitions
+        with embedding_turn():
+            for key in keys:
+                partition = self.partition(key, create=False)
+                if partition is None:
+                    continue
+                result = partition.find_similar(query)
+                # Own partition is searched first; shared only replaces it with a strictly better score
+                if result and (best is None or result[1] > best[1]):
+                    best, best_key = result, key
+
+        if best is None:
+            self.stats['cache_misses'] += 1
+            return None
+        self.stats['cache_hits'] += 1
+        if best_key == self.SHARED_PARTITION:
+            self.stats['shared_hits'] += 1
+        return best
+
+    def add(
+        self,
+        query: str,
+        response: str,
+        partition_key: str,
+        shared: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl_minutes: Optional[float] = None
+    ) -> CachedResponse:
+        """
+        Add a query-response pair to the patient's partition
+
+        Args:
+            partition_key: Patient partition (see partition_key())
+            shared: Store in the shared partition instead (profile-independent answer;
+                ignored if the shared partition is disabled)
+        """
+        key = self.SHARED_PARTITION if shared and self.shared_partition else partition_key
+        return self.partition(key).add(query, response, metadata=metadata, ttl_minutes=ttl_minutes)
+
+    def update_stats(self, tokens_saved: int, time_saved_ms: int):
+        """Update statistics for reporting"""
+        self.stats['total_tokens_saved'] += tokens_saved
+        self.stats['total_time_saved_ms'] += time_saved_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics (aggregated over partitions)"""
+        cache_hit_rate = (
+            self.stats['cache_hits'] / self.stats['total_queries']
+            if self.stats['total_queries'] > 0 else 0
+        )
+        return {
+            **self.stats,
+            'cache_hit_rate': cache_hit_rate,
+            'cache_size': sum(len(p.cache) for p in self.partitions.values()),
+            'partitions': len(self.partitions),
+            'max_partition_size': self.max_partition_size,
+            'index_backend': self.index_backend
+        }
+
+    def clear(self):
+        """Clear all partitions"""
+        self.partitions.clear()
+        for key in self.stats:
+            self.stats[key] = 0
+
 
 class ResponseStyleVariator:
     """
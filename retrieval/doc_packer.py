@@ -0,0 +1,157 @@
+"""
+토큰 예산 내 문서 패킹 (0/1 knapsack)
+
+기존 예산 루프는 예산을 넘는 첫 문서에서 멈추므로(greedy break), 뒤 순위의 짧은 문서로
+채울 수 있는 예산이 남습니다. 여기서는 미리 계산한 토큰 수로 예산 안에서
+융합 점수 합이 최대인 문서 집합을 고르고, 남은 예산은 문장 단위로 자른 조각으로 채웁니다(선택).
+
+- 가치: rrf_score (없으면 순위 기반 1 / (rrf_k + rank), RRF와 같은 척도)
+- 알고리즘: 1차원 DP, 문서 수 * 예산 칸이 max_cells를 넘으면 토큰을 묶어 칸 수 축소
+  (무게는 올림하므로 결과는 항상 예산 이내)
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+RRF_K = 60
+
+# 조각으로 채울 최소 토큰 수 (이보다 짧은 조각은 근거로 쓰기 어려움)
+MIN_FRAGMENT_TOKENS = 40
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?。])\s+|\n+')
+
+
+def doc_value(doc: Dict[str, Any], rank: int, rrf_k: int = RRF_K) -> float:
+    """문서 가치 (융합 점수, 없으면 순위 기반 RRF 점수)"""
+    score = doc.get('rrf_score')
+    if isinstance(score, (int, float)) and score > 0:
+        return float(score)
+    return 1.0 / (rrf_k + rank)
+
+
+def greedy_prefix(token_counts: List[int], budget: int) -> List[int]:
+    """기존 방식: 순위대로 담다가 예산을 넘는 첫 문서에서 중단 (비교용)"""
+    selected, used = [], 0
+    for i, tokens in enumerate(token_counts):
+        if used + tokens > budget:
+            break
+        selected.append(i)
+        used += tokens
+    return selected
+
+
+def knapsack_select(values: List[float], weights: List[int], budget: int,
+                    max_cells: int = 200000) -> List[int]:
+    """
+    0/1 knapsack: 무게 합 budget 이하에서 가치 합이 최대인 인덱스 목록 (오름차순)
+
+    무게가 0 이하이거나 budget을 넘는 항목은 제외합니다.
+    """
+    items = [i for i, w in enumerate(weights) if 0 < w <= budget]
+    if not items or budget <= 0:
+        return []
+
+    # 칸 수 축소 (granularity 토큰 단위로 묶음, 무게는 올림)
+    granularity = max(1, -(-len(items) * budget // max_cells))
+    capacity = budget // granularity
+    scaled = {i: -(-weights[i] // granularity) for i in items}
+
+    best = [0.0] * (capacity + 1)
+    keep: List[bytearray] = []
+    for i in items:
+        w, v = scaled[i], values[i]
+        taken = bytearray(capacity + 1)
+        for c in range(capacity, w - 1, -1):
+            candidate = best[c - w] + v
+            if candidate > best[c]:
+                best[c] = candidate
+                taken[c] = 1
+        keep.append(taken)
+
+    # 역추적
+    selected = []
+    c = capacity
+    for idx in range(len(items) - 1, -1, -1):
+        if keep[idx][c]:
+            i = items[idx]
+            selected.append(i)
+            c -= scaled[i]
+    return sorted(selected)
+
+
+def trim_to_sentences(text: str, max_tokens: int,
+                      count_tokens_batch: Callable[[List[str]], List[int]]) -> Tuple[str, int]:
+    """앞 문장부터 max_tokens 이내로 담은 조각과 토큰 수"""
+    sentences = [s for s in _SENTENCE_SPLIT.split(text or '') if s.strip()]
+    if not sentences:
+        return "", 0
+
+    counts = count_tokens_batch(sentences)
+    parts, used = [], 0
+    for sentence, tokens in zip(sentences, counts):
+        if used + tokens > max_tokens:
+            break
+        parts.append(sentence.strip())
+        used += tokens
+    return " ".join(parts), used
+
+
+def pack_documents(
+    docs: List[Dict[str, Any]],
+    token_counts: List[int],
+    budget: int,
+    count_tokens_batch: Optional[Callable[[List[str]], List[int]]] = None,
+    fragments: bool = False,
+    min_fragment_tokens: int = MIN_FRAGMENT_TOKENS,
+    rrf_k: int = RRF_K,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    예산 내 최적 문서 집합 선택
+
+    Args:
+        docs: 순위순 후보 문서
+        token_counts: 문서별 토큰 수 (docs와 같은 순서)
+        budget: 문서용 토큰 예산
+        count_tokens_batch: 문장 토큰 계산 함수 (fragments=True일 때 필요)
+        fragments: 남은 예산을 선택되지 않은 문서의 앞 문장 조각으로 채우기
+
+    Returns:
+        (순위순 선택 문서, 패킹 통계)
+        조각 문서는 text가 잘려 있고 'trimmed': True, 'original_tokens'가 표시됨
+    """
+    values = [doc_value(doc, rank, rrf_k) for rank, doc in enumerate(docs, start=1)]
+    selected = knapsack_select(values, token_counts, budget)
+    used = sum(token_counts[i] for i in selected)
+
+    fragment_docs: Dict[int, Dict[str, Any]] = {}
+    if fragments and count_tokens_batch is not None:
+        chosen = set(selected)
+        for i in sorted(range(len(docs)), key=lambda i: values[i], reverse=True):
+            remaining = budget - used
+            if remaining < min_fragment_tokens:
+                break
+            if i in chosen or token_counts[i] <= 0:
+                continue
+            text, tokens = trim_to_sentences(docs[i].get('text', ''), remaining, count_tokens_batch)
+            if tokens >= min_fragment_tokens:
+                fragment_docs[i] = {**docs[i], 'text': text, 'trimmed': True, 'original_tokens': token_counts[i]}
+                used += tokens
+
+    order = sorted(set(selected) | set(fragment_docs))
+    packed = [fragment_docs.get(i, docs[i]) for i in order]
+
+    greedy = greedy_prefix(token_counts, budget)
+    stats = {
+        'budget': budget,
+        'used_tokens': used,
+        'utilization': round(used / budget, 4) if budget > 0 else 0.0,
+        'candidates': len(docs),
+        'selected': len(selected),
+        'fragments': len(fragment_docs),
+        'value': round(sum(values[i] for i in selected), 6),
+        'greedy_selected': len(greedy),
+        'greedy_utilization': round(sum(token_counts[i] for i in greedy) / budget, 4) if budget > 0 else 0.0,
+        'greedy_value': round(sum(values[i] for i in greedy), 6),
+    }
+    return packed, stats
@@ -9,6 +9,8 @@ import os
 from typing import List, Dict, Any, Optional
 import json
 
+from core.tracing import trace_span
+
 try:
     import faiss
     import numpy as np
@@ -139,7 +141,8 @@ class FAISSIndex:
                 faiss.normalize_L2(query_vec)
             
             # 검색 실행
-            scores, indices = self.index.search(query_vec, k)
+            with trace_span("faiss.search", k=k, ntotal=self.index.ntotal):
+                scores, indices = self.index.search(query_vec, k)
             
             # 결과 구성
             results = []
@@ -22,6 +22,7 @@ except ImportError:
 
 from .faiss_index import FAISSIndex
 from .rrf_fusion import rrf_fusion
+from core.tracing import trace_span
 
 
 # 전역 캐시: 같은 경로에 대해서는 한 번만 로드
@@ -118,7 +119,8 @@ class BM25Retriever:
         
         try:
             query_tokens = tokenize_ko_en(query)
-            scores = self.bm25_index.get_scores(query_tokens)
+            with trace_span("bm25.search", k=k, num_tokens=len(query_tokens)):
+                scores = self.bm25_index.get_scores(query_tokens)
             
             # 상위 k개만 선택 (O(n log k) - 전체 정렬 대신)
             top_indices = heapq.nlargest(k, range(len(scores)), key=lambda i: scores[i])
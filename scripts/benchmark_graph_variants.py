@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_graph_variants.py
+- Compares the single full graph against per-profile specialized graphs
+  (feature flag graph_specialization_enabled) on the ablation profile matrix
+- Reports compiled node count, node transitions per turn and turn latency (mean/p50/p95)
+
+Usage:
+    python scripts/benchmark_graph_variants.py
+    python scripts/benchmark_graph_variants.py --profiles baseline self_refine_heuristic --modes ai_agent llm
+    python scripts/benchmark_graph_variants.py --turns 5 --json runs/graph_variants.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.graph import run_agent, get_agent_graph  # noqa: E402
+from agent.graph_profile import graph_profile  # noqa: E402
+from config.ablation_config import ABLATION_PROFILES, get_ablation_profile  # noqa: E402
+
+
+DEFAULT_QUERIES = [
+    "당뇨병 환자에게 메트포르민의 부작용은 무엇인가요?",
+    "고혈압 약을 먹고 있는데 두통이 있어요. 어떻게 해야 하나요?",
+    "65세 남성으로 당뇨병이 있습니다. 혈당 관리를 어떻게 해야 할까요?",
+]
+
+
+def quantile(sorted_vals: List[float], q: float) -> float:
+    """Linear interpolation quantile (same convention as summarize_traces.py). Requires sorted input."""
+    if not sorted_vals:
+        return float("nan")
+    if len(sorted_vals) == 1:
+        return sorted_vals[0]
+    pos = (len(sorted_vals) - 1) * q
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    if lo == hi:
+        return sorted_vals[lo]
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+def compiled_node_count(features: Dict[str, Any], mode: str) -> int:
+    app = get_agent_graph(features, mode)
+    # __start__ / __end__ 제외
+    return len([name for name in app.get_graph().nodes if not name.startswith("__")])
+
+
+def run_variant(features: Dict[str, Any], mode: str, queries: List[str], turns: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    transitions: List[int] = []
+
+    for i in range(turns):
+        for query in queries:
+            events: List[Dict[str, Any]] = []
+            start = time.perf_counter()
+            run_agent(
+                query,
+                mode=mode,
+                session_state={"stream_sink": events.append},
+                feature_overrides=features,
+                session_id=f"bench-{i}",
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            transitions.append(sum(1 for e in events if e.get("type") == "node" and e.get("status") == "start"))
+
+    latencies.sort()
+    return {
+        "nodes": compiled_node_count(features, mode),
+        "transitions_mean": statistics.mean(transitions) if transitions else 0.0,
+        "turn_ms_mean": statistics.mean(latencies) if latencies else float("nan"),
+        "turn_ms_p50": quantile(latencies, 0.50),
+        "turn_ms_p95": quantile(latencies, 0.95),
+        "n": len(latencies),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark specialized compiled graphs on the ablation matrix")
+    ap.add_argument("--profiles", nargs="*", default=list(ABLATION_PROFILES.keys()))
+    ap.add_argument("--modes", nargs="*", default=["ai_agent", "llm"])
+    ap.add_argument("--turns", type=int, default=3, help="repetitions of the query set per variant")
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to JSON")
+    args = ap.parse_args()
+
+    results = []
+    for profile_name in args.profiles:
+        base_features = get_ablation_profile(profile_name)
+        for mode in args.modes:
+            row: Dict[str, Any] = {
+                "profile": profile_name,
+                "mode": mode,
+                "graph_variant": graph_profile(base_features, mode).name,
+            }
+            for label, specialized in (("full", False), ("specialized", True)):
+                features = {**base_features, "graph_specialization_enabled": specialized}
+                row[label] = run_variant(features, mode, DEFAULT_QUERIES, args.turns)
+            results.append(row)
+
+            full, spec = row["full"], row["specialized"]
+            print(f"{profile_name:<30} {mode:<8} nodes {full['nodes']:>2} -> {spec['nodes']:>2} | "
+                  f"transitions {full['transitions_mean']:.1f} -> {spec['transitions_mean']:.1f} | "
+                  f"p50 {full['turn_ms_p50']:.1f}ms -> {spec['turn_ms_p50']:.1f}ms")
+
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nWrote: {args.json_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
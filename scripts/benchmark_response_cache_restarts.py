@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_response_cache_restarts.py
+- Replays a query workload across simulated process restarts and compares the
+  response-cache hit rate of the in-memory ResponseCache (cold after every restart)
+  with PersistentResponseCache (warm start from SQLite + mmap embeddings)
+- A miss stores a placeholder answer, like store_response_node after generation
+
+Usage:
+    python scripts/benchmark_response_cache_restarts.py
+    python scripts/benchmark_response_cache_restarts.py --jsonl data/questions.jsonl --field question --restarts 5
+    python scripts/benchmark_response_cache_restarts.py --json runs/response_cache_restarts.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from memory.response_cache import ResponseCache  # noqa: E402
+from memory.persistent_response_cache import PersistentResponseCache  # noqa: E402
+
+
+SAMPLE_QUERIES = [
+    "당뇨병 환자에게 메트포르민의 부작용은 무엇인가요?",
+    "메트포르민 부작용이 뭐예요?",
+    "고혈압 환자는 하루에 소금을 얼마나 먹어도 되나요?",
+    "고혈압 환자의 나트륨 섭취 권장량은?",
+    "당뇨병 환자에게 좋은 운동은 무엇인가요?",
+    "혈당 관리를 위한 운동 방법을 알려주세요.",
+    "암로디핀을 먹으면 발이 붓나요?",
+    "암로디핀 부작용으로 부종이 생길 수 있나요?",
+]
+
+
+def load_queries(jsonl_path: str | None, field: str, limit: int) -> List[str]:
+    if not jsonl_path:
+        return list(SAMPLE_QUERIES) * 3
+    queries: List[str] = []
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(queries) >= limit:
+                break
+            try:
+                text = json.loads(line).get(field, "")
+            except json.JSONDecodeError:
+                continue
+            if text:
+                queries.append(text)
+    return queries
+
+
+def replay(make_cache, segments: List[List[str]]) -> Dict[str, Any]:
+    """Run each segment on a fresh cache instance (one instance = one process lifetime)"""
+    hits = lookups = 0
+    per_restart = []
+    lookup_ms = []
+    for segment in segments:
+        cache = make_cache()
+        segment_hits = 0
+        for query in segment:
+            start = time.perf_counter()
+            result = cache.find_similar(query)
+            lookup_ms.append((time.perf_counter() - start) * 1000)
+            if result:
+                segment_hits += 1
+            else:
+                cache.add(query, f"[answer] {query}")
+        if hasattr(cache, "close"):
+            cache.close()
+        per_restart.append(round(segment_hits / max(1, len(segment)), 4))
+        hits += segment_hits
+        lookups += len(segment)
+    return {
+        "hit_rate": round(hits / max(1, lookups), 4),
+        "hit_rate_per_restart": per_restart,
+        "mean_lookup_ms": round(sum(lookup_ms) / max(1, len(lookup_ms)), 3),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Response-cache hit rate across restarts: in-memory vs persistent")
+    ap.add_argument("--jsonl", default=None, help="JSONL with one query per line (default: built-in samples)")
+    ap.add_argument("--field", default="question")
+    ap.add_argument("--limit", type=int, default=2000)
+    ap.add_argument("--restarts", type=int, default=3, help="number of process lifetimes to simulate")
+    ap.add_argument("--threshold", type=float, default=0.85)
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to JSON")
+    args = ap.parse_args()
+
+    queries = load_queries(args.jsonl, args.field, args.limit)
+    size = max(1, -(-len(queries) // args.restarts))
+    segments = [queries[i:i + size] for i in range(0, len(queries), size)]
+    cache_kwargs = {"similarity_threshold": args.threshold, "max_cache_size": 100000}
+
+    cache_dir = tempfile.mkdtemp(prefix="response_cache_")
+    try:
+        results = {
+            "queries": len(queries),
+            "restarts": len(segments),
+            "in_memory": replay(lambda: ResponseCache(**cache_kwargs), segments),
+            "persistent": replay(lambda: PersistentResponseCache(path=cache_dir, **cache_kwargs), segments),
+        }
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"\nqueries: {results['queries']}  restarts: {results['restarts']}")
+    for name in ("in_memory", "persistent"):
+        r = results[name]
+        print(f"{name:<11} hit rate {r['hit_rate']:.1%}  per restart {r['hit_rate_per_restart']}  "
+              f"lookup {r['mean_lookup_ms']:.2f} ms")
+
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nWrote: {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
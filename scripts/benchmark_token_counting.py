@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_token_counting.py
+- Compares the word-count approximation (words * 1.3) with the BPE TokenManager
+  (tiktoken, memoized by text hash)
+- Reports per-text latency (approx / BPE cold / BPE memoized / batch) and the
+  approximation error against real token counts
+
+Usage:
+    python scripts/benchmark_token_counting.py
+    python scripts/benchmark_token_counting.py --jsonl data/corpus/train_source/chunks.jsonl --limit 2000
+    python scripts/benchmark_token_counting.py --repeat 5 --json runs/token_counting.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from context.token_manager import (  # noqa: E402
+    HAS_TIKTOKEN, TokenManager, approx_token_count, _token_count_cache,
+)
+
+
+SAMPLE_TEXTS = [
+    "당뇨병 환자에게 메트포르민의 부작용은 무엇인가요?",
+    "고혈압 약을 먹고 있는데 두통이 있어요. 어떻게 해야 하나요?",
+    "65세 남성으로 당뇨병이 있습니다. 혈당 관리를 어떻게 해야 할까요?",
+    "메트포르민은 제2형 당뇨병의 1차 치료제로, 흔한 부작용은 설사, 구역, 복부 불편감이며 "
+    "드물게 유산산증이 발생할 수 있습니다. 신기능(eGFR)이 30 mL/min/1.73m² 미만이면 금기입니다.",
+    "Patient: 58-year-old female with hypertension (BP 152/94 mmHg), taking amlodipine 5 mg daily.",
+    "【환자 프로필】\n만성 질환: 고혈압, 제2형 당뇨병\n복용 약물: 메트포르민 500mg, 암로디핀 5mg\n알레르기: 페니실린",
+]
+
+
+def load_texts(jsonl_path: str | None, limit: int) -> List[str]:
+    if not jsonl_path:
+        return list(SAMPLE_TEXTS)
+    texts: List[str] = []
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(texts) >= limit:
+                break
+            try:
+                text = json.loads(line).get("text", "")
+            except json.JSONDecodeError:
+                continue
+            if text:
+                texts.append(text)
+    return texts
+
+
+def time_per_text(fn: Callable[[], Any], n_texts: int, repeat: int) -> float:
+    """Microseconds per text (median over repeats)"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1e6 / max(1, n_texts))
+    return statistics.median(runs)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark BPE token counting against the word approximation")
+    ap.add_argument("--jsonl", default=None, help="JSONL corpus with a 'text' field (default: built-in samples)")
+    ap.add_argument("--limit", type=int, default=1000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--model", default=None, help="tokenizer model (default: llm.model in model_config.yaml)")
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to JSON")
+    args = ap.parse_args()
+
+    if not HAS_TIKTOKEN:
+        print("tiktoken is not installed; nothing to compare (pip install tiktoken)")
+        return 1
+
+    texts = load_texts(args.jsonl, args.limit)
+    manager = TokenManager(model=args.model)
+    n = len(texts)
+
+    def bpe_cold():
+        _token_count_cache.clear()
+        for text in texts:
+            manager.count_tokens(text)
+
+    def bpe_batch_cold():
+        _token_count_cache.clear()
+        manager.count_tokens_batch(texts)
+
+    def bpe_memoized():
+        for text in texts:
+            manager.count_tokens(text)
+
+    results: Dict[str, Any] = {
+        "encoding": manager.encoding_name,
+        "texts": n,
+        "approx_us": time_per_text(lambda: [approx_token_count(t) for t in texts], n, args.repeat),
+        "bpe_cold_us": time_per_text(bpe_cold, n, args.repeat),
+        "bpe_batch_cold_us": time_per_text(bpe_batch_cold, n, args.repeat),
+    }
+    manager.count_tokens_batch(texts)  # warm
+    results["bpe_memoized_us"] = time_per_text(bpe_memoized, n, args.repeat)
+
+    real = manager.count_tokens_batch(texts)
+    approx = [approx_token_count(t) for t in texts]
+    rel_errors = [abs(a - r) / r for a, r in zip(approx, real) if r]
+    results["approx_mean_abs_rel_error"] = statistics.mean(rel_errors) if rel_errors else 0.0
+    results["approx_undercount_rate"] = sum(1 for a, r in zip(approx, real) if a < r) / max(1, n)
+    results["real_tokens_total"] = sum(real)
+    results["approx_tokens_total"] = sum(approx)
+
+    print(f"encoding: {results['encoding']}  texts: {n}")
+    print(f"approx          {results['approx_us']:8.2f} us/text")
+    print(f"BPE cold        {results['bpe_cold_us']:8.2f} us/text")
+    print(f"BPE batch cold  {results['bpe_batch_cold_us']:8.2f} us/text")
+    print(f"BPE memoized    {results['bpe_memoized_us']:8.2f} us/text")
+    print(f"approx error: mean |rel| {results['approx_mean_abs_rel_error']:.1%}, "
+          f"undercounts {results['approx_undercount_rate']:.1%} of texts "
+          f"(total {results['approx_tokens_total']} vs {results['real_tokens_total']} tokens)")
+
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nWrote: {args.json_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+summarize_traces.py
+- Reads a span JSONL written by core/tracing.py (runs/<run_id>/node_trace.jsonl)
+- Prints per-span p50/p95/p99 wall time, mean CPU time, and token/cache totals
+
+Usage:
+    python scripts/summarize_traces.py runs/traces/<run>/node_trace.jsonl
+    python scripts/summarize_traces.py runs/traces/<run>/node_trace.jsonl --prefix node.
+    python scripts/summarize_traces.py runs/traces/<run>/node_trace.jsonl --json summary.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List
+
+
+def read_jsonl(path: str) -> Iterable[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise RuntimeError(f"JSONL parse error: {path}:{line_no}: {e}") from e
+
+
+def quantile(sorted_vals: List[float], q: float) -> float:
+    """Linear interpolation quantile (same convention as summarize_run.py). Requires sorted input."""
+    if not sorted_vals:
+        return float("nan")
+    if len(sorted_vals) == 1:
+        return sorted_vals[0]
+    pos = (len(sorted_vals) - 1) * q
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    if lo == hi:
+        return sorted_vals[lo]
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+def summarize_spans(spans: Iterable[Dict[str, Any]], prefix: str = "") -> Dict[str, Dict[str, Any]]:
+    wall: Dict[str, List[float]] = defaultdict(list)
+    cpu: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    tokens: Dict[str, int] = defaultdict(int)
+    cache_hits: Dict[str, int] = defaultdict(int)
+
+    for span in spans:
+        name = span.get("name", "")
+        if prefix and not name.startswith(prefix):
+            continue
+        if span.get("wall_ms") is not None:
+            wall[name].append(float(span["wall_ms"]))
+        if span.get("cpu_ms") is not None:
+            cpu[name].append(float(span["cpu_ms"]))
+        if span.get("status") == "error":
+            errors[name] += 1
+
+        attrs = span.get("attributes") or {}
+        tokens[name] += int(attrs.get("total_tokens") or 0)
+        if attrs.get("cache_hit"):
+            cache_hits[name] += 1
+
+    summary = {}
+    for name, values in wall.items():
+        values.sort()
+        cpu_values = cpu.get(name, [])
+        summary[name] = {
+            "count": len(values),
+            "p50_ms": quantile(values, 0.50),
+            "p95_ms": quantile(values, 0.95),
+            "p99_ms": quantile(values, 0.99),
+            "mean_ms": sum(values) / len(values),
+            "total_ms": sum(values),
+            "mean_cpu_ms": (sum(cpu_values) / len(cpu_values)) if cpu_values else float("nan"),
+            "errors": errors.get(name, 0),
+            "total_tokens": tokens.get(name, 0),
+            "cache_hits": cache_hits.get(name, 0),
+        }
+    return summary
+
+
+def print_table(summary: Dict[str, Dict[str, Any]]) -> None:
+    header = f"{'span':<32} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'cpu':>9} {'tokens':>8} {'hits':>5} {'err':>4}"
+    print(header)
+    print("-" * len(header))
+    for name, row in sorted(summary.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+        print(
+            f"{name:<32} {row['count']:>5} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+            f"{row['p99_ms']:>9.1f} {row['mean_cpu_ms']:>9.1f} {row['total_tokens']:>8} "
+            f"{row['cache_hits']:>5} {row['errors']:>4}"
+        )
+    print("(times in ms; cpu = mean thread CPU time; sorted by total wall time)")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Per-span latency percentiles from a node_trace.jsonl")
+    ap.add_argument("trace_path", help="Path to node_trace.jsonl")
+    ap.add_argument("--prefix", default="", help="Only include spans whose name starts with this (e.g. node.)")
+    ap.add_argument("--json", dest="json_out", default=None, help="Also write the summary as JSON")
+    args = ap.parse_args()
+
+    summary = summarize_spans(read_jsonl(args.trace_path), prefix=args.prefix)
+    if not summary:
+        print(f"No spans found in {args.trace_path}", file=sys.stderr)
+        return 1
+
+    print_table(summary)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"Wrote {args.json_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+API 서버 (승인 제어 / 타임아웃) 테스트
+"""
+
+import sys
+import json
+import time
+import asyncio
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.server import AgentServer, mock_stream_runner
+from agent.session_manager import SessionManager
+
+
+def _slow_runner(user_text, return_state=False, **kwargs):
+    time.sleep(0.3)
+    state = {'answer': f"답변: {user_text}"}
+    return state if return_state else state['answer']
+
+
+async def _post(port, path, payload):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload.decode('utf-8')
+
+
+async def _wait_idle(server, timeout=5.0):
+    """워커에서 실행 중인 턴이 모두 끝날 때까지 대기 (승인 슬롯 반환)"""
+    deadline = time.monotonic() + timeout
+    while server.metrics()['in_flight'] and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_admission_control_and_timeout(tmp_path):
+    """워커/큐가 가득 차면 503, 타임아웃 초과 시 504"""
+    async def scenario():
+        server = AgentServer(
+            runner=_slow_runner, stream_runner=mock_stream_runner, warmup=None,
+            session_manager=SessionManager(spill_dir=str(tmp_path), runner=_slow_runner),
+            workers=1, max_queue=0, request_timeout=5.0,
+        )
+        port = (await server.start('127.0.0.1', 0)).sockets[0].getsockname()[1]
+        try:
+            first = asyncio.create_task(_post(port, '/v1/turn', {'session_id': 'a', 'user_text': '두통'}))
+            await asyncio.sleep(0.1)
+            rejected = await _post(port, '/v1/turn', {'session_id': 'b', 'user_text': '발열'})
+            accepted = await first
+            timed_out = await _post(port, '/v1/turn', {'session_id': 'c', 'user_text': '기침', 'timeout': 0.05})
+            # 타임아웃된 턴이 아직 워커를 점유 중이므로 바로 다음 요청도 거절
+            after_timeout = await _post(port, '/v1/turn', {'session_id': 'e', 'user_text': '복통'})
+            await _wait_idle(server)
+            streamed = await _post(port, '/v1/turn/stream', {'session_id': 'd', 'user_text': '감기'})
+            return accepted, rejected, timed_out, after_timeout, streamed, server.metrics()
+        finally:
+            await server.close()
+
+    accepted, rejected, timed_out, after_timeout, streamed, metrics = asyncio.run(scenario())
+
+    assert accepted[0] == 200 and json.loads(accepted[1])['answer'] == "답변: 두통"
+    assert rejected[0] == 503
+    assert timed_out[0] == 504
+    assert after_timeout[0] == 503
+    assert streamed[0] == 200 and 'event: final' in streamed[1]
+    assert metrics['rejected'] == 2 and metrics['timeouts'] == 1
+    assert metrics['completed'] == 2 and metrics['failed'] == 1 and metrics['in_flight'] == 0
+    print("✓ 승인 제어 / 타임아웃 / SSE")
+
+
+def test_abandoned_stream_stops_producer_and_holds_slot(tmp_path):
+    """SSE 타임아웃 후 생산자는 다음 이벤트에서 중단, 슬롯은 생산자가 끝날 때 반환"""
+    produced = []
+
+    def slow_stream_runner(user_text, return_state=False, **kwargs):
+        for i in range(50):
+            time.sleep(0.1)
+            produced.append(i)
+            yield {'type': 'delta', 'draft': 0, 'text': str(i)}
+        yield {'type': 'final', 'answer': user_text, 'draft': 0, 'state': None}
+
+    async def scenario():
+        server = AgentServer(
+            runner=_slow_runner, stream_runner=slow_stream_runner, warmup=None,
+            session_manager=SessionManager(spill_dir=str(tmp_path), runner=_slow_runner),
+            workers=1, max_queue=0, request_timeout=5.0,
+        )
+        port = (await server.start('127.0.0.1', 0)).sockets[0].getsockname()[1]
+        try:
+            streamed = await _post(port, '/v1/turn/stream', {'session_id': 's', 'user_text': '감기', 'timeout': 0.05})
+            in_flight = server.metrics()['in_flight']
+            await _wait_idle(server)
+            return streamed, in_flight, server.metrics()
+        finally:
+            await server.close()
+
+    streamed, in_flight, metrics = asyncio.run(scenario())
+    assert 'turn timed out' in streamed[1] and 'event: final' not in streamed[1]
+    assert in_flight == 1  # 생산자가 아직 워커 점유 중
+    assert metrics['in_flight'] == 0 and metrics['failed'] == 1
+    assert len(produced) <= 2  # 포기 후 다음 이벤트에서 중단
+    print("✓ 포기된 SSE 스트림")
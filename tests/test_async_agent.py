@@ -0,0 +1,111 @@
+"""
+비동기 실행 경로 (agenerate / run_agent_async) 테스트
+"""
+
+import sys
+import types
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core import llm_client
+from core.llm_client import LLMClient, OpenAIClient
+
+
+class FakeCompletions:
+    """동시에 진행 중인 요청 수를 기록하는 chat.completions 대역"""
+
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, messages, timeout=None, **options):
+        self.requests.append((model, messages, options))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        message = types.SimpleNamespace(content=f"답변: {messages[-1]['content']}")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+
+def test_openai_agenerate_awaits_async_sdk(monkeypatch):
+    """OpenAIClient.agenerate: AsyncOpenAI 호출을 await, 한 루프에서 요청이 동시에 진행"""
+    completions = FakeCompletions()
+    closed = []
+
+    class FakeAsyncOpenAI:
+        def __init__(self, api_key, max_retries):
+            self.chat = types.SimpleNamespace(completions=completions)
+
+        async def close(self):
+            closed.append(self)
+
+    fake = types.SimpleNamespace(OpenAI=lambda api_key, max_retries: object(), AsyncOpenAI=FakeAsyncOpenAI)
+    monkeypatch.setitem(sys.modules, 'openai', fake)
+    monkeypatch.setattr(llm_client, '_shared_async_openai_clients', llm_client.weakref.WeakKeyDictionary())
+    monkeypatch.setattr(llm_client, 'get_completion_cache', lambda: None)
+    client = OpenAIClient(api_key='key-a', model='gpt-4o-mini')
+
+    async def run():
+        answers = await asyncio.gather(*[
+            client.agenerate(f"질문 {i}", system_prompt="의료 상담", max_tokens=50) for i in range(3)
+        ])
+        await llm_client.aclose_shared_async_openai()
+        return answers
+
+    answers = asyncio.run(run())
+    assert answers == ["답변: 질문 0", "답변: 질문 1", "답변: 질문 2"]
+    assert len(closed) == 1 and not llm_client._shared_async_openai_clients  # 루프 공유 클라이언트 1개 종료
+    assert completions.max_in_flight == 3
+    model, messages, options = completions.requests[0]
+    assert model == 'gpt-4o-mini' and messages[0] == {'role': 'system', 'content': "의료 상담"}
+    assert options['max_tokens'] == 50
+    print("✓ OpenAI agenerate + 종료")
+
+
+def test_default_agenerate_runs_sync_generate_off_loop():
+    """네이티브 비동기 SDK가 없으면 동기 generate를 스레드 풀에서 실행"""
+
+    class SyncOnlyClient(LLMClient):
+        def generate(self, prompt, system_prompt=None, **kwargs):
+            return f"{prompt}@{threading.current_thread().name}"
+
+        def embed(self, text, **kwargs):
+            return [0.0]
+
+    async def run():
+        return await SyncOnlyClient().agenerate("질문"), threading.current_thread().name
+
+    answer, loop_thread = asyncio.run(run())
+    assert answer.startswith("질문@") and not answer.endswith(f"@{loop_thread}")
+    print("✓ 기본 agenerate")
+
+
+def test_run_agent_async_matches_run_agent(monkeypatch):
+    """mock LLM으로 run_agent_async 결과가 run_agent와 같고, 여러 턴을 한 루프에서 동시 처리"""
+    for module in ("langgraph", "dotenv", "numpy", "sentence_transformers"):
+        pytest.importorskip(module)
+    monkeypatch.setenv('LLM_MOCK', '1')
+    from agent.graph import run_agent, run_agent_async
+
+    overrides = {'response_cache_enabled': False}
+    question = "메트포르민 부작용은?"
+    sync_answer = run_agent(question, mode='llm', feature_overrides=overrides)
+
+    async def run():
+        return await asyncio.gather(*[
+            run_agent_async(question, mode='llm', feature_overrides=overrides, session_id=f"async-{i}")
+            for i in range(3)
+        ])
+
+    answers = asyncio.run(run())
+    assert sync_answer.startswith("[mock]") and answers == [sync_answer] * 3
+    print("✓ run_agent_async")
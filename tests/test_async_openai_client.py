@@ -0,0 +1,81 @@
+"""
+이벤트 루프별 공유 AsyncOpenAI 클라이언트 테스트
+"""
+
+import sys
+import gc
+import types
+import asyncio
+import threading
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core import llm_client
+from core.llm_client import OpenAIClient, aclose_shared_async_openai
+
+
+class FakeAsyncOpenAI:
+    """생성/종료만 기록하는 AsyncOpenAI 대역 (네트워크 없음)"""
+
+    def __init__(self, api_key, max_retries):
+        self.api_key = api_key
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def _fake_openai(monkeypatch):
+    fake = types.SimpleNamespace(OpenAI=lambda api_key, max_retries: object(), AsyncOpenAI=FakeAsyncOpenAI)
+    monkeypatch.setitem(sys.modules, 'openai', fake)
+    monkeypatch.setattr(llm_client, '_shared_async_openai_clients', llm_client.weakref.WeakKeyDictionary())
+
+
+def test_async_clients_are_keyed_by_loop_and_api_key(monkeypatch):
+    """같은 루프/키는 공유, 루프가 다르면 별도 클라이언트 (공유 인스턴스 상태는 바꾸지 않음)"""
+    _fake_openai(monkeypatch)
+    client = OpenAIClient(api_key='key-a')
+    other_key = OpenAIClient(api_key='key-b')
+
+    async def get_clients():
+        return client._get_async_client(), client._get_async_client(), other_key._get_async_client()
+
+    first, again, different_key = asyncio.run(get_clients())
+    assert first is again and first is not different_key
+    assert (first.api_key, different_key.api_key) == ('key-a', 'key-b')
+
+    # 여러 스레드가 각자 루프에서 같은 인스턴스 사용
+    results = [None] * 4
+
+    def worker(i):
+        results[i] = asyncio.run(get_clients())[0]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(c) for c in results + [first]}) == 5
+    assert not hasattr(client, '_async_client')
+
+    gc.collect()
+    assert len(llm_client._shared_async_openai_clients) == 0  # 종료된 루프 항목 해제
+    print("✓ 루프/키별 클라이언트")
+
+
+def test_aclose_closes_clients_of_current_loop(monkeypatch):
+    """aclose_shared_async_openai는 현재 루프의 클라이언트만 종료"""
+    _fake_openai(monkeypatch)
+    client = OpenAIClient(api_key='key-a')
+
+    async def run():
+        async_client = client._get_async_client()
+        await aclose_shared_async_openai()
+        return async_client, client._get_async_client()
+
+    closed, fresh = asyncio.run(run())
+    assert closed.closed and not fresh.closed and fresh is not closed
+    print("✓ 현재 루프 클라이언트 종료")
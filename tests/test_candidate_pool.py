@@ -0,0 +1,54 @@
+"""
+재검색 후보 풀 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.candidate_pool import CandidatePool, pool_size, shown_doc_ids
+
+
+def _pool():
+    docs = [
+        {'doc_id': 'a', 'text': '메트포르민 당뇨 치료 효과'},
+        {'doc_id': 'b', 'text': '당뇨 환자 식이 요법'},
+        {'doc_id': 'c', 'text': '메트포르민 부작용 위장 장애 유산증'},
+        {'doc_id': 'd', 'text': '고혈압 약물 상호작용'},
+    ]
+    return CandidatePool(docs, user_text='메트포르민 질문', route='medication')
+
+
+def test_rescore_prefers_rewritten_query_terms_and_skips_shown():
+    """재작성 질의 키워드가 많은 문서가 앞에 오고, 이미 보여준 문서는 제외"""
+    pool = _pool()
+    shown = shown_doc_ids([['a', 'b']])
+
+    docs = pool.rescore('메트포르민 부작용 유산증', k=2, exclude_ids=shown)
+
+    assert [doc['doc_id'] for doc in docs] == ['c', 'd']
+    assert docs[0]['pool_score'] > docs[1]['pool_score']
+    assert pool.remaining(shown) == 2
+    assert 'pool_score' not in pool.docs[2]  # 원본 문서는 변경하지 않음
+    print("✓ 풀 재점수화 + 중복 제외")
+
+
+def test_pool_matches_turn_and_size_flag():
+    """다른 턴/라우트의 풀은 사용하지 않으며, 비활성화 시 k 그대로 검색"""
+    pool = _pool()
+    assert pool.matches('메트포르민 질문', 'medication')
+    assert not pool.matches('다른 질문', 'medication')
+    assert not pool.matches('메트포르민 질문', 'default')
+
+    assert pool_size({}, 8) == 8
+    assert pool_size({'candidate_pool_enabled': True, 'candidate_pool_size': 40}, 8) == 40
+    assert pool_size({'candidate_pool_enabled': True, 'candidate_pool_size': 5}, 8) == 8
+    print("✓ 풀 범위 / 크기")
+
+
+if __name__ == "__main__":
+    test_rescore_prefers_rewritten_query_terms_and_skips_shown()
+    test_pool_matches_turn_and_size_flag()
@@ -0,0 +1,93 @@
+"""
+체크포인트 Fork prefix 그룹 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.checkpoint import prefix_signature, group_by_prefix
+
+
+def test_post_generation_flags_share_prefix():
+    """generate_answer 이후 단계 플래그만 다른 설정은 같은 prefix 그룹"""
+    common = {'retrieval_mode': 'hybrid', 'response_cache_enabled': False}
+    flags_by_name = {
+        'basic_rag': {**common, 'refine_strategy': 'basic_rag'},
+        'corrective_rag': {**common, 'refine_strategy': 'corrective_rag', 'max_refine_iterations': 3},
+        'bm25_only': {**common, 'retrieval_mode': 'bm25', 'refine_strategy': 'corrective_rag'},
+    }
+
+    assert prefix_signature(flags_by_name['basic_rag']) == prefix_signature(flags_by_name['corrective_rag'])
+
+    groups = list(group_by_prefix(flags_by_name).values())
+    assert groups == [['basic_rag', 'corrective_rag'], ['bm25_only']]
+    print("✓ prefix 그룹")
+
+
+def _fork_graph(checkpointer):
+    """prefix(한 번 실행) → generate_answer(fork 지점) → refine(flags로 분기) 축소 그래프"""
+    from typing import TypedDict
+    from langgraph.graph import StateGraph, END
+
+    class State(TypedDict, total=False):
+        feature_flags: dict
+        prefix_runs: int
+        answer: str
+
+    def prefix(state):
+        return {'prefix_runs': state.get('prefix_runs', 0) + 1}
+
+    def generate_answer(state):
+        return {'answer': "초안"}
+
+    def refine(state):
+        return {'answer': f"{state['answer']} + {state['feature_flags']['refine_strategy']}"}
+
+    graph = StateGraph(State)
+    graph.add_node('prefix', prefix)
+    graph.add_node('generate_answer', generate_answer)
+    graph.add_node('refine', refine)
+    graph.set_entry_point('prefix')
+    graph.add_edge('prefix', 'generate_answer')
+    graph.add_edge('generate_answer', 'refine')
+    graph.add_edge('refine', END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def test_interrupt_update_resume_and_thread_cleanup(tmp_path):
+    """interrupt → update_state → resume로 설정별 분기, 실행 후 fork 스레드 체크포인트 삭제"""
+    import pytest
+    pytest.importorskip("langgraph")
+    import sqlite3
+    from langgraph.checkpoint.memory import MemorySaver
+    from agent.checkpoint import HAS_SQLITE_SAVER, delete_thread
+
+    checkpointers = [MemorySaver()]
+    if HAS_SQLITE_SAVER:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+        checkpointers.append(SqliteSaver(sqlite3.connect(str(tmp_path / "ckpt.sqlite"), check_same_thread=False)))
+
+    for checkpointer in checkpointers:
+        app = _fork_graph(checkpointer)
+        thread = {'configurable': {'thread_id': "fork::test"}}
+        app.invoke({'feature_flags': {'refine_strategy': 'none'}}, thread, interrupt_after=['generate_answer'])
+        snapshot = app.get_state(thread)
+        assert snapshot.next == ('refine',) and snapshot.values['answer'] == "초안"
+
+        answers = {}
+        for strategy in ('basic_rag', 'corrective_rag'):
+            fork_config = app.update_state(
+                snapshot.config, {'feature_flags': {'refine_strategy': strategy}}, as_node='generate_answer'
+            )
+            final_state = app.invoke(None, fork_config)
+            answers[strategy] = (final_state['answer'], final_state['prefix_runs'])
+        assert answers == {'basic_rag': ("초안 + basic_rag", 1), 'corrective_rag': ("초안 + corrective_rag", 1)}
+
+        assert list(checkpointer.list(thread))
+        delete_thread("fork::test", checkpointer)
+        assert list(checkpointer.list(thread)) == []
+    print("✓ fork 분기 + 스레드 정리")
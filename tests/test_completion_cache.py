@@ -0,0 +1,67 @@
+"""
+LLM 완성 결과 캐시 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.completion_cache import CompletionCache, completion_key
+
+
+MESSAGES = [
+    {"role": "system", "content": "의료 답변 평가자"},
+    {"role": "user", "content": "메트포르민 부작용?"},
+]
+
+
+def test_key_covers_request_parameters():
+    """같은 요청은 같은 키, 모델/메시지/온도/max_tokens가 다르면 다른 키"""
+    key = completion_key('openai', 'gpt-4o-mini', MESSAGES, 0.3, 900)
+    assert key == completion_key('openai', 'gpt-4o-mini', [dict(m) for m in MESSAGES], 0.3, 900)
+    assert key != completion_key('openai', 'gpt-4o', MESSAGES, 0.3, 900)
+    assert key != completion_key('openai', 'gpt-4o-mini', MESSAGES, 0.0, 900)
+    assert key != completion_key('openai', 'gpt-4o-mini', MESSAGES, 0.3, 500)
+    assert key != completion_key('openai', 'gpt-4o-mini', MESSAGES[1:], 0.3, 900)
+    print("✓ 캐시 키")
+
+
+def test_hit_miss_and_saved_tokens(tmp_path):
+    """미스 → 저장 → 적중 시 절약 토큰 집계, 디스크에 유지"""
+    path = str(tmp_path / 'completions.sqlite')
+    cache = CompletionCache(path)
+    key = completion_key('openai', 'gpt-4o-mini', MESSAGES, 0.3, 900)
+
+    assert cache.get(key) is None
+    cache.put(key, '{"overall_score": 0.8}', tokens=1200)
+    assert cache.get(key) == '{"overall_score": 0.8}'
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert stats['saved_tokens'] == 1200
+    cache.close()
+
+    reopened = CompletionCache(path)
+    assert reopened.get(key) == '{"overall_score": 0.8}'
+    reopened.close()
+    print("✓ 적중/미스 + 영속성")
+
+
+def test_size_bound_evicts_least_recently_used():
+    """크기 상한 초과 시 가장 오래 사용되지 않은 항목부터 삭제"""
+    cache = CompletionCache(':memory:', max_bytes=1000)
+    keys = [completion_key('openai', 'm', [{"role": "user", "content": str(i)}], 0.0, 10) for i in range(3)]
+
+    cache.put(keys[0], 'a' * 300)
+    cache.put(keys[1], 'b' * 300)
+    assert cache.get(keys[0]) is not None  # keys[0]을 최근 사용으로 갱신
+    cache.put(keys[2], 'c' * 300)  # 상한 초과 → keys[1] 삭제
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache.get_stats()['evictions'] >= 1
+    assert len(cache) == 2
+    print("✓ LRU 삭제")
@@ -0,0 +1,82 @@
+"""
+예산 내 문서 패킹 (knapsack) 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.doc_packer import knapsack_select, pack_documents
+
+
+def _docs(n):
+    return [{'id': f'doc{i}', 'text': f'문서 {i}', 'rrf_score': 1.0 / (60 + i + 1)} for i in range(n)]
+
+
+def test_fills_budget_past_first_oversized_doc():
+    """greedy는 2번째 문서에서 멈추지만 패킹은 뒤 순위 짧은 문서로 예산을 채움"""
+    docs = _docs(4)
+    packed, stats = pack_documents(docs, [300, 700, 250, 300], budget=900)
+
+    assert [d['id'] for d in packed] == ['doc0', 'doc2', 'doc3']  # 순위 순서 유지
+    assert stats['used_tokens'] == 850 and stats['utilization'] == round(850 / 900, 4)
+    assert stats['greedy_selected'] == 1 and stats['value'] > stats['greedy_value']
+    print("✓ greedy break 대체")
+
+
+def test_knapsack_is_optimal_and_within_budget():
+    """가치 합 최대 + 무게 합 예산 이내 (칸 축소 시에도)"""
+    values = [10, 7, 6, 1]
+    weights = [6, 4, 3, 1]
+    assert knapsack_select(values, weights, 7) == [1, 2]
+    assert knapsack_select(values, weights, 0) == []
+
+    weights = [123, 457, 389, 250, 611, 90] * 5
+    values = [1.0 / (61 + i) for i in range(len(weights))]
+    selected = knapsack_select(values, weights, 2000, max_cells=500)
+    assert selected and sum(weights[i] for i in selected) <= 2000
+    print("✓ 최적 선택")
+
+
+def test_fragments_fill_leftover_budget():
+    """남은 예산은 선택되지 않은 문서의 앞 문장 조각으로 채움"""
+    docs = _docs(2)
+    docs[1]['text'] = "가" * 50 + ". " + "나" * 50 + ". " + "다" * 50 + "."
+    count_batch = lambda texts: [len(t) for t in texts]  # 문자 1개 = 토큰 1개
+
+    packed, stats = pack_documents(docs, [100, 155], budget=210,
+                                   count_tokens_batch=count_batch, fragments=True)
+    assert [d['id'] for d in packed] == ['doc0', 'doc1']
+    assert packed[1]['trimmed'] and packed[1]['text'] == "가" * 50 + ". " + "나" * 50 + "."
+    assert stats['fragments'] == 1 and stats['used_tokens'] == 100 + 102
+    assert 'trimmed' not in docs[1]  # 원본 문서는 변경하지 않음
+    print("✓ 문장 조각")
+
+
+def test_reretrieval_packs_merged_docs_within_budget():
+    """CRAG 재검색(iteration ≥ 1): 이전 iteration 문서까지 합친 집합이 예산을 넘지 않음"""
+    import pytest
+    pytest.importorskip("dotenv")
+    from agent.nodes.retrieve import _finalize_retrieval
+
+    class TokenManager:
+        def count_tokens_batch(self, texts):
+            return [len(t) for t in texts]  # 문자 1개 = 토큰 1개
+
+    def docs(prefix, n, offset=0):
+        return [{'id': f'{prefix}{i}', 'text': "가" * 100, 'rrf_score': 1.0 / (60 + offset + i + 1)} for i in range(n)]
+
+    state = {
+        'feature_flags': {'doc_packing_enabled': True}, 'token_manager': TokenManager(),
+        'iteration_count': 1, 'retrieved_docs': docs('old', 3, offset=3),
+    }
+    result = _finalize_retrieval(state, {'docs_budget': 450}, docs('new', 3))
+
+    assert sum(len(d['text']) for d in result['retrieved_docs']) <= 450
+    assert [d['id'] for d in result['retrieved_docs']] == ['new0', 'new1', 'new2', 'old0']
+    assert result['doc_packing_stats']['candidates'] == 6
+    assert result['retrieved_docs_history'] == [['new0', 'new1', 'new2']]
+    print("✓ 재검색 병합 문서 패킹")
@@ -0,0 +1,70 @@
+"""
+검색 문서 집합 (retrieved_docs 리듀서) 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.doc_set import (
+    MAX_RETRIEVED_DOCS,
+    doc_id,
+    reduce_retrieved_docs,
+    merge_iteration_docs,
+    summarize_provenance,
+)
+
+
+def _docs(*texts):
+    return [{'text': text, 'score': 1.0} for text in texts]
+
+
+def test_doc_id_prefers_explicit_id():
+    """doc_id/id 필드 우선, 없으면 본문 해시"""
+    assert doc_id({'doc_id': 'D1', 'text': 'a'}) == 'D1'
+    assert doc_id({'id': 7, 'text': 'a'}) == '7'
+    assert doc_id({'text': 'a'}) == doc_id({'text': 'a', 'score': 0.3})
+    print("✓ doc_id")
+
+
+def test_reducer_is_idempotent_and_bounded():
+    """같은 리스트를 반복 전달해도 누적되지 않고, 상한이 적용됨"""
+    docs = _docs('a', 'b', 'a')
+    state_docs = []
+    for _ in range(5):  # 노드 5개가 {**state}를 반환하는 상황
+        state_docs = reduce_retrieved_docs(state_docs, state_docs or docs)
+    assert [d['text'] for d in state_docs] == ['a', 'b']
+
+    many = _docs(*[f"doc-{i}" for i in range(MAX_RETRIEVED_DOCS + 10)])
+    assert len(reduce_retrieved_docs([], many)) == MAX_RETRIEVED_DOCS
+    assert reduce_retrieved_docs(docs, None) == docs
+    print("✓ reducer idempotent and bounded")
+
+
+def test_merge_iteration_docs_provenance():
+    """재검색 문서 우선 배치, 중복 제거, 최초 iteration 유지"""
+    first = merge_iteration_docs([], _docs('a', 'b'), iteration=0)
+    assert [d['retrieval_iteration'] for d in first] == [0, 0]
+
+    second = merge_iteration_docs(first, _docs('c', 'a'), iteration=1)
+    assert [d['text'] for d in second] == ['c', 'a', 'b']
+    assert [d['retrieval_iteration'] for d in second] == [1, 0, 0]
+    assert summarize_provenance(second) == {'1': 1, '0': 2}
+
+    capped = merge_iteration_docs(second, _docs('d'), iteration=2, cap=2)
+    assert [d['text'] for d in capped] == ['d', 'c']
+    print("✓ merge_iteration_docs keeps provenance")
+
+
+def run_all_tests():
+    """모든 테스트 실행"""
+    test_doc_id_prefers_explicit_id()
+    test_reducer_is_idempotent_and_bounded()
+    test_merge_iteration_docs_provenance()
+
+
+if __name__ == "__main__":
+    run_all_tests()
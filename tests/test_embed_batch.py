@@ -0,0 +1,76 @@
+"""
+배치 임베딩 (embed_batch) 테스트
+"""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.llm_client import LLMClient, chunk_texts
+
+
+class FakeEmbeddingClient(LLMClient):
+    """텍스트 길이를 벡터로 돌려주는 클라이언트 ("bad"가 든 텍스트는 실패)"""
+
+    def __init__(self):
+        self.chunk_calls = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, system_prompt=None, **kwargs):
+        return prompt
+
+    def embed(self, text, **kwargs):
+        if 'bad' in text:
+            raise RuntimeError("embed failed")
+        return [float(len(text))]
+
+    def _embed_chunk(self, texts, **kwargs):
+        with self.lock:
+            self.chunk_calls.append(list(texts))
+        if any('bad' in text for text in texts):
+            raise RuntimeError("batch failed")
+        return [[float(len(text))] for text in texts]
+
+
+def test_chunk_texts_by_count_and_tokens():
+    """개수 / 추정 토큰 상한으로 분할, 순서 유지"""
+    texts = ['a' * 10] * 5
+    assert chunk_texts(texts, batch_size=2, max_batch_tokens=1000) == [[0, 1], [2, 3], [4]]
+    # 텍스트당 추정 5토큰 → 12토큰 상한이면 2개씩
+    assert chunk_texts(texts, batch_size=100, max_batch_tokens=12) == [[0, 1], [2, 3], [4]]
+    # 상한보다 큰 단일 텍스트는 단독 청크
+    assert chunk_texts(['a' * 100, 'b'], batch_size=10, max_batch_tokens=10) == [[0], [1]]
+    print("✓ 청크 분할")
+
+
+def test_embed_batch_keeps_order_and_isolates_failures():
+    """동시 실행 후 입력 순서로 결과 조립, 실패 청크는 개별 재시도 후 실패 텍스트만 None"""
+    client = FakeEmbeddingClient()
+    texts = ['x' * n for n in range(1, 9)]
+    texts[5] = 'bad'
+
+    vectors = client.embed_batch(texts, batch_size=3, max_workers=3)
+
+    assert len(vectors) == len(texts)
+    for text, vector in zip(texts, vectors):
+        if text == 'bad':
+            assert vector is None
+        else:
+            assert vector == [float(len(text))]
+    assert len(client.chunk_calls) == 3
+    print("✓ 순서 유지 + 부분 실패")
+
+
+def test_aembed_batch_matches_sync():
+    """비동기 버전도 같은 결과"""
+    client = FakeEmbeddingClient()
+    texts = ['a', 'bb', 'bad', 'dddd']
+    vectors = asyncio.run(client.aembed_batch(texts, batch_size=2))
+    assert vectors == [[1.0], [2.0], None, [4.0]]
+    assert client.embed_batch([]) == []
+    print("✓ aembed_batch")
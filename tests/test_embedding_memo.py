@@ -0,0 +1,66 @@
+"""
+턴 단위 임베딩 메모 테스트
+"""
+
+import sys
+import asyncio
+import threading
+import contextvars
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.embedding_memo import embedding_turn, memoized_embedding, get_turn_embedding_stats
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        with self._lock:
+            self.calls += 1
+        return [float(len(text))]
+
+
+def test_one_forward_pass_per_model_and_text_per_turn():
+    """턴 안에서는 (model, text)당 한 번만 계산, 턴이 끝나면 메모 폐기"""
+    encoder = CountingEncoder()
+    with embedding_turn() as memo:
+        first = memoized_embedding('minilm', "당뇨병 식단", encoder)
+        assert memoized_embedding('minilm', "당뇨병 식단", encoder) is first
+        memoized_embedding('other-model', "당뇨병 식단", encoder)
+        with embedding_turn() as inner:  # 중첩 턴은 바깥 메모 공유
+            assert inner is memo
+            memoized_embedding('minilm', "당뇨병 식단", encoder)
+        assert encoder.calls == 2
+        assert get_turn_embedding_stats() == {'hits': 2, 'forward_passes': 2, 'size': 2}
+
+    assert get_turn_embedding_stats() is None
+    memoized_embedding('minilm', "당뇨병 식단", encoder)  # 턴 밖: 메모 없음
+    assert encoder.calls == 3
+    print("✓ 턴 단위 메모")
+
+
+def test_memo_is_shared_with_threads_and_tasks():
+    """copy_context 스레드와 asyncio 태스크도 같은 턴 메모 사용, 동시 요청은 한 번만 계산"""
+    encoder = CountingEncoder()
+
+    async def turn():
+        with embedding_turn():
+            await asyncio.gather(*[
+                asyncio.to_thread(memoized_embedding, 'minilm', "고혈압", encoder) for _ in range(8)
+            ])
+            context = contextvars.copy_context()
+            worker = threading.Thread(target=context.run, args=(memoized_embedding, 'minilm', "고혈압", encoder))
+            worker.start()
+            worker.join()
+            return get_turn_embedding_stats()
+
+    stats = asyncio.run(turn())
+    assert encoder.calls == 1
+    assert stats['forward_passes'] == 1 and stats['hits'] == 8
+    print("✓ 스레드/태스크 공유")
@@ -0,0 +1,52 @@
+"""
+Feature-flag 프로파일별 그래프 구성 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.graph_profile import FULL_PROFILE, graph_profile, entry_defaults, exit_defaults
+
+
+def test_profile_follows_node_skip_conditions():
+    """각 노드가 조기 반환하는 플래그 조합에서 해당 노드를 제외"""
+    flags = {
+        'response_cache_enabled': False,
+        'active_retrieval_enabled': False,
+        'self_refine_enabled': True,
+        'quality_check_enabled': False,
+    }
+    profile = graph_profile(flags, 'ai_agent')
+    assert not profile.response_cache
+    assert not profile.active_retrieval
+    assert profile.retrieval and profile.self_refine
+    assert not profile.quality_loop
+
+    # LLM 모드: 캐시/검색/셀프 리파인 모두 제외
+    llm = graph_profile({'active_retrieval_enabled': True}, 'llm')
+    assert not any(llm)
+    assert llm.name == 'minimal'
+
+    # 같은 플래그 조합은 같은 서명 (컴파일 그래프 캐시 키)
+    assert graph_profile(dict(flags), 'ai_agent') == profile
+    assert graph_profile({'active_retrieval_enabled': True}, 'ai_agent') == FULL_PROFILE
+    print("✓ 프로파일 서명")
+
+
+def test_defaults_replace_skipped_node_outputs():
+    """제외된 노드가 남겼을 상태 값 보충 (needs_retrieval은 종료 후에만 덮어씀)"""
+    profile = graph_profile({'self_refine_enabled': False}, 'ai_agent')
+
+    entry = entry_defaults(profile)
+    assert entry['classification_skipped'] is True
+    assert entry['needs_retrieval'] is True  # 검색 라우팅은 classify_intent 비활성화 결과와 동일
+    assert entry['quality_score'] == 1.0
+    assert 'retrieval_attempted' not in entry
+
+    assert exit_defaults(profile) == {'needs_retrieval': False}
+    assert entry_defaults(FULL_PROFILE) == {} and exit_defaults(FULL_PROFILE) == {}
+    print("✓ 제외 노드 기본값")
@@ -0,0 +1,90 @@
+"""
+모의 LLM / 임베딩 클라이언트 테스트 (API 키 없이 실행)
+"""
+
+import sys
+import math
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.llm_client import MockLLMClient, MockAPIError, get_llm_client
+from core.rate_limiter import RetryPolicy
+from agent.quality_evaluator import QualityEvaluator
+
+
+def test_answers_are_deterministic_and_seedable():
+    """같은 seed + 프롬프트 → 같은 답변, seed가 다르면 달라질 수 있음"""
+    a = MockLLMClient(seed=7)
+    b = MockLLMClient(seed=7)
+    prompt = "메트포르민의 부작용은 무엇인가요?"
+
+    answer = a.generate(prompt, system_prompt="의료 상담")
+    assert answer == b.generate(prompt, system_prompt="의료 상담")
+    assert answer == asyncio.run(b.agenerate(prompt, system_prompt="의료 상담"))
+    assert answer.startswith("[mock]")
+
+    answers = {MockLLMClient(seed=seed).generate(prompt) for seed in range(10)}
+    assert len(answers) > 1
+    assert "".join(a.generate_stream(prompt, system_prompt="의료 상담")) == answer
+    print("✓ 결정적 답변")
+
+
+def test_quality_evaluation_json_is_parsed():
+    """품질 평가 프롬프트에는 QualityEvaluator가 파싱하는 JSON 반환"""
+    evaluator = QualityEvaluator(llm_client=MockLLMClient(seed=1))
+    feedback = evaluator.evaluate(
+        user_query="고혈압 식이요법은?",
+        answer="싱겁게 드세요.",
+        retrieved_docs=[{'text': '나트륨 섭취를 줄인다.'}],
+    )
+    assert 0.5 <= feedback['grounding_score'] <= 0.95
+    assert 'JSON 파싱 실패' not in feedback['reason']
+    assert 0.0 <= feedback['overall_score'] <= 1.0
+    print("✓ 품질 평가 JSON")
+
+
+def test_hash_embeddings_match_configured_dimension():
+    """임베딩: 설정 차원의 단위 벡터, 같은 텍스트 → 같은 벡터"""
+    client = MockLLMClient(embedding_model='text-embedding-3-large')
+    vector = client.embed("당뇨병")
+    assert len(vector) == 3072
+    assert math.isclose(sum(v * v for v in vector), 1.0, rel_tol=1e-6)
+    assert vector == client.embed("당뇨병")
+    assert vector != client.embed("고혈압")
+
+    small = MockLLMClient(embedding_dimension=8)
+    assert [len(v) for v in small.embed_batch(["a", "b", "c"], batch_size=2)] == [8, 8, 8]
+    print("✓ 해시 임베딩")
+
+
+def test_injected_errors_go_through_retry():
+    """주입된 429/503은 재시도 경로를 거치고, 재시도 한도를 넘으면 전파"""
+    always_fail = MockLLMClient(error_rate=1.0)
+    always_fail.retry_policy = RetryPolicy(max_retries=0, deadline_s=5)
+    with pytest.raises(MockAPIError) as exc_info:
+        always_fail.generate("질문")
+    assert exc_info.value.status_code in (429, 503)
+
+    flaky = MockLLMClient(seed=3, error_rate=0.5)
+    flaky.retry_policy = RetryPolicy(max_retries=20, base_delay=0.001, max_delay=0.001, deadline_s=5)
+    retries_before = flaky.limiter.get_stats()['retries']
+    answers = [flaky.generate(f"질문 {i}") for i in range(10)]
+    assert all(answer.startswith("[mock]") for answer in answers)
+    assert flaky.limiter.get_stats()['retries'] > retries_before
+    print("✓ 오류 주입 + 재시도")
+
+
+def test_factory_returns_mock_without_api_keys(monkeypatch):
+    """provider='mock' 또는 LLM_MOCK=1이면 API 키 없이 mock 클라이언트"""
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    assert isinstance(get_llm_client('mock', model='load-test'), MockLLMClient)
+
+    monkeypatch.setenv('LLM_MOCK', '1')
+    assert isinstance(get_llm_client('openai', model='gpt-4o-mini'), MockLLMClient)
+    print("✓ 팩토리")
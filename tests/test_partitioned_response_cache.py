@@ -0,0 +1,177 @@
+"""
+환자 맥락별 응답 캐시 파티션 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+
+from memory import response_cache
+from memory.response_cache import PartitionedResponseCache, partition_key
+
+
+class KeywordEncoder:
+    """키워드 포함 여부로 벡터를 만드는 테스트용 인코더 (모델 다운로드 없음)"""
+    KEYWORDS = ["당뇨", "고혈압", "메트포르민", "부작용", "식단", "운동"]
+
+    def __init__(self, model_name):
+        self.calls = 0
+
+    def encode(self, text, convert_to_tensor=False):
+        self.calls += 1
+        return np.array([float(k in text) for k in self.KEYWORDS] + [0.1], dtype=np.float32)
+
+
+def _cache(monkeypatch, **kwargs):
+    monkeypatch.setattr(response_cache, "SentenceTransformer", KeywordEncoder)
+    return PartitionedResponseCache(similarity_threshold=0.8, **kwargs)
+
+
+def test_lookup_is_limited_to_patient_and_shared_partitions(monkeypatch):
+    """다른 환자(또는 같은 환자의 다른 프로필)의 개인화 답변은 반환하지 않음"""
+    cache = _cache(monkeypatch, shared_partition=True)
+    alice = partition_key("alice", "만성 질환: 제2형 당뇨병")
+    alice_updated = partition_key("alice", "만성 질환: 제2형 당뇨병, 고혈압")
+    bob = partition_key("bob", "만성 질환: 제2형 당뇨병")
+    assert len({alice, alice_updated, bob}) == 3
+
+    cache.add("당뇨 식단", "앨리스님은 탄수화물을 줄이세요.", partition_key=alice)
+    assert cache.find_similar("당뇨 식단 알려줘", alice)[0].response == "앨리스님은 탄수화물을 줄이세요."
+    assert cache.find_similar("당뇨 식단 알려줘", bob) is None
+    assert cache.find_similar("당뇨 식단 알려줘", alice_updated) is None
+
+    cache.add("메트포르민 부작용", "설사, 구역", partition_key=bob, shared=True)
+    assert cache.find_similar("메트포르민 부작용", alice)[0].response == "설사, 구역"
+
+    stats = cache.get_stats()
+    assert stats['cache_hits'] == 2 and stats['shared_hits'] == 1 and stats['partitions'] == 2
+    assert cache.encoder.calls == 4  # 저장 2 + 조회 2 (조회당 한 번, 빈 파티션은 건너뜀)
+    print("✓ 파티션 격리 + 공유 파티션")
+
+
+def test_partitions_have_their_own_capacity(monkeypatch):
+    """파티션별 LRU, 파티션 수 상한 초과 시 오래된 환자 파티션 삭제 (공유 파티션 유지)"""
+    cache = _cache(monkeypatch, max_partition_size=1, max_partitions=2, shared_partition=True)
+    cache.add("운동 방법", "걷기", partition_key="any", shared=True)
+    cache.add("당뇨 식단", "A", partition_key="p1")
+    cache.add("고혈압 식단", "B", partition_key="p2")  # p1 파티션 삭제
+    assert list(cache.partitions) == [PartitionedResponseCache.SHARED_PARTITION, "p2"]
+
+    cache.add("당뇨 운동", "C", partition_key="p2")  # p2 파티션 안에서만 LRU
+    assert [item.response for item in cache.partition("p2").cache.values()] == ["C"]
+    assert cache.find_similar("운동 방법", "p2")[0].response == "걷기"
+
+    no_shared = _cache(monkeypatch)  # 기본값: 공유 파티션 없음
+    no_shared.add("운동 방법", "걷기", partition_key="p1", shared=True)
+    assert list(no_shared.partitions) == ["p1"]
+    print("✓ 파티션별 용량")
+
+
+def test_own_partition_wins_ties_with_shared(monkeypatch):
+    """같은 점수면 환자 본인 파티션 답변 우선, include_shared=False면 공유 파티션 제외"""
+    cache = _cache(monkeypatch, shared_partition=True)
+    cache.add("당뇨 식단", "일반 식단 안내", partition_key="p1", shared=True)
+    cache.add("당뇨 식단", "앨리스님 맞춤 식단", partition_key="p1")
+
+    assert cache.find_similar("당뇨 식단", "p1")[0].response == "앨리스님 맞춤 식단"
+    assert cache.get_stats()['shared_hits'] == 0
+    assert cache.find_similar("당뇨 식단", "p2")[0].response == "일반 식단 안내"
+    assert cache.find_similar("당뇨 식단", "p2", include_shared=False) is None
+    print("✓ 본인 파티션 우선")
+
+
+def test_nodes_store_and_hit_with_partitioning_enabled(monkeypatch):
+    """store_response_node → check_similarity_node (cache_partitioning_enabled) 한 턴씩 실행"""
+    from agent.nodes import check_similarity
+
+    monkeypatch.setattr(response_cache, "SentenceTransformer", KeywordEncoder)
+    monkeypatch.setattr(check_similarity, "_partitioned_cache", None)
+
+    class Profile:
+        def __init__(self, summary):
+            self.summary = summary
+
+        def get_profile_summary(self):
+            return self.summary
+
+    flags = {'response_cache_enabled': True, 'cache_partitioning_enabled': True, 'style_variation_level': 0.0}
+    state = {
+        'mode': 'ai_agent', 'feature_flags': flags, 'user_id': 'alice',
+        'user_text': "당뇨 식단", 'answer': "앨리스님은 탄수화물을 줄이세요.",
+        'profile_store': Profile("만성 질환: 제2형 당뇨병"), 'profile_summary': "만성 질환: 제2형 당뇨병",
+        'cache_hit': False,
+    }
+    assert check_similarity.store_response_node(state) is state
+
+    hit = check_similarity.check_similarity_node({**state, 'answer': ''})
+    assert hit['cache_hit'] and hit['answer'] == "앨리스님은 탄수화물을 줄이세요."
+    assert hit['cache_stats']['cache_size'] == 1
+
+    other = check_similarity.check_similarity_node({**state, 'answer': '', 'user_id': 'bob'})
+    assert not other['cache_hit']
+    print("✓ 노드 실행 (파티션)")
+
+
+def test_shared_eligibility_is_decided_by_flags_and_question(monkeypatch):
+    """프로필이 비어 있어도 개인화 설정이면 공유하지 않고, 환자 정보 슬롯이 있는 질문도 공유하지 않음"""
+    from agent.nodes import check_similarity
+
+    monkeypatch.setattr(response_cache, "SentenceTransformer", KeywordEncoder)
+    monkeypatch.setattr(check_similarity, "_partitioned_cache", None)
+
+    class Profile:
+        def get_profile_summary(self):
+            return ''
+
+    flags = {
+        'response_cache_enabled': True, 'cache_partitioning_enabled': True,
+        'cache_shared_partition': True, 'style_variation_level': 0.0,
+    }
+    state = {
+        'mode': 'ai_agent', 'feature_flags': flags, 'user_id': 'new_patient',
+        'user_text': "운동 방법", 'answer': "하루 30분 걷기", 'profile_store': Profile(),
+        'slot_out': {'demographics': {'age': None}, 'conditions': []}, 'cache_hit': False,
+    }
+    assert not check_similarity._shared_eligible(state)  # 빈 프로필이지만 개인화 설정
+
+    unpersonalized = {**flags, 'include_personalization': False}
+    assert check_similarity._shared_eligible({**state, 'feature_flags': unpersonalized})
+    assert not check_similarity._shared_eligible({
+        **state, 'feature_flags': unpersonalized, 'slot_out': {'medications': ['메트포르민']},
+    })
+
+    check_similarity.store_response_node({**state, 'feature_flags': unpersonalized})
+    cache = check_similarity._partitioned_cache
+    assert PartitionedResponseCache.SHARED_PARTITION in cache.partitions
+
+    # 프로필을 쓰는 설정의 다른 환자는 공유 답변을 받지 않음
+    personalized = check_similarity.check_similarity_node({**state, 'user_id': 'bob', 'answer': ''})
+    assert not personalized['cache_hit']
+    shared = check_similarity.check_similarity_node(
+        {**state, 'user_id': 'bob', 'answer': '', 'feature_flags': unpersonalized}
+    )
+    assert shared['cache_hit'] and shared['answer'] == "하루 30분 걷기"
+    print("✓ 공유 파티션 대상 판정")
+
+
+def test_partitioning_warns_that_persistent_cache_is_not_used(monkeypatch, tmp_path, capsys):
+    """RESPONSE_CACHE_DIR가 있어도 파티션 캐시는 메모리 전용 (경고 출력, 디렉터리 미사용)"""
+    from agent.nodes import check_similarity
+
+    monkeypatch.setattr(response_cache, "SentenceTransformer", KeywordEncoder)
+    monkeypatch.setattr(check_similarity, "_partitioned_cache", None)
+    monkeypatch.setenv("RESPONSE_CACHE_DIR", str(tmp_path / "response_cache"))
+
+    cache = check_similarity.get_partitioned_response_cache({'cache_partition_size': 5})
+    assert type(cache) is PartitionedResponseCache and cache.max_partition_size == 5
+    assert "RESPONSE_CACHE_DIR" in capsys.readouterr().out
+    assert not (tmp_path / "response_cache").exists()
+    print("✓ 영속 캐시 비호환 경고")
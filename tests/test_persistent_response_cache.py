@@ -0,0 +1,138 @@
+"""
+영속 응답 캐시 (SQLite + mmap 임베딩) 테스트
+
+같은 디렉터리를 여는 인스턴스 두 개로 재시작 / 다른 프로세스를 흉내냅니다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+
+from memory import response_cache, persistent_response_cache
+from memory.persistent_response_cache import PersistentResponseCache
+
+
+class KeywordEncoder:
+    """키워드 포함 여부로 벡터를 만드는 테스트용 인코더 (모델 다운로드 없음)"""
+    KEYWORDS = ["당뇨", "고혈압", "메트포르민", "부작용", "식단", "운동"]
+
+    def __init__(self, model_name):
+        pass
+
+    def encode(self, text, convert_to_tensor=False):
+        return np.array([float(k in text) for k in self.KEYWORDS] + [0.1], dtype=np.float32)
+
+
+@pytest.fixture
+def open_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(response_cache, "SentenceTransformer", KeywordEncoder)
+    opened = []
+
+    def _open(**kwargs):
+        kwargs.setdefault('similarity_threshold', 0.8)
+        cache = PersistentResponseCache(path=str(tmp_path / "response_cache"), sync_interval_s=0, **kwargs)
+        opened.append(cache)
+        return cache
+
+    yield _open
+    for cache in opened:
+        cache.close()
+
+
+def test_warm_start_and_cumulative_stats(open_cache):
+    """재시작 후에도 항목과 누적 적중률 유지"""
+    first = open_cache()
+    first.add("당뇨 환자 식단", "싱겁게 드세요.", metadata={'user_id': 'u1'})
+    assert first.find_similar("당뇨 식단 알려줘")[0].response == "싱겁게 드세요."
+    assert first.find_similar("운동") is None
+    first.close()
+
+    restarted = open_cache()
+    assert restarted.warm_start_entries == 1
+    hit, _ = restarted.find_similar("당뇨 식단")
+    assert hit.metadata == {'user_id': 'u1'} and hit.hit_count == 2  # 이전 프로세스 적중 1 + 이번 1
+
+    persistent = restarted.get_stats()['persistent']
+    assert persistent['total_queries'] == 3 and persistent['cache_hits'] == 2
+    print("✓ warm start + 누적 통계")
+
+
+def test_writes_and_evictions_are_shared(open_cache):
+    """다른 인스턴스의 쓰기/용량 초과 삭제가 동기화로 반영"""
+    writer = open_cache(max_cache_size=2)
+    reader = open_cache(max_cache_size=2)
+
+    writer.add("당뇨 환자 식단", "싱겁게 드세요.")
+    assert reader.find_similar("당뇨 식단")[0].response == "싱겁게 드세요."
+
+    writer.add("고혈압 운동", "걷기")
+    writer.add("메트포르민 부작용", "설사, 구역")  # 가장 오래 사용되지 않은 '당뇨 환자 식단' 삭제
+    assert reader.find_similar("당뇨 식단") is None
+    assert sorted(item.query for item in reader.cache.values()) == ["고혈압 운동", "메트포르민 부작용"]
+    assert set(reader.index._slot_of) == set(reader.cache)
+    assert not hasattr(reader.index, 'add')  # 행 쓰기는 캐시(SQLite 트랜잭션)만 담당
+    assert reader.get_stats()['index_backend'] == 'mmap'
+    print("✓ 인스턴스 간 공유")
+
+
+def test_compaction_rewrites_live_rows(open_cache, tmp_path):
+    """압축 후 새 세대 파일로 재매핑, 검색 결과 유지"""
+    writer = open_cache(max_cache_size=2)
+    reader = open_cache(max_cache_size=2)
+    for query in ["당뇨 식단", "고혈압 운동", "메트포르민 부작용", "당뇨 운동"]:
+        writer.add(query, f"답변: {query}")
+    assert reader.find_similar("메트포르민 부작용") is not None
+
+    assert writer.compact() == 2
+    files = list((tmp_path / "response_cache").glob("embeddings.*.f32"))
+    assert [f.name for f in files] == ["embeddings.1.f32"]
+
+    hit, similarity = reader.find_similar("당뇨 운동 방법")
+    assert hit.response == "답변: 당뇨 운동" and similarity > 0.99
+    assert sorted(reader.index._slot_of.values()) == [0, 1]
+    print("✓ 압축")
+
+
+def test_full_generation_rolls_over_without_resizing(open_cache, tmp_path, monkeypatch):
+    """세대 파일은 고정 크기, 행이 다 차면 새 세대로 압축하고 이전 세대 파일 삭제"""
+    monkeypatch.setattr(persistent_response_cache, "_CAPACITY_ROWS", 4)
+    cache_dir = tmp_path / "response_cache"
+    writer = open_cache(max_cache_size=2)
+    reader = open_cache(max_cache_size=2)
+
+    writer.add("당뇨 식단", "싱겁게")
+    first = cache_dir / "embeddings.0.f32"
+    size = first.stat().st_size
+    assert size == 4 * 7 * 4  # 용량 4행 (max_cache_size의 2배) x 7차원 float32
+
+    for query in ["고혈압 운동", "메트포르민 부작용", "당뇨 운동"]:
+        writer.add(query, f"답변: {query}")
+        assert first.stat().st_size == size  # 매핑된 파일 크기는 그대로
+    assert reader.find_similar("당뇨 운동")[0].response == "답변: 당뇨 운동"
+
+    writer.add("고혈압 식단", "저염식")  # 5번째 행: 새 세대로 압축
+    assert writer.get_stats()['persistent']['generation'] == 1
+    assert reader.find_similar("고혈압 식단")[0].response == "저염식"
+    assert sorted(f.name for f in cache_dir.glob("embeddings.*.f32")) == ["embeddings.1.f32"]
+    print("✓ 세대 전환")
+
+
+def test_clear_removes_old_generation_file(open_cache, tmp_path):
+    """clear는 세대를 올리고 이전 세대 파일을 삭제"""
+    cache = open_cache()
+    cache.add("당뇨 식단", "싱겁게")
+    cache.clear()
+    assert list((tmp_path / "response_cache").glob("embeddings.*.f32")) == []
+    assert cache.find_similar("당뇨 식단") is None
+
+    cache.add("고혈압 운동", "걷기")
+    assert [f.name for f in (tmp_path / "response_cache").glob("embeddings.*.f32")] == ["embeddings.1.f32"]
+    print("✓ clear")
@@ -0,0 +1,164 @@
+"""
+Cascade 품질 평가 (휴리스틱 → 불확실 구간만 LLM) 및 평가/재작성 통합 호출 테스트
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("dotenv")
+
+from agent.quality_evaluator import QualityEvaluator
+from agent.refine_strategies.corrective_rag_strategy import CorrectiveRAGStrategy
+from agent.metrics.ablation_metrics import AblationMetrics
+from config.ablation_config import ABLATION_PROFILES
+
+
+JUDGE_JSON = json.dumps({
+    'grounding_score': 0.2, 'completeness_score': 0.2, 'accuracy_score': 0.5,
+    'missing_info': ['용량'], 'improvement_suggestions': [], 'needs_retrieval': True, 'reason': '근거 부족',
+})
+
+
+class FakeLLM:
+    """호출을 기록하고 정해진 응답을 돌려주는 LLM (error면 예외)"""
+
+    def __init__(self, response=JUDGE_JSON, error=False):
+        self.response = response
+        self.error = error
+        self.calls = []
+
+    def generate(self, prompt, system_prompt=None, **kwargs):
+        self.calls.append(kwargs)
+        if self.error:
+            raise RuntimeError("LLM unavailable")
+        return self.response
+
+
+class FakeRewriter:
+    def __init__(self):
+        self.calls = 0
+
+    def rewrite(self, **kwargs):
+        self.calls += 1
+        return "재작성된 질의 (개별 호출)"
+
+
+CASCADE_FLAGS = {'quality_check_mode': 'cascade', 'cascade_band_low': 0.35, 'cascade_band_high': 0.75}
+
+
+def _state(llm, answer, docs, profile=''):
+    return {
+        'user_text': "메트포르민 용량", 'answer': answer, 'retrieved_docs': docs, 'profile_summary': profile,
+        'iteration_count': 0, 'quality_evaluator': QualityEvaluator(llm_client=llm), 'query_rewriter': FakeRewriter(),
+    }
+
+
+def _stats(tmp_path, *results):
+    metrics = AblationMetrics("cascade", save_dir=str(tmp_path))
+    return metrics._quality_check_stats({'refine_iteration_logs': [log for r in results for log in r['refine_iteration_logs']]})
+
+
+def test_cascade_calls_judge_only_inside_band(tmp_path):
+    """휴리스틱 점수가 구간 안이면 LLM 평가, 밖이면 생략"""
+    strategy = CorrectiveRAGStrategy({**CASCADE_FLAGS, 'dynamic_query_rewrite': False})
+
+    in_band_llm = FakeLLM()
+    in_band = strategy.refine(_state(in_band_llm, "", [{'text': "근거"}]))  # 휴리스틱 0.4
+    cascade = in_band['quality_feedback']['cascade']
+    assert len(in_band_llm.calls) == 1 and cascade['judge_called'] and in_band['needs_retrieval']
+    assert in_band['quality_feedback']['evaluator'] == 'llm'
+
+    confident_llm = FakeLLM()
+    confident = strategy.refine(_state(confident_llm, "가" * 500, [{'text': "근거"}], profile="당뇨"))  # 1.0
+    cascade = confident['quality_feedback']['cascade']
+    assert confident_llm.calls == [] and not cascade['judge_called'] and not cascade['shadow_judge']
+    assert confident['quality_feedback']['evaluator'] == 'heuristic' and not confident['needs_retrieval']
+
+    stats = _stats(tmp_path, in_band, confident)
+    assert stats['quality_judge_calls'] == 1 and stats['quality_judge_avoided'] == 1
+    assert stats['quality_judge_shadow_calls'] == 0 and stats['cascade_comparisons'] == 0
+    print("✓ 불확실 구간 라우팅")
+
+
+def test_shadow_judge_is_measured_but_not_counted_as_avoided(tmp_path):
+    """cascade_shadow_judge: 구간 밖에서도 LLM 평가를 호출해 일치도만 측정 (결정은 휴리스틱)"""
+    assert ABLATION_PROFILES['self_refine_cascade_quality']['features']['cascade_shadow_judge'] is False
+    assert ABLATION_PROFILES['self_refine_cascade_quality_shadow']['features']['cascade_shadow_judge'] is True
+
+    strategy = CorrectiveRAGStrategy({**CASCADE_FLAGS, 'cascade_shadow_judge': True, 'dynamic_query_rewrite': False})
+    llm = FakeLLM()
+    result = strategy.refine(_state(llm, "가" * 500, [{'text': "근거"}], profile="당뇨"))
+    cascade = result['quality_feedback']['cascade']
+
+    assert len(llm.calls) == 1 and cascade['shadow_judge'] and not cascade['judge_called']
+    assert cascade['agrees_with_judge'] is False  # 휴리스틱: 재검색 불필요, LLM: 재검색 필요
+    assert result['quality_feedback']['evaluator'] == 'heuristic' and not result['needs_retrieval']
+    assert strategy.get_metrics({**result, 'iteration_count': 0})['judge_calls_avoided'] == 0
+
+    stats = _stats(tmp_path, result)
+    assert stats['quality_judge_avoided'] == 0 and stats['quality_judge_shadow_calls'] == 1
+    assert stats['cascade_comparisons'] == 1 and stats['cascade_agreements'] == 0
+    print("✓ shadow 평가")
+
+
+def test_judge_error_fallback_is_a_failed_call_not_an_avoided_one(tmp_path):
+    """LLM 평가 실패 후 휴리스틱 폴백: 호출 + 실패로 집계, 일치도 비교에서 제외"""
+    llm_mode = CorrectiveRAGStrategy({'quality_check_mode': 'llm', 'dynamic_query_rewrite': False})
+    failed = llm_mode.refine(_state(FakeLLM(error=True), "", [{'text': "근거"}]))
+    assert failed['quality_feedback']['judge_failed']
+
+    shadow = CorrectiveRAGStrategy({**CASCADE_FLAGS, 'cascade_shadow_judge': True, 'dynamic_query_rewrite': False})
+    shadow_failed = shadow.refine(_state(FakeLLM(error=True), "가" * 500, [{'text': "근거"}], profile="당뇨"))
+    cascade = shadow_failed['quality_feedback']['cascade']
+    assert cascade['judge_failed'] and cascade['agrees_with_judge'] is None
+
+    stats = _stats(tmp_path, failed, shadow_failed)
+    assert stats['quality_judge_calls'] == 1 and stats['quality_judge_shadow_calls'] == 1
+    assert stats['quality_judge_failures'] == 2
+    assert stats['quality_judge_avoided'] == 0 and stats['cascade_comparisons'] == 0
+    print("✓ LLM 평가 실패 폴백")
+
+
+def test_combined_eval_rewrite_parses_structured_output():
+    """통합 호출: 코드 블록 JSON 파싱, rewritten_query를 재작성 질의로 바로 사용 (재작성 호출 없음)"""
+    combined = json.loads(JUDGE_JSON)
+    combined['rewritten_query'] = "  메트포르민 1일 최대 용량  "
+    llm = FakeLLM(response=f"```json\n{json.dumps(combined, ensure_ascii=False)}\n```")
+    strategy = CorrectiveRAGStrategy({'quality_check_mode': 'llm', 'combined_eval_rewrite': True})
+    state = _state(llm, "", [{'text': "근거"}])
+
+    result = strategy.refine(state)
+    assert len(llm.calls) == 1 and llm.calls[0]['response_format']['type'] == 'json_schema'
+    assert result['query_for_retrieval'] == "메트포르민 1일 최대 용량"
+    assert result['quality_feedback']['overall_score'] == pytest.approx(0.2 * 0.4 + 0.2 * 0.4 + 0.5 * 0.2)
+    assert state['query_rewriter'].calls == 0
+    print("✓ 통합 호출 파싱")
+
+
+def test_combined_eval_rewrite_falls_back_to_separate_calls():
+    """통합 응답이 JSON이 아니면 개별 평가 + 개별 재작성으로 폴백"""
+    llm = FakeLLM(response="평가 결과를 드릴 수 없습니다.")
+    with pytest.raises(ValueError):
+        QualityEvaluator(llm_client=llm).evaluate_and_rewrite(user_query="q", answer="a", retrieved_docs=[])
+
+    class SwitchingLLM(FakeLLM):
+        def generate(self, prompt, system_prompt=None, **kwargs):
+            self.calls.append(kwargs)
+            return "not json" if 'response_format' in kwargs else JUDGE_JSON
+
+    llm = SwitchingLLM()
+    strategy = CorrectiveRAGStrategy({'quality_check_mode': 'llm', 'combined_eval_rewrite': True})
+    state = _state(llm, "", [{'text': "근거"}])
+    result = strategy.refine(state)
+
+    assert len(llm.calls) == 2 and 'response_format' not in llm.calls[1]
+    assert result['needs_retrieval'] and result['query_for_retrieval'] == "재작성된 질의 (개별 호출)"
+    assert state['query_rewriter'].calls == 1
+    print("✓ 통합 호출 폴백")
@@ -0,0 +1,93 @@
+"""
+LLM 호출 제한 / 재시도 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.rate_limiter import (
+    TokenBucket, RateLimiter, RetryPolicy, DeadlineExceeded,
+    backoff_delay, is_retryable, call_with_retry,
+)
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def test_token_bucket_queues_callers():
+    """버킷이 비면 대기 시간을 누적해 반환하고, 시간이 지나면 다시 채워짐"""
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])  # 초당 1개, 용량 60
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)  # 앞선 예약 뒤에 줄을 섬
+
+    now[0] = 10.0
+    assert bucket.reserve(1) == 0.0  # 10초 동안 10개 충전 (-2 → 8)
+    print("✓ 토큰 버킷")
+
+
+def test_backoff_and_retryable():
+    """full-jitter 상한과 재시도 대상 판별"""
+    assert backoff_delay(0, base=0.5, cap=20, rng=lambda: 0.999) < 0.5
+    assert backoff_delay(3, base=0.5, cap=20, rng=lambda: 0.999) < 4.0
+    assert backoff_delay(10, base=0.5, cap=20, rng=lambda: 0.999) < 20.0
+
+    assert is_retryable(FakeAPIError(429))
+    assert is_retryable(FakeAPIError(503))
+    assert not is_retryable(FakeAPIError(400))
+    assert not is_retryable(ValueError("bad"))
+    print("✓ 백오프 / 재시도 판별")
+
+
+def test_call_with_retry_recovers_from_429():
+    """429 뒤 성공하면 결과 반환 + 통계 기록, 재시도 불가 에러는 즉시 전파"""
+    limiter = RateLimiter()
+    policy = RetryPolicy(max_retries=3, base_delay=0.001, max_delay=0.001, deadline_s=5)
+    attempts = []
+
+    def flaky(timeout):
+        attempts.append(timeout)
+        if len(attempts) < 3:
+            raise FakeAPIError(429)
+        return "ok"
+
+    assert call_with_retry(flaky, limiter, policy) == "ok"
+    assert len(attempts) == 3
+    assert all(0 < t <= 5 for t in attempts)  # 남은 deadline이 요청 timeout으로 전달
+
+    stats = limiter.get_stats()
+    assert stats['calls'] == 3 and stats['retries'] == 2 and stats['rate_limit_errors'] == 2
+
+    def bad_request(timeout):
+        raise FakeAPIError(400)
+
+    with pytest.raises(FakeAPIError):
+        call_with_retry(bad_request, limiter, policy)
+    assert limiter.get_stats()['retries'] == 2
+    print("✓ 429 재시도")
+
+
+def test_deadline_stops_waiting():
+    """한도 대기가 deadline을 넘으면 호출하지 않고 DeadlineExceeded"""
+    limiter = RateLimiter(requests_per_minute=1)
+    policy = RetryPolicy(deadline_s=0.5)
+    calls = []
+
+    assert call_with_retry(lambda t: calls.append(t) or "first", limiter, policy) == "first"
+    with pytest.raises(DeadlineExceeded):
+        call_with_retry(lambda t: calls.append(t), limiter, policy)
+
+    assert len(calls) == 1
+    assert limiter.get_stats()['deadline_exceeded'] == 1
+    print("✓ deadline")
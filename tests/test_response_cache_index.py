@@ -0,0 +1,131 @@
+"""
+ResponseCache 임베딩 행렬 (벡터화 유사도 검색) 테스트
+"""
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+
+from memory import response_cache
+from memory.response_cache import EmbeddingMatrix, ResponseCache
+
+
+class KeywordEncoder:
+    """키워드 포함 여부로 벡터를 만드는 테스트용 인코더 (모델 다운로드 없음)"""
+    KEYWORDS = ["당뇨", "고혈압", "메트포르민", "부작용", "식단"]
+
+    def __init__(self, model_name):
+        self.calls = 0
+
+    def encode(self, text, convert_to_tensor=False):
+        self.calls += 1
+        return np.array([float(k in text) for k in self.KEYWORDS] + [0.1], dtype=np.float32)
+
+
+def _cache(monkeypatch, **kwargs):
+    monkeypatch.setattr(response_cache, "SentenceTransformer", KeywordEncoder)
+    return ResponseCache(similarity_threshold=0.8, **kwargs)
+
+
+def test_matrix_matches_python_cosine_loop():
+    """행렬 곱 + argmax 결과가 항목별 코사인 루프와 같음 (삭제 슬롯 재사용 포함)"""
+    rng = np.random.default_rng(0)
+    vectors = {f"k{i}": rng.normal(size=16) for i in range(200)}
+    matrix = EmbeddingMatrix(initial_capacity=4)
+    for key, vec in vectors.items():
+        matrix.add(key, vec)
+    for i in range(0, 200, 3):
+        matrix.remove(f"k{i}")
+        del vectors[f"k{i}"]
+    matrix.add("new", rng.normal(size=16))
+    vectors["new"] = matrix._vectors[matrix._slot_of["new"]]
+    assert len(matrix) == len(vectors) and matrix._size == 200  # 삭제된 슬롯 재사용
+
+    query = rng.normal(size=16)
+    cosine = {k: float(np.dot(query, v) / (np.linalg.norm(query) * np.linalg.norm(v))) for k, v in vectors.items()}
+    key, score = matrix.best_match(query)
+    assert key == max(cosine, key=cosine.get)
+    assert score == pytest.approx(cosine[key], abs=1e-5)
+    print("✓ 벡터화 검색 = 코사인 루프")
+
+
+def test_cache_lookup_and_eviction_keep_matrix_in_step(monkeypatch):
+    """의미 검색 적중, LRU/clear 후 행렬과 OrderedDict 동기화"""
+    cache = _cache(monkeypatch, max_cache_size=2)
+    cache.add("당뇨 환자 식단", "싱겁게 드세요.")
+    cache.add("고혈압 약 부작용", "어지러움이 있을 수 있습니다.")
+
+    hit, similarity = cache.find_similar("당뇨 식단 알려줘")
+    assert hit.response == "싱겁게 드세요." and similarity > 0.8
+    assert cache.find_similar("메트포르민") is None
+
+    cache.add("메트포르민 부작용", "설사, 구역")  # LRU: 고혈압 항목 제거
+    assert set(cache.index._slot_of) == set(cache.cache)
+    assert [item.query for item in cache.cache.values()] == ["당뇨 환자 식단", "메트포르민 부작용"]
+
+    cache.clear()
+    assert len(cache.index) == 0 and cache.find_similar("당뇨 식단") is None
+    print("✓ 캐시 동기화")
+
+
+@pytest.mark.skipif(not response_cache.HAS_FAISS, reason="faiss 미설치")
+def test_faiss_backend_agrees_with_numpy():
+    """FAISS 내적 인덱스와 numpy 행렬 결과 일치"""
+    rng = np.random.default_rng(1)
+    numpy_matrix, faiss_matrix = EmbeddingMatrix(), EmbeddingMatrix(backend='faiss')
+    for i in range(100):
+        vec = rng.normal(size=32)
+        numpy_matrix.add(f"k{i}", vec)
+        faiss_matrix.add(f"k{i}", vec)
+    faiss_matrix.remove("k5")
+    numpy_matrix.remove("k5")
+
+    for _ in range(5):
+        query = rng.normal(size=32)
+        assert numpy_matrix.best_match(query)[0] == faiss_matrix.best_match(query)[0]
+    print("✓ FAISS 백엔드")
+
+
+def test_expiry_heap_pops_only_expired_entries(monkeypatch):
+    """항목별 TTL: 만료된 항목만 힙에서 꺼내 제거, 교체된 키의 이전 만료는 무시"""
+    cache = _cache(monkeypatch)
+    cache.add("당뇨 식단", "싱겁게 드세요.")
+    cache.add("당뇨 검사 수치", "A1c 7% 미만", ttl_minutes=10)
+    cache.add("고혈압 식단", "나트륨 제한", ttl_minutes=10)
+    cache.add("고혈압 식단", "나트륨 제한 (갱신)")  # 기본 TTL로 교체
+
+    now = response_cache.datetime.now()
+    later = now + timedelta(minutes=30)
+
+    class FakeDatetime:
+        @staticmethod
+        def now():
+            return later
+
+    monkeypatch.setattr(response_cache, "datetime", FakeDatetime)
+    cache._evict_expired()
+    assert [item.query for item in cache.cache.values()] == ["당뇨 식단", "고혈압 식단"]
+    assert set(cache.index._slot_of) == set(cache.cache)
+    assert len(cache._expiry_heap) == 2
+    print("✓ 만료 힙")
+
+
+def test_turn_memo_shares_query_embedding_between_lookup_and_store(monkeypatch):
+    """한 턴의 find_similar + add는 인코더를 한 번만 호출"""
+    from core.embedding_memo import embedding_turn
+
+    cache = _cache(monkeypatch)
+    with embedding_turn():
+        assert cache.find_similar("메트포르민 부작용") is None
+        cache.add("메트포르민 부작용", "설사, 구역")
+    assert cache.encoder.calls == 1
+    print("✓ 턴 임베딩 메모")
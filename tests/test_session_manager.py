@@ -0,0 +1,67 @@
+"""
+세션 매니저 (LRU 퇴출 / 디스크 영속화) 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.session_manager import SessionManager
+from agent.session_registry import get_session_registry
+from memory.profile_store import ProfileStore
+
+
+def _fake_runner(calls):
+    """run_agent 대체: 프로필에 조건을 추가하고 받은 대화 이력을 기록"""
+    def runner(user_text, return_state=False, session_id=None, conversation_history=None, **kwargs):
+        calls.append({'session_id': session_id, 'history': conversation_history})
+        registry = get_session_registry()
+        store = registry.get_or_create(session_id, 'profile_store', ProfileStore)
+        store.update_slots({'conditions': [{'name': user_text}]})
+        return {'answer': f"답변: {user_text}"}
+    return runner
+
+
+def test_lru_eviction_and_lazy_reload(tmp_path):
+    """상한 초과 시 오래된 세션을 디스크로 내보내고, 다음 턴에서 다시 불러옴"""
+    calls = []
+    manager = SessionManager(max_sessions=2, spill_dir=str(tmp_path), runner=_fake_runner(calls))
+
+    assert manager.run_turn('p1', '당뇨') == "답변: 당뇨"
+    manager.run_turn('p2', '고혈압')
+    manager.run_turn('p3', '천식')  # p1 퇴출
+
+    assert manager.resident_sessions() == ['p2', 'p3']
+    assert 'p1' not in get_session_registry()
+    assert 'p1' in manager
+
+    manager.run_turn('p1', '비만')  # 디스크에서 다시 로딩 (p2 퇴출)
+    assert calls[-1]['history'] == "사용자: 당뇨\nAI: 답변: 당뇨"
+
+    profile = manager.get_resource('p1', 'profile_store')
+    assert [c.name for c in profile.ltm.conditions] == ['당뇨', '비만']
+    assert manager.get_stats()['evicted'] == 2
+    assert manager.get_stats()['reloaded'] == 1
+
+    for session_id in ('p1', 'p2', 'p3'):
+        manager.close(session_id, delete=True)
+    print("✓ LRU 퇴출 및 지연 로딩")
+
+
+def test_active_session_is_not_evicted(tmp_path):
+    """진행 중인 턴이 있는 세션은 퇴출하지 않음"""
+    manager = SessionManager(max_sessions=1, spill_dir=str(tmp_path), runner=_fake_runner([]))
+
+    manager.begin_turn('busy')
+    manager.run_turn('other', '두통')
+    assert 'busy' in manager.resident_sessions()
+
+    manager.end_turn('busy', '감기', '답변')
+    assert manager.resident_sessions() == ['other']  # 턴 종료 후 상한 적용
+
+    for session_id in ('busy', 'other'):
+        manager.close(session_id, delete=True)
+    print("✓ 진행 중 세션 보호")
@@ -0,0 +1,108 @@
+"""
+세션 리소스 레지스트리 테스트
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.session_registry import (
+    SessionResourceRegistry,
+    get_session_registry,
+    get_resource,
+    set_resource,
+    get_or_create_resource,
+    measure_state_size,
+)
+
+
+def test_registry_mode_keeps_resources_out_of_state():
+    """resource_handle이 있으면 리소스는 상태가 아닌 레지스트리에 저장"""
+    handle = "test-session::registry"
+    state = {'resource_handle': handle}
+
+    created = get_or_create_resource(state, 'profile_store', lambda: {'slots': []})
+    assert 'profile_store' not in state
+    assert get_resource(state, 'profile_store') is created
+    assert get_or_create_resource(state, 'profile_store', lambda: {'slots': ['new']}) is created
+
+    set_resource(state, 'speculative_retrieval', None)
+    assert get_resource(state, 'speculative_retrieval') is None
+
+    get_session_registry().release(handle)
+    assert get_resource(state, 'profile_store') is None
+    print("✓ registry mode keeps resources out of state")
+
+
+def test_legacy_mode_uses_state():
+    """resource_handle이 없으면 기존처럼 상태에 저장"""
+    state = {'hierarchical_memory': None}
+
+    memory = get_or_create_resource(state, 'hierarchical_memory', lambda: object())
+    assert state['hierarchical_memory'] is memory
+    assert get_resource(state, 'hierarchical_memory') is memory
+    print("✓ legacy mode stores resources in state")
+
+
+def test_registry_register_and_export():
+    """세션 상태로 전달된 리소스 등록/내보내기"""
+    registry = SessionResourceRegistry()
+    registry.register("s1", {'profile_store': 'profile', 'hierarchical_memory': None})
+
+    assert registry.export("s1", ('profile_store', 'hierarchical_memory')) == {'profile_store': 'profile'}
+    assert "s1" in registry
+
+    registry.release("s1")
+    assert "s1" not in registry
+    print("✓ register/export/release")
+
+
+def test_registry_concurrent_get_or_create():
+    """동시 생성 경합 시 모든 스레드가 같은 객체를 받음"""
+    registry = SessionResourceRegistry()
+    results = []
+
+    def worker():
+        results.append(registry.get_or_create("s1", 'llm_client', object))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(obj) for obj in results}) == 1
+    print("✓ concurrent get_or_create returns a single instance")
+
+
+def test_measure_state_size():
+    """상태 크기 측정 및 직렬화 불가 키 탐지"""
+    state = {
+        'user_text': '당뇨 약 부작용',
+        'retrieved_docs': [{'text': 'x' * 1000}],
+        'lock': threading.Lock(),
+    }
+    size = measure_state_size(state)
+
+    assert size['num_keys'] == 3
+    assert size['non_serializable'] == ['lock']
+    assert size['largest_keys'][0][0] == 'retrieved_docs'
+    assert size['total_bytes'] > 1000
+    print("✓ state size measured")
+
+
+def run_all_tests():
+    """모든 테스트 실행"""
+    test_registry_mode_keeps_resources_out_of_state()
+    test_legacy_mode_uses_state()
+    test_registry_register_and_export()
+    test_registry_concurrent_get_or_create()
+    test_measure_state_size()
+
+
+if __name__ == "__main__":
+    run_all_tests()
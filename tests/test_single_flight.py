@@ -0,0 +1,54 @@
+"""
+Single-Flight 요청 병합 테스트
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.single_flight import SingleFlight
+from core.utils import normalize_query, patient_fingerprint
+
+
+def test_normalize_query_and_fingerprint():
+    """공백/대소문자/끝 문장부호 차이는 같은 질의, 환자 맥락이 다르면 다른 지문"""
+    assert normalize_query("  Metformin  부작용은?  ") == normalize_query("metformin 부작용은")
+    assert patient_fingerprint("당뇨", None, "ai_agent") == patient_fingerprint("당뇨", "", "ai_agent")
+    assert patient_fingerprint("당뇨", None, "ai_agent") != patient_fingerprint("고혈압", None, "ai_agent")
+    print("✓ 정규화 / 지문")
+
+
+def test_concurrent_calls_share_one_computation():
+    """동시에 들어온 같은 키 요청은 한 번만 계산하고 결과를 공유"""
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'answer': '공유된 답변'}
+
+    def worker():
+        results.append(flight.do('key', compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(result == {'answer': '공유된 답변'} for result, _ in results)
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert flight.inflight() == 0
+
+    # 완료 후 같은 키는 다시 계산
+    flight.do('key', compute)
+    assert len(calls) == 2
+    print("✓ 동시 요청 병합")
@@ -0,0 +1,121 @@
+"""
+Speculative Retrieval (슬롯 추출과 검색 중첩 실행) 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.speculative_retrieval import (
+    SpeculativeRetrieval,
+    choose_better,
+    keyword_coverage,
+    start_speculative_retrieval,
+)
+
+
+def _docs(*texts):
+    return [{'id': f'doc{i}', 'text': text} for i, text in enumerate(texts)]
+
+
+class FakeClient:
+    def __init__(self):
+        self.embedded = []
+
+    def embed(self, text, embedding_model=None):
+        self.embedded.append(text)
+        return [float(len(text))]
+
+
+class FakeRetriever:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def search(self, query, query_vector, k):
+        self.calls.append((query, query_vector, k))
+        return self.docs[:k]
+
+
+def test_keyword_coverage_counts_query_terms_found_in_docs():
+    """보강 질의의 2자 이상 토큰 중 문서 본문에 등장하는 비율"""
+    docs = _docs("메트포르민 복용 시 설사", "Metformin dose")
+    assert keyword_coverage("메트포르민 설사 구역 metformin", docs) == pytest.approx(3 / 4)
+    assert keyword_coverage("메트포르민 a", docs) == 1.0  # 1자 토큰 제외
+    assert keyword_coverage("메트포르민", []) == 0.0
+    assert keyword_coverage("", docs) == 0.0
+    print("✓ 키워드 커버리지")
+
+
+def test_choose_better_prefers_refined_on_ties_and_empty_results():
+    """커버리지가 높은 쪽 선택, 동점이면 보강 질의 결과, 한쪽이 비면 다른 쪽"""
+    query = "당뇨 메트포르민 설사"
+    speculative = _docs("메트포르민 설사")
+    refined = _docs("당뇨 메트포르민")
+    narrow = _docs("당뇨")
+
+    source, docs, scores = choose_better(query, speculative, refined)
+    assert source == 'refined' and docs is refined  # 동점 (2/3)
+    assert scores == {'speculative': pytest.approx(2 / 3), 'refined': pytest.approx(2 / 3)}
+
+    assert choose_better(query, speculative, narrow)[0] == 'speculative'
+    assert choose_better(query, [], narrow)[:2] == ('refined', narrow)
+    assert choose_better(query, speculative, [])[:2] == ('speculative', speculative)
+    print("✓ 결과 선택")
+
+
+def test_background_search_embeds_original_query():
+    """1차 검색은 원문 질의로 임베딩 + 검색 (bm25 모드는 임베딩 생략)"""
+    client, retriever = FakeClient(), FakeRetriever(_docs("a", "b", "c"))
+    handle = start_speculative_retrieval(client, 'embed-model', retriever, "혈압 약", k=2, route='medication')
+    docs, vector, elapsed_ms = handle.result(timeout=5)
+    assert [d['id'] for d in docs] == ['doc0', 'doc1'] and vector == [float(len("혈압 약"))]
+    assert (handle.query, handle.route, handle.k) == ("혈압 약", 'medication', 2) and elapsed_ms >= 0
+
+    bm25 = start_speculative_retrieval(client, 'embed-model', retriever, "혈압", k=1, retrieval_mode='bm25')
+    assert bm25.result(timeout=5)[1] is None and client.embedded == ["혈압 약"]
+    assert retriever.calls[-1] == ("혈압", None, 1)
+    print("✓ 백그라운드 1차 검색")
+
+
+def _handle(query="당뇨 식단", route='default', k=5):
+    return SpeculativeRetrieval(query=query, route=route, k=k, retrieval_mode='hybrid', future=None)
+
+
+def test_retrieve_reuses_refines_or_falls_back():
+    """retrieve 노드: 질의/라우트가 같으면 재사용, 다르면 보강 검색과 비교, 1차 실패 시 폴백"""
+    pytest.importorskip("dotenv")
+    from agent.nodes.retrieve import _can_reuse_speculative, _merge_speculative
+
+    plan = {'query': "당뇨 식단", 'route': 'default', 'k': 3}
+    outcome = (_docs("당뇨 식단 관리", "운동"), [0.1], 12.0)
+
+    assert _can_reuse_speculative(plan, _handle(), outcome)
+    assert not _can_reuse_speculative(plan, _handle(), None)
+    assert not _can_reuse_speculative({**plan, 'query': "당뇨 식단 65세"}, _handle(), outcome)
+    assert not _can_reuse_speculative({**plan, 'route': 'symptom'}, _handle(), outcome)
+    assert not _can_reuse_speculative({**plan, 'k': 8}, _handle(k=5), outcome)
+
+    docs, vector, stats = _merge_speculative(plan, _handle(), outcome, wait_ms=4.0, refined=None, refine_ms=0.0)
+    assert stats['decision'] == 'reused' and docs is outcome[0] and vector == [0.1]
+    assert stats['sequential_retrieval_ms'] == 12.0 and stats['overlapped_retrieval_ms'] == 4.0
+
+    enriched = {**plan, 'query': "당뇨 식단 고혈압"}
+    refined = (_docs("당뇨 고혈압 식단"), [0.2])
+    docs, vector, stats = _merge_speculative(enriched, _handle(), outcome, 4.0, refined, 10.0)
+    assert stats['decision'] == 'refined' and docs is refined[0] and vector == [0.2]
+    assert stats['coverage'] == {'speculative': 0.667, 'refined': 1.0}
+    assert stats['sequential_retrieval_ms'] == 10.0 and stats['overlapped_retrieval_ms'] == 14.0
+
+    weaker = (_docs("고혈압"), [0.3])
+    docs, _, stats = _merge_speculative(enriched, _handle(), outcome, 4.0, weaker, 10.0)
+    assert stats['decision'] == 'speculative' and docs is outcome[0]
+
+    docs, vector, stats = _merge_speculative(plan, _handle(), None, 4.0, refined, 10.0)
+    assert stats['decision'] == 'fallback' and docs is refined[0] and stats['speculative_ms'] is None
+    print("✓ 재사용 / 보강 / 폴백")
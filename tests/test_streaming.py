@@ -0,0 +1,51 @@
+"""
+답변 스트리밍 이벤트 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.session_registry import get_session_registry
+from agent.streaming import emit_event, is_streaming, stream_answer
+
+
+def test_stream_answer_emits_deltas():
+    """조각을 delta 이벤트로 전달하고 전체 답변을 반환"""
+    events = []
+    state = {'stream_sink': events.append, 'answer': '', 'iteration_count': 0}
+
+    answer = stream_answer(state, iter(['안녕', '하세요']))
+
+    assert answer == '안녕하세요'
+    assert [e['type'] for e in events] == ['answer_start', 'delta', 'delta']
+    assert all(e['draft'] == 0 for e in events)
+    print("✓ delta 이벤트")
+
+
+def test_regenerated_answer_supersedes_previous_draft():
+    """재생성 시 이전 초안에 대한 superseded 이벤트가 먼저 전달됨"""
+    handle = 'test-stream::draft'
+    events = []
+    get_session_registry().set(handle, 'stream_sink', events.append)
+    state = {'resource_handle': handle, 'answer': '이전 답변', 'iteration_count': 1}
+
+    try:
+        stream_answer(state, iter(['새 답변']))
+    finally:
+        get_session_registry().release(handle)
+
+    assert events[0] == {'type': 'superseded', 'draft': 0}
+    assert events[1] == {'type': 'answer_start', 'draft': 1}
+    print("✓ superseded 이벤트")
+
+
+def test_emit_without_sink_is_noop():
+    """stream_sink가 없으면 이벤트는 무시됨"""
+    state = {'resource_handle': None}
+    assert not is_streaming(state)
+    emit_event(state, {'type': 'node', 'node': 'retrieve', 'status': 'start'})
+    print("✓ sink 없음")
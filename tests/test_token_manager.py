@@ -0,0 +1,77 @@
+"""
+TokenManager 토큰 계산 / 자르기 테스트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from context.token_manager import TokenManager, get_token_cache_stats, _token_count_cache
+from context.context_manager import ContextManager
+
+
+class CharEncoding:
+    """문자 1개 = 토큰 1개인 테스트용 인코딩 (tiktoken Encoding과 같은 메서드)"""
+    name = 'char-test'
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode_ordinary(self, text):
+        self.encoded += 1
+        return [ord(c) for c in text]
+
+    def encode_ordinary_batch(self, texts):
+        return [self.encode_ordinary(text) for text in texts]
+
+    def decode(self, tokens):
+        return ''.join(chr(t) for t in tokens)
+
+
+def _manager():
+    manager = TokenManager(max_total_tokens=4000, model='gpt-4o-mini')
+    manager._encoding = CharEncoding()
+    _token_count_cache.clear()
+    return manager
+
+
+def test_counts_are_memoized_by_text_hash():
+    """같은 텍스트는 한 번만 인코딩, 배치는 캐시 미스만 인코딩"""
+    manager = _manager()
+    assert manager.count_tokens("메트포르민 부작용") == 9
+    assert manager.count_tokens("메트포르민 부작용") == 9
+    assert manager._encoding.encoded == 1
+
+    counts = manager.count_tokens_batch(["메트포르민 부작용", "고혈압", "", "고혈압"])
+    assert counts == [9, 3, 0, 3]
+    assert manager._encoding.encoded == 2  # "고혈압"만 새로 인코딩
+
+    stats = get_token_cache_stats()
+    assert stats['size'] == 2 and stats['hits'] >= 2
+    print("✓ 메모이제이션")
+
+
+def test_clip_by_token_ids_keeps_head_or_tail():
+    """토큰 ID 단위로 앞/뒤 유지 자르기, 최근 대화는 뒷부분 유지"""
+    manager = _manager()
+    text = "첫번째 대화. 두번째 대화."
+    assert manager.clip_to_tokens(text, 100) == text
+    assert manager.clip_to_tokens(text, 3) == "첫번째"
+    assert manager.clip_to_tokens(text, 3, keep='tail') == "대화."
+    assert manager.clip_to_tokens(text, 0) == ""
+
+    context = ContextManager(token_manager=manager)
+    assert context._clip_text(text, 3) == "대화."
+    print("✓ 토큰 단위 자르기")
+
+
+def test_plan_uses_token_counts():
+    """예산 계획은 실제 토큰 수 기준"""
+    manager = _manager()
+    plan = manager.make_plan(current_query="당뇨병", profile_summary="고혈압 환자")
+    assert plan.for_query == 3 and plan.for_profile == 6
+    assert plan.for_recent == int((4000 - 900 - 400 - 9) * 0.6)
+    print("✓ 예산 계획")
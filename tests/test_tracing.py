@@ -0,0 +1,91 @@
+"""
+Span 추적 (core/tracing.py) 및 trace 요약 스크립트 테스트
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.tracing import configure_tracing, disable_tracing, trace_span, current_span
+
+
+def test_nested_spans_written_to_jsonl(tmp_path):
+    """중첩 span이 부모-자식 관계와 함께 JSONL로 기록됨"""
+    trace_file = tmp_path / "node_trace.jsonl"
+    configure_tracing(str(trace_file))
+    try:
+        with trace_span("node.retrieve") as parent:
+            with trace_span("llm.embed", model="test") as child:
+                child.set_attribute("total_tokens", 12)
+            current_span().set_attribute("cache_hit", True)
+            parent.add("num_calls")
+    finally:
+        disable_tracing()
+
+    spans = [json.loads(line) for line in trace_file.read_text(encoding="utf-8").splitlines()]
+    assert [s['name'] for s in spans] == ["llm.embed", "node.retrieve"]  # 종료 순서대로 기록
+
+    embed, retrieve = spans
+    assert embed['parent_id'] == retrieve['span_id']
+    assert embed['trace_id'] == retrieve['trace_id']
+    assert embed['attributes'] == {"model": "test", "total_tokens": 12}
+    assert retrieve['attributes'] == {"cache_hit": True, "num_calls": 1}
+    assert retrieve['wall_ms'] >= embed['wall_ms'] >= 0
+    assert retrieve['cpu_ms'] is not None
+    print("✓ nested spans exported")
+
+
+def test_span_records_errors(tmp_path):
+    """예외 발생 시 status=error로 기록되고 예외는 그대로 전파"""
+    trace_file = tmp_path / "node_trace.jsonl"
+    configure_tracing(str(trace_file))
+    try:
+        try:
+            with trace_span("faiss.search"):
+                raise ValueError("dimension mismatch")
+        except ValueError:
+            pass
+        else:
+            assert False, "exception should propagate"
+    finally:
+        disable_tracing()
+
+    span = json.loads(trace_file.read_text(encoding="utf-8").strip())
+    assert span['status'] == "error"
+    assert "dimension mismatch" in span['attributes']['error']
+    print("✓ span error recorded")
+
+
+def test_disabled_tracing_is_noop(tmp_path):
+    """비활성화 시 아무것도 기록하지 않음"""
+    disable_tracing()
+    with trace_span("node.generate_answer") as span:
+        span.set_attribute("prompt_tokens", 10)
+    assert list(tmp_path.iterdir()) == []
+    print("✓ disabled tracing is a no-op")
+
+
+def test_summarize_traces_percentiles():
+    """노드별 p50/p95/p99 요약"""
+    sys.path.insert(0, str(project_root / "scripts"))
+    from summarize_traces import summarize_spans
+
+    spans = [{'name': 'node.retrieve', 'wall_ms': float(ms), 'cpu_ms': 1.0, 'attributes': {}}
+             for ms in range(1, 101)]
+    spans.append({'name': 'llm.generate', 'wall_ms': 500.0, 'cpu_ms': 2.0,
+                  'attributes': {'total_tokens': 300}})
+
+    summary = summarize_spans(spans, prefix="node.")
+    assert list(summary) == ['node.retrieve']
+    row = summary['node.retrieve']
+    assert row['count'] == 100
+    assert abs(row['p50_ms'] - 50.5) < 1e-9
+    assert abs(row['p95_ms'] - 95.05) < 1e-9
+    assert abs(row['p99_ms'] - 99.01) < 1e-9
+
+    assert summarize_spans(spans)['llm.generate']['total_tokens'] == 300
+    print("✓ summarize_traces percentiles")